@@ -31,13 +31,21 @@ from voicevox_engine.core.core_initializer import MOCK_VER, initialize_cores
 from voicevox_engine.engine_manifest import load_manifest
 from voicevox_engine.library.library_manager import LibraryManager
 from voicevox_engine.logging import LOGGING_CONFIG, logger
+from voicevox_engine.metas.Metas import StyleId
 from voicevox_engine.preset.preset_manager import PresetManager
-from voicevox_engine.setting.model import CorsPolicyMode
+from voicevox_engine.setting.model import (
+    CorsPolicyMode,
+    ModelPrecision,
+    OnnxExecutionMode,
+    OnnxGraphOptimizationLevel,
+)
 from voicevox_engine.setting.setting_manager import USER_SETTING_PATH, SettingHandler
+from voicevox_engine.tts_pipeline.onnx_session import OnnxSessionConfig
 from voicevox_engine.tts_pipeline.style_bert_vits2_tts_engine import (
     StyleBertVITS2TTSEngine,
 )
 from voicevox_engine.tts_pipeline.tts_engine import TTSEngineManager
+from voicevox_engine.user_dict.openjtalk_pool import install_openjtalk_pool
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
 from voicevox_engine.utility.path_utility import (
     engine_manifest_path,
@@ -75,6 +83,7 @@ class Envs:
     cpu_num_threads: str | None
     env_preset_path: str | None
     disable_mutable_api: bool
+    frontend_token_key: str | None
 
 
 _env_adapter = TypeAdapter(Envs)
@@ -87,6 +96,7 @@ def read_environment_variables() -> Envs:
         cpu_num_threads=os.getenv("VV_CPU_NUM_THREADS"),
         env_preset_path=os.getenv("VV_PRESET_FILE"),
         disable_mutable_api=decide_boolean_from_env("VV_DISABLE_MUTABLE_API"),
+        frontend_token_key=os.getenv("AIVISSPEECH_FRONTEND_TOKEN_KEY") or None,
     )
     return _env_adapter.validate_python(asdict(envs))
 
@@ -151,12 +161,51 @@ def select_first_not_none_or_none(candidates: list[S | None]) -> S | None:
     return None
 
 
+def parse_byte_size(value: str) -> int:
+    """
+    "4G" や "512M" のような K / M / G 単位付きの文字列をバイト数に変換する。
+
+    単位を省略した場合はバイト数とみなす。単位は 1024 の累乗として扱う。
+    """
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    value = value.strip().upper().removesuffix("B")
+    try:
+        if value[-1:] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid byte size: {value}")
+
+
 @dataclass(frozen=True)
 class CLIArgs:
     host: str
     port: int
     use_gpu: bool
     load_all_models: bool
+    model_pool_size: int
+    max_model_memory: int | None
+    pin_style_ids: list[int] | None
+    bert_feature_cache_size: int
+    bert_feature_cache_spill: bool
+    synthesis_workers: int
+    pipeline_stage_threads: list[int] | None
+    pipeline_queue_size: int
+    max_segment_phones: int
+    synthesis_cache_size: int
+    synthesis_cache_disk_size: int
+    text_frontend_cache_size: int
+    frontend_token_key: str | None
+    openjtalk_pool_size: int
+    document_frontend_workers: int
+    incremental_synthesis_cache_size: int
+    onnx_intra_op_num_threads: int | None
+    onnx_inter_op_num_threads: int | None
+    onnx_graph_optimization_level: OnnxGraphOptimizationLevel | None
+    onnx_execution_mode: OnnxExecutionMode | None
+    onnx_disable_cpu_mem_arena: bool | None
+    disable_optimized_model_cache: bool | None
+    precision: ModelPrecision | None
     output_log_utf8: bool
     cors_policy_mode: CorsPolicyMode | None
     allow_origins: list[str] | None
@@ -237,7 +286,230 @@ def read_cli_arguments(envs: Envs) -> CLIArgs:
     parser.add_argument(
         "--load_all_models",
         action="store_true",
-        help="起動時に全ての音声合成モデルを読み込みます。",
+        help=(
+            "起動時に全ての音声合成モデルをバックグラウンドで読み込みます。"
+            "ロードの進捗は /model_load_status で確認できます。"
+        ),
+    )
+    parser.add_argument(
+        "--model_pool_size",
+        type=int,
+        default=1,
+        help=(
+            "音声合成モデルごとに保持する推論セッション数の上限です。デフォルトは 1 です。"
+            "2 以上を指定すると同じ音声合成モデルへの複数のリクエストを並列に処理できますが、その分メモリ使用量が増えます。"
+            "DirectML を利用する場合は常に 1 になります。"
+        ),
+    )
+    parser.add_argument(
+        "--max_model_memory",
+        type=parse_byte_size,
+        default=None,
+        help=(
+            "ロードしておく音声合成モデルの合計メモリ使用量の上限です。4G や 512M のように K / M / G 単位で指定できます。"
+            "上限を超えると、最も長く使われていない音声合成モデルから順にアンロードされます。指定しない場合は無制限です。"
+        ),
+    )
+    parser.add_argument(
+        "--pin_style_ids",
+        type=int,
+        nargs="*",
+        default=None,
+        help=(
+            "起動時にロードし、常にメモリ上に保持しておく音声合成モデルのスタイル ID を指定します。スペースで区切ることで複数指定できます。"
+            "指定されたスタイル ID に紐づく音声合成モデルは、--max_model_memory の上限を超えても自動的にアンロードされません。"
+        ),
+    )
+    parser.add_argument(
+        "--bert_feature_cache_size",
+        type=parse_byte_size,
+        default=128 * 1024 * 1024,
+        help=(
+            "話者間で共有される BERT 特徴量キャッシュのメモリ使用量の上限です。4G や 512M のように K / M / G 単位で指定できます。"
+            "デフォルトは 128M です。0 を指定するとキャッシュを無効化します。"
+        ),
+    )
+    parser.add_argument(
+        "--bert_feature_cache_spill",
+        action="store_true",
+        help="BERT 特徴量キャッシュの上限を超えた特徴量を破棄せず、ユーザーディレクトリ内に退避します。",
+    )
+    parser.add_argument(
+        "--synthesis_workers",
+        type=int,
+        default=0,
+        help=(
+            "音声合成を別プロセスで実行するワーカープロセスの数です。0 を指定するとワーカープロセスを使わずに音声合成を行います。"
+            "音声合成モデルごとに担当のワーカープロセスが決まり、各ワーカープロセスがそれぞれ BERT モデルと担当の音声合成モデルをロードします。"
+            "1 以上を指定すると /cancellable_synthesis が利用できるようになります。"
+        ),
+    )
+    parser.add_argument(
+        "--pipeline_stage_threads",
+        type=int,
+        nargs=3,
+        metavar=("FRONTEND", "BERT", "ACOUSTIC"),
+        default=None,
+        help=(
+            "音声合成処理をテキスト処理・BERT 特徴量の抽出・音響モデルの推論の 3 段階に分けて並列実行するパイプライン並列化を有効にし、"
+            "各段階の処理に使うスレッド数をこの順にスペース区切りで指定します (例: 1 1 2) 。"
+            "同時に複数のリクエストを処理する際、あるリクエストの音響モデルの推論中に後続のリクエストの BERT 特徴量を抽出できるようになります。"
+            "BERT 特徴量の抽出中は推論セッションを 1 つ借り出すため、同じ音声合成モデルへのリクエストを重ねて処理するには --model_pool_size に 2 以上を指定してください。"
+            "指定しない場合は無効です。--synthesis_workers と同時には利用できません。"
+        ),
+    )
+    parser.add_argument(
+        "--pipeline_queue_size",
+        type=int,
+        default=16,
+        help="パイプライン並列化の各段階で処理待ちにできるリクエストの最大数です。デフォルトは 16 です。",
+    )
+    parser.add_argument(
+        "--max_segment_phones",
+        type=int,
+        default=300,
+        help=(
+            "1 回の音響モデルの推論で扱う音素数の目安となる上限です。"
+            "音素数がこれを超える長い文章は句読点の位置で分割して音声合成し、境界をクロスフェードしながら連結することで、ピークメモリ使用量を抑えます。"
+            "デフォルトは 300 です。0 を指定すると分割しません。"
+        ),
+    )
+    parser.add_argument(
+        "--synthesis_cache_size",
+        type=parse_byte_size,
+        default=64 * 1024 * 1024,
+        help=(
+            "/synthesis API の音声合成結果をメモリ上にキャッシュする際の、メモリ使用量の上限です。4G や 512M のように K / M / G 単位で指定できます。"
+            "上限を超えると、最も長く使われていない音声合成結果から破棄されます。デフォルトは 64M です。0 を指定するとキャッシュを無効化します。"
+        ),
+    )
+    parser.add_argument(
+        "--synthesis_cache_disk_size",
+        type=parse_byte_size,
+        default=0,
+        help=(
+            "音声合成結果をユーザーディレクトリ内にもキャッシュし、再起動後も利用する際の、ディスク使用量の上限です。"
+            "上限を超えると、最も長く使われていない音声合成結果から削除されます。デフォルトは 0 (ディスクにはキャッシュしない) です。"
+        ),
+    )
+    parser.add_argument(
+        "--text_frontend_cache_size",
+        type=int,
+        default=1024,
+        help=(
+            "読み上げテキストの解析結果 (読み・アクセント) をメモリ上にキャッシュする文章数の上限です。"
+            "/audio_query の文書モードでの文ごとの解析結果も、同じ上限の文数までキャッシュします。"
+            "ユーザー辞書が更新されると、キャッシュは自動的に破棄されます。デフォルトは 1024 です。0 を指定するとキャッシュを無効化します。"
+        ),
+    )
+    parser.add_argument(
+        "--frontend_token_key",
+        type=str,
+        default=None,
+        help=(
+            "/audio_query などで作成する音声合成用のクエリに、読み上げテキストの解析結果を埋め込んだトークン (frontendToken) を含める際の署名用の鍵です。"
+            "複数のエンジンのプロセスでリクエストを分散する場合は全てのプロセスで同じ鍵を指定すると、クエリを作成したプロセスとは異なるプロセスでも音声合成時に解析を省略できます。"
+            "環境変数 AIVISSPEECH_FRONTEND_TOKEN_KEY でも指定できます。指定しない場合はトークンを含めません。"
+        ),
+    )
+    parser.add_argument(
+        "--openjtalk_pool_size",
+        type=int,
+        default=4,
+        help=(
+            "読み上げテキストの解析に用いる OpenJTalk のインスタンスの数の上限です。"
+            "同時に受け付けたリクエストのテキスト解析を、それぞれ別のインスタンスで並列に実行します。"
+            "全てのインスタンスにはユーザー辞書が適用され、辞書の更新時には一括で置き換えられます。"
+            "デフォルトは 4 です。1 を指定すると単一のインスタンスで順番にテキスト解析を行います。"
+        ),
+    )
+    parser.add_argument(
+        "--document_frontend_workers",
+        type=int,
+        default=0,
+        help=(
+            "/audio_query の文書モード (document_mode=true) で、文ごとの読み上げテキストの解析を並列に実行するワーカープロセスの数です。"
+            "各ワーカープロセスにはユーザー辞書が適用されます。長い文章の解析時間を CPU コア数に応じて短縮できます。"
+            "デフォルトは 0 (ワーカープロセスを使わず、文ごとに順番に解析する) です。"
+        ),
+    )
+    parser.add_argument(
+        "--incremental_synthesis_cache_size",
+        type=parse_byte_size,
+        default=64 * 1024 * 1024,
+        help=(
+            "/incremental_synthesis API で、ハンドルごとに前回の音声合成結果 (文ごとの音声波形) を保持する際の、メモリ使用量の上限です。4G や 512M のように K / M / G 単位で指定できます。"
+            "上限を超えると、最も長く使われていないハンドルの音声合成結果から破棄されます。デフォルトは 64M です。0 を指定すると常に全ての文を音声合成し直します。"
+        ),
+    )
+
+    parser.add_argument(
+        "--onnx_intra_op_num_threads",
+        type=int,
+        default=None,
+        help=(
+            "ONNX Runtime がノード内の並列処理に使うスレッド数です。0 を指定すると ONNX Runtime が自動的に決定します。"
+            "このオプションは --setting_file で指定される設定ファイルよりも優先されます。"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_inter_op_num_threads",
+        type=int,
+        default=None,
+        help=(
+            "ONNX Runtime がノード間の並列処理に使うスレッド数です。0 を指定すると ONNX Runtime が自動的に決定します。"
+            "このオプションは --setting_file で指定される設定ファイルよりも優先されます。"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_graph_optimization_level",
+        type=OnnxGraphOptimizationLevel,
+        choices=list(OnnxGraphOptimizationLevel),
+        default=None,
+        help=(
+            "ONNX Runtime のグラフ最適化レベル。disable / basic / extended / all が指定できます。デフォルトは all 。"
+            "このオプションは --setting_file で指定される設定ファイルよりも優先されます。"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_execution_mode",
+        type=OnnxExecutionMode,
+        choices=list(OnnxExecutionMode),
+        default=None,
+        help=(
+            "ONNX Runtime のグラフの実行モード。sequential / parallel が指定できます。デフォルトは sequential 。"
+            "このオプションは --setting_file で指定される設定ファイルよりも優先されます。"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_disable_cpu_mem_arena",
+        action="store_true",
+        default=None,
+        help=(
+            "ONNX Runtime の CPU メモリアリーナを無効化し、メモリ使用量を抑えます。推論は若干遅くなります。"
+            "このオプションは --setting_file で指定される設定ファイルよりも優先されます。"
+        ),
+    )
+    parser.add_argument(
+        "--disable_optimized_model_cache",
+        action="store_true",
+        default=None,
+        help=(
+            "最適化済みの BERT モデル・音声合成モデルをユーザーディレクトリ内にキャッシュせず、ロードのたびにグラフ最適化を行います。"
+            "このオプションは --setting_file で指定される設定ファイルよりも優先されます。"
+        ),
+    )
+    parser.add_argument(
+        "--precision",
+        type=ModelPrecision,
+        choices=list(ModelPrecision),
+        default=None,
+        help=(
+            "推論に利用するモデルの精度。fp32 / int8 が指定できます。デフォルトは fp32 。"
+            "int8 を指定すると、CPU 推論時に BERT モデル・音声合成モデルの重みを int8 に動的量子化したモデルを利用し、音声合成を高速化します (音質は若干低下します) 。"
+            "量子化済みのモデルは初回ロード時に生成され、ユーザーディレクトリ内にキャッシュされます。"
+            "このオプションは --setting_file で指定される設定ファイルよりも優先されます。"
+        ),
     )
 
     # 引数へcpu_num_threadsの指定がなければ、環境変数をロールします。
@@ -363,10 +635,98 @@ def main() -> None:
     # AivmManager を初期化
     aivm_manager = AivmManager(get_save_dir() / "Models")
 
+    setting_loader = SettingHandler(args.setting_file)
+    settings = setting_loader.load()
+
+    # ONNX Runtime の推論セッションの設定
+    ## 複数方式で指定可能な場合、優先度は上から「引数」「設定ファイル」「デフォルト値」
+    default_onnx_session_config = OnnxSessionConfig()
+    disable_optimized_model_cache = select_first_not_none(
+        [args.disable_optimized_model_cache, settings.disable_optimized_model_cache, False]  # fmt: skip
+    )
+    onnx_session_config = OnnxSessionConfig(
+        intra_op_num_threads=select_first_not_none(
+            [
+                args.onnx_intra_op_num_threads,
+                settings.onnx_intra_op_num_threads,
+                default_onnx_session_config.intra_op_num_threads,
+            ]
+        ),
+        inter_op_num_threads=select_first_not_none(
+            [
+                args.onnx_inter_op_num_threads,
+                settings.onnx_inter_op_num_threads,
+                default_onnx_session_config.inter_op_num_threads,
+            ]
+        ),
+        graph_optimization_level=select_first_not_none(
+            [
+                args.onnx_graph_optimization_level,
+                settings.onnx_graph_optimization_level,
+                default_onnx_session_config.graph_optimization_level,
+            ]
+        ),
+        execution_mode=select_first_not_none(
+            [
+                args.onnx_execution_mode,
+                settings.onnx_execution_mode,
+                default_onnx_session_config.execution_mode,
+            ]
+        ),
+        enable_cpu_mem_arena=not select_first_not_none(
+            [args.onnx_disable_cpu_mem_arena, settings.onnx_disable_cpu_mem_arena, False]  # fmt: skip
+        ),
+        optimized_model_cache_dir=(
+            None
+            if disable_optimized_model_cache
+            else StyleBertVITS2TTSEngine.OPTIMIZED_MODEL_CACHE_DIR
+        ),
+        precision=select_first_not_none(
+            [args.precision, settings.precision, default_onnx_session_config.precision]
+        ),
+        quantized_model_cache_dir=StyleBertVITS2TTSEngine.QUANTIZED_MODEL_CACHE_DIR,
+    )
+
+    # 同時に受け付けたリクエストのテキスト解析を並列に実行できるよう、OpenJTalk のインスタンスをプールする
+    ## ユーザー辞書はプール内の全てのインスタンスに適用されるため、UserDictionary の初期化より前に行う
+    install_openjtalk_pool(args.openjtalk_pool_size)
+
     # StyleBertVITS2TTSEngine を通常の TTSEngine の代わりに利用
     tts_engines = TTSEngineManager()
     tts_engines.register_engine(
-        StyleBertVITS2TTSEngine(aivm_manager, args.use_gpu, args.load_all_models),
+        StyleBertVITS2TTSEngine(
+            aivm_manager,
+            args.use_gpu,
+            args.load_all_models,
+            model_pool_size=args.model_pool_size,
+            max_model_memory=args.max_model_memory,
+            pinned_style_ids=[
+                StyleId(style_id) for style_id in args.pin_style_ids or []
+            ],
+            bert_feature_cache_size=args.bert_feature_cache_size,
+            bert_feature_cache_spill=args.bert_feature_cache_spill,
+            onnx_session_config=onnx_session_config,
+            synthesis_workers=args.synthesis_workers,
+            pipeline_stage_threads=(
+                (
+                    args.pipeline_stage_threads[0],
+                    args.pipeline_stage_threads[1],
+                    args.pipeline_stage_threads[2],
+                )
+                if args.pipeline_stage_threads is not None
+                else None
+            ),
+            pipeline_queue_size=args.pipeline_queue_size,
+            max_segment_phones=args.max_segment_phones,
+            synthesis_cache_size=args.synthesis_cache_size,
+            synthesis_cache_disk_size=args.synthesis_cache_disk_size,
+            text_frontend_cache_size=args.text_frontend_cache_size,
+            frontend_token_key=select_first_not_none_or_none(
+                [args.frontend_token_key, envs.frontend_token_key]
+            ),
+            document_frontend_workers=args.document_frontend_workers,
+            incremental_synthesis_cache_size=args.incremental_synthesis_cache_size,
+        ),
         MOCK_VER,
     )
 
@@ -382,9 +742,6 @@ def main() -> None:
             enable_mock=args.enable_mock,
         )
 
-    setting_loader = SettingHandler(args.setting_file)
-    settings = setting_loader.load()
-
     # 複数方式で指定可能な場合、優先度は上から「引数」「環境変数」「設定ファイル」「デフォルト値」
 
     cors_policy_mode = select_first_not_none(
@@ -53,6 +53,10 @@ a = Analysis(
     hiddenimports=[
         # ref: https://github.com/pypa/setuptools/issues/4374
         'pkg_resources.extern',
+        # uvicorn は WebSocket の実装を文字列で指定して動的にインポートするため、静的解析では検出されない
+        'uvicorn.protocols.websockets.auto',
+        'uvicorn.protocols.websockets.websockets_impl',
+        'websockets.legacy.server',
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,116 @@
+"""音声合成用のクエリのフィンガープリント生成にかかる時間の測定"""
+
+import argparse
+from test.benchmark.speed.utility import benchmark_time
+from typing import Any
+
+from pydantic import BaseModel
+
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+
+
+def _legacy_hash(model: BaseModel) -> int:
+    """フィンガープリント導入前の AudioQuery / AccentPhrase / Mora の __hash__() と同じ処理"""
+
+    def to_hashable(value: Any) -> Any:
+        if isinstance(value, BaseModel):
+            return _legacy_hash(value)
+        return value
+
+    items = [
+        (
+            (k, tuple(to_hashable(e) for e in v))
+            if isinstance(v, list)
+            else (k, to_hashable(v))
+        )  # fmt: skip
+        for k, v in model.__dict__.items()
+    ]
+    return hash(tuple(sorted(items)))
+
+
+def _gen_query(n_accent_phrases: int) -> AudioQuery:
+    """アクセント句ごとに 5 モーラを持つ長いクエリを生成する"""
+    accent_phrases = [
+        AccentPhrase(
+            moras=[
+                Mora(
+                    text="カ",
+                    consonant="k",
+                    consonant_length=0.0,
+                    vowel="a",
+                    vowel_length=0.0,
+                    pitch=float(i),
+                )  # fmt: skip
+                for i in range(5)
+            ],
+            accent=1,
+            pause_mora=Mora(text="、", vowel="pau", vowel_length=0.0, pitch=0.0),
+        )
+        for _ in range(n_accent_phrases)
+    ]
+    return AudioQuery(
+        accent_phrases=accent_phrases,
+        speedScale=1.0,
+        intonationScale=1.0,
+        tempoDynamicsScale=1.0,
+        pitchScale=0.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=44100,
+        outputStereo=False,
+        kana="カカカカカ、" * n_accent_phrases,
+    )
+
+
+def benchmark_fingerprint(n_accent_phrases: int, n_repeat: int) -> dict[str, float]:
+    """既存の __hash__() ・JSON シリアライズと、初回およびメモ化後のフィンガープリント生成の平均時間を測定する"""
+
+    query = _gen_query(n_accent_phrases)
+
+    def fingerprint_first() -> None:
+        """モーラのメモ化が効かない状態で、フィンガープリントを生成する"""
+        _gen_query(n_accent_phrases).fingerprint()
+
+    def build_only() -> None:
+        """fingerprint_first() からクエリの生成時間を差し引くため、クエリの生成のみを行う"""
+        _gen_query(n_accent_phrases)
+
+    def legacy_hash() -> None:
+        _legacy_hash(query)
+
+    def dump_json() -> None:
+        query.model_dump_json()
+
+    def fingerprint_memoized() -> None:
+        query.fingerprint()
+
+    build_time = benchmark_time(build_only, n_repeat=n_repeat, sec_sleep=0.0)
+    first_time = benchmark_time(fingerprint_first, n_repeat=n_repeat, sec_sleep=0.0)
+    query.fingerprint()
+    return {
+        "legacy __hash__": benchmark_time(
+            legacy_hash, n_repeat=n_repeat, sec_sleep=0.0
+        ),
+        "model_dump_json": benchmark_time(dump_json, n_repeat=n_repeat, sec_sleep=0.0),
+        "fingerprint (first)": first_time - build_time,
+        "fingerprint (memoized)": benchmark_time(
+            fingerprint_memoized, n_repeat=n_repeat, sec_sleep=0.0
+        ),
+    }
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.fingerprint` である。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_accent_phrases", type=int, default=200)
+    parser.add_argument("--n_repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    results = benchmark_fingerprint(args.n_accent_phrases, args.n_repeat)
+    for name, average_time in results.items():
+        print("{}: {:.3f} ms".format(name, average_time * 1000))
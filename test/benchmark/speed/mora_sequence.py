@@ -0,0 +1,102 @@
+"""長いアクセント句系列の生成にかかる時間とメモリ確保の測定"""
+
+import argparse
+from test.benchmark.speed.utility import benchmark_allocations, benchmark_time
+from typing import Callable
+
+from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+from voicevox_engine.tts_pipeline.mora_mapping import mora_kana_to_mora_phonemes
+from voicevox_engine.tts_pipeline.mora_sequence import MoraSequenceBuilder
+
+_MORAS_PER_ACCENT_PHRASE = 5
+
+
+def _gen_moras(n_moras: int) -> list[tuple[str, str | None, str]]:
+    """カタカナモーラを順に並べ、アクセント句 4 つごとに読点の記号モーラを挟んだモーラ (テキスト・子音・母音) のリストを生成する"""
+    kana_moras = list(mora_kana_to_mora_phonemes.items())
+    moras: list[tuple[str, str | None, str]] = []
+    for index in range(n_moras):
+        if index % (_MORAS_PER_ACCENT_PHRASE * 4) == _MORAS_PER_ACCENT_PHRASE * 4 - 1:
+            moras.append((",", None, "pau"))
+            continue
+        text, (consonant, vowel) = kana_moras[index % len(kana_moras)]
+        moras.append((text, consonant, vowel))
+    return moras
+
+
+def _create_pydantic(moras: list[tuple[str, str | None, str]]) -> list[AccentPhrase]:
+    """MoraSequence 導入前と同様に、検証付きの Mora / AccentPhrase を生成し、update_length() と同じ代入を行う"""
+    accent_phrases: list[AccentPhrase] = []
+    for start in range(0, len(moras), _MORAS_PER_ACCENT_PHRASE):
+        phrase_moras = [
+            Mora(
+                text=text,
+                consonant=consonant,
+                consonant_length=None if consonant is None else 0.0,
+                vowel=vowel,
+                vowel_length=0.0,
+                pitch=0.0,
+            )
+            for text, consonant, vowel in moras[
+                start : start + _MORAS_PER_ACCENT_PHRASE
+            ]
+        ]
+        accent_phrases.append(AccentPhrase(moras=phrase_moras, accent=1, pause_mora=None))  # fmt: skip
+    for accent_phrase in accent_phrases:
+        for mora in accent_phrase.moras:
+            if mora.consonant is not None:
+                if mora.consonant_length is None:
+                    mora.consonant_length = 0.0
+            else:
+                mora.consonant_length = None
+    return accent_phrases
+
+
+def _create_mora_sequence(
+    moras: list[tuple[str, str | None, str]]
+) -> list[AccentPhrase]:
+    """モーラごとの配列としてアクセント句系列を生成し、最後に 1 度だけ AccentPhrase に変換する"""
+    builder = MoraSequenceBuilder()
+    for index, (text, consonant, vowel) in enumerate(moras):
+        builder.add_mora(text, consonant, vowel, None if consonant is None else 0.0, 0.0, 0.0)  # fmt: skip
+        if (index + 1) % _MORAS_PER_ACCENT_PHRASE == 0:
+            builder.end_accent_phrase(1)
+    return builder.build().to_accent_phrases()
+
+
+def benchmark_mora_sequence(
+    n_moras: int, n_repeat: int
+) -> dict[str, tuple[float, int, int]]:
+    """
+    アクセント句系列の生成 (create_accent_phrases() 相当) を、
+    検証付きの pydantic モデルを直接扱う場合と MoraSequence を経由する場合とで比較する
+    """
+
+    moras = _gen_moras(n_moras)
+    targets: dict[str, Callable[[], object]] = {
+        "create (pydantic)": lambda: _create_pydantic(moras),
+        "create (MoraSequence)": lambda: _create_mora_sequence(moras),
+    }
+    results: dict[str, tuple[float, int, int]] = {}
+    for name, target in targets.items():
+        average_time = benchmark_time(lambda: None if target() else None, n_repeat=n_repeat, sec_sleep=0.0)  # fmt: skip
+        block_count, peak_size = benchmark_allocations(target)
+        results[name] = (average_time, block_count, peak_size)
+    return results
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.mora_sequence` である。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_moras", type=int, default=1000)
+    parser.add_argument("--n_repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    results = benchmark_mora_sequence(args.n_moras, args.n_repeat)
+    for name, (average_time, block_count, peak_size) in results.items():
+        print(
+            "{}: {:.3f} ms, {} blocks retained, {:.1f} KiB peak".format(
+                name, average_time * 1000, block_count, peak_size / 1024
+            )
+        )
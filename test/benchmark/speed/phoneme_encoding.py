@@ -0,0 +1,137 @@
+"""長い音声合成用のクエリにおける、音素ID系列とフレームごとの音素 onehot ベクトルへの変換にかかる時間とメモリ確保の測定"""
+
+import argparse
+from test.benchmark.speed.utility import benchmark_allocations, benchmark_time
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voicevox_engine.dev.core.mock import MockCoreWrapper
+from voicevox_engine.metas.Metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+from voicevox_engine.tts_pipeline.mora_mapping import mora_kana_to_mora_phonemes
+from voicevox_engine.tts_pipeline.phoneme import to_frame_onehot
+from voicevox_engine.tts_pipeline.tts_engine import (
+    TTSEngine,
+    _count_frame_per_unit,
+    _to_consonant_and_vowel_ids,
+    _to_flatten_phoneme_ids,
+    _to_flatten_phonemes,
+    to_flatten_moras,
+)
+
+_MORAS_PER_ACCENT_PHRASE = 5
+
+
+def _gen_query(n_moras: int) -> AudioQuery:
+    """カタカナモーラを順に並べ、アクセント句 4 つごとに読点の pause_mora を挟んだ音声合成用のクエリを生成する"""
+    kana_moras = list(mora_kana_to_mora_phonemes.items())
+    accent_phrases: list[AccentPhrase] = []
+    for start in range(0, n_moras, _MORAS_PER_ACCENT_PHRASE):
+        moras: list[Mora] = []
+        for index in range(start, min(start + _MORAS_PER_ACCENT_PHRASE, n_moras)):
+            text, (consonant, vowel) = kana_moras[index % len(kana_moras)]
+            moras.append(
+                Mora(
+                    text=text,
+                    consonant=consonant,
+                    consonant_length=None if consonant is None else 0.05,
+                    vowel=vowel,
+                    vowel_length=0.1,
+                    pitch=5.5,
+                )
+            )
+        pause_mora = None
+        if len(accent_phrases) % 4 == 3:
+            pause_mora = Mora(text="、", vowel="pau", vowel_length=0.3, pitch=0.0)
+        accent_phrases.append(AccentPhrase(moras=moras, accent=1, pause_mora=pause_mora))  # fmt: skip
+    return AudioQuery(
+        accent_phrases=accent_phrases,
+        speedScale=1.0,
+        intonationScale=1.0,
+        tempoDynamicsScale=1.0,
+        pitchScale=0.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=44100,
+        outputStereo=False,
+        kana="",
+    )
+
+
+def _decoder_phoneme_per_phoneme(query: AudioQuery) -> NDArray[np.float32]:
+    """ベクトル化前の _query_to_decoder_feature() と同様に、音素ごとの onehot ベクトルを連結してからフレーム長だけ繰り返す"""
+    moras = to_flatten_moras(query.accent_phrases)
+    phoneme = np.stack([p.onehot for p in _to_flatten_phonemes(moras)])
+    frame_per_phoneme, _ = _count_frame_per_unit(moras)
+    return np.repeat(phoneme, frame_per_phoneme, axis=0)
+
+
+def _phoneme_ids_per_phoneme(query: AudioQuery) -> NDArray[np.int64]:
+    """ベクトル化前の update_length() と同様に、Phoneme ごとに tuple.index() で音素IDを求める"""
+    phonemes = _to_flatten_phonemes(to_flatten_moras(query.accent_phrases))
+    return np.array([phoneme._PHONEME_LIST.index(phoneme._phoneme) for phoneme in phonemes], dtype=np.int64)  # fmt: skip
+
+
+def _phoneme_ids_vectorized(query: AudioQuery) -> NDArray[np.int64]:
+    """update_length() と同様に、変換表とベクトル化した処理で音素ID系列を求める"""
+    moras = to_flatten_moras(query.accent_phrases)
+    phoneme_ids, _ = _to_flatten_phoneme_ids(*_to_consonant_and_vowel_ids(moras))
+    return phoneme_ids
+
+
+def _decoder_phoneme_vectorized(query: AudioQuery) -> NDArray[np.float32]:
+    """_query_to_decoder_feature() と同様に、音素ID系列からフレームごとの音素 onehot ベクトルを直接生成する"""
+    moras = to_flatten_moras(query.accent_phrases)
+    phoneme_ids, _ = _to_flatten_phoneme_ids(*_to_consonant_and_vowel_ids(moras))
+    frame_per_phoneme, _ = _count_frame_per_unit(moras)
+    return to_frame_onehot(phoneme_ids, frame_per_phoneme)
+
+
+def benchmark_phoneme_encoding(
+    n_moras: int, n_repeat: int
+) -> dict[str, tuple[float, int, int]]:
+    """
+    音素IDへの変換とフレームごとの音素 onehot ベクトルの生成を、音素ごとに Phoneme を経由する場合とベクトル化した場合とで比較する
+    update_length() / update_pitch() はモックのコアを用いて、音声合成モデルの推論以外にかかる時間を測定する
+    """
+
+    query = _gen_query(n_moras)
+    tts_engine = TTSEngine(MockCoreWrapper())
+    accent_phrases = query.accent_phrases
+    targets: dict[str, Callable[[], object]] = {
+        "phoneme ids (per phoneme)": lambda: _phoneme_ids_per_phoneme(query),
+        "phoneme ids (vectorized)": lambda: _phoneme_ids_vectorized(query),
+        "decoder phoneme (per phoneme)": lambda: _decoder_phoneme_per_phoneme(query),
+        "decoder phoneme (vectorized)": lambda: _decoder_phoneme_vectorized(query),
+        "update_length": lambda: tts_engine.update_length(accent_phrases, StyleId(0)),
+        "update_pitch": lambda: tts_engine.update_pitch(accent_phrases, StyleId(0)),
+    }
+    results: dict[str, tuple[float, int, int]] = {}
+    for name, target in targets.items():
+        average_time = benchmark_time(lambda: None if target() is None else None, n_repeat=n_repeat, sec_sleep=0.0)  # fmt: skip
+        block_count, peak_size = benchmark_allocations(target)
+        results[name] = (average_time, block_count, peak_size)
+    return results
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.phoneme_encoding` である。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_moras", type=int, default=5000)
+    parser.add_argument("--n_repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = benchmark_phoneme_encoding(args.n_moras, args.n_repeat)
+    for name, (average_time, block_count, peak_size) in results.items():
+        print(
+            "{}: {:.3f} ms, {} blocks retained, {:.1f} KiB peak".format(
+                name, average_time * 1000, block_count, peak_size / 1024
+            )
+        )
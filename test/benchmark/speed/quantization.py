@@ -0,0 +1,109 @@
+"""int8 に動的量子化したモデルによる音声合成にかかる時間と音質の劣化の測定"""
+
+import argparse
+import multiprocessing
+from test.benchmark.speed.utility import benchmark_time
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voicevox_engine.aivm_manager import AivmManager
+from voicevox_engine.metas.Metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.setting.model import ModelPrecision
+from voicevox_engine.tts_pipeline.onnx_session import OnnxSessionConfig
+from voicevox_engine.tts_pipeline.style_bert_vits2_tts_engine import (
+    StyleBertVITS2TTSEngine,
+)
+from voicevox_engine.utility.path_utility import get_save_dir
+
+BENCHMARK_TEXT = "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。"
+
+
+def _benchmark_synthesis(
+    precision: ModelPrecision, style_id: StyleId, n_repeat: int
+) -> tuple[float, NDArray[np.float32], NDArray[np.float32]]:
+    """
+    指定した精度のモデルで音声合成にかかる平均時間を測定し、2 回分の合成結果と共に返す。
+    BERT モデルはプロセス全体で共有されるため、精度ごとに別プロセスで実行する必要がある。
+    """
+
+    engine = StyleBertVITS2TTSEngine(
+        AivmManager(get_save_dir() / "Models"),
+        onnx_session_config=OnnxSessionConfig(
+            precision=precision,
+            quantized_model_cache_dir=StyleBertVITS2TTSEngine.QUANTIZED_MODEL_CACHE_DIR,
+        ),
+    )
+    engine.initialize_synthesis(style_id, skip_reinit=True)
+    query = AudioQuery(
+        accent_phrases=engine.create_accent_phrases(BENCHMARK_TEXT, style_id),
+        speedScale=1.0,
+        intonationScale=1.0,
+        # 音素長の揺らぎを無効にし、精度ごとの合成結果の長さを揃える
+        tempoDynamicsScale=0.0,
+        pitchScale=0.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1,
+        outputSamplingRate=engine.default_sampling_rate,
+        outputStereo=False,
+        kana=BENCHMARK_TEXT,
+    )
+
+    def execute() -> None:
+        """計測対象となる処理を実行する"""
+        engine.synthesize_wave(query, style_id)
+
+    average_time = benchmark_time(execute, n_repeat=n_repeat)
+    return (
+        average_time,
+        engine.synthesize_wave(query, style_id),
+        engine.synthesize_wave(query, style_id),
+    )
+
+
+def _log_spectrogram_distance(a: NDArray[np.float32], b: NDArray[np.float32]) -> float:
+    """2 つの音声波形の対数振幅スペクトログラムの平均二乗誤差の平方根 (dB) を返す。"""
+
+    def log_spectrogram(wave: NDArray[np.float32]) -> NDArray[np.float32]:
+        n_fft, hop_length = 1024, 256
+        n_frames = max(1, 1 + (len(wave) - n_fft) // hop_length)
+        frames = np.stack(
+            [wave[i * hop_length : i * hop_length + n_fft] for i in range(n_frames)]
+        )
+        spectrum = np.abs(np.fft.rfft(frames * np.hanning(n_fft), axis=1))
+        return 20 * np.log10(np.maximum(spectrum, 1e-5))
+
+    length = min(len(a), len(b))
+    return float(
+        np.sqrt(np.mean((log_spectrogram(a[:length]) - log_spectrogram(b[:length])) ** 2))  # fmt: skip
+    )
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.quantization --style_id=<スタイル ID>` である。
+    # 指定したスタイルの音声合成モデルが、事前にエンジンにインストールされている必要がある。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--style_id", type=int, required=True)
+    parser.add_argument("--n_repeat", type=int, default=10)
+    args = parser.parse_args()
+    style_id = StyleId(args.style_id)
+
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        fp32_time, fp32_wave, fp32_wave_2 = pool.apply(
+            _benchmark_synthesis, (ModelPrecision.fp32, style_id, args.n_repeat)
+        )
+        int8_time, int8_wave, _ = pool.apply(
+            _benchmark_synthesis, (ModelPrecision.int8, style_id, args.n_repeat)
+        )
+
+    print("synthesis fp32: {:.4f} sec".format(fp32_time))
+    print("synthesis int8: {:.4f} sec".format(int8_time))
+    print("speedup: {:.2f}x".format(fp32_time / int8_time))
+    # 同じ精度での合成結果の揺らぎを基準として、量子化による音質の劣化を比較する
+    print("log spectrogram distance fp32 vs fp32: {:.2f} dB".format(_log_spectrogram_distance(fp32_wave, fp32_wave_2)))  # fmt: skip
+    print("log spectrogram distance fp32 vs int8: {:.2f} dB".format(_log_spectrogram_distance(fp32_wave, int8_wave)))  # fmt: skip
@@ -0,0 +1,84 @@
+"""OpenJTalk のフルコンテキストラベルの解析にかかる時間の測定"""
+
+import argparse
+from test.benchmark.speed.utility import benchmark_time
+
+import pyopenjtalk
+
+from voicevox_engine.tts_pipeline.text_analyzer import (
+    Label,
+    UtteranceLabel,
+    _parse_contexts,
+    text_to_accent_phrases,
+)
+
+# 長い入力の文章のコーパス
+BENCHMARK_CORPUS = [
+    "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。"
+    "何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。",
+    "メロスは激怒した。必ず、かの邪智暴虐の王を除かなければならぬと決意した。"
+    "メロスには政治がわからぬ。メロスは、村の牧人である。笛を吹き、羊と遊んで暮して来た。",
+    "2024年10月16日の東京の最高気温は23.5度、降水確率は30%でした。明日は晴れのち曇りの予報です。",
+]
+
+
+def benchmark_label_parser(n_repeat: int, n_concat: int) -> dict[str, float]:
+    """
+    長い文章から抽出したフルコンテキストラベルを、全ての属性を正規表現で解析する従来の方法と、
+    区切り文字で分割して利用する属性のみを取り出す Label.from_feature() とで解析し、平均時間を比較する
+    """
+
+    features_list = [
+        pyopenjtalk.extract_fullcontext(text * n_concat) for text in BENCHMARK_CORPUS
+    ]
+
+    def regex_parse() -> None:
+        """従来の Label.from_feature() と同じく、全ての属性を正規表現で解析する"""
+        for features in features_list:
+            for feature in features:
+                _parse_contexts(feature)
+
+    def split_parse() -> None:
+        for features in features_list:
+            for feature in features:
+                Label.from_feature(feature)
+
+    def accent_phrases_from_labels() -> None:
+        """ラベルの解析からアクセント句系列の生成まで (OpenJTalk によるラベルの抽出を除く)"""
+        for features in features_list:
+            text_to_accent_phrases("_", text_to_features=lambda _: features)
+
+    def utterance_from_labels() -> None:
+        """解析済みのラベルから UtteranceLabel を生成する (ラベルの解析を含まない)"""
+        for labels in labels_list:
+            UtteranceLabel.from_labels(labels)
+
+    labels_list = [list(map(Label.from_feature, features)) for features in features_list]  # fmt: skip
+    targets = {
+        "label parse (regex, all contexts)": regex_parse,
+        "label parse (split, used fields)": split_parse,
+        "UtteranceLabel.from_labels": utterance_from_labels,
+        "text_to_accent_phrases (without OpenJTalk)": accent_phrases_from_labels,
+    }
+    return {
+        name: benchmark_time(target, n_repeat=n_repeat, sec_sleep=0.0)
+        for name, target in targets.items()
+    }
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.text_analyzer` である。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_repeat", type=int, default=20)
+    parser.add_argument("--n_concat", type=int, default=10)
+    args = parser.parse_args()
+
+    n_labels = sum(
+        len(pyopenjtalk.extract_fullcontext(text * args.n_concat))
+        for text in BENCHMARK_CORPUS
+    )
+    print(f"labels: {n_labels}")
+    results = benchmark_label_parser(args.n_repeat, args.n_concat)
+    for name, average_time in results.items():
+        print("{}: {:.2f} ms".format(name, average_time * 1000))
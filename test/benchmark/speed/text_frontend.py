@@ -0,0 +1,73 @@
+"""音声合成 1 リクエストあたりの読み上げテキストの解析 (正規化と g2p) にかかる時間の測定"""
+
+import argparse
+from test.benchmark.speed.utility import benchmark_time
+
+from style_bert_vits2.constants import Languages
+from style_bert_vits2.nlp import clean_text
+
+from voicevox_engine.aivm_manager import AivmManager
+from voicevox_engine.tts_pipeline.style_bert_vits2_tts_engine import (
+    StyleBertVITS2TTSEngine,
+    _analyze_text,
+    _install_text_analysis_hook,
+    _text_analysis_context,
+)
+from voicevox_engine.utility.path_utility import get_save_dir
+
+BENCHMARK_TEXT = (
+    "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。"
+    "何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。"
+)
+
+
+def benchmark_text_frontend(text: str, n_repeat: int) -> dict[str, float]:
+    """
+    TTSModel.infer() の内部で行われるテキストのクリーニング (正規化と g2p) を、
+    解析結果を再利用しない場合と、事前に 1 度だけ解析した結果を再利用する場合とで比較する
+    パイプライン並列化が有効な場合、1 区間ごとに BERT 特徴量の事前抽出と音響モデルの推論で 2 回クリーニングが行われる
+    """
+
+    def before_sequential() -> None:
+        """解析結果を再利用しない場合 (推論時に 1 回クリーニングする)"""
+        clean_text(text, Languages.JP, use_jp_extra=True, raise_yomi_error=False)
+
+    def before_pipeline() -> None:
+        """解析結果を再利用しない場合 (BERT 特徴量の事前抽出と推論で 2 回クリーニングする)"""
+        for _ in range(2):
+            clean_text(text, Languages.JP, use_jp_extra=True, raise_yomi_error=False)
+
+    def after_pipeline() -> None:
+        """事前に 1 度だけ解析し、BERT 特徴量の事前抽出と推論でその解析結果を再利用する場合"""
+        _text_analysis_context.analysis = _analyze_text(text)
+        try:
+            for _ in range(2):
+                clean_text(text, Languages.JP, use_jp_extra=True, raise_yomi_error=False)  # fmt: skip
+        finally:
+            _text_analysis_context.analysis = None
+
+    targets = {
+        "before (sequential)": before_sequential,
+        "before (pipeline)": before_pipeline,
+        "after": after_pipeline,
+    }
+    return {
+        name: benchmark_time(target, n_repeat=n_repeat, sec_sleep=0.0)
+        for name, target in targets.items()
+    }
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.text_frontend` である。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # g2p に必要な BERT トークナイザーや pyopenjtalk の辞書を読み込むため、エンジンを初期化する
+    StyleBertVITS2TTSEngine(AivmManager(get_save_dir() / "Models"))
+    assert _install_text_analysis_hook() is True
+
+    results = benchmark_text_frontend(BENCHMARK_TEXT * 4, args.n_repeat)
+    for name, average_time in results.items():
+        print("{}: {:.2f} ms".format(name, average_time * 1000))
@@ -1,6 +1,7 @@
 """速度ベンチマーク用のユーティリティ"""
 
 import time
+import tracemalloc
 from typing import Callable
 
 
@@ -17,3 +18,25 @@ def benchmark_time(
         time.sleep(sec_sleep)
     average = sum(scores) / len(scores)
     return average
+
+
+def benchmark_allocations(target_function: Callable[[], object]) -> tuple[int, int]:
+    """
+    対象関数の実行で確保され、戻り値として保持されているメモリブロックの数と、実行中のピークメモリ使用量 (バイト) を計測する。
+    """
+    tracemalloc.start()
+    try:
+        start_size, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+        result = target_function()
+        _, peak_size = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # スナップショットの取得自体による確保は除外する
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before = before.filter_traces(filters)
+    after = after.filter_traces(filters)
+    block_count = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return block_count, peak_size - start_size
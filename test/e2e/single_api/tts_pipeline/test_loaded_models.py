@@ -0,0 +1,17 @@
+"""
+/loaded_models API のテスト
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_get_loaded_models_200(client: TestClient) -> None:
+    response = client.post("/initialize_speaker", params={"speaker": 888753760})
+    assert response.status_code == 204
+    response = client.get("/loaded_models")
+    assert response.status_code == 200
+    loaded_models = response.json()
+    assert len(loaded_models) >= 1
+    for loaded_model in loaded_models:
+        assert 1 <= loaded_model["pool_size"] <= loaded_model["max_pool_size"]
+        assert loaded_model["in_use"] == 0
@@ -0,0 +1,17 @@
+"""
+/preload_speaker API のテスト
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_post_preload_speaker_202(client: TestClient) -> None:
+    response = client.post("/preload_speaker", params={"speaker": 888753760})
+    assert response.status_code == 202
+    model_load_status = response.json()
+    assert model_load_status["state"] in ("queued", "loading", "warming_up", "ready")
+
+    response = client.get("/model_load_status")
+    assert response.status_code == 200
+    aivm_uuids = [status["aivm_uuid"] for status in response.json()]
+    assert model_load_status["aivm_uuid"] in aivm_uuids
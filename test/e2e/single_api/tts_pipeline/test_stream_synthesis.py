@@ -0,0 +1,101 @@
+"""
+/stream_synthesis API のテスト
+"""
+
+import io
+from test.e2e.single_api.utils import gen_mora
+
+import soundfile
+from fastapi.testclient import TestClient
+
+# 文末の句点を表す記号モーラ
+PERIOD_MORA = {
+    "text": ".",
+    "consonant": None,
+    "consonant_length": None,
+    "vowel": "pau",
+    "vowel_length": 0.0,
+    "pitch": 0.0,
+}
+
+
+def _gen_query(kana: str) -> dict[str, object]:
+    return {
+        "accent_phrases": [
+            {
+                "moras": [
+                    gen_mora("テ", "t", 0.0, "e", 0.0, 0.0),
+                    gen_mora("ス", "s", 0.0, "U", 0.0, 0.0),
+                    gen_mora("ト", "t", 0.0, "o", 0.0, 0.0),
+                    PERIOD_MORA,
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            },
+            {
+                "moras": [
+                    gen_mora("テ", "t", 0.0, "e", 0.0, 0.0),
+                    gen_mora("ス", "s", 0.0, "U", 0.0, 0.0),
+                    gen_mora("ト", "t", 0.0, "o", 0.0, 0.0),
+                    PERIOD_MORA,
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            },
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 0.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": 44100,
+        "outputStereo": False,
+        "kana": kana,
+    }
+
+
+def test_post_stream_synthesis_wav_200(client: TestClient) -> None:
+    response = client.post(
+        "/stream_synthesis",
+        params={"speaker": 888753760},
+        json=_gen_query("テスト。テスト。"),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+
+    # ストリーミング用の WAV ヘッダーを持つ 16bit PCM の WAV として読み込める
+    body = response.read()
+    wave, sample_rate = soundfile.read(io.BytesIO(body), dtype="int16")
+    assert sample_rate == 44100
+    assert len(wave) == (len(body) - 44) // 2
+    assert response.headers.get("content-length") is None
+
+
+def test_post_stream_synthesis_pcm_200(client: TestClient) -> None:
+    response = client.post(
+        "/stream_synthesis",
+        params={"speaker": 888753760, "format": "pcm"},
+        json=_gen_query("テスト。テスト。"),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    body = response.read()
+    assert len(body) > 0 and len(body) % 2 == 0
+
+
+def test_stream_synthesis_first_chunk_latency_is_recorded(client: TestClient) -> None:
+    client.post(
+        "/stream_synthesis",
+        params={"speaker": 888753760},
+        json=_gen_query("テスト。テスト。"),
+    )
+    response = client.get("/inference_statistics")
+    assert response.status_code == 200
+    streaming = response.json()["streaming"]
+    assert streaming["stream_count"] >= 1
+    assert streaming["max_first_chunk_latency_ms"] > 0
@@ -0,0 +1,37 @@
+"""
+/tts_session API のテスト
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+
+def test_tts_session_synthesizes_text_fragments(client: TestClient) -> None:
+    with client.websocket_connect("/tts_session?speaker=888753760") as websocket:
+        websocket.send_json({"type": "text", "text": "テスト"})
+        websocket.send_json({"type": "text", "text": "です。"})
+        start = websocket.receive_json()
+        assert start["type"] == "sentence_start"
+        assert start["text"] == "テストです。"
+        assert start["sample_rate"] == 44100
+
+        # 文の音声は 1 つ以上のバイナリメッセージで届き、sentence_end で終わる
+        total_bytes = 0
+        while True:
+            message = websocket.receive()
+            if message.get("bytes") is not None:
+                total_bytes += len(message["bytes"])
+                continue
+            assert '"sentence_end"' in message["text"]
+            break
+        assert total_bytes > 0 and total_bytes % 2 == 0
+
+        websocket.send_json({"type": "flush"})
+        assert websocket.receive_json() == {"type": "flushed"}
+
+
+def test_tts_session_unknown_speaker_is_rejected(client: TestClient) -> None:
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/tts_session?speaker=1"):
+            pass
@@ -0,0 +1,15 @@
+"""
+/unload_speaker API のテスト
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_post_unload_speaker_204(client: TestClient) -> None:
+    response = client.post("/initialize_speaker", params={"speaker": 888753760})
+    assert response.status_code == 204
+    response = client.post("/unload_speaker", params={"speaker": 888753760})
+    assert response.status_code == 204
+    response = client.get("/is_initialized_speaker", params={"speaker": 888753760})
+    assert response.status_code == 200
+    assert response.json() is False
@@ -1,6 +1,10 @@
 from pathlib import Path
 
-from voicevox_engine.setting.model import CorsPolicyMode
+from voicevox_engine.setting.model import (
+    CorsPolicyMode,
+    OnnxExecutionMode,
+    OnnxGraphOptimizationLevel,
+)
 from voicevox_engine.setting.setting_manager import Setting, SettingHandler
 
 
@@ -71,3 +75,22 @@ def test_setting_handler_save(tmp_path: Path) -> None:
     setting = setting_loader.load()  # NOTE: `.load()` の正常動作を前提とする
     # Test
     assert true_setting == setting
+
+
+def test_setting_handler_save_onnx_settings(tmp_path: Path) -> None:
+    """`SettingHandler.save()` で ONNX Runtime の推論セッションの設定値を保存できる。"""
+    # Inputs
+    setting_path = tmp_path / "setting-test-dump-onnx.yaml"
+    setting_loader = SettingHandler(setting_path)
+    new_setting = Setting(
+        cors_policy_mode=CorsPolicyMode.localapps,
+        onnx_intra_op_num_threads=4,
+        onnx_graph_optimization_level=OnnxGraphOptimizationLevel.extended,
+        onnx_execution_mode=OnnxExecutionMode.parallel,
+        disable_optimized_model_cache=True,
+    )
+    # Outputs
+    setting_loader.save(new_setting)
+    setting = setting_loader.load()  # NOTE: `.load()` の正常動作を前提とする
+    # Test
+    assert new_setting == setting
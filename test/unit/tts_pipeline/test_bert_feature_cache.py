@@ -0,0 +1,133 @@
+"""BertFeatureCache のテスト"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from voicevox_engine.tts_pipeline.bert_feature_cache import BertFeatureCache
+
+
+def _feature(value: float, length: int = 4) -> np.ndarray:
+    """テスト用の BERT 特徴量 (1024 次元 x length) を生成する"""
+    return np.full((1024, length), value, dtype=np.float32)
+
+
+def test_make_key() -> None:
+    """キャッシュキーはテキスト・word2ph・オプションの全てに依存する。"""
+    key = BertFeatureCache.make_key("こんにちは", [1, 2, 2, 1])
+    assert key == BertFeatureCache.make_key("こんにちは", [1, 2, 2, 1])
+    assert key != BertFeatureCache.make_key("こんにちは", [1, 2, 1, 2])
+    assert key != BertFeatureCache.make_key("こんばんは", [1, 2, 2, 1])
+    assert key != BertFeatureCache.make_key("こんにちは", [1, 2, 2, 1], "補助")
+
+
+def test_get_and_put() -> None:
+    """キャッシュした特徴量のコピーを取得でき、ヒット率が記録される。"""
+    # Inputs
+    cache = BertFeatureCache(max_size=1024 * 1024)
+    feature = _feature(1.0)
+
+    # Outputs
+    missed = cache.get("a")
+    cache.put("a", feature)
+    hit = cache.get("a")
+
+    # Tests
+    assert missed is None
+    assert hit is not None
+    assert np.array_equal(hit, feature)
+    assert hit is not feature
+    stats = cache.stats
+    assert stats.hit_count == 1
+    assert stats.miss_count == 1
+    assert stats.hit_rate == 0.5
+    assert stats.entry_count == 1
+    assert stats.memory_size == feature.nbytes
+
+
+def test_evicts_least_recently_used() -> None:
+    """サイズの上限を超えると、最も長く使われていない特徴量から破棄される。"""
+    # Inputs
+    feature_size = _feature(0.0).nbytes
+    cache = BertFeatureCache(max_size=feature_size * 2)
+    cache.put("a", _feature(1.0))
+    cache.put("b", _feature(2.0))
+    cache.get("a")
+
+    # Outputs
+    cache.put("c", _feature(3.0))
+
+    # Tests
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats.memory_size == feature_size * 2
+
+
+def test_spill_to_disk(tmp_path: Path) -> None:
+    """退避先ディレクトリが指定されている場合、溢れた特徴量はディスクから読み戻される。"""
+    # Inputs
+    feature_size = _feature(0.0).nbytes
+    cache = BertFeatureCache(max_size=feature_size, spill_dir=tmp_path)
+    cache.put("a", _feature(1.0))
+    cache.put("b", _feature(2.0))
+
+    # Outputs
+    stats_after_spill = cache.stats
+    restored = cache.get("a")
+
+    # Tests
+    assert stats_after_spill.disk_entry_count == 1
+    assert restored is not None
+    assert np.array_equal(restored, _feature(1.0))
+    # "a" が読み戻された代わりに "b" が退避される
+    assert cache.stats.disk_entry_count == 1
+    assert (tmp_path / "b.npy").exists()
+
+
+def test_disk_io_runs_without_lock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """ディスクへの退避と読み戻しは、キャッシュのロックを解放した状態で行われる。"""
+    # Inputs
+    feature_size = _feature(0.0).nbytes
+    cache = BertFeatureCache(max_size=feature_size, spill_dir=tmp_path)
+    lock_states: list[bool] = []
+    original_save, original_load = np.save, np.load
+
+    def save(*args: Any, **kwargs: Any) -> None:
+        lock_states.append(cache._lock.locked())
+        original_save(*args, **kwargs)
+
+    def load(*args: Any, **kwargs: Any) -> Any:
+        lock_states.append(cache._lock.locked())
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(np, "save", save)
+    monkeypatch.setattr(np, "load", load)
+
+    # Outputs
+    cache.put("a", _feature(1.0))
+    cache.put("b", _feature(2.0))
+    restored = cache.get("a")
+
+    # Tests
+    assert restored is not None
+    # "a" の退避・"a" の読み戻し・"b" の退避
+    assert lock_states == [False, False, False]
+
+
+def test_spill_dir_is_cleaned_on_init(tmp_path: Path) -> None:
+    """キャッシュの生成時に、過去に退避された特徴量は削除される。"""
+    # Inputs
+    (tmp_path / "stale.npy").write_bytes(b"")
+    (tmp_path / "other.txt").write_text("keep")
+
+    # Outputs
+    BertFeatureCache(max_size=1024, spill_dir=tmp_path)
+
+    # Tests
+    assert not (tmp_path / "stale.npy").exists()
+    assert (tmp_path / "other.txt").exists()
@@ -0,0 +1,162 @@
+"""DocumentFrontend のテスト"""
+
+import os
+from test.unit.tts_pipeline.tts_utils import gen_mora
+
+from voicevox_engine.tts_pipeline.document_frontend import (
+    DocumentFrontend,
+    copy_accent_phrases,
+    split_document,
+)
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.text_frontend_cache import TextFrontendCache
+
+_DOCUMENT = "吾輩は猫である。名前はまだ無い。\nどこで生れたかとんと見当がつかぬ。「ニャー！」何でも薄暗い所で泣いていた。"
+_SENTENCES = [
+    "吾輩は猫である。",
+    "名前はまだ無い。",
+    "どこで生れたかとんと見当がつかぬ。",
+    "「ニャー！」",
+    "何でも薄暗い所で泣いていた。",
+]
+
+
+def _analyze_sentences(sentences: list[str]) -> list[list[AccentPhrase]]:
+    """文ごとに、文をテキストとし、解析したプロセスの ID をアクセント核の位置とするアクセント句を 1 つ生成する"""
+    return [
+        [
+            AccentPhrase(
+                moras=[gen_mora(sentence, None, None, "a", 0.0, 0.0)],
+                accent=os.getpid(),
+            )
+        ]
+        for sentence in sentences
+    ]
+
+
+class _AnalyzedSentences:
+    """解析された文を記録するテスト用の解析関数"""
+
+    def __init__(self) -> None:
+        self.sentences: list[str] = []
+
+    def __call__(self, sentences: list[str]) -> list[list[AccentPhrase]]:
+        self.sentences.extend(sentences)
+        return _analyze_sentences(sentences)
+
+
+class _DictVersion:
+    """テスト用の辞書のバージョン"""
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def __call__(self) -> int:
+        return self.value
+
+
+def test_split_document() -> None:
+    """文の終わりを表す記号と閉じ括弧の位置で文に分割され、文の終わりが揃っていない末尾のテキストも 1 文になる。"""
+    assert split_document(_DOCUMENT, max_sentence_length=100) == _SENTENCES
+    assert split_document(_DOCUMENT + "続き", max_sentence_length=100) == [*_SENTENCES, "続き"]  # fmt: skip
+    assert split_document(" \n", max_sentence_length=100) == []
+
+
+def test_split_document_keeps_text() -> None:
+    """空白を除き、分割した文を連結すると元の文章と一致する。"""
+    # Inputs
+    document = '今日は晴れ。"AI"の時代だ。」。あいうえおかきくけこ。さしすせそ\nたちつ'
+    # Outputs
+    sentences = split_document(document, max_sentence_length=10)
+    # Tests
+    assert sentences[:2] == ["今日は晴れ。", '"AI"の時代だ。」。']
+    assert "".join(sentences) == "".join(document.split())
+
+
+def test_create_accent_phrases_in_current_process() -> None:
+    """ワーカープロセスの数が 0 の場合は、呼び出し元のプロセスで文ごとに解析する。"""
+    # Inputs
+    document_frontend = DocumentFrontend(_analyze_sentences, max_workers=0)
+
+    # Outputs
+    accent_phrases = document_frontend.create_accent_phrases(_DOCUMENT)
+
+    # Tests
+    assert [accent_phrase.moras[0].text for accent_phrase in accent_phrases] == _SENTENCES  # fmt: skip
+    assert all(accent_phrase.accent == os.getpid() for accent_phrase in accent_phrases)
+
+
+def test_create_accent_phrases_in_workers() -> None:
+    """ワーカープロセスで解析した文ごとのアクセント句系列が、元の文の順序で連結される。"""
+    # Inputs
+    document_frontend = DocumentFrontend(_analyze_sentences, max_workers=2)
+    document = _DOCUMENT * 5
+
+    # Outputs
+    try:
+        accent_phrases = document_frontend.create_accent_phrases(document)
+    finally:
+        document_frontend.close()
+
+    # Tests
+    assert [accent_phrase.moras[0].text for accent_phrase in accent_phrases] == _SENTENCES * 5  # fmt: skip
+    assert all(accent_phrase.accent != os.getpid() for accent_phrase in accent_phrases)
+
+
+def test_create_accent_phrases_with_sentence_cache() -> None:
+    """一部の文を編集した文章を再度解析すると、新しい文や変更された文のみが解析される。"""
+    # Inputs
+    analyzed_sentences = _AnalyzedSentences()
+    dict_version = _DictVersion()
+    document_frontend = DocumentFrontend(
+        analyzed_sentences,
+        max_workers=0,
+        sentence_cache=TextFrontendCache(
+            max_entries=16,
+            get_dict_version=dict_version,
+            copy_result=copy_accent_phrases,
+        ),
+    )
+    edited_document = _DOCUMENT.replace("名前はまだ無い。", "名前はもう有る。")
+
+    # Outputs
+    first_accent_phrases = document_frontend.create_accent_phrases(_DOCUMENT)
+    # 返されたアクセント句を書き換えても、キャッシュされたアクセント句には影響しない
+    first_accent_phrases[0].moras[0].vowel_length = 1.0
+    analyzed_sentences.sentences.clear()
+    edited_accent_phrases = document_frontend.create_accent_phrases(edited_document)
+    analyzed_after_edit = list(analyzed_sentences.sentences)
+    # 辞書が更新されると、全ての文が解析し直される
+    analyzed_sentences.sentences.clear()
+    dict_version.value += 1
+    document_frontend.create_accent_phrases(edited_document)
+    analyzed_after_dict_update = list(analyzed_sentences.sentences)
+
+    # Tests
+    assert [accent_phrase.moras[0].text for accent_phrase in edited_accent_phrases] == split_document(edited_document, 100)  # fmt: skip
+    assert edited_accent_phrases[0].moras[0].vowel_length == 0.0
+    assert analyzed_after_edit == ["名前はもう有る。"]
+    assert analyzed_after_dict_update == split_document(edited_document, 100)
+
+
+def test_create_accent_phrases_with_repeated_sentences() -> None:
+    """同じ文が複数回現れる場合は 1 度だけ解析し、それぞれ独立したアクセント句系列を返す。"""
+    # Inputs
+    analyzed_sentences = _AnalyzedSentences()
+    document_frontend = DocumentFrontend(
+        analyzed_sentences,
+        max_workers=0,
+        sentence_cache=TextFrontendCache(
+            max_entries=16,
+            get_dict_version=_DictVersion(),
+            copy_result=copy_accent_phrases,
+        ),
+    )
+
+    # Outputs
+    accent_phrases = document_frontend.create_accent_phrases("はい。" * 3)
+
+    # Tests
+    assert analyzed_sentences.sentences == ["はい。"]
+    assert len(accent_phrases) == 3
+    assert accent_phrases[0].moras[0] is not accent_phrases[1].moras[0]
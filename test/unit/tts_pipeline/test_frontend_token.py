@@ -0,0 +1,88 @@
+"""FrontendTokenCodec のテスト"""
+
+from test.unit.tts_pipeline.tts_utils import gen_mora
+from typing import Any
+
+from voicevox_engine.tts_pipeline.frontend_token import FrontendTokenCodec
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+
+_TEXT = "こんにちは"
+_DICT_FINGERPRINT = b"\x01" * 16
+
+
+def _gen_accent_phrases() -> list[AccentPhrase]:
+    return [
+        AccentPhrase(
+            moras=[
+                gen_mora("コ", "k", 0.0, "o", 0.0, 0.0),
+                gen_mora("ン", None, None, "N", 0.0, 0.0),
+                gen_mora("ニ", "n", 0.0, "i", 0.0, 0.0),
+                gen_mora("チ", "ch", 0.0, "i", 0.0, 0.0),
+                gen_mora("ワ", "w", 0.0, "a", 0.0, 0.0),
+            ],
+            accent=5,
+        )
+    ]
+
+
+def _gen_g2p_result() -> tuple[Any, ...]:
+    phones = ["_", "k", "o", "N", "n", "i", "ch", "i", "w", "a", "_"]
+    tones = [0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0]
+    word2ph = [1, 2, 1, 2, 2, 2, 1]
+    return (phones, tones, word2ph, ["コンニチワ"])
+
+
+def test_encode_and_decode() -> None:
+    """同じ鍵のコーデックであれば、別のインスタンスでもトークンから解析結果を復元できる。"""
+    # Inputs
+    token = FrontendTokenCodec(b"secret", "1.0.0").encode(
+        _TEXT, _gen_accent_phrases(), _DICT_FINGERPRINT, _gen_g2p_result()
+    )
+    # Outputs
+    g2p_result = FrontendTokenCodec(b"secret", "1.0.0").decode(
+        token, _TEXT, _gen_accent_phrases(), _DICT_FINGERPRINT
+    )
+    # Tests
+    assert token.startswith("v1.")
+    assert g2p_result == _gen_g2p_result()
+
+
+def test_decode_mismatch() -> None:
+    """読み上げテキスト・アクセント句・辞書・鍵・エンジンのバージョンのいずれかが異なる場合は復元できない。"""
+    # Inputs
+    codec = FrontendTokenCodec(b"secret", "1.0.0")
+    token = codec.encode(
+        _TEXT, _gen_accent_phrases(), _DICT_FINGERPRINT, _gen_g2p_result()
+    )
+    edited_accent_phrases = _gen_accent_phrases()
+    edited_accent_phrases[0].accent = 1
+
+    # Tests
+    assert codec.decode(token, "こんばんは", _gen_accent_phrases(), _DICT_FINGERPRINT) is None  # fmt: skip
+    assert codec.decode(token, _TEXT, edited_accent_phrases, _DICT_FINGERPRINT) is None  # fmt: skip
+    assert codec.decode(token, _TEXT, _gen_accent_phrases(), b"\x02" * 16) is None
+    assert FrontendTokenCodec(b"other", "1.0.0").decode(token, _TEXT, _gen_accent_phrases(), _DICT_FINGERPRINT) is None  # fmt: skip
+    assert FrontendTokenCodec(b"secret", "1.0.1").decode(token, _TEXT, _gen_accent_phrases(), _DICT_FINGERPRINT) is None  # fmt: skip
+
+
+def test_decode_invalid_token() -> None:
+    """改竄・破損したトークンや形式の異なるトークンは、例外を送出せずに復元に失敗する。"""
+    # Inputs
+    codec = FrontendTokenCodec(b"secret", "1.0.0")
+    token = codec.encode(
+        _TEXT, _gen_accent_phrases(), _DICT_FINGERPRINT, _gen_g2p_result()
+    )
+    prefix, payload, signature = token.split(".")
+    tampered_payload = payload[:-2] + ("AA" if payload[-2:] != "AA" else "BB")
+    invalid_tokens = [
+        "",
+        "v1.",
+        f"v0.{payload}.{signature}",
+        f"{prefix}.{tampered_payload}.{signature}",
+        f"{prefix}.{payload}.!!!",
+        f"{prefix}.{payload}",
+    ]
+
+    # Tests
+    for invalid_token in invalid_tokens:
+        assert codec.decode(invalid_token, _TEXT, _gen_accent_phrases(), _DICT_FINGERPRINT) is None  # fmt: skip
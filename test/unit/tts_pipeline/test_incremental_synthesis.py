@@ -0,0 +1,127 @@
+"""IncrementalSynthesisStore / render_segments のテスト"""
+
+import numpy as np
+
+from voicevox_engine.tts_pipeline.incremental_synthesis import (
+    IncrementalSynthesisStore,
+    RenderedSegment,
+    render_segments,
+)
+
+
+def _segment(key: bytes, length: int = 100) -> RenderedSegment:
+    """テスト用の int16 型の音声波形を持つ区間を生成する"""
+    return RenderedSegment(key, 44100, np.zeros(length, dtype=np.int16))
+
+
+def test_get_previous_render() -> None:
+    """同じハンドルで保持した前回の音声合成結果を、区間の入力のフィンガープリントから引ける。"""
+    # Inputs
+    store = IncrementalSynthesisStore(max_size=1024 * 1024)
+    first_segment = _segment(b"first")
+    second_segment = _segment(b"second")
+
+    # Outputs
+    store.put("line-1", [first_segment, second_segment])
+    previous_segments = store.get("line-1")
+    other_segments = store.get("line-2")
+
+    # Tests
+    assert previous_segments == {b"first": first_segment, b"second": second_segment}
+    assert other_segments == {}
+    assert store.stats.render_count == 1
+    assert store.stats.memory_size == 400
+
+
+def test_put_replaces_previous_render() -> None:
+    """同じハンドルで保持し直すと、前回の音声合成結果は置き換えられる。"""
+    # Inputs
+    store = IncrementalSynthesisStore(max_size=1024 * 1024)
+
+    # Outputs
+    store.put("line-1", [_segment(b"first"), _segment(b"second")])
+    store.put("line-1", [_segment(b"first"), _segment(b"edited")])
+
+    # Tests
+    assert set(store.get("line-1")) == {b"first", b"edited"}
+    assert store.stats.memory_size == 400
+
+
+def test_evict_least_recently_used_render() -> None:
+    """保持している音声波形の合計サイズが上限を超えると、最も長く使われていないハンドルから破棄する。"""
+    # Inputs
+    store = IncrementalSynthesisStore(max_size=500)
+
+    # Outputs
+    store.put("line-1", [_segment(b"a")])
+    store.put("line-2", [_segment(b"b")])
+    # line-1 を参照すると、line-2 の方が長く使われていないことになる
+    store.get("line-1")
+    store.put("line-3", [_segment(b"c")])
+    # 1 件で上限を超える音声合成結果は保持しない
+    store.put("line-4", [_segment(b"d", length=1000)])
+
+    # Tests
+    assert store.get("line-1") != {}
+    assert store.get("line-2") == {}
+    assert store.get("line-3") != {}
+    assert store.get("line-4") == {}
+    assert store.stats.memory_size == 400
+
+
+def test_record_reuse_rate() -> None:
+    """再利用した区間と音声合成し直した区間の数から、再利用率を算出する。"""
+    # Inputs
+    store = IncrementalSynthesisStore(max_size=1024)
+
+    # Outputs
+    store.record(reused_segment_count=0, synthesized_segment_count=4)
+    store.record(reused_segment_count=3, synthesized_segment_count=1)
+
+    # Tests
+    assert store.stats.reused_segment_count == 3
+    assert store.stats.synthesized_segment_count == 5
+    assert store.stats.reuse_rate == 3 / 8
+
+
+def test_render_segments_synthesizes_only_changed_segments() -> None:
+    """前回の音声合成結果にない区間のみが音声合成され、結果がハンドルの新たな音声合成結果として保持される。"""
+    # Inputs
+    store = IncrementalSynthesisStore(max_size=1024 * 1024)
+    unchanged_segment = _segment(b"unchanged")
+    store.put("line-1", [unchanged_segment, _segment(b"removed")])
+    requested_indices: list[list[int]] = []
+
+    def synthesize(indices: list[int]) -> list[tuple[int, np.ndarray]]:
+        requested_indices.append(indices)
+        return [(44100, np.full(10, index, dtype=np.int16)) for index in indices]
+
+    # Outputs
+    segments, reused_count, synthesized_count = render_segments(
+        store, "line-1", [b"added", b"unchanged", b"added-2"], synthesize
+    )
+
+    # Tests
+    assert requested_indices == [[0, 2]]
+    assert [segment.key for segment in segments] == [b"added", b"unchanged", b"added-2"]
+    assert segments[1] is unchanged_segment
+    assert segments[2].raw_wave.tolist() == [2] * 10
+    assert (reused_count, synthesized_count) == (1, 2)
+    assert set(store.get("line-1")) == {b"added", b"unchanged", b"added-2"}
+    assert store.stats.reused_segment_count == 1
+    assert store.stats.synthesized_segment_count == 2
+
+
+def test_render_segments_without_store() -> None:
+    """保持先がない場合は、常に全ての区間を音声合成する。"""
+    # Outputs
+    segments, reused_count, synthesized_count = render_segments(
+        None,
+        "line-1",
+        [b"first", b"second"],
+        lambda indices: [(44100, np.zeros(10, dtype=np.int16)) for _ in indices],
+    )
+
+    # Tests
+    assert len(segments) == 2
+    assert (reused_count, synthesized_count) == (0, 2)
@@ -0,0 +1,98 @@
+"""長い読み上げテキストの分割・連結処理のテスト"""
+
+import numpy as np
+
+from voicevox_engine.tts_pipeline.long_input_segmenter import (
+    InputSegment,
+    crossfade_concatenate,
+    split_long_input,
+)
+
+PUNCTUATIONS = ["!", "?", "…", ",", ".", "'", "-"]
+
+
+def _to_phones(text: str) -> list[str]:
+    """テスト用に、1 文字を 2 音素 (子音と母音) とみなした音素のリストを生成する。"""
+    phones = ["_"]
+    for char in text:
+        phones.extend([char] if char in PUNCTUATIONS else ["k", "a"])
+    phones.append("_")
+    return phones
+
+
+def test_split_long_input_splits_at_punctuations() -> None:
+    """音素数が上限を超える場合、句読点の直後で上限以下の区間に分割される。"""
+    # Inputs
+    text = "あいう.えお,かきくけ.こ"
+    phones = _to_phones(text)
+    tones = list(range(len(phones)))
+    # Outputs
+    segments = split_long_input(text, phones, tones, 12, PUNCTUATIONS)
+    # Expects
+    true_texts = ["あいう.えお,", "かきくけ.こ"]
+    # Tests
+    assert [segment.text for segment in segments] == true_texts
+    for segment in segments:
+        assert segment.phones == _to_phones(segment.text)
+        assert segment.phones[0] == "_" and segment.phones[-1] == "_"
+        assert len(segment.phones) == len(segment.tones)
+    # 境界記号を除いた音高の並びは元の音高の並びと一致する
+    inner_tones = [tone for segment in segments for tone in segment.tones[1:-1]]
+    assert inner_tones == tones[1:-1]
+
+
+def test_split_long_input_keeps_short_input() -> None:
+    """音素数が上限以下の場合は分割されない。"""
+    # Inputs
+    text = "あい.う"
+    phones = _to_phones(text)
+    tones = [0] * len(phones)
+    # Outputs
+    segments = split_long_input(text, phones, tones, 100, PUNCTUATIONS)
+    # Tests
+    assert segments == [InputSegment(text=text, phones=phones, tones=tones)]
+
+
+def test_split_long_input_keeps_mismatched_input() -> None:
+    """読み上げテキストと音素のリストに含まれる句読点の並びが一致しない場合は分割されない。"""
+    # Inputs
+    text = "あいう.えお,かきくけ.こ"
+    phones = _to_phones(text.replace(",", ""))
+    tones = [0] * len(phones)
+    # Outputs
+    segments = split_long_input(text, phones, tones, 12, PUNCTUATIONS)
+    # Tests
+    assert len(segments) == 1
+    assert segments[0].phones == phones
+
+
+def test_split_long_input_keeps_consecutive_punctuations_together() -> None:
+    """連続する句読点は分割されずに同じ区間に含まれる。"""
+    # Inputs
+    text = "あいうえ!?かきくけ"
+    phones = _to_phones(text)
+    tones = [0] * len(phones)
+    # Outputs
+    segments = split_long_input(text, phones, tones, 12, PUNCTUATIONS)
+    # Tests
+    assert [segment.text for segment in segments] == ["あいうえ!?", "かきくけ"]
+
+
+def test_crossfade_concatenate() -> None:
+    """境界はクロスフェードしながら重ねて連結され、境界 1 つにつきクロスフェードの長さだけ短くなる。"""
+    # Inputs
+    waves = [
+        np.ones(10, dtype=np.float32),
+        np.zeros(10, dtype=np.float32),
+        np.ones(2, dtype=np.float32),
+    ]
+    # Outputs
+    wave = crossfade_concatenate(waves, 4)
+    # Tests
+    assert wave.dtype == np.float32
+    # 3 つ目の音声波形はクロスフェードの長さより短いため、重ねる長さは 2 サンプルになる
+    assert len(wave) == 10 + 10 + 2 - 4 - 2
+    np.testing.assert_allclose(wave[:6], np.ones(6))
+    np.testing.assert_allclose(wave[6:10], [1.0, 2 / 3, 1 / 3, 0.0], atol=1e-6)
+    np.testing.assert_allclose(wave[10:14], np.zeros(4))
+    np.testing.assert_allclose(wave[14:], [0.0, 1.0])
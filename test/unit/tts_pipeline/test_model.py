@@ -0,0 +1,100 @@
+"""音声合成用のクエリ・アクセント句・モーラのフィンガープリントのテスト"""
+
+import copy
+import pickle
+from test.unit.tts_pipeline.tts_utils import gen_mora
+
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+
+
+def _gen_query() -> AudioQuery:
+    return AudioQuery(
+        accent_phrases=[
+            AccentPhrase(
+                moras=[
+                    gen_mora("コ", "k", 0.0, "o", 0.0, 0.0),
+                    gen_mora("ン", None, None, "N", 0.0, 0.0),
+                ],
+                accent=1,
+                pause_mora=gen_mora("、", None, None, "pau", 0.0, 0.0),
+            ),
+            AccentPhrase(moras=[gen_mora("ニ", "n", 0.0, "i", 0.0, 0.0)], accent=1),
+        ],
+        speedScale=1.0,
+        intonationScale=1.0,
+        tempoDynamicsScale=1.0,
+        pitchScale=0.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=44100,
+        outputStereo=False,
+        kana="こん、に",
+    )
+
+
+def test_fingerprint_is_stable() -> None:
+    """同じ内容のクエリからは、コピーやプロセス間の受け渡しを経ても同じフィンガープリントが生成される。"""
+    # Inputs
+    query = _gen_query()
+    # Outputs
+    fingerprint = query.fingerprint()
+    # Tests
+    assert len(fingerprint) == 16
+    assert fingerprint == _gen_query().fingerprint()
+    assert fingerprint == copy.deepcopy(query).fingerprint()
+    assert fingerprint == pickle.loads(pickle.dumps(query)).fingerprint()
+    assert fingerprint == AudioQuery.model_validate_json(query.model_dump_json()).fingerprint()  # fmt: skip
+    # -0.0 と 0.0 は等値比較で等しいため、同じフィンガープリントになる
+    negative_zero_query = _gen_query()
+    negative_zero_query.pitchScale = -0.0
+    assert fingerprint == negative_zero_query.fingerprint()
+    assert hash(query) == hash(_gen_query())
+
+
+def test_fingerprint_changes_on_mutation() -> None:
+    """入れ子になったモーラやリストの要素を直接書き換えた場合も、フィンガープリントが変わる。"""
+    # Inputs
+    query = _gen_query()
+    fingerprint = query.fingerprint()
+    mora_fingerprint = query.accent_phrases[0].moras[0].fingerprint()
+
+    # Outputs
+    query.accent_phrases[0].moras[0].pitch = 5.0
+    mutated_mora_fingerprint = query.accent_phrases[0].moras[0].fingerprint()
+    mutated_mora = query.fingerprint()
+    query.accent_phrases[0].moras[0].pitch = 0.0
+    restored = query.fingerprint()
+    query.accent_phrases[1].moras.append(gen_mora("ハ", "h", 0.0, "a", 0.0, 0.0))
+    appended_mora = query.fingerprint()
+    query.accent_phrases[1].moras.pop()
+    query.accent_phrases[0].pause_mora = None
+    removed_pause_mora = query.fingerprint()
+
+    # Tests
+    assert mutated_mora_fingerprint != mora_fingerprint
+    assert mutated_mora != fingerprint
+    assert restored == fingerprint
+    assert appended_mora != fingerprint
+    assert removed_pause_mora != fingerprint
+
+
+def test_fingerprint_exclude() -> None:
+    """除外したフィールドの値は、フィンガープリントに影響しない。"""
+    # Inputs
+    query = _gen_query()
+    changed_query = _gen_query()
+    changed_query.volumeScale = 2.0
+    changed_query.outputStereo = True
+    exclude = {"volumeScale", "outputStereo"}
+    # Outputs
+    fingerprint = query.fingerprint(exclude=exclude)
+    changed_fingerprint = changed_query.fingerprint(exclude=exclude)
+    # Tests
+    assert fingerprint == changed_fingerprint
+    assert query.fingerprint() != changed_query.fingerprint()
+    changed_query.speedScale = 1.5
+    assert fingerprint != changed_query.fingerprint(exclude=exclude)
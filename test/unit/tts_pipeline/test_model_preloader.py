@@ -0,0 +1,102 @@
+"""ModelPreloader のテスト"""
+
+import threading
+from collections.abc import Callable
+
+from voicevox_engine.tts_pipeline.model_preloader import ModelLoadState, ModelPreloader
+
+
+def test_enqueue_loads_in_background() -> None:
+    """登録したジョブはバックグラウンドで処理され、進捗と完了状態が記録される。"""
+    # Inputs
+    release = threading.Event()
+    states: list[ModelLoadState] = []
+
+    def load_function(key: str, report_progress: Callable[[ModelLoadState], None]) -> None:  # fmt: skip
+        release.wait()
+        report_progress("warming_up")
+        states.append(preloader.get_job(key).state)  # type: ignore[union-attr]
+
+    preloader = ModelPreloader(load_function)
+
+    # Outputs
+    queued_job = preloader.enqueue("a")
+    release.set()
+    finished_job = preloader.wait("a", timeout=5.0)
+
+    # Tests
+    assert queued_job.state == "queued"
+    assert states == ["warming_up"]
+    assert finished_job is not None
+    assert finished_job.state == "ready"
+    assert finished_job.started_at is not None
+    assert finished_job.finished_at is not None
+    assert finished_job.error is None
+
+
+def test_enqueue_deduplicates_inflight_jobs() -> None:
+    """未完了のジョブがあるモデルを再度登録しても、新たなジョブは作られない。"""
+    # Inputs
+    release = threading.Event()
+    loaded_keys: list[str] = []
+
+    def load_function(key: str, report_progress: Callable[[ModelLoadState], None]) -> None:  # fmt: skip
+        release.wait()
+        loaded_keys.append(key)
+
+    preloader = ModelPreloader(load_function)
+
+    # Outputs
+    first_job = preloader.enqueue("a")
+    second_job = preloader.enqueue("a")
+    preloader.enqueue("b")
+    release.set()
+    preloader.wait("a", timeout=5.0)
+    preloader.wait("b", timeout=5.0)
+
+    # Tests
+    assert first_job.queued_at == second_job.queued_at
+    assert loaded_keys == ["a", "b"]
+    assert [job.key for job in preloader.get_jobs()] == ["a", "b"]
+
+
+def test_enqueue_records_failure() -> None:
+    """ロードに失敗したジョブは failed となり、エラーメッセージが記録される。再登録すると再びロードされる。"""
+    # Inputs
+    attempts: list[str] = []
+
+    def load_function(key: str, report_progress: Callable[[ModelLoadState], None]) -> None:  # fmt: skip
+        attempts.append(key)
+        if len(attempts) == 1:
+            raise RuntimeError("broken model")
+
+    preloader = ModelPreloader(load_function)
+
+    # Outputs
+    preloader.enqueue("a")
+    failed_job = preloader.wait("a", timeout=5.0)
+    preloader.enqueue("a")
+    retried_job = preloader.wait("a", timeout=5.0)
+
+    # Tests
+    assert failed_job is not None
+    assert failed_job.state == "failed"
+    assert failed_job.error == "broken model"
+    assert retried_job is not None
+    assert retried_job.state == "ready"
+    assert attempts == ["a", "a"]
+
+
+def test_finished_jobs_are_discarded() -> None:
+    """完了済みのジョブは上限を超えると古い順に破棄される。"""
+    # Inputs
+    preloader = ModelPreloader(lambda key, report_progress: None, max_finished_jobs=2)
+
+    # Outputs
+    for key in ["a", "b", "c", "d"]:
+        preloader.enqueue(key)
+        preloader.wait(key, timeout=5.0)
+
+    # Tests
+    assert [job.key for job in preloader.get_jobs()] == ["b", "c", "d"]
+    assert preloader.wait("a") is None
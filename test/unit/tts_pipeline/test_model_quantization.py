@@ -0,0 +1,83 @@
+"""ONNX モデルの int8 動的量子化のテスト"""
+
+from pathlib import Path
+
+import numpy as np
+import onnxruntime
+import pytest
+from numpy.typing import NDArray
+
+from voicevox_engine.tts_pipeline.model_quantization import (
+    get_file_content_hash,
+    get_quantized_model_path,
+    quantize_model_dynamic,
+)
+
+onnx = pytest.importorskip("onnx")
+
+
+def _save_matmul_model(model_path: Path, seed: int = 0) -> NDArray[np.float32]:
+    """定数の重みとの行列積からなる小さなモデルを保存し、その重みを返す。"""
+    helper = onnx.helper
+    weight = np.random.default_rng(seed).standard_normal((64, 32)).astype(np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("MatMul", ["x", "weight"], ["y"])],
+        "test",
+        [helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [1, 64])],
+        [helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [1, 32])],
+        [onnx.numpy_helper.from_array(weight, name="weight")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(model_path))
+    return weight
+
+
+def test_get_quantized_model_path_depends_on_content(tmp_path: Path) -> None:
+    """量子化済みモデルのパスは、元のモデルファイルの名前や配置場所ではなく内容で決まる。"""
+    # Inputs
+    model_path = tmp_path / "model.onnx"
+    _save_matmul_model(model_path, seed=0)
+    copied_model_dir = tmp_path / "copied"
+    copied_model_dir.mkdir()
+    copied_model_path = copied_model_dir / "model.onnx"
+    copied_model_path.write_bytes(model_path.read_bytes())
+    other_model_path = tmp_path / "other" / "model.onnx"
+    other_model_path.parent.mkdir()
+    _save_matmul_model(other_model_path, seed=1)
+    cache_dir = tmp_path / "cache"
+    # Outputs
+    path = get_quantized_model_path(cache_dir, model_path)
+    copied_path = get_quantized_model_path(cache_dir, copied_model_path)
+    other_path = get_quantized_model_path(cache_dir, other_model_path)
+    # Tests
+    assert path == copied_path
+    assert path != other_path
+    assert get_file_content_hash(model_path) == get_file_content_hash(copied_model_path)
+
+
+def test_quantize_model_dynamic(tmp_path: Path) -> None:
+    """量子化済みモデルは元のモデルに近い出力を返し、2 回目以降はキャッシュが再利用される。"""
+    # Inputs
+    model_path = tmp_path / "model.onnx"
+    weight = _save_matmul_model(model_path)
+    cache_dir = tmp_path / "cache"
+    x = np.random.default_rng(2).standard_normal((1, 64)).astype(np.float32)
+
+    # Outputs
+    quantized_model_path = quantize_model_dynamic(cache_dir, model_path)
+    quantized_mtime = quantized_model_path.stat().st_mtime_ns
+    cached_model_path = quantize_model_dynamic(cache_dir, model_path)
+    session = onnxruntime.InferenceSession(
+        str(quantized_model_path), providers=["CPUExecutionProvider"]
+    )
+    result = session.run(None, {"x": x})[0]
+    node_types = {node.op_type for node in onnx.load(str(quantized_model_path)).graph.node}  # fmt: skip
+
+    # Tests
+    assert cached_model_path == quantized_model_path
+    assert quantized_model_path.stat().st_mtime_ns == quantized_mtime
+    assert list(cache_dir.glob("*.tmp")) == []
+    assert "MatMul" not in node_types
+    expected = x @ weight
+    assert np.abs(result - expected).max() < 0.05 * np.abs(expected).max()
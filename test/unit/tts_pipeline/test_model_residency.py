@@ -0,0 +1,102 @@
+"""ModelResidencyManager のテスト"""
+
+from voicevox_engine.tts_pipeline.model_residency import ModelResidencyManager
+
+
+def test_no_budget_never_evicts() -> None:
+    """メモリ使用量の上限が指定されていない場合は何もアンロードしない。"""
+    # Inputs
+    manager = ModelResidencyManager(None)
+    manager.add("a", 100)
+    manager.add("b", 100)
+
+    # Outputs
+    evictions = manager.select_evictions(incoming_size=10**12)
+
+    # Tests
+    assert evictions == []
+    assert manager.total_size == 200
+
+
+def test_evicts_least_recently_used() -> None:
+    """上限を超える場合、最も長く使われていないモデルから順にアンロード対象になる。"""
+    # Inputs
+    manager = ModelResidencyManager(250)
+    manager.add("a", 100)
+    manager.add("b", 100)
+    manager.touch("a")
+
+    # Outputs
+    evictions = manager.select_evictions(incoming_size=100, exclude="c")
+
+    # Tests
+    assert evictions == ["b"]
+    assert "b" not in manager
+    assert "a" in manager
+    assert manager.total_size == 100
+
+
+def test_pinned_models_are_not_evicted() -> None:
+    """ピン留めされたモデルはアンロード対象にならない。"""
+    # Inputs
+    manager = ModelResidencyManager(150)
+    manager.add("a", 100)
+    manager.add("b", 100)
+    manager.pin("a")
+
+    # Outputs
+    evictions = manager.select_evictions()
+
+    # Tests
+    assert evictions == ["b"]
+    assert manager.is_pinned("a")
+
+
+def test_pin_is_reference_counted() -> None:
+    """ピン留めは同じ回数だけ解除されるまで有効である。"""
+    # Inputs
+    manager = ModelResidencyManager(None)
+    manager.pin("a")
+    manager.pin("a")
+
+    # Tests
+    manager.unpin("a")
+    assert manager.is_pinned("a")
+    manager.unpin("a")
+    assert not manager.is_pinned("a")
+
+
+def test_in_use_models_are_not_evicted() -> None:
+    """アンロードできないと判定されたモデルは飛ばして、次に古いモデルをアンロード対象にする。"""
+    # Inputs
+    manager = ModelResidencyManager(150)
+    manager.add("a", 100)
+    manager.add("b", 100)
+    manager.add("c", 100)
+
+    # Outputs
+    evictions = manager.select_evictions(is_evictable=lambda key: key != "a")
+
+    # Tests
+    assert evictions == ["b", "c"]
+    assert manager.total_size == 100
+
+
+def test_resident_models_are_sorted_by_last_use() -> None:
+    """常駐中のモデルの一覧は最終利用日時が新しい順に返される。"""
+    # Inputs
+    manager = ModelResidencyManager(None)
+    manager.add("a", 100)
+    manager.add("b", 200)
+    manager.touch("a")
+    manager.update_size("b", 300)
+    manager.pin("b")
+
+    # Outputs
+    resident_models = manager.get_resident_models()
+
+    # Tests
+    assert [model.key for model in resident_models] == ["a", "b"]
+    assert resident_models[1].size == 300
+    assert resident_models[1].pinned is True
+    assert resident_models[0].last_used_at >= resident_models[1].last_used_at
@@ -0,0 +1,109 @@
+"""MoraSequence のテスト"""
+
+import numpy as np
+
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.mora_sequence import (
+    NO_CONSONANT_ID,
+    MoraSequence,
+    MoraSequenceBuilder,
+)
+from voicevox_engine.tts_pipeline.phoneme import Phoneme
+
+from .tts_utils import gen_mora
+
+
+def _gen_accent_phrases() -> list[AccentPhrase]:
+    """pause_mora と疑問系のアクセント句を含む、テスト用のアクセント句系列を生成する"""
+    return [
+        AccentPhrase(
+            moras=[
+                gen_mora("コ", "k", 0.1, "o", 0.2, 5.0),
+                gen_mora("ン", None, None, "N", 0.1, 5.5),
+            ],
+            accent=1,
+            pause_mora=gen_mora("、", None, None, "pau", 0.3, 0.0),
+        ),
+        AccentPhrase(
+            moras=[
+                gen_mora("ニ", "n", 0.1, "i", 0.2, 5.8),
+                gen_mora("チ", "ch", 0.1, "I", 0.2, 0.0),
+                gen_mora("ワ", "w", 0.1, "a", 0.2, 5.6),
+            ],
+            accent=3,
+            is_interrogative=True,
+        ),
+    ]
+
+
+def _gen_mora_sequence() -> MoraSequence:
+    """_gen_accent_phrases() と同じアクセント句系列を、MoraSequenceBuilder で生成する"""
+    builder = MoraSequenceBuilder()
+    builder.add_mora("コ", "k", "o", 0.1, 0.2, 5.0)
+    builder.add_mora("ン", None, "N", None, 0.1, 5.5)
+    builder.add_mora("、", None, "pau", None, 0.3, 0.0)
+    builder.end_accent_phrase(1, has_pause_mora=True)
+    builder.add_mora("ニ", "n", "i", 0.1, 0.2, 5.8)
+    builder.add_mora("チ", "ch", "I", 0.1, 0.2, 0.0)
+    builder.add_mora("ワ", "w", "a", 0.1, 0.2, 5.6)
+    builder.end_accent_phrase(3, is_interrogative=True)
+    return builder.build()
+
+
+def test_builder() -> None:
+    """追加したモーラが、to_flatten_moras() と同じ順序でモーラごとの配列にまとめられる。"""
+    # Outputs
+    mora_sequence = _gen_mora_sequence()
+
+    # Tests
+    assert mora_sequence.mora_texts() == ["コ", "ン", "、", "ニ", "チ", "ワ"]
+    assert mora_sequence.consonant_ids.tolist() == [
+        Phoneme("k").id,
+        NO_CONSONANT_ID,
+        NO_CONSONANT_ID,
+        Phoneme("n").id,
+        Phoneme("ch").id,
+        Phoneme("w").id,
+    ]
+    assert mora_sequence.vowel_ids.tolist() == [
+        Phoneme(vowel).id for vowel in ["o", "N", "pau", "i", "I", "a"]
+    ]
+    assert np.isnan(mora_sequence.consonant_lengths[1])
+    assert mora_sequence.pitches.tolist() == [5.0, 5.5, 0.0, 5.8, 0.0, 5.6]
+    assert mora_sequence.phrase_offsets.tolist() == [0, 3, 6]
+    assert mora_sequence.has_pause_mora.tolist() == [True, False]
+    assert mora_sequence.is_interrogative.tolist() == [False, True]
+
+
+def test_to_accent_phrases() -> None:
+    """AccentPhrase に変換すると同じアクセント句系列になり、変換したモデルのフィールドにも代入できる。"""
+    # Inputs
+    accent_phrases = _gen_accent_phrases()
+
+    # Outputs
+    converted = _gen_mora_sequence().to_accent_phrases()
+    converted_before_update = [phrase.model_copy(deep=True) for phrase in converted]
+    converted[0].moras[0].pitch = 6.0
+
+    # Tests
+    assert converted_before_update == accent_phrases
+    assert converted[0].moras[0].pitch == 6.0
+
+
+def test_builder_keeps_unknown_phonemes() -> None:
+    """音素リストにない音素も、系列内で追加の音素 ID を割り当てて元の文字列に戻せる。"""
+    # Inputs
+    builder = MoraSequenceBuilder()
+    builder.add_mora("ア", None, "sil", None, 0.0, 0.0)
+    builder.add_mora("ヴ", "xx", "u", 0.0, 0.0, 0.0)
+
+    # Outputs
+    # 最後のアクセント句を閉じていない場合は、残りのモーラで 1 つのアクセント句になる
+    mora_sequence = builder.build()
+    accent_phrases = mora_sequence.to_accent_phrases()
+
+    # Tests
+    assert mora_sequence.extra_phonemes == ["sil", "xx"]
+    assert [mora.vowel for mora in accent_phrases[0].moras] == ["sil", "u"]
+    assert [mora.consonant for mora in accent_phrases[0].moras] == [None, "xx"]
+    assert accent_phrases[0].accent == 2
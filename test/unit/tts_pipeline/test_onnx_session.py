@@ -0,0 +1,176 @@
+"""ONNX Runtime の推論セッションの設定のテスト"""
+
+from pathlib import Path
+
+import numpy as np
+import onnxruntime
+import pytest
+
+from voicevox_engine.setting.model import (
+    ModelPrecision,
+    OnnxExecutionMode,
+    OnnxGraphOptimizationLevel,
+)
+from voicevox_engine.tts_pipeline import onnx_session
+from voicevox_engine.tts_pipeline.onnx_session import (
+    OnnxSessionConfig,
+    get_optimized_model_cache_path,
+    install_onnx_session_config,
+)
+
+onnx = pytest.importorskip("onnx")
+
+
+@pytest.fixture(autouse=True)
+def restore_inference_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """テスト中に差し替えた onnxruntime.InferenceSession をテスト後に元に戻す。"""
+    monkeypatch.setattr(onnxruntime, "InferenceSession", onnxruntime.InferenceSession)
+    monkeypatch.setattr(onnx_session, "_original_inference_session", None)
+
+
+def _save_test_model(model_path: Path) -> None:
+    """定数の加算と恒等変換からなる、グラフ最適化で畳み込める小さなモデルを保存する。"""
+    helper = onnx.helper
+    constant = helper.make_tensor("constant", onnx.TensorProto.FLOAT, [1], [1.0])
+    graph = helper.make_graph(
+        [
+            helper.make_node("Add", ["x", "constant"], ["y"]),
+            helper.make_node("Identity", ["y"], ["z"]),
+        ],
+        "test",
+        [helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [1])],
+        [helper.make_tensor_value_info("z", onnx.TensorProto.FLOAT, [1])],
+        [constant],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(model_path))
+
+
+def test_create_session_options() -> None:
+    """`OnnxSessionConfig.create_session_options()` は設定を反映した SessionOptions を返す。"""
+    # Inputs
+    config = OnnxSessionConfig(
+        intra_op_num_threads=2,
+        inter_op_num_threads=3,
+        graph_optimization_level=OnnxGraphOptimizationLevel.basic,
+        execution_mode=OnnxExecutionMode.parallel,
+        enable_cpu_mem_arena=False,
+    )
+    # Outputs
+    session_options = config.create_session_options()
+    # Test
+    assert session_options.intra_op_num_threads == 2
+    assert session_options.inter_op_num_threads == 3
+    assert session_options.graph_optimization_level == onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC  # fmt: skip
+    assert session_options.execution_mode == onnxruntime.ExecutionMode.ORT_PARALLEL
+    assert session_options.enable_cpu_mem_arena is False
+
+
+def test_get_optimized_model_cache_path_depends_on_options(tmp_path: Path) -> None:
+    """キャッシュファイルのパスは ExecutionProvider と最適化レベルごとに異なる。"""
+    # Inputs
+    model_path = tmp_path / "model.onnx"
+    _save_test_model(model_path)
+    cpu = ["CPUExecutionProvider"]
+    cuda = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    level_all = OnnxGraphOptimizationLevel.all
+    level_basic = OnnxGraphOptimizationLevel.basic
+    # Outputs
+    path = get_optimized_model_cache_path(tmp_path, model_path, cpu, level_all)
+    path_same = get_optimized_model_cache_path(tmp_path, model_path, cpu, level_all)
+    path_cuda = get_optimized_model_cache_path(tmp_path, model_path, cuda, level_all)
+    path_basic = get_optimized_model_cache_path(tmp_path, model_path, cpu, level_basic)
+    # Test
+    assert path == path_same
+    assert len({path, path_cuda, path_basic}) == 3
+
+
+def test_install_onnx_session_config_caches_optimized_model(tmp_path: Path) -> None:
+    """初回ロード時に最適化済みモデルが保存され、2 回目以降のロードで再利用される。"""
+    # Inputs
+    model_path = tmp_path / "model.onnx"
+    _save_test_model(model_path)
+    cache_dir = tmp_path / "cache"
+    providers = ["CPUExecutionProvider"]
+    install_onnx_session_config(OnnxSessionConfig(optimized_model_cache_dir=cache_dir))
+    cache_path = get_optimized_model_cache_path(
+        cache_dir, model_path, providers, OnnxGraphOptimizationLevel.all
+    )
+    x = np.array([1.0], dtype=np.float32)
+
+    # Outputs
+    first_session = onnxruntime.InferenceSession(str(model_path), providers=providers)
+    first_result = first_session.run(None, {"x": x})[0]
+    cache_mtime = cache_path.stat().st_mtime_ns
+    second_session = onnxruntime.InferenceSession(str(model_path), providers=providers)
+    second_result = second_session.run(None, {"x": x})[0]
+
+    # Test
+    assert cache_path.is_file()
+    assert list(cache_dir.glob("*.tmp")) == []
+    assert cache_path.stat().st_mtime_ns == cache_mtime
+    np.testing.assert_array_equal(first_result, [2.0])
+    np.testing.assert_array_equal(second_result, [2.0])
+
+
+def test_install_onnx_session_config_regenerates_broken_cache(tmp_path: Path) -> None:
+    """キャッシュファイルが壊れている場合は元のモデルから読み込み直し、キャッシュを再生成する。"""
+    # Inputs
+    model_path = tmp_path / "model.onnx"
+    _save_test_model(model_path)
+    cache_dir = tmp_path / "cache"
+    providers = ["CPUExecutionProvider"]
+    install_onnx_session_config(OnnxSessionConfig(optimized_model_cache_dir=cache_dir))
+    cache_path = get_optimized_model_cache_path(
+        cache_dir, model_path, providers, OnnxGraphOptimizationLevel.all
+    )
+    cache_path.write_bytes(b"broken")
+    x = np.array([1.0], dtype=np.float32)
+
+    # Outputs
+    session = onnxruntime.InferenceSession(str(model_path), providers=providers)
+    result = session.run(None, {"x": x})[0]
+
+    # Test
+    np.testing.assert_array_equal(result, [2.0])
+    assert cache_path.read_bytes() != b"broken"
+
+
+def test_install_onnx_session_config_respects_explicit_options(tmp_path: Path) -> None:
+    """SessionOptions が明示的に指定された場合は設定を適用せず、キャッシュもしない。"""
+    # Inputs
+    model_path = tmp_path / "model.onnx"
+    _save_test_model(model_path)
+    cache_dir = tmp_path / "cache"
+    install_onnx_session_config(OnnxSessionConfig(optimized_model_cache_dir=cache_dir))
+    session_options = onnxruntime.SessionOptions()
+    # Outputs
+    onnxruntime.InferenceSession(
+        str(model_path), session_options, providers=["CPUExecutionProvider"]
+    )
+    # Test
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_install_onnx_session_config_uses_quantized_model(tmp_path: Path) -> None:
+    """precision が int8 の場合、CPU のみで推論するセッションは量子化済みモデルを読み込む。"""
+    # Inputs
+    model_path = tmp_path / "model.onnx"
+    _save_test_model(model_path)
+    quantized_model_cache_dir = tmp_path / "quantized"
+    install_onnx_session_config(
+        OnnxSessionConfig(
+            precision=ModelPrecision.int8,
+            quantized_model_cache_dir=quantized_model_cache_dir,
+        )
+    )
+    x = np.array([1.0], dtype=np.float32)
+    # Outputs
+    session = onnxruntime.InferenceSession(
+        str(model_path), providers=["CPUExecutionProvider"]
+    )
+    result = session.run(None, {"x": x})[0]
+    # Tests
+    assert len(list(quantized_model_cache_dir.glob("*-int8.onnx"))) == 1
+    np.testing.assert_array_equal(result, [2.0])
@@ -1,6 +1,12 @@
+import numpy as np
 import pytest
 
-from voicevox_engine.tts_pipeline.phoneme import Phoneme
+from voicevox_engine.tts_pipeline.phoneme import (
+    Phoneme,
+    is_unvoiced_mora_tail_ids,
+    to_frame_onehot,
+    to_phoneme_ids,
+)
 
 TRUE_NUM_PHONEME = 45
 
@@ -68,3 +74,32 @@ def test_onehot() -> None:
                 assert phoneme.onehot[j] == 1.0
             else:
                 assert phoneme.onehot[j] == 0.0
+
+
+def test_to_phoneme_ids() -> None:
+    """音素の文字列の系列は、Phoneme.id と同じ音素ID系列へまとめて変換される。"""
+    assert to_phoneme_ids(hello_hiho).tolist() == [p.id for p in ojt_hello_hiho]
+    assert is_unvoiced_mora_tail_ids(to_phoneme_ids(hello_hiho)).tolist() == [
+        p.is_unvoiced_mora_tail() for p in ojt_hello_hiho
+    ]
+    with pytest.raises(ValueError):
+        to_phoneme_ids(["a", "xx"])
+
+
+def test_to_frame_onehot() -> None:
+    """音素ID系列は、音素ごとの onehot ベクトルをフレーム長だけ繰り返したものと一致する。"""
+    # Inputs
+    phoneme_ids = to_phoneme_ids(hello_hiho)
+    frame_per_phoneme = np.arange(len(hello_hiho), dtype=np.int64) % 3
+
+    # Expects
+    true_onehot = np.repeat(
+        np.stack([p.onehot for p in ojt_hello_hiho]), frame_per_phoneme, axis=0
+    )
+
+    # Outputs
+    onehot = to_frame_onehot(phoneme_ids, frame_per_phoneme)
+
+    # Tests
+    assert onehot.dtype == np.float32
+    assert np.array_equal(onehot, true_onehot)
@@ -0,0 +1,135 @@
+"""PipelineStage / SynthesisPipeline のテスト"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from voicevox_engine.tts_pipeline.pipeline_stage import PipelineStage, SynthesisPipeline
+
+
+def test_stages_overlap_across_requests() -> None:
+    """後段のステージがあるリクエストを処理している間に、前段のステージは後続のリクエストを処理できる。"""
+    # Inputs
+    first_stage = PipelineStage("first", threads=1, queue_size=4)
+    second_stage = PipelineStage("second", threads=1, queue_size=4)
+    second_stage_started = threading.Event()
+    release_second_stage = threading.Event()
+    events: list[str] = []
+
+    def process_second_stage(index: int) -> int:
+        events.append(f"second-{index}")
+        second_stage_started.set()
+        release_second_stage.wait(5.0)
+        return index
+
+    def process(index: int) -> int:
+        first_stage.run(lambda: events.append(f"first-{index}"))
+        return second_stage.run(lambda: process_second_stage(index))
+
+    # Outputs
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first_result = executor.submit(process, 0)
+        second_stage_started.wait(5.0)
+        second_result = executor.submit(process, 1)
+        # 1 件目が後段のステージで処理中のまま、2 件目の前段のステージの処理が完了するまで待つ
+        for _ in range(500):
+            if "first-1" in events:
+                break
+            threading.Event().wait(0.01)
+        events_while_second_stage_busy = list(events)
+        release_second_stage.set()
+        results = [first_result.result(), second_result.result()]
+
+    # Tests
+    assert events_while_second_stage_busy == ["first-0", "second-0", "first-1"]
+    assert results == [0, 1]
+
+
+def test_run_propagates_exception() -> None:
+    """ステージのスレッドで送出された例外は、呼び出し元に送出され、失敗したジョブとして記録される。"""
+    # Inputs
+    stage = PipelineStage("test", threads=1, queue_size=1)
+
+    def fail() -> None:
+        raise ValueError("broken")
+
+    # Tests
+    with pytest.raises(ValueError, match="broken"):
+        stage.run(fail)
+    assert stage.run(lambda: 1) == 1
+    stats = stage.stats
+    assert stats.processed_count == 2
+    assert stats.failed_count == 1
+
+
+def test_submit_blocks_when_queue_is_full() -> None:
+    """処理待ちキューが満杯の場合、ジョブの投入は空きができるまでブロックされる。"""
+    # Inputs
+    stage = PipelineStage("test", threads=1, queue_size=1)
+    running = threading.Event()
+    release = threading.Event()
+
+    def block() -> None:
+        running.set()
+        release.wait(5.0)
+
+    # Outputs
+    stage.submit(block)
+    running.wait(5.0)
+    stage.submit(lambda: None)  # 処理待ちキューに積まれる
+    blocked_submission = threading.Thread(target=lambda: stage.submit(lambda: None))
+    blocked_submission.start()
+    blocked_submission.join(0.2)
+    is_blocked = blocked_submission.is_alive()
+    stats_while_blocked = stage.stats
+    release.set()
+    blocked_submission.join(5.0)
+
+    # Tests
+    assert is_blocked is True
+    assert stats_while_blocked.queue_depth == 1
+    assert stats_while_blocked.running_count == 1
+    assert blocked_submission.is_alive() is False
+
+
+def test_invalid_arguments() -> None:
+    """スレッド数や処理待ちキューの上限が 1 未満の場合はエラーになる。"""
+    with pytest.raises(ValueError):
+        PipelineStage("test", threads=0, queue_size=1)
+    with pytest.raises(ValueError):
+        PipelineStage("test", threads=1, queue_size=0)
+
+
+def test_synthesis_pipeline_iter_segments() -> None:
+    """各区間は BERT ステージと音響ステージのスレッドで処理され、次の区間の BERT 特徴量は 1 区間分だけ先に抽出される。"""
+    # Inputs
+    pipeline = SynthesisPipeline(1, 1, 1, queue_size=4)
+    events: list[str] = []
+    thread_names: dict[str, str] = {}
+
+    def prefetch(index: int) -> int:
+        events.append(f"prefetch-{index}")
+        thread_names["prefetch"] = threading.current_thread().name
+        return index
+
+    def infer(index: int) -> str:
+        events.append(f"infer-{index}")
+        thread_names["infer"] = threading.current_thread().name
+        return f"wave-{index}"
+
+    # Outputs
+    segments = pipeline.iter_segments([0, 1, 2], prefetch, infer)
+    first_result = next(segments)
+    events_after_first_segment = list(events)
+    results = [first_result, *segments]
+
+    # Tests
+    assert results == ["wave-0", "wave-1", "wave-2"]
+    # 1 区間目の推論結果を返した時点では、3 区間目の BERT 特徴量の抽出はまだ投入されていない
+    assert "infer-0" in events_after_first_segment
+    assert "prefetch-2" not in events_after_first_segment
+    assert thread_names["prefetch"].startswith("PipelineStage-bert-")
+    assert thread_names["infer"].startswith("PipelineStage-acoustic-")
+    assert [stage.name for stage in pipeline.stages] == ["frontend", "bert", "acoustic"]
+    assert list(pipeline.iter_segments([], prefetch, infer)) == []
@@ -0,0 +1,85 @@
+"""SingleFlight のテスト"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from voicevox_engine.tts_pipeline.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    """同じキーの処理が実行中に要求されると、処理は 1 回だけ実行され、全ての呼び出し元に同じ結果が返る。"""
+    # Inputs
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    call_count = 0
+
+    def compute() -> int:
+        nonlocal call_count
+        call_count += 1
+        started.set()
+        release.wait(5.0)
+        return 42
+
+    # Outputs
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(single_flight.run, "a", compute)
+        started.wait(5.0)
+        followers = [executor.submit(single_flight.run, "a", compute) for _ in range(2)]  # fmt: skip
+        # 後続の要求が実行中の処理を待ち始めるまで待つ
+        while single_flight.stats.shared_count < 2:
+            threading.Event().wait(0.01)
+        release.set()
+        results = [leader.result(), *[follower.result() for follower in followers]]
+
+    # Tests
+    assert call_count == 1
+    assert results == [(42, False), (42, True), (42, True)]
+    assert single_flight.stats.execution_count == 1
+    assert single_flight.stats.shared_count == 2
+
+
+def test_completed_key_is_executed_again() -> None:
+    """完了した処理の結果は保持されず、同じキーでも別のキーでも再び実行される。"""
+    # Inputs
+    single_flight: SingleFlight[str, str] = SingleFlight()
+    # Outputs
+    first = single_flight.run("a", lambda: "first")
+    second = single_flight.run("a", lambda: "second")
+    other = single_flight.run("b", lambda: "other")
+    # Tests
+    assert first == ("first", False)
+    assert second == ("second", False)
+    assert other == ("other", False)
+    assert single_flight.stats.execution_count == 3
+
+
+def test_exception_is_propagated_to_all_callers() -> None:
+    """処理が例外を送出すると、結果を待っていた全ての呼び出し元に同じ例外が送出され、キーは解放される。"""
+    # Inputs
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail() -> int:
+        started.set()
+        release.wait(5.0)
+        raise ValueError("failed")
+
+    # Outputs
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(single_flight.run, "a", fail)
+        started.wait(5.0)
+        follower = executor.submit(single_flight.run, "a", fail)
+        while single_flight.stats.shared_count < 1:
+            threading.Event().wait(0.01)
+        release.set()
+
+        # Tests
+        with pytest.raises(ValueError, match="failed"):
+            leader.result()
+        with pytest.raises(ValueError, match="failed"):
+            follower.result()
+    assert single_flight.run("a", lambda: 1) == (1, False)
@@ -0,0 +1,99 @@
+"""ストリーミング音声合成の補助処理のテスト"""
+
+import io
+import struct
+
+import numpy as np
+import soundfile
+
+from voicevox_engine.tts_pipeline.streaming_synthesis import (
+    FirstChunkLatencyRecorder,
+    create_streaming_wav_header,
+    iter_stream_chunks,
+    wave_to_pcm16_bytes,
+)
+
+
+def test_streaming_wav_header() -> None:
+    """ストリーミング用の WAV ヘッダーに続けて PCM データを連結すると、WAV ファイルとして読み込める。"""
+    # Inputs
+    wave = np.array([[0.0, 0.5], [-0.5, 1.0], [-1.0, 0.25]], dtype=np.float32)
+    # Outputs
+    header = create_streaming_wav_header(sample_rate=24000, channels=2)
+    data = header + wave_to_pcm16_bytes(wave[:1]) + wave_to_pcm16_bytes(wave[1:])
+    read_wave, sample_rate = soundfile.read(io.BytesIO(data), dtype="float32")
+    # Tests
+    assert len(header) == 44
+    assert struct.unpack("<I", header[4:8])[0] == 0xFFFFFFFF
+    assert struct.unpack("<I", header[40:44])[0] == 0xFFFFFFFF
+    assert sample_rate == 24000
+    np.testing.assert_allclose(read_wave, wave, atol=1 / 32767)
+
+
+def test_wave_to_pcm16_bytes_clips() -> None:
+    """-1.0 ~ 1.0 の範囲外の値はクリップされる。"""
+    # Inputs
+    wave = np.array([2.0, -2.0, 0.0], dtype=np.float32)
+    # Outputs
+    pcm = np.frombuffer(wave_to_pcm16_bytes(wave), dtype="<i2")
+    # Tests
+    assert pcm.tolist() == [32767, -32767, 0]
+
+
+def test_iter_stream_chunks() -> None:
+    """最初の文の前に無音区間が追加され、最後の文の後ろの無音区間は別に返される。"""
+    # Inputs
+    raw_results = [
+        (10, np.full(3, 16384, dtype=np.int16)),
+        (10, np.full(2, -16384, dtype=np.int16)),
+    ]
+    first_chunk_calls: list[int] = []
+    # Outputs
+    chunks = list(
+        iter_stream_chunks(
+            raw_results,
+            default_sampling_rate=24000,
+            pre_phoneme_length=0.2,
+            post_phoneme_length=0.3,
+            to_output_wave=lambda wave, sample_rate: wave * 2,
+            on_first_chunk=lambda: first_chunk_calls.append(1),
+        )
+    )
+    # Tests
+    assert [chunk.tolist() for chunk in chunks] == [
+        [0.0, 0.0, 1.0, 1.0, 1.0],
+        [-1.0, -1.0],
+        [0.0, 0.0, 0.0],
+    ]
+    assert first_chunk_calls == [1]
+
+
+def test_iter_stream_chunks_empty() -> None:
+    """推論結果が 1 つもない場合は、既定のサンプリングレートでの後ろの無音区間のみを返す。"""
+    # Outputs
+    chunks = list(
+        iter_stream_chunks(
+            [],
+            default_sampling_rate=10,
+            pre_phoneme_length=0.2,
+            post_phoneme_length=0.5,
+            to_output_wave=lambda wave, sample_rate: wave,
+            on_first_chunk=lambda: None,
+        )
+    )
+    # Tests
+    assert [chunk.tolist() for chunk in chunks] == [[0.0] * 5]
+
+
+def test_first_chunk_latency_recorder() -> None:
+    """最初の音声波形を返すまでの時間の平均値と最大値が記録される。"""
+    # Inputs
+    recorder = FirstChunkLatencyRecorder()
+    # Outputs
+    recorder.record(0.1)
+    recorder.record(0.3)
+    stats = recorder.stats
+    # Tests
+    assert stats.stream_count == 2
+    assert stats.max_latency == 0.3
+    assert abs(stats.average_latency - 0.2) < 1e-9
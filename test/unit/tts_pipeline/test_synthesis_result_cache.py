@@ -0,0 +1,230 @@
+"""SynthesisResultCache のテスト"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from voicevox_engine.metas.Metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline import synthesis_result_cache
+from voicevox_engine.tts_pipeline.synthesis_result_cache import SynthesisResultCache
+
+
+def _wave(value: float, length: int = 1000) -> np.ndarray:
+    """テスト用の音声波形を生成する"""
+    return np.full(length, value, dtype=np.float32)
+
+
+def _query(kana: str = "テスト", speed_scale: float = 1.0) -> AudioQuery:
+    return AudioQuery(
+        accent_phrases=[],
+        speedScale=speed_scale,
+        intonationScale=1.0,
+        tempoDynamicsScale=1.0,
+        pitchScale=0.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=44100,
+        outputStereo=False,
+        kana=kana,
+    )
+
+
+def test_make_key() -> None:
+    """キャッシュキーはクエリ・スタイル ID・オプションの全てに依存する。"""
+    key = SynthesisResultCache.make_key(_query(), StyleId(0), "rev1")
+    assert key == SynthesisResultCache.make_key(_query(), StyleId(0), "rev1")
+    assert key != SynthesisResultCache.make_key(_query("テスト2"), StyleId(0), "rev1")
+    assert key != SynthesisResultCache.make_key(_query(speed_scale=1.5), StyleId(0), "rev1")  # fmt: skip
+    assert key != SynthesisResultCache.make_key(_query(), StyleId(1), "rev1")
+    assert key != SynthesisResultCache.make_key(_query(), StyleId(0), "rev2")
+
+
+def test_get_and_put() -> None:
+    """キャッシュした音声波形のコピーを取得でき、ヒット率が記録される。"""
+    # Inputs
+    cache = SynthesisResultCache(max_size=1024 * 1024)
+    wave = _wave(0.5)
+
+    # Outputs
+    missed = cache.get("model", "rev1", "a")
+    cache.put("model", "rev1", "a", wave)
+    hit = cache.get("model", "rev1", "a")
+
+    # Tests
+    assert missed is None
+    assert hit is not None
+    assert np.array_equal(hit, wave)
+    assert hit is not wave
+    stats = cache.stats
+    assert stats.hit_count == 1
+    assert stats.miss_count == 1
+    assert stats.hit_rate == 0.5
+    assert stats.entry_count == 1
+    assert stats.memory_size == wave.nbytes
+
+
+def test_get_or_synthesize() -> None:
+    """キャッシュされていない場合のみ音声合成が行われ、その結果がキャッシュされる。"""
+    # Inputs
+    cache = SynthesisResultCache(max_size=1024 * 1024)
+    synthesized: list[np.ndarray] = []
+
+    def synthesize() -> np.ndarray:
+        wave = _wave(0.5)
+        synthesized.append(wave)
+        return wave
+
+    # Outputs
+    first_wave, first_hit = cache.get_or_synthesize("model", "rev1", "a", synthesize)
+    second_wave, second_hit = cache.get_or_synthesize("model", "rev1", "a", synthesize)
+
+    # Tests
+    assert len(synthesized) == 1
+    assert (first_hit, second_hit) == (False, True)
+    assert first_wave is synthesized[0]
+    assert np.array_equal(second_wave, first_wave)
+
+
+def test_evicts_least_recently_used() -> None:
+    """サイズの上限を超えると、最も長く使われていない音声波形から破棄される。"""
+    # Inputs
+    wave_size = _wave(0.0).nbytes
+    cache = SynthesisResultCache(max_size=wave_size * 2)
+    cache.put("model", "rev1", "a", _wave(0.1))
+    cache.put("model", "rev1", "b", _wave(0.2))
+    cache.get("model", "rev1", "a")
+
+    # Outputs
+    cache.put("model", "rev1", "c", _wave(0.3))
+
+    # Tests
+    assert cache.get("model", "rev1", "b") is None
+    assert cache.get("model", "rev1", "a") is not None
+    assert cache.get("model", "rev1", "c") is not None
+
+
+def test_model_revision_change_invalidates_model_entries(tmp_path: Path) -> None:
+    """音声合成モデルのリビジョンが変わると、そのモデルのキャッシュのみが破棄される。"""
+    # Inputs
+    cache = SynthesisResultCache(max_size=1024 * 1024, cache_dir=tmp_path, max_disk_size=1024 * 1024)  # fmt: skip
+    cache.put("model", "rev1", "a", _wave(0.1))
+    cache.put("other", "rev1", "b", _wave(0.2))
+
+    # Outputs
+    reinstalled = cache.get("model", "rev2", "a")
+    other = cache.get("other", "rev1", "b")
+
+    # Tests
+    assert reinstalled is None
+    assert other is not None
+    assert not (tmp_path / "model" / "a.npy").exists()
+    assert (tmp_path / "other" / "b.npy").exists()
+
+
+def test_disk_cache_survives_restart(tmp_path: Path) -> None:
+    """ディスクにキャッシュした音声波形は、キャッシュを作り直した後も取得できる。"""
+    # Inputs
+    wave = _wave(0.5)
+    cache = SynthesisResultCache(max_size=1024 * 1024, cache_dir=tmp_path, max_disk_size=1024 * 1024)  # fmt: skip
+    cache.put("model", "rev1", "a", wave)
+
+    # Outputs
+    restarted_cache = SynthesisResultCache(max_size=1024 * 1024, cache_dir=tmp_path, max_disk_size=1024 * 1024)  # fmt: skip
+    stats_before_get = restarted_cache.stats
+    hit = restarted_cache.get("model", "rev1", "a")
+    outdated = SynthesisResultCache(max_size=1024 * 1024, cache_dir=tmp_path, max_disk_size=1024 * 1024).get("model", "rev2", "a")  # fmt: skip
+
+    # Tests
+    assert stats_before_get.entry_count == 0
+    assert stats_before_get.disk_entry_count == 1
+    assert hit is not None
+    assert np.array_equal(hit, wave)
+    assert restarted_cache.stats.entry_count == 1
+    assert outdated is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """ディスクのサイズの上限を超えると、最も長く使われていない音声波形から削除される。"""
+    # Inputs
+    cache = SynthesisResultCache(max_size=0, cache_dir=tmp_path, max_disk_size=1024 * 1024)  # fmt: skip
+    cache.put("model", "rev1", "a", _wave(0.1))
+    file_size = cache.stats.disk_size
+    cache = SynthesisResultCache(max_size=0, cache_dir=tmp_path, max_disk_size=file_size * 2)  # fmt: skip
+    cache.put("model", "rev1", "b", _wave(0.2))
+    cache.get("model", "rev1", "a")
+
+    # Outputs
+    cache.put("model", "rev1", "c", _wave(0.3))
+
+    # Tests
+    assert cache.stats.disk_entry_count == 2
+    assert cache.get("model", "rev1", "b") is None
+    assert cache.get("model", "rev1", "a") is not None
+    assert cache.get("model", "rev1", "c") is not None
+
+
+def test_disk_io_runs_without_lock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """ディスクへの保存と読み込みは、キャッシュのロックを解放した状態で行われる。"""
+    # Inputs
+    cache = SynthesisResultCache(max_size=0, cache_dir=tmp_path, max_disk_size=1024 * 1024)  # fmt: skip
+    lock_states: list[bool] = []
+    original_save, original_load = np.save, np.load
+
+    def save(*args: Any, **kwargs: Any) -> None:
+        lock_states.append(cache._lock.locked())
+        original_save(*args, **kwargs)
+
+    def load(*args: Any, **kwargs: Any) -> Any:
+        lock_states.append(cache._lock.locked())
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(np, "save", save)
+    monkeypatch.setattr(np, "load", load)
+
+    # Outputs
+    cache.put("model", "rev1", "a", _wave(0.5))
+    hit = cache.get("model", "rev1", "a")
+
+    # Tests
+    assert hit is not None
+    assert lock_states == [False, False]
+
+
+def test_invalidation_disk_io_runs_without_lock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """破棄したモデルのディレクトリの削除とリビジョンの記録は、キャッシュのロックを解放した状態で行われる。"""
+    # Inputs
+    cache = SynthesisResultCache(max_size=0, cache_dir=tmp_path, max_disk_size=1024 * 1024)  # fmt: skip
+    cache.put("model", "rev1", "a", _wave(0.5))
+    lock_states: list[tuple[str, bool]] = []
+    original_rmtree, original_write_text = synthesis_result_cache.shutil.rmtree, Path.write_text  # fmt: skip
+
+    def rmtree(*args: Any, **kwargs: Any) -> None:
+        lock_states.append(("rmtree", cache._lock.locked()))
+        original_rmtree(*args, **kwargs)
+
+    def write_text(self: Path, *args: Any, **kwargs: Any) -> int:
+        lock_states.append(("write_text", cache._lock.locked()))
+        return original_write_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(synthesis_result_cache.shutil, "rmtree", rmtree)
+    monkeypatch.setattr(Path, "write_text", write_text)
+
+    # Outputs
+    reinstalled = cache.get("model", "rev2", "a")
+
+    # Tests
+    assert reinstalled is None
+    assert lock_states == [("rmtree", False), ("write_text", False)]
+    assert (tmp_path / "model" / "REVISION").read_text(encoding="utf-8") == "rev2"
+    assert not (tmp_path / "model" / "a.npy").exists()
+    assert [path.name for path in tmp_path.iterdir()] == ["model"]
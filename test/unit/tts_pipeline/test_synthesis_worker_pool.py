@@ -0,0 +1,184 @@
+"""SynthesisWorkerPool のテスト"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pyopenjtalk
+import pytest
+from fastapi import HTTPException
+
+from voicevox_engine.metas.Metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline import synthesis_worker_pool
+from voicevox_engine.tts_pipeline.synthesis_worker_pool import (
+    SynthesisCancelledError,
+    SynthesisWorkerPool,
+)
+
+_TEST_TEXT = "テスト用の文字列"
+_TEST_PRONUNCIATION = "デフォルトノジショデハゼッタイニセイセイサレナイヨミ"
+
+
+class _FakeEngine:
+    """ワーカープロセス内で StyleBertVITS2TTSEngine の代わりに使う、音声合成の挙動を模したエンジン"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.pin_counts: dict[str, int] = {}
+
+    def pin_model(self, aivm_uuid: str) -> None:
+        self.pin_counts[aivm_uuid] = self.pin_counts.get(aivm_uuid, 0) + 1
+
+    def unpin_model(self, aivm_uuid: str) -> None:
+        self.pin_counts[aivm_uuid] = self.pin_counts.get(aivm_uuid, 0) - 1
+
+    def synthesize_wave(self, query: AudioQuery, style_id: StyleId) -> Any:
+        # スタイル ID 4 の場合は、ピン留めの回数を音声波形の代わりに返す
+        if style_id == 4:
+            return np.array([self.pin_counts.get("model", 0)], dtype=np.float32)
+        # スタイル ID 5 の場合は、ワーカープロセスで解析したテスト用の文字列の読みの文字コードを音声波形の代わりに返す
+        if style_id == 5:
+            pronunciation = "".join(feature["pron"] for feature in pyopenjtalk.run_frontend(_TEST_TEXT))  # fmt: skip
+            return np.array([ord(char) for char in pronunciation], dtype=np.float32)
+        # スタイル ID に応じて、正常終了・異常終了・長時間の処理・エラーを模す
+        if style_id == 1:
+            os._exit(1)
+        if style_id == 2:
+            time.sleep(60)
+        if style_id == 3:
+            raise HTTPException(status_code=422, detail="invalid query")
+        return np.arange(query.outputSamplingRate, dtype=np.float32)
+
+
+def _create_fake_engine(**kwargs: Any) -> _FakeEngine:
+    return _FakeEngine(**kwargs)
+
+
+def _make_query(output_sampling_rate: int) -> AudioQuery:
+    return AudioQuery(
+        accent_phrases=[],
+        speedScale=1.0,
+        intonationScale=1.0,
+        tempoDynamicsScale=1.0,
+        pitchScale=0.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=output_sampling_rate,
+        outputStereo=False,
+        kana="",
+    )
+
+
+@pytest.fixture()
+def worker_pool() -> Any:
+    worker_pool = SynthesisWorkerPool([{}], engine_factory=_create_fake_engine)
+    yield worker_pool
+    worker_pool.close()
+
+
+def test_synthesize_returns_wave_through_shared_memory(
+    worker_pool: SynthesisWorkerPool,
+) -> None:
+    """ワーカープロセスで生成された音声波形が、共有メモリを介して正しく返される。共有メモリが拡張されても正しく返される。"""
+    # Outputs
+    small_wave = worker_pool.synthesize("model", _make_query(100), StyleId(0))
+    large_wave = worker_pool.synthesize("model", _make_query(2_000_000), StyleId(0))
+    # Tests
+    np.testing.assert_array_equal(small_wave, np.arange(100, dtype=np.float32))
+    np.testing.assert_array_equal(large_wave, np.arange(2_000_000, dtype=np.float32))
+    assert worker_pool.is_model_loaded("model")
+
+
+def test_synthesize_propagates_http_exception(worker_pool: SynthesisWorkerPool) -> None:
+    """ワーカープロセス内で発生した HTTPException は、ステータスコードを保ったまま送出される。"""
+    with pytest.raises(HTTPException) as e:
+        worker_pool.synthesize("model", _make_query(100), StyleId(3))
+    assert e.value.status_code == 422
+    assert e.value.detail == "invalid query"
+
+
+def test_crashed_worker_is_restarted(worker_pool: SynthesisWorkerPool) -> None:
+    """ワーカープロセスが異常終了すると 500 エラーとなり、以降のリクエストは再起動したワーカープロセスで処理される。"""
+    # Outputs
+    with pytest.raises(HTTPException) as e:
+        worker_pool.synthesize("model", _make_query(100), StyleId(1))
+    wave = worker_pool.synthesize("model", _make_query(100), StyleId(0))
+    # Tests
+    assert e.value.status_code == 500
+    np.testing.assert_array_equal(wave, np.arange(100, dtype=np.float32))
+
+
+def test_synthesize_can_be_cancelled(worker_pool: SynthesisWorkerPool) -> None:
+    """キャンセルされた音声合成は中断され、以降のリクエストは再起動したワーカープロセスで処理される。"""
+    # Inputs
+    cancel_event = threading.Event()
+    threading.Timer(0.5, cancel_event.set).start()
+    # Outputs
+    started_at = time.time()
+    with pytest.raises(SynthesisCancelledError):
+        worker_pool.synthesize("model", _make_query(100), StyleId(2), cancel_event)
+    elapsed = time.time() - started_at
+    wave = worker_pool.synthesize("model", _make_query(100), StyleId(0))
+    # Tests
+    assert elapsed < 30
+    np.testing.assert_array_equal(wave, np.arange(100, dtype=np.float32))
+
+
+def test_pins_are_restored_after_restart(worker_pool: SynthesisWorkerPool) -> None:
+    """ワーカープロセスが再起動しても、再起動前のピン留め状態が引き継がれる。"""
+    # Inputs
+    worker_pool.pin_model("model")
+    worker_pool.pin_model("model")
+    worker_pool.unpin_model("model")
+    pin_count_before_restart = worker_pool.synthesize("model", _make_query(100), StyleId(4))  # fmt: skip
+    # Outputs
+    with pytest.raises(HTTPException):
+        worker_pool.synthesize("model", _make_query(100), StyleId(1))
+    pin_count_after_restart = worker_pool.synthesize("model", _make_query(100), StyleId(4))  # fmt: skip
+    # Tests
+    np.testing.assert_array_equal(pin_count_before_restart, [1.0])
+    np.testing.assert_array_equal(pin_count_after_restart, [1.0])
+
+
+def test_get_worker_index_is_stable() -> None:
+    """同じ音声合成モデルは常に同じワーカープロセスに振り分けられる。"""
+    indexes = {SynthesisWorkerPool.get_worker_index("model", 4) for _ in range(10)}
+    assert len(indexes) == 1
+    assert 0 <= indexes.pop() < 4
+
+
+def test_worker_applies_user_dict(
+    worker_pool: SynthesisWorkerPool,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """このプロセスで適用された辞書が、音声合成の前にワーカープロセスにも適用される。"""
+    # Inputs
+    csv_path = tmp_path / "user_dict.csv"
+    compiled_path = tmp_path / "user.dic"
+    csv_path.write_text(
+        f"{_TEST_TEXT},1348,1348,-30000,名詞,固有名詞,一般,*,*,*,{_TEST_TEXT},"
+        f"{_TEST_PRONUNCIATION},{_TEST_PRONUNCIATION},1/26,*\n",
+        encoding="utf-8",
+    )
+    pyopenjtalk.mecab_dict_index(str(csv_path), str(compiled_path))
+
+    def pronunciation() -> str:
+        wave = worker_pool.synthesize("model", _make_query(100), StyleId(5))
+        return "".join(chr(int(code)) for code in wave)
+
+    # Outputs
+    monkeypatch.setattr(synthesis_worker_pool, "get_applied_dict", lambda: (-1, None))
+    default_pronunciation = pronunciation()
+    monkeypatch.setattr(synthesis_worker_pool, "get_applied_dict", lambda: (-2, str(compiled_path)))  # fmt: skip
+    user_dict_pronunciation = pronunciation()
+
+    # Tests
+    assert default_pronunciation != _TEST_PRONUNCIATION
+    assert user_dict_pronunciation == _TEST_PRONUNCIATION
@@ -1,3 +1,6 @@
+import pyopenjtalk
+import pytest
+
 from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
 from voicevox_engine.tts_pipeline.text_analyzer import (
     AccentPhraseLabel,
@@ -176,6 +179,43 @@ def test_label_feature() -> None:
     ] == test_case_hello_hiho
 
 
+def test_label_from_feature_matches_contexts() -> None:
+    """Label が保持する属性は、正規表現で全ての属性を解析した結果と一致する。"""
+    # Inputs
+    features = pyopenjtalk.extract_fullcontext(
+        "吾輩は猫である。名前はまだ無い。2024年10月16日の気温は-3.5度です！？「ＡＢＣ」とｱｲｳ…"
+    )
+    # Tests
+    for feature in [*test_case_hello_hiho, *features]:
+        label = Label.from_feature(feature)
+        contexts = label.contexts
+        assert (
+            label.p3,
+            label.a2,
+            label.f1,
+            label.f2,
+            label.f3,
+            label.f5,
+            label.i3,
+        ) == (
+            contexts["p3"],
+            contexts["a2"],
+            contexts["f1"],
+            contexts["f2"],
+            contexts["f3"],
+            contexts["f5"],
+            contexts["i3"],
+        )
+
+
+def test_label_from_invalid_feature() -> None:
+    """OpenJTalk feature として解析できない文字列は ValueError を送出する。"""
+    with pytest.raises(ValueError):
+        Label.from_feature("invalid")
+    with pytest.raises(ValueError):
+        Label.from_feature(test_case_hello_hiho[1].replace("/F:", "/X:"))
+
+
 # contexts["a2"] == "1" ko
 mora_hello_1 = MoraLabel(consonant=labels_hello_hiho[1], vowel=labels_hello_hiho[2])
 # contexts["a2"] == "2" N
@@ -0,0 +1,85 @@
+"""TextFrontendCache のテスト"""
+
+from typing import Any
+
+from voicevox_engine.tts_pipeline.text_frontend_cache import TextFrontendCache
+
+
+class _DictVersion:
+    """テスト用の辞書のバージョン"""
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def __call__(self) -> int:
+        return self.value
+
+
+def _result(text: str) -> tuple[Any, ...]:
+    """テスト用の g2p の解析結果を生成する"""
+    return (["_", *text, "_"], [0] * (len(text) + 2), [1] * (len(text) + 2), [text])
+
+
+def test_get_and_put() -> None:
+    """キャッシュした解析結果のコピーを取得でき、ヒット率が記録される。"""
+    # Inputs
+    cache = TextFrontendCache(max_entries=4, get_dict_version=_DictVersion())
+    result = _result("abc")
+
+    # Outputs
+    missed = cache.get("abc")
+    cache.put("abc", result, cache.get_dict_version())
+    hit = cache.get("abc")
+    assert hit is not None
+    hit[0].append("x")
+
+    # Tests
+    assert missed is None
+    assert hit[1:] == result[1:]
+    assert cache.get("abc") == result
+    stats = cache.stats
+    assert (stats.hit_count, stats.miss_count, stats.entry_count) == (2, 1, 1)
+    assert stats.hit_rate == 2 / 3
+
+
+def test_evicts_least_recently_used() -> None:
+    """上限を超えると、最も長く使われていない解析結果から破棄される。"""
+    # Inputs
+    cache = TextFrontendCache(max_entries=2, get_dict_version=_DictVersion())
+
+    # Outputs
+    cache.put("a", _result("a"), 0)
+    cache.put("b", _result("b"), 0)
+    cache.get("a")
+    cache.put("c", _result("c"), 0)
+
+    # Tests
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats.entry_count == 2
+
+
+def test_invalidated_on_dict_update() -> None:
+    """辞書のバージョンが変わるとキャッシュ全体が破棄され、解析中に辞書が更新された結果はキャッシュされない。"""
+    # Inputs
+    dict_version = _DictVersion()
+    cache = TextFrontendCache(max_entries=4, get_dict_version=dict_version)
+    cache.put("a", _result("a"), cache.get_dict_version())
+
+    # Outputs
+    # 解析を始める前に辞書のバージョンを取得し、解析中に辞書が更新された場合を再現する
+    stale_version = cache.get_dict_version()
+    dict_version.value += 1
+    cache.put("b", _result("b"), stale_version)
+    missed_a = cache.get("a")
+    missed_b = cache.get("b")
+    cache.put("a", _result("a"), cache.get_dict_version())
+
+    # Tests
+    assert missed_a is None
+    assert missed_b is None
+    assert cache.get("a") == _result("a")
+    stats = cache.stats
+    assert stats.entry_count == 1
+    assert stats.invalidation_count == 1
@@ -21,6 +21,8 @@ from voicevox_engine.tts_pipeline.text_analyzer import text_to_accent_phrases
 from voicevox_engine.tts_pipeline.tts_engine import (
     TTSEngine,
     _apply_interrogative_upspeak,
+    _to_consonant_and_vowel_ids,
+    _to_flatten_phoneme_ids,
     _to_flatten_phonemes,
     to_flatten_moras,
 )
@@ -47,6 +49,29 @@ def test_to_flatten_phonemes() -> None:
     assert true_phoneme_strs == phoneme_strs
 
 
+def test_to_flatten_phoneme_ids() -> None:
+    """`_to_flatten_phoneme_ids()` は `_to_flatten_phonemes()` と同じ順序の音素ID系列と、各モーラの母音の位置を返す。"""
+    # Inputs
+    moras = [
+        gen_mora("　", None, None, "sil", sec(2), 0.0),
+        gen_mora("ヒ", "h", sec(2), "i", sec(4), 5.0),
+        gen_mora("ン", None, None, "N", sec(4), 5.0),
+        gen_mora("チ", "ch", sec(2), "I", sec(4), 0.0),
+        gen_mora("　", None, None, "sil", sec(6), 0.0),
+    ]
+    # Expects
+    true_phoneme_ids = [p.id for p in _to_flatten_phonemes(moras)]
+    true_vowel_indexes = [0, 2, 3, 5, 6]
+    # Outputs
+    phoneme_ids, vowel_indexes = _to_flatten_phoneme_ids(
+        *_to_consonant_and_vowel_ids(moras)
+    )
+
+    # Test
+    assert phoneme_ids.tolist() == true_phoneme_ids
+    assert vowel_indexes.tolist() == true_vowel_indexes
+
+
 def _gen_hello_hiho_accent_phrases() -> list[AccentPhrase]:
     return [
         AccentPhrase(
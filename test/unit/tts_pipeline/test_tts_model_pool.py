@@ -0,0 +1,116 @@
+"""TTSModelPool のテスト"""
+
+import threading
+import time
+
+import pytest
+
+from voicevox_engine.tts_pipeline.tts_model_pool import TTSModelPool
+
+
+class _DummySession:
+    """推論セッションの代わりに利用するダミー"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+
+
+def test_init_creates_one_session() -> None:
+    """プールの生成時に最初のセッションが 1 つだけ生成される。"""
+    # Inputs
+    pool = TTSModelPool(_DummySession, max_size=4)
+
+    # Tests
+    assert pool.size == 1
+    assert pool.max_size == 4
+    assert pool.in_use == 0
+
+
+def test_init_invalid_max_size() -> None:
+    """max_size に 0 以下を指定するとエラーになる。"""
+    with pytest.raises(ValueError):
+        TTSModelPool(_DummySession, max_size=0)
+
+
+def test_acquire_reuses_idle_session() -> None:
+    """空きセッションがある場合は新しいセッションを生成せずに再利用する。"""
+    # Inputs
+    pool = TTSModelPool(_DummySession, max_size=4)
+
+    # Outputs
+    with pool.acquire() as first_session:
+        assert pool.in_use == 1
+    with pool.acquire() as second_session:
+        pass
+
+    # Tests
+    assert first_session is second_session
+    assert pool.size == 1
+    assert pool.in_use == 0
+
+
+def test_acquire_grows_up_to_max_size() -> None:
+    """全てのセッションが利用中の場合は max_size まで新しいセッションを生成する。"""
+    # Inputs
+    pool = TTSModelPool(_DummySession, max_size=2)
+
+    # Outputs
+    with pool.acquire() as first_session:
+        with pool.acquire() as second_session:
+            assert pool.size == 2
+            assert pool.in_use == 2
+
+    # Tests
+    assert first_session is not second_session
+    assert pool.in_use == 0
+
+
+def test_acquire_is_exclusive() -> None:
+    """1 つのセッションが同時に複数のスレッドへ貸し出されることはない。"""
+    # Inputs
+    pool = TTSModelPool(_DummySession, max_size=2)
+    errors: list[str] = []
+
+    def worker() -> None:
+        for _ in range(20):
+            with pool.acquire() as session:
+                if not session.lock.acquire(blocking=False):
+                    errors.append("session is shared")
+                    continue
+                time.sleep(0.001)
+                session.lock.release()
+
+    # Outputs
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Tests
+    assert errors == []
+    assert pool.size == 2
+    assert pool.in_use == 0
+
+
+def test_acquire_factory_error() -> None:
+    """セッションの生成に失敗した場合、プールの状態は変化しない。"""
+    # Inputs
+    created_count = 0
+
+    def factory() -> _DummySession:
+        nonlocal created_count
+        created_count += 1
+        if created_count > 1:
+            raise RuntimeError("failed to create session")
+        return _DummySession()
+
+    pool = TTSModelPool(factory, max_size=2)
+
+    # Tests
+    with pool.acquire():
+        with pytest.raises(RuntimeError):
+            with pool.acquire():
+                pass
+    assert pool.size == 1
+    assert pool.in_use == 0
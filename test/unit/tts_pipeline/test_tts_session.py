@@ -0,0 +1,166 @@
+"""音声合成セッションのテスト"""
+
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from numpy.typing import NDArray
+
+from voicevox_engine.metas.Metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.tts_session import SentenceBuffer, TTSSession
+
+
+class _FakeEngine:
+    """音声合成の代わりに、文ごとに 2 つの音声波形を返すエンジン"""
+
+    synthesis_worker_pool = None
+    default_sampling_rate = 100
+
+    def __init__(self) -> None:
+        # セットされるまで、各文の 2 つ目の音声波形を返さない
+        self.release_second_chunk = threading.Event()
+        self.release_second_chunk.set()
+        self.queries: list[AudioQuery] = []
+
+    def create_accent_phrases(self, text: str, style_id: StyleId) -> list[Any]:
+        return []
+
+    def synthesize_wave_stream(
+        self, query: AudioQuery, style_id: StyleId
+    ) -> Iterator[NDArray[np.float32]]:
+        self.queries.append(query)
+        yield np.full(10, 0.5, dtype=np.float32)
+        self.release_second_chunk.wait(5.0)
+        yield np.full(5, -0.5, dtype=np.float32)
+
+
+def _create_client(engine: _FakeEngine) -> TestClient:
+    app = FastAPI()
+
+    @app.websocket("/tts_session")
+    async def tts_session(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await TTSSession(websocket, engine, StyleId(0)).run()  # type: ignore[arg-type]
+
+    return TestClient(app)
+
+
+def test_sentence_buffer_splits_at_sentence_terminators() -> None:
+    """文の終わりまで揃った文のみが取り出され、連続する終端記号と閉じ括弧は同じ文に含まれる。"""
+    # Inputs
+    buffer = SentenceBuffer()
+    # Outputs
+    first_sentences = buffer.append("こんにちは。今日")
+    second_sentences = buffer.append("は「晴れ」ですね！？」明日は")
+    third_sentences = buffer.append("」雨です")
+    rest = buffer.flush()
+    # Tests
+    assert first_sentences == ["こんにちは。"]
+    assert second_sentences == ["今日は「晴れ」ですね！？」"]
+    # 前の文の閉じ括弧が次の断片の先頭に届いた場合は捨てられる
+    assert third_sentences == []
+    assert rest == "明日は」雨です"
+    assert buffer.flush() is None
+
+
+def test_sentence_buffer_keeps_quotes() -> None:
+    """開きと閉じが同じ引用符は、対応する開きの引用符がある場合のみ前の文の閉じの引用符として扱われ、文頭の開きの引用符は捨てられない。"""
+    # Inputs
+    buffer = SentenceBuffer()
+    # Outputs
+    first_sentences = buffer.append('"AI"の時代だ。')
+    second_sentences = buffer.append('彼は"そうだ。"と言った。"次"の話')
+    rest = buffer.flush()
+    # Tests
+    assert first_sentences == ['"AI"の時代だ。']
+    assert second_sentences == ['彼は"そうだ。"', "と言った。"]
+    assert rest == '"次"の話'
+
+
+def test_sentence_buffer_splits_long_sentence() -> None:
+    """文の終わりが現れないまま最大文字数を超えた場合は、最後の読点 (なければ最大文字数) で区切られる。"""
+    # Inputs
+    buffer = SentenceBuffer(max_sentence_length=10)
+    # Outputs
+    sentences = buffer.append("あいう、えおかき、くけこさしすせそたちつてと")
+    # Tests
+    assert sentences == ["あいう、えおかき、", "くけこさしすせそたち"]
+    assert buffer.pending_text == "つてと"
+
+
+def test_session_synthesizes_sentences_in_order() -> None:
+    """文の終わりまで揃った文から順に音声合成され、flush で残りのテキストも音声合成される。"""
+    # Inputs
+    engine = _FakeEngine()
+    client = _create_client(engine)
+    # Outputs
+    with client.websocket_connect("/tts_session") as websocket:
+        websocket.send_json({"type": "parameters", "speedScale": 1.5})
+        websocket.send_json({"type": "text", "text": "こんにちは。元気"})
+        first_messages = [websocket.receive() for _ in range(4)]
+        websocket.send_json({"type": "flush"})
+        second_start = websocket.receive_json()
+        websocket.receive_bytes()
+        websocket.receive_bytes()
+        second_end = websocket.receive_json()
+        flushed = websocket.receive_json()
+    # Tests
+    assert first_messages[0]["text"] is not None
+    assert '"text": "こんにちは。"' in first_messages[0]["text"]
+    assert first_messages[1]["bytes"] == np.full(10, 16383, dtype="<i2").tobytes()
+    assert first_messages[2]["bytes"] == np.full(5, -16383, dtype="<i2").tobytes()
+    assert '"type": "sentence_end"' in first_messages[3]["text"]
+    assert second_start["type"] == "sentence_start"
+    assert second_start["sentence_index"] == 1
+    assert second_start["text"] == "元気"
+    assert second_start["sample_rate"] == 100
+    assert second_end == {"type": "sentence_end", "sentence_index": 1}
+    assert flushed == {"type": "flushed"}
+    assert [query.speedScale for query in engine.queries] == [1.5, 1.5]
+
+
+def test_session_cancel_stops_current_sentence() -> None:
+    """cancel を送ると、音声合成中の文の残りの音声と処理待ちの文は送られなくなる。"""
+    # Inputs
+    engine = _FakeEngine()
+    engine.release_second_chunk.clear()
+    client = _create_client(engine)
+    # Outputs
+    with client.websocket_connect("/tts_session") as websocket:
+        websocket.send_json({"type": "text", "text": "一文目。二文目。"})
+        start = websocket.receive_json()
+        websocket.receive_bytes()
+        websocket.send_json({"type": "cancel"})
+        cancelled = websocket.receive_json()
+        engine.release_second_chunk.set()
+        websocket.send_json({"type": "flush"})
+        flushed = websocket.receive_json()
+    # Tests
+    assert start["text"] == "一文目。"
+    assert cancelled == {"type": "cancelled"}
+    # キャンセル後に flushed が届くまでの間に、キャンセル前の文の音声は届かない
+    assert flushed == {"type": "flushed"}
+    assert len(engine.queries) == 1
+
+
+def test_session_reports_invalid_messages() -> None:
+    """不正なメッセージにはエラーが返され、セッションは継続する。"""
+    # Inputs
+    engine = _FakeEngine()
+    client = _create_client(engine)
+    # Outputs
+    with client.websocket_connect("/tts_session") as websocket:
+        websocket.send_text("not json")
+        invalid_json = websocket.receive_json()
+        websocket.send_json({"type": "parameters", "unknownScale": 1.0})
+        invalid_parameters = websocket.receive_json()
+        websocket.send_json({"type": "flush"})
+        flushed = websocket.receive_json()
+    # Tests
+    assert invalid_json["type"] == "error"
+    assert invalid_parameters["type"] == "error"
+    assert flushed == {"type": "flushed"}
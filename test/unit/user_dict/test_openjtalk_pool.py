@@ -0,0 +1,136 @@
+"""OpenJTalkPool のテスト"""
+
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pyopenjtalk
+import pytest
+
+from voicevox_engine.user_dict import openjtalk_pool
+from voicevox_engine.user_dict.openjtalk_pool import (
+    OpenJTalkPool,
+    install_openjtalk_pool,
+)
+
+_TEST_TEXT = "テスト用の文字列"
+_TEST_PRONUNCIATION = "デフォルトノジショデハゼッタイニセイセイサレナイヨミ"
+
+
+def _pronunciation(jtalk: pyopenjtalk.OpenJTalk) -> str:
+    """OpenJTalk インスタンスで解析したテスト用の文字列の読みを取得する"""
+    return "".join(feature["pron"] for feature in jtalk.run_frontend(_TEST_TEXT))
+
+
+def _compile_user_dict(tmp_path: Path) -> str:
+    """テスト用の文字列の読みを登録したユーザー辞書をコンパイルする"""
+    csv_path = tmp_path / "user_dict.csv"
+    compiled_path = tmp_path / "user.dic"
+    csv_path.write_text(
+        f"{_TEST_TEXT},1348,1348,-30000,名詞,固有名詞,一般,*,*,*,{_TEST_TEXT},"
+        f"{_TEST_PRONUNCIATION},{_TEST_PRONUNCIATION},1/26,*\n",
+        encoding="utf-8",
+    )
+    pyopenjtalk.mecab_dict_index(str(csv_path), str(compiled_path))
+    return str(compiled_path)
+
+
+def test_acquire_distinct_instances() -> None:
+    """同時に貸し出されるインスタンスは互いに異なり、返却されたインスタンスは再利用される。"""
+    # Inputs
+    pool = OpenJTalkPool(max_instances=2)
+
+    # Outputs
+    with pool.acquire() as jtalk_1, pool.acquire() as jtalk_2:
+        pass
+    with pool.acquire() as jtalk_3:
+        pass
+
+    # Tests
+    assert jtalk_1 is not jtalk_2
+    assert jtalk_3 is jtalk_1 or jtalk_3 is jtalk_2
+
+
+def test_acquire_waits_for_release() -> None:
+    """全てのインスタンスが貸し出し中の場合、返却されるまで待機する。"""
+    # Inputs
+    pool = OpenJTalkPool(max_instances=1)
+    acquired = threading.Event()
+
+    def acquire() -> None:
+        with pool.acquire():
+            acquired.set()
+
+    # Outputs
+    with pool.acquire():
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        acquired_while_in_use = acquired.wait(timeout=0.2)
+    thread.join(timeout=5.0)
+
+    # Tests
+    assert not acquired_while_in_use
+    assert acquired.is_set()
+
+
+# Windows では pytest 下での辞書の更新ができないためテストをスキップする
+@pytest.mark.skipif(sys.platform == "win32", reason="MeCab の初期化に失敗するため")
+def test_set_user_dict(tmp_path: Path) -> None:
+    """辞書を置き換えると、貸し出し中のインスタンスの返却を待ってから、新しい辞書を適用したインスタンスに切り替わる。"""
+    # Inputs
+    pool = OpenJTalkPool(max_instances=2)
+    user_dict_path = _compile_user_dict(tmp_path)
+    replaced = threading.Event()
+
+    def set_user_dict() -> None:
+        pool.set_user_dict(user_dict_path)
+        replaced.set()
+
+    # Outputs
+    with pool.acquire() as old_jtalk:
+        thread = threading.Thread(target=set_user_dict)
+        thread.start()
+        replaced_while_in_use = replaced.wait(timeout=0.2)
+        old_pronunciation = _pronunciation(old_jtalk)
+    thread.join(timeout=5.0)
+    with pool.acquire() as new_jtalk:
+        new_pronunciation = _pronunciation(new_jtalk)
+
+    # Tests
+    assert not replaced_while_in_use
+    assert replaced.is_set()
+    assert pool.user_dict_path == user_dict_path
+    assert new_jtalk is not old_jtalk
+    assert old_pronunciation != _TEST_PRONUNCIATION
+    assert new_pronunciation == _TEST_PRONUNCIATION
+
+
+def test_install_openjtalk_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    install_openjtalk_pool() の適用後は、pyopenjtalk のテキスト解析がプールから貸し出されたインスタンスで実行される。
+    pyopenjtalk の非公開の実装 (_global_jtalk) に依存しているため、pyopenjtalk の更新で変更された場合はこのテストが失敗する。
+    """
+    # Inputs
+    monkeypatch.setattr(pyopenjtalk, "_global_jtalk", pyopenjtalk._global_jtalk)
+    monkeypatch.setattr(openjtalk_pool, "_global_pool", None)
+    acquired_count = 0
+    original_acquire = OpenJTalkPool.acquire
+
+    @contextmanager
+    def acquire(self: OpenJTalkPool) -> Iterator[pyopenjtalk.OpenJTalk]:
+        nonlocal acquired_count
+        acquired_count += 1
+        with original_acquire(self) as jtalk:
+            yield jtalk
+
+    monkeypatch.setattr(OpenJTalkPool, "acquire", acquire)
+
+    # Outputs
+    install_openjtalk_pool(max_instances=2)
+    phonemes = pyopenjtalk.g2p(_TEST_TEXT)
+
+    # Tests
+    assert phonemes != ""
+    assert acquired_count > 0
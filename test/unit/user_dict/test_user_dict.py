@@ -7,7 +7,7 @@ import pytest
 from pyopenjtalk import g2p, unset_user_dict
 
 from voicevox_engine.user_dict.model import UserDictWord, WordTypes
-from voicevox_engine.user_dict.user_dict_manager import UserDictionary
+from voicevox_engine.user_dict.user_dict_manager import UserDictionary, get_dict_version
 from voicevox_engine.user_dict.user_dict_word import (
     USER_DICT_MAX_PRIORITY,
     UserDictInputError,
@@ -313,6 +313,7 @@ if sys.platform != "win32":
 
         # 既に辞書に登録されていないか確認する
         assert g2p(text=test_text, kana=True) != success_pronunciation
+        dict_version = get_dict_version()
 
         user_dict.apply_word(
             WordProperty(
@@ -323,6 +324,8 @@ if sys.platform != "win32":
             )
         )
         assert g2p(text=test_text, kana=True) == success_pronunciation
+        # 辞書が置き換えられると、辞書のバージョンが更新される
+        assert get_dict_version() != dict_version
 
         # 疑似的にエンジンを再起動する
         unset_user_dict()
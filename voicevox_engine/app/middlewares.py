@@ -6,7 +6,10 @@ from collections.abc import Awaitable, Callable
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from starlette.middleware.errors import ServerErrorMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
 
 from voicevox_engine.logging import logger
 from voicevox_engine.setting.model import CorsPolicyMode
@@ -58,28 +61,47 @@ def configure_middlewares(
         allow_headers=["*"],
     )
 
-    # 許可されていないOriginを遮断するミドルウェア
-    @app.middleware("http")
-    async def block_origin_middleware(
-        request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response | JSONResponse:
+    def is_valid_origin(headers: Headers) -> bool:
         isValidOrigin: bool = False
-        if "Origin" not in request.headers:  # Originのない純粋なリクエストの場合
+        if "Origin" not in headers:  # Originのない純粋なリクエストの場合
             isValidOrigin = True
         elif "*" in allowed_origins:  # すべてを許可する設定の場合
             isValidOrigin = True
-        elif request.headers["Origin"] in allowed_origins:  # Originが許可されている場合
+        elif headers["Origin"] in allowed_origins:  # Originが許可されている場合
             isValidOrigin = True
-        elif compiled_localhost_regex.fullmatch(
-            request.headers["Origin"]
-        ):  # localhostの場合
+        elif compiled_localhost_regex.fullmatch(headers["Origin"]):  # localhostの場合
             isValidOrigin = True
+        return isValidOrigin
 
-        if isValidOrigin:
+    # 許可されていないOriginを遮断するミドルウェア
+    @app.middleware("http")
+    async def block_origin_middleware(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response | JSONResponse:
+        if is_valid_origin(request.headers):
             return await call_next(request)
         else:
             return JSONResponse(
                 status_code=403, content={"detail": "Origin not allowed"}
             )
 
+    # WebSocket の接続は CORS の対象外で、上記の HTTP 用のミドルウェアも適用されないため、
+    # 許可されていないOriginからの WebSocket の接続を別途遮断する
+    app.add_middleware(_BlockWebSocketOriginMiddleware, is_valid_origin=is_valid_origin)  # fmt: skip
+
     return app
+
+
+class _BlockWebSocketOriginMiddleware:
+    """許可されていないOriginからの WebSocket の接続を、接続の受け入れ前に拒否する ASGI ミドルウェア"""
+
+    def __init__(self, app: ASGIApp, is_valid_origin: Callable[[Headers], bool]) -> None:  # fmt: skip
+        self.app = app
+        self.is_valid_origin = is_valid_origin
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "websocket" and not self.is_valid_origin(Headers(scope=scope)):  # fmt: skip
+            # 接続の受け入れ前に close を送ると、クライアントには 403 Forbidden が返される
+            await WebSocketClose(code=1008, reason="Origin not allowed")(scope, receive, send)  # fmt: skip
+            return
+        await self.app(scope, receive, send)
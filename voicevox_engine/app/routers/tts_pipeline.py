@@ -1,18 +1,37 @@
 """音声合成機能を提供する API Router"""
 
+import asyncio
 import io
+import threading
 import zipfile
+from collections.abc import Iterator
 from typing import Annotated, Self
 
 import soundfile
-from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketException,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from pydantic.json_schema import SkipJsonSchema
+from starlette.concurrency import run_in_threadpool
 
 from voicevox_engine.cancellable_engine import CancellableEngine
 from voicevox_engine.core.core_adapter import DeviceSupport
 from voicevox_engine.metas.Metas import StyleId
-from voicevox_engine.model import AudioQuery
+from voicevox_engine.model import (
+    AudioQuery,
+    InferenceStatistics,
+    LoadedModelInfo,
+    ModelLoadStatus,
+)
 from voicevox_engine.preset.preset_manager import (
     PresetInputError,
     PresetInternalError,
@@ -29,7 +48,21 @@ from voicevox_engine.tts_pipeline.model import (
     ParseKanaErrorCode,
     Score,
 )
-from voicevox_engine.tts_pipeline.tts_engine import LATEST_VERSION, TTSEngineManager
+from voicevox_engine.tts_pipeline.streaming_synthesis import (
+    StreamingAudioFormat,
+    create_streaming_wav_header,
+    wave_to_pcm16_bytes,
+)
+from voicevox_engine.tts_pipeline.style_bert_vits2_tts_engine import (
+    StyleBertVITS2TTSEngine,
+)
+from voicevox_engine.tts_pipeline.synthesis_worker_pool import SynthesisCancelledError
+from voicevox_engine.tts_pipeline.tts_engine import (
+    LATEST_VERSION,
+    TTSEngine,
+    TTSEngineManager,
+)
+from voicevox_engine.tts_pipeline.tts_session import TTSSession
 
 
 class ParseKanaBadRequest(BaseModel):
@@ -71,6 +104,21 @@ class SupportedDevicesInfo(BaseModel):
         )
 
 
+def _create_accent_phrases_with_frontend_token(
+    engine: TTSEngine, text: str, style_id: StyleId, document_mode: bool = False
+) -> tuple[list[AccentPhrase], str | None]:
+    """
+    テキストからアクセント句系列を生成する。
+    StyleBertVITS2TTSEngine の場合は、音声合成用のクエリに埋め込む読み上げテキストの解析結果のトークンも併せて生成する。
+    文書モードでは文ごとに解析するため、文章全体の解析結果であるトークンは生成しない。
+    """
+    if isinstance(engine, StyleBertVITS2TTSEngine):
+        if document_mode is True:
+            return engine.create_accent_phrases_from_document(text, style_id), None
+        return engine.create_accent_phrases_with_frontend_token(text, style_id)
+    return engine.create_accent_phrases(text, style_id), None
+
+
 def generate_tts_pipeline_router(
     tts_engines: TTSEngineManager,
     preset_manager: PresetManager,
@@ -87,6 +135,16 @@ def generate_tts_pipeline_router(
     def audio_query(
         text: str,
         style_id: Annotated[StyleId, Query(alias="speaker")],
+        document_mode: Annotated[
+            bool,
+            Query(
+                description=(
+                    "true を指定すると、長い文章を文ごとに分割して解析する文書モードでクエリを作成します。"
+                    "エンジンの起動時にワーカープロセスの数が指定されていれば、文ごとの解析を複数のプロセスで並列に実行します。"
+                    "文ごとの解析結果はキャッシュされるため、一部の文だけを編集した文章を再度送信した場合は、新しい文や変更された文のみが解析されます。"
+                ),
+            ),
+        ] = False,
         core_version: Annotated[
             str | SkipJsonSchema[None],
             Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
@@ -97,7 +155,7 @@ def generate_tts_pipeline_router(
         """
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_engine(version)
-        accent_phrases = engine.create_accent_phrases(text, style_id)
+        accent_phrases, frontend_token = _create_accent_phrases_with_frontend_token(engine, text, style_id, document_mode)  # fmt: skip
         return AudioQuery(
             accent_phrases=accent_phrases,
             speedScale=1.0,
@@ -113,6 +171,7 @@ def generate_tts_pipeline_router(
             outputStereo=False,
             # kana=create_kana(accent_phrases),
             kana=text,  # AivisSpeech Engine では音声合成時に読み上げテキストも必要なため、kana に読み上げテキストをそのまま入れて返す
+            frontendToken=frontend_token,
         )
 
     @router.post(
@@ -148,7 +207,7 @@ def generate_tts_pipeline_router(
                 status_code=422, detail="該当するプリセットIDが見つかりません"
             )
 
-        accent_phrases = engine.create_accent_phrases(text, selected_preset.style_id)
+        accent_phrases, frontend_token = _create_accent_phrases_with_frontend_token(engine, text, selected_preset.style_id)  # fmt: skip
         return AudioQuery(
             accent_phrases=accent_phrases,
             speedScale=selected_preset.speedScale,
@@ -164,6 +223,7 @@ def generate_tts_pipeline_router(
             outputStereo=False,
             # kana=create_kana(accent_phrases),
             kana=text,  # AivisSpeech Engine では音声合成時に読み上げテキストも必要なため、kana に読み上げテキストをそのまま入れて返す
+            frontendToken=frontend_token,
         )
 
     @router.post(
@@ -266,6 +326,12 @@ def generate_tts_pipeline_router(
                 "content": {
                     "audio/wav": {"schema": {"type": "string", "format": "binary"}}
                 },
+                "headers": {
+                    "X-Cache": {
+                        "description": "音声合成結果のキャッシュにヒットした場合は HIT 、ヒットしなかった場合は MISS (キャッシュが無効な場合は付与されない)",
+                        "schema": {"type": "string", "enum": ["HIT", "MISS"]},
+                    }
+                },
             }
         },
         tags=["音声合成"],
@@ -284,20 +350,197 @@ def generate_tts_pipeline_router(
         ] = None,  # fmt: skip # noqa
     ) -> Response:
         """
-        指定されたスタイル ID に紐づく音声合成モデルを用いて音声合成を行います。
+        指定されたスタイル ID に紐づく音声合成モデルを用いて音声合成を行います。<br>
+        `--synthesis_cache_size` オプションで音声合成結果のキャッシュを有効にした場合、同じクエリ・スタイル ID での音声合成結果はキャッシュから返されます。
+        キャッシュにヒットしたかどうかは `X-Cache` レスポンスヘッダーで確認できます。
         """
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_engine(version)
-        wave = engine.synthesize_wave(
-            query, style_id, enable_interrogative_upspeak=enable_interrogative_upspeak
+        headers: dict[str, str] = {}
+        if isinstance(engine, StyleBertVITS2TTSEngine) and engine.synthesis_result_cache is not None:  # fmt: skip
+            wave, cache_hit = engine.synthesize_wave_with_cache(query, style_id)
+            headers["X-Cache"] = "HIT" if cache_hit else "MISS"
+        else:
+            wave = engine.synthesize_wave(
+                query,
+                style_id,
+                enable_interrogative_upspeak=enable_interrogative_upspeak,
+            )
+
+        buffer = io.BytesIO()
+        soundfile.write(
+            file=buffer, data=wave, samplerate=query.outputSamplingRate, format="WAV"
         )
 
+        return Response(buffer.getvalue(), media_type="audio/wav", headers=headers)
+
+    @router.post(
+        "/stream_synthesis",
+        response_class=StreamingResponse,
+        responses={
+            200: {
+                "content": {
+                    "audio/wav": {"schema": {"type": "string", "format": "binary"}},
+                    "application/octet-stream": {
+                        "schema": {"type": "string", "format": "binary"}
+                    },
+                },
+            }
+        },
+        tags=["音声合成"],
+        summary="音声合成し、文ごとに音声をストリーミングで返す",
+    )
+    def stream_synthesis(
+        query: AudioQuery,
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        audio_format: Annotated[
+            StreamingAudioFormat,
+            Query(
+                alias="format",
+                description="出力形式 (wav: ストリーミング用の WAV ヘッダー付き / pcm: ヘッダーなしの 16bit PCM)",
+            ),
+        ] = "wav",
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> StreamingResponse:
+        """
+        読み上げテキストを文ごとに分割して音声合成し、音声合成が終わった文から順にチャンク形式で音声を返します。<br>
+        文章全体の音声合成の完了を待たずに再生を開始できるため、長い文章でも最初の音声が届くまでの時間を短縮できます。<br>
+        音声は 16bit 符号付き整数 (リトルエンディアン) の PCM データで、サンプリングレートとチャンネル数は AudioQuery の指定に従います。<br>
+        format に wav を指定した場合は、データ長が不明であることを示す WAV ヘッダーを先頭に付けて返します。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise HTTPException(
+                status_code=501,
+                detail="Streaming synthesis is not supported by this engine.",
+            )
+
+        # 最初の文の音声合成はレスポンスの送信開始前に行い、音声合成のエラーを通常のエラーレスポンスとして返せるようにする
+        waves = engine.synthesize_wave_stream(query, style_id)
+        first_wave = next(waves)
+
+        def generate_chunks() -> Iterator[bytes]:
+            if audio_format == "wav":
+                channels = 2 if query.outputStereo else 1
+                yield create_streaming_wav_header(query.outputSamplingRate, channels)
+            yield wave_to_pcm16_bytes(first_wave)
+            for wave in waves:
+                yield wave_to_pcm16_bytes(wave)
+
+        return StreamingResponse(
+            generate_chunks(),
+            media_type="audio/wav" if audio_format == "wav" else "application/octet-stream",  # fmt: skip
+        )
+
+    @router.post(
+        "/incremental_synthesis",
+        response_class=Response,
+        responses={
+            200: {
+                "content": {
+                    "audio/wav": {"schema": {"type": "string", "format": "binary"}}
+                },
+                "headers": {
+                    "X-Reused-Segments": {
+                        "description": "前回の音声合成結果を再利用した文の数",
+                        "schema": {"type": "integer"},
+                    },
+                    "X-Synthesized-Segments": {
+                        "description": "音声合成し直した文の数",
+                        "schema": {"type": "integer"},
+                    },
+                },
+            }
+        },
+        tags=["音声合成"],
+        summary="前回の音声合成結果を利用し、変更された文のみを音声合成し直す",
+    )
+    def incremental_synthesis(
+        query: AudioQuery,
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        handle: Annotated[
+            str,
+            Query(
+                min_length=1,
+                max_length=256,
+                description="前回の音声合成結果を識別するハンドル (エディタの行ごとの ID など、クライアントが任意に決める文字列)",
+            ),
+        ],
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> Response:
+        """
+        読み上げテキストを文ごとに分割して音声合成し、同じハンドルでの前回の音声合成結果と音素・アクセント・パラメータが同じ文は、前回の音声を再利用します。<br>
+        長い台詞の一部のアクセント句だけを編集した場合などに、変更された文のみを音声合成し直して、文の境界をクロスフェードしながら連結した音声を返します。<br>
+        前回の音声合成結果は `--incremental_synthesis_cache_size` オプションで指定したメモリ使用量の上限まで保持され、上限を超えると最も長く使われていないハンドルから破棄されます。<br>
+        再利用した文と音声合成し直した文の数は、`X-Reused-Segments` / `X-Synthesized-Segments` レスポンスヘッダーで確認できます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise HTTPException(
+                status_code=501,
+                detail="Incremental synthesis is not supported by this engine.",
+            )
+
+        wave, reused_segment_count, synthesized_segment_count = engine.synthesize_wave_incremental(query, style_id, handle)  # fmt: skip
+
         buffer = io.BytesIO()
         soundfile.write(
             file=buffer, data=wave, samplerate=query.outputSamplingRate, format="WAV"
         )
 
-        return Response(buffer.getvalue(), media_type="audio/wav")
+        return Response(
+            buffer.getvalue(),
+            media_type="audio/wav",
+            headers={
+                "X-Reused-Segments": str(reused_segment_count),
+                "X-Synthesized-Segments": str(synthesized_segment_count),
+            },
+        )
+
+    @router.websocket("/tts_session")
+    async def tts_session(
+        websocket: WebSocket,
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> None:
+        """
+        指定されたスタイルに紐づく音声合成セッションを開始する WebSocket API
+        LLM などから逐次届く読み上げテキストの断片を受け取り、文の終わりまで揃った文から順に音声合成して音声を送り続ける
+        メッセージの形式は TTSSession を参照
+        セッション中は音声合成モデルをピン留めし、メモリ使用量の上限による自動アンロードの対象から除外する
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason="TTS session is not supported by this engine.",
+            )
+        try:
+            aivm_manifest, _, _ = engine.aivm_manager.get_aivm_manifest_from_style_id(style_id)  # fmt: skip
+        except HTTPException as e:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))  # fmt: skip
+        aivm_uuid = str(aivm_manifest.uuid)
+
+        await websocket.accept()
+        await run_in_threadpool(engine.pin_model, aivm_uuid)
+        try:
+            # 最初の文の音声合成でモデルのロードを待たずに済むよう、セッションの開始と同時にロードしておく
+            engine.preload_model(aivm_uuid)
+            await TTSSession(websocket, engine, style_id).run()
+        finally:
+            await run_in_threadpool(engine.unpin_model, aivm_uuid)
 
     @router.post(
         "/cancellable_synthesis",
@@ -310,10 +553,9 @@ def generate_tts_pipeline_router(
             }
         },
         tags=["音声合成"],
-        # summary="音声合成する（キャンセル可能）",
-        summary="AivisSpeech Engine ではサポートされていない API です (常に 501 Not Implemented を返します)",
+        summary="音声合成する (キャンセル可能)",
     )
-    def cancellable_synthesis(
+    async def cancellable_synthesis(
         query: AudioQuery,
         request: Request,
         style_id: Annotated[StyleId, Query(alias="speaker")],
@@ -322,33 +564,43 @@ def generate_tts_pipeline_router(
             Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
         ] = None,  # fmt: skip # noqa
     ) -> Response:
-        raise HTTPException(
-            status_code=501,
-            detail="Cancelable synthesis is not supported in AivisSpeech Engine.",
-        )
         """
-        if cancellable_engine is None:
+        音声合成を行います。音声合成の完了前にクライアントが接続を切断すると、音声合成を中断します。<br>
+        この API は `--synthesis_workers` オプションで音声合成ワーカープロセスを有効にした場合のみ利用できます (無効な場合は 501 Not Implemented を返します) 。<br>
+        音声合成の中断時には、その音声合成を担当していたワーカープロセスが再起動されます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine) or engine.synthesis_worker_pool is None:  # fmt: skip
             raise HTTPException(
-                status_code=404,
-                detail="実験的機能はデフォルトで無効になっています。使用するには引数を指定してください。",
-            )
-        try:
-            version = core_version or LATEST_VERSION
-            f_name = cancellable_engine._synthesis_impl(
-                query, style_id, request, version=version
+                status_code=501,
+                detail="Cancellable synthesis requires --synthesis_workers option.",
             )
-        except CancellableEngineInternalError as e:
-            raise HTTPException(status_code=500, detail=str(e))
 
-        if f_name == "":
-            raise HTTPException(status_code=422, detail="不明なバージョンです")
+        # 音声合成はスレッドプールで実行し、その間クライアントの切断を監視する
+        cancel_event = threading.Event()
+        synthesis_task = asyncio.ensure_future(
+            run_in_threadpool(
+                engine.synthesize_wave_cancellable, query, style_id, cancel_event
+            )
+        )
+        while not synthesis_task.done():
+            if await request.is_disconnected():
+                cancel_event.set()
+                break
+            await asyncio.wait([synthesis_task], timeout=0.1)
+        try:
+            wave = await synthesis_task
+        except SynthesisCancelledError:
+            # クライアントは既に切断されておりレスポンスが届くことはないため、空のレスポンスを返して処理を終える
+            return Response(status_code=204)
 
-        return FileResponse(
-            f_name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f_name),
+        buffer = io.BytesIO()
+        soundfile.write(
+            file=buffer, data=wave, samplerate=query.outputSamplingRate, format="WAV"
         )
-        """
+
+        return Response(buffer.getvalue(), media_type="audio/wav")
 
     @router.post(
         "/multi_synthesis",
@@ -601,6 +853,53 @@ def generate_tts_pipeline_router(
         engine = tts_engines.get_engine(version)
         engine.initialize_synthesis(style_id, skip_reinit=skip_reinit)
 
+    @router.post(
+        "/preload_speaker",
+        status_code=202,
+        tags=["音声合成モデル管理"],
+        summary="指定されたスタイル ID に紐づく音声合成モデルをバックグラウンドでロードする",
+    )
+    def preload_speaker(
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> ModelLoadStatus:
+        """
+        指定されたスタイル ID に紐づく音声合成モデルのロードをバックグラウンドで開始し、ロードの完了を待たずに事前ロードジョブの状態を返します。<br>
+        ロード後には短いウォームアップ推論が行われ、初回の音声合成にかかる時間が短縮されます。<br>
+        ロード中のモデルに対する音声合成リクエストは、新たにロードを開始せずにロードの完了を待ってから処理されます。<br>
+        ロードの進捗は `/model_load_status` で確認できます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise HTTPException(status_code=422, detail="非対応の機能です。")
+        aivm_manifest, _, _ = engine.aivm_manager.get_aivm_manifest_from_style_id(style_id)  # fmt: skip
+        return engine.preload_model(str(aivm_manifest.uuid))
+
+    @router.get(
+        "/model_load_status",
+        tags=["音声合成モデル管理"],
+        summary="音声合成モデルの事前ロードジョブの状態の一覧を取得する",
+    )
+    def model_load_status(
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> list[ModelLoadStatus]:
+        """
+        `/preload_speaker` ・起動時の `--load_all_models` などで要求された、
+        音声合成モデルの事前ロードジョブの状態の一覧を、要求された順に返します。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise HTTPException(status_code=422, detail="非対応の機能です。")
+        return engine.get_model_load_statuses()
+
     @router.get(
         "/is_initialized_speaker",
         tags=["音声合成モデル管理"],
@@ -620,6 +919,74 @@ def generate_tts_pipeline_router(
         engine = tts_engines.get_engine(version)
         return engine.is_synthesis_initialized(style_id)
 
+    @router.post(
+        "/unload_speaker",
+        status_code=204,
+        tags=["音声合成モデル管理"],
+        summary="指定されたスタイル ID に紐づく音声合成モデルをアンロードする",
+    )
+    def unload_speaker(
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> None:
+        """
+        指定されたスタイル ID に紐づく音声合成モデルをアンロードし、メモリを解放します。<br>
+        音声合成モデルがロードされていない場合は何もしません。アンロード後も、音声合成時に必要に応じて再ロードされます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise HTTPException(status_code=422, detail="非対応の機能です。")
+        aivm_manifest, _, _ = engine.aivm_manager.get_aivm_manifest_from_style_id(style_id)  # fmt: skip
+        engine.unload_model(str(aivm_manifest.uuid))
+
+    @router.get(
+        "/loaded_models",
+        tags=["音声合成モデル管理"],
+        summary="ロード済みの音声合成モデルの一覧を取得する",
+    )
+    def loaded_models(
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> list[LoadedModelInfo]:
+        """
+        ロード済みの音声合成モデルの一覧を、最後に利用された順に返します。<br>
+        各モデルの推論セッションプールの状態・推定メモリ使用量・最終利用日時・ピン留め状態が含まれます。<br>
+        推論セッション数の上限は `--model_pool_size` 、メモリ使用量の上限は `--max_model_memory` 、
+        ピン留めするスタイル ID は `--pin_style_ids` オプションで起動時に指定できます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise HTTPException(status_code=422, detail="非対応の機能です。")
+        return engine.get_loaded_models()
+
+    @router.get(
+        "/inference_statistics",
+        tags=["音声合成モデル管理"],
+        summary="音声合成処理の統計情報を取得する",
+    )
+    def inference_statistics(
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"),
+        ] = None,  # fmt: skip # noqa
+    ) -> InferenceStatistics:
+        """
+        BERT 特徴量キャッシュのヒット率やメモリ使用量など、音声合成処理の統計情報を返します。<br>
+        無効化されている機能の統計情報は null になります。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_engine(version)
+        if not isinstance(engine, StyleBertVITS2TTSEngine):
+            raise HTTPException(status_code=422, detail="非対応の機能です。")
+        return engine.get_inference_statistics()
+
     @router.get(
         "/supported_devices",
         tags=["音声合成モデル管理"],
@@ -1,4 +1,6 @@
+from collections.abc import Collection
 from pathlib import Path
+from typing import ClassVar
 
 from aivmlib.schemas.aivm_manifest import AivmManifest
 from pydantic import BaseModel, Field
@@ -6,6 +8,8 @@ from pydantic.json_schema import SkipJsonSchema
 
 from voicevox_engine.library.model import LibrarySpeaker
 from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.model_preloader import ModelLoadState
+from voicevox_engine.utility.fingerprint_utility import FingerprintBuilder
 
 
 class AudioQuery(BaseModel):
@@ -13,6 +17,19 @@ class AudioQuery(BaseModel):
     音声合成用のクエリ
     """
 
+    # fingerprint() で浮動小数点数として扱うフィールド
+    _FINGERPRINT_FLOAT_FIELDS: ClassVar[tuple[str, ...]] = (
+        "speedScale",
+        "intonationScale",
+        "tempoDynamicsScale",
+        "pitchScale",
+        "volumeScale",
+        "prePhonemeLength",
+        "postPhonemeLength",
+        "pauseLength",
+        "pauseLengthScale",
+    )
+
     accent_phrases: list[AccentPhrase] = Field(title="アクセント句のリスト")
     speedScale: float = Field(
         title="全体の話速",
@@ -83,13 +100,47 @@ class AudioQuery(BaseModel):
             "可能な限り kana に通常の読み上げテキストを指定した上で音声合成 API に渡すことを推奨する。"
         ),
     )
+    frontendToken: str | SkipJsonSchema[None] = Field(
+        default=None,
+        title="読み上げテキストの解析結果のトークン (AivisSpeech Engine 独自のフィールド)",
+        description=(
+            "音声合成用のクエリの作成時に、読み上げテキストの解析結果 (音素・音高など) を埋め込んだトークン。\n"
+            "音声合成時に kana とアクセント句がクエリの作成時から変更されていなければ、読み上げテキストの解析を省略できる。\n"
+            "トークンが無効な場合や一致しない場合は通常通り解析されるため、内容を編集せずにそのまま送り返すこと。\n"
+            "エンジンの起動時にトークンの署名用の鍵が指定されていない場合は常に null になる。"
+        ),
+    )
+
+    def fingerprint(self, exclude: Collection[str] = ()) -> bytes:
+        """
+        音声合成用のクエリの内容から、プロセスを跨いでも安定したフィンガープリントを生成する
+        キャッシュキーや同一のクエリの判定に用いる (JSON へのシリアライズより高速で、フィールドの順序にも依存しない)
+        アクセント句の部分は、メモ化された各モーラのフィンガープリントから合成される
+        frontendToken は生成される音声波形に影響しないため、フィンガープリントに含めない
+
+        Parameters
+        ----------
+        exclude : Collection[str], optional
+            フィンガープリントに含めないフィールド名 (accent_phrases 以外のフィールドのみ指定できる)
+            除外したフィールドは None として扱われるため、同じ exclude で生成したフィンガープリント同士のみを比較すること
+
+        Returns
+        -------
+        bytes
+            16 バイトのフィンガープリント
+        """
+
+        builder = FingerprintBuilder("AudioQuery")
+        builder.add_fingerprints([accent_phrase.fingerprint() for accent_phrase in self.accent_phrases])  # fmt: skip
+        for name in self._FINGERPRINT_FLOAT_FIELDS:
+            builder.add_float(None if name in exclude else getattr(self, name))
+        builder.add_int(None if "outputSamplingRate" in exclude else self.outputSamplingRate)  # fmt: skip
+        builder.add_int(None if "outputStereo" in exclude else self.outputStereo)
+        builder.add_str(None if "kana" in exclude else self.kana)
+        return builder.digest()
 
     def __hash__(self) -> int:
-        items = [
-            (k, tuple(v)) if isinstance(v, list) else (k, v)
-            for k, v in self.__dict__.items()
-        ]
-        return hash(tuple(sorted(items)))
+        return hash(self.fingerprint())
 
 
 class AivmInfo(BaseModel):
@@ -105,3 +156,167 @@ class AivmInfo(BaseModel):
     speakers: list[LibrarySpeaker] = Field(
         title="話者情報のリスト (VOICEVOX ENGINE 互換)"
     )
+
+
+class LoadedModelInfo(BaseModel):
+    """
+    ロード済みの音声合成モデルの情報
+    """
+
+    aivm_uuid: str = Field(title="AIVM の UUID")
+    name: str = Field(title="音声合成モデルの名前")
+    pool_size: int = Field(title="現在生成されている推論セッション数")
+    max_pool_size: int = Field(title="推論セッション数の上限")
+    in_use: int = Field(title="現在推論に利用中の推論セッション数")
+    size: int = Field(title="推定メモリ使用量 (バイト)")
+    last_used_at: float = Field(title="最終利用日時 (UNIX 時間)")
+    pinned: bool = Field(
+        title="ピン留めされているか (ピン留めされたモデルは自動的にアンロードされない)"
+    )
+
+
+class ModelLoadStatus(BaseModel):
+    """
+    音声合成モデルの事前ロードジョブの状態
+    """
+
+    aivm_uuid: str = Field(title="AIVM の UUID")
+    name: str = Field(title="音声合成モデルの名前")
+    state: ModelLoadState = Field(
+        title="ジョブの状態",
+        description=(
+            "queued: ロード待ち / loading: ロード中 / warming_up: ウォームアップ推論中 / "
+            "ready: ロード完了 / failed: ロード失敗"
+        ),
+    )
+    queued_at: float = Field(title="ジョブの登録日時 (UNIX 時間)")
+    started_at: float | None = Field(default=None, title="ロードの開始日時 (UNIX 時間)")
+    finished_at: float | None = Field(
+        default=None, title="ロードの完了日時 (UNIX 時間)"
+    )
+    error: str | None = Field(
+        default=None, title="ロードに失敗した場合のエラーメッセージ"
+    )
+
+
+class CacheStatistics(BaseModel):
+    """
+    キャッシュの統計情報
+    """
+
+    hit_count: int = Field(title="キャッシュにヒットした回数")
+    miss_count: int = Field(title="キャッシュにヒットしなかった回数")
+    hit_rate: float = Field(title="キャッシュのヒット率 (0.0 ~ 1.0)")
+    entry_count: int = Field(title="メモリ上のキャッシュの要素数")
+    memory_size: int = Field(title="メモリ上のキャッシュの合計サイズ (バイト)")
+    disk_entry_count: int = Field(title="ディスクに退避されたキャッシュの要素数")
+    disk_size: int = Field(title="ディスクに退避されたキャッシュの合計サイズ (バイト)")
+
+
+class TextFrontendCacheStatistics(BaseModel):
+    """
+    読み上げテキストの解析結果キャッシュの統計情報
+    """
+
+    hit_count: int = Field(title="キャッシュにヒットした回数")
+    miss_count: int = Field(title="キャッシュにヒットしなかった回数")
+    hit_rate: float = Field(title="キャッシュのヒット率 (0.0 ~ 1.0)")
+    entry_count: int = Field(title="キャッシュされている解析結果の数")
+    max_entry_count: int = Field(title="キャッシュする解析結果の数の上限")
+    invalidation_count: int = Field(
+        title="ユーザー辞書の更新によってキャッシュが破棄された回数"
+    )
+
+
+class CoalescingStatistics(BaseModel):
+    """
+    同時に要求された同一の音声合成をまとめる処理の統計情報
+    """
+
+    execution_count: int = Field(title="実際に音声合成を実行した回数")
+    shared_count: int = Field(
+        title="実行中の音声合成の結果を共有し、音声合成を省略した回数"
+    )
+
+
+class IncrementalSynthesisStatistics(BaseModel):
+    """
+    差分音声合成 (前回の音声合成結果のうち、変更されていない文の音声波形の再利用) の統計情報
+    """
+
+    render_count: int = Field(title="前回の音声合成結果を保持しているハンドルの数")
+    memory_size: int = Field(title="保持している音声波形の合計サイズ (バイト)")
+    reused_segment_count: int = Field(title="前回の音声合成結果を再利用した文の数")
+    synthesized_segment_count: int = Field(title="音声合成し直した文の数")
+    reuse_rate: float = Field(
+        title="前回の音声合成結果を再利用した文の割合 (0.0 ~ 1.0)"
+    )
+
+
+class PipelineStageStatistics(BaseModel):
+    """
+    音声合成パイプラインの各ステージの統計情報
+    """
+
+    name: str = Field(title="ステージ名 (frontend / bert / acoustic)")
+    threads: int = Field(title="ステージの処理に使うスレッド数")
+    queue_size: int = Field(title="処理待ちキューの上限")
+    queue_depth: int = Field(title="現在の処理待ちのジョブ数")
+    running_count: int = Field(title="現在処理中のジョブ数")
+    processed_count: int = Field(title="処理したジョブの数")
+    failed_count: int = Field(title="処理に失敗したジョブの数")
+    average_queue_wait_ms: float = Field(
+        title="ジョブが処理の開始まで待機した時間の平均値 (ミリ秒)"
+    )
+    max_queue_wait_ms: float = Field(
+        title="ジョブが処理の開始まで待機した時間の最大値 (ミリ秒)"
+    )
+    average_processing_time_ms: float = Field(
+        title="ジョブの処理にかかった時間の平均値 (ミリ秒)"
+    )
+    max_processing_time_ms: float = Field(
+        title="ジョブの処理にかかった時間の最大値 (ミリ秒)"
+    )
+
+
+class StreamingStatistics(BaseModel):
+    """
+    ストリーミング音声合成の統計情報
+    """
+
+    stream_count: int = Field(title="最初の音声を返したストリーミング音声合成の数")
+    average_first_chunk_latency_ms: float = Field(
+        title="リクエストから最初の音声を返すまでの時間の平均値 (ミリ秒)"
+    )
+    max_first_chunk_latency_ms: float = Field(
+        title="リクエストから最初の音声を返すまでの時間の最大値 (ミリ秒)"
+    )
+
+
+class InferenceStatistics(BaseModel):
+    """
+    音声合成処理の統計情報
+    """
+
+    bert_feature_cache: CacheStatistics | None = Field(
+        title="BERT 特徴量キャッシュの統計情報 (キャッシュが無効な場合は null)"
+    )
+    text_frontend_cache: TextFrontendCacheStatistics | None = Field(
+        title="読み上げテキストの解析結果キャッシュの統計情報 (キャッシュが無効な場合は null)"
+    )
+    document_sentence_cache: TextFrontendCacheStatistics | None = Field(
+        title="文書モードの文ごとのアクセント句系列キャッシュの統計情報 (キャッシュが無効な場合は null)"
+    )
+    synthesis_result_cache: CacheStatistics | None = Field(
+        title="音声合成結果キャッシュの統計情報 (キャッシュが無効な場合は null)"
+    )
+    synthesis_coalescing: CoalescingStatistics = Field(
+        title="同時に要求された同一の音声合成をまとめる処理の統計情報"
+    )
+    incremental_synthesis: IncrementalSynthesisStatistics | None = Field(
+        title="差分音声合成の統計情報 (前回の音声合成結果を保持しない設定の場合は null)"
+    )
+    pipeline_stages: list[PipelineStageStatistics] | None = Field(
+        title="音声合成パイプラインの各ステージの統計情報 (パイプライン並列化が無効な場合は null)"
+    )
+    streaming: StreamingStatistics = Field(title="ストリーミング音声合成の統計情報")
@@ -14,3 +14,32 @@ class CorsPolicyMode(str, Enum):
 
     all = "all"  # 全てのオリジンからのリクエストを許可
     localapps = "localapps"  # ローカルアプリケーションからのリクエストを許可
+
+
+class OnnxGraphOptimizationLevel(str, Enum):
+    """
+    ONNX Runtime のグラフ最適化レベル
+    """
+
+    disable = "disable"  # グラフ最適化を行わない
+    basic = "basic"  # 冗長なノードの削除など、基本的な最適化のみを行う
+    extended = "extended"  # 複雑なノードの融合などを含む拡張された最適化を行う
+    all = "all"  # メモリレイアウトの最適化を含む全ての最適化を行う (デフォルト)
+
+
+class OnnxExecutionMode(str, Enum):
+    """
+    ONNX Runtime のグラフの実行モード
+    """
+
+    sequential = "sequential"  # ノードを 1 つずつ順に実行する (デフォルト)
+    parallel = "parallel"  # 依存関係のないノードを並列に実行する
+
+
+class ModelPrecision(str, Enum):
+    """
+    推論に利用するモデルの精度
+    """
+
+    fp32 = "fp32"  # 元のモデルをそのまま利用する (デフォルト)
+    int8 = "int8"  # 重みを int8 に動的量子化したモデルを利用する (CPU 推論時のみ)
@@ -9,7 +9,12 @@ import yaml
 from pydantic import TypeAdapter
 
 from ..utility.path_utility import get_save_dir
-from .model import CorsPolicyMode
+from .model import (
+    CorsPolicyMode,
+    ModelPrecision,
+    OnnxExecutionMode,
+    OnnxGraphOptimizationLevel,
+)
 
 
 @dataclass(frozen=True)
@@ -18,6 +23,14 @@ class Setting:
 
     cors_policy_mode: CorsPolicyMode  # リソース共有ポリシー
     allow_origin: str | None = None  # 許可するオリジン
+    # 以下は ONNX Runtime の推論セッションの設定 (None の場合は引数またはデフォルト値が使われる)
+    onnx_intra_op_num_threads: int | None = None  # ノード内の並列処理に使うスレッド数
+    onnx_inter_op_num_threads: int | None = None  # ノード間の並列処理に使うスレッド数
+    onnx_graph_optimization_level: OnnxGraphOptimizationLevel | None = None  # グラフ最適化レベル  # fmt: skip
+    onnx_execution_mode: OnnxExecutionMode | None = None  # グラフの実行モード
+    onnx_disable_cpu_mem_arena: bool | None = None  # CPU のメモリアリーナを無効化するか
+    disable_optimized_model_cache: bool | None = None  # 最適化済みモデルのキャッシュを無効化するか  # fmt: skip
+    precision: ModelPrecision | None = None  # 推論に利用するモデルの精度
 
 
 _setting_adapter = TypeAdapter(Setting)
@@ -53,8 +66,9 @@ class SettingHandler:
         """設定値をファイルへ書き込む。"""
         settings_dict: dict[str, Any] = _setting_adapter.dump_python(settings)
 
-        if isinstance(settings_dict["cors_policy_mode"], Enum):
-            settings_dict["cors_policy_mode"] = settings_dict["cors_policy_mode"].value
+        for key, value in settings_dict.items():
+            if isinstance(value, Enum):
+                settings_dict[key] = value.value
 
         with open(self.setting_file_path, mode="w", encoding="utf-8") as f:
             yaml.safe_dump(settings_dict, f)
@@ -0,0 +1,254 @@
+"""BERT 特徴量のキャッシュ"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class BertFeatureCacheStats:
+    """BERT 特徴量キャッシュの統計情報"""
+
+    hit_count: int  # メモリまたはディスクのキャッシュにヒットした回数
+    miss_count: int  # キャッシュにヒットしなかった回数
+    entry_count: int  # メモリ上にキャッシュされている特徴量の数
+    memory_size: int  # メモリ上にキャッシュされている特徴量の合計サイズ (バイト)
+    disk_entry_count: int  # ディスクに退避されている特徴量の数
+    disk_size: int  # ディスクに退避されている特徴量の合計サイズ (バイト)
+
+    @property
+    def hit_rate(self) -> float:
+        """キャッシュのヒット率 (0.0 ~ 1.0)"""
+        total = self.hit_count + self.miss_count
+        return self.hit_count / total if total > 0 else 0.0
+
+
+class BertFeatureCache:
+    """
+    テキストから抽出した BERT 特徴量の LRU キャッシュ
+    BERT 特徴量は話者に依存せずテキスト (と音素の割り当て) のみで決まるため、全ての音声合成モデルで共有できる
+    メモリ上のキャッシュがサイズの上限を超えると、最も長く使われていない特徴量から順に破棄される
+    退避先ディレクトリが指定されている場合は、破棄する代わりにディスクへ退避し、次回利用時にメモリへ読み戻す
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        spill_dir: Path | None = None,
+        max_disk_size: int | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        max_size : int
+            メモリ上にキャッシュする特徴量の合計サイズの上限 (バイト)
+        spill_dir : Path | None
+            メモリから溢れた特徴量の退避先ディレクトリ (None の場合は退避しない)
+            キャッシュの生成時に、退避先ディレクトリ内に残っている過去の退避ファイル (*.npy) は全て削除される
+        max_disk_size : int | None
+            ディスクに退避する特徴量の合計サイズの上限 (バイト) 。None の場合は max_size の 8 倍
+        """
+
+        self.max_size = max_size
+        self.spill_dir = spill_dir
+        self.max_disk_size = (
+            max_disk_size if max_disk_size is not None else max_size * 8
+        )
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, NDArray[Any]] = OrderedDict()
+        self._memory_size = 0
+        self._disk_entries: OrderedDict[str, int] = OrderedDict()
+        self._disk_size = 0
+        self._hit_count = 0
+        self._miss_count = 0
+        # clear() のたびに増える世代番号 (ロックを解放して退避している間に破棄されたかどうかの判定に使う)
+        self._generation = 0
+
+        # 前回起動時に退避された特徴量は BERT モデルの更新などで古くなっている可能性があるため、起動時に破棄する
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            for spilled_file in [*self.spill_dir.glob("*.npy"), *self.spill_dir.glob("*.tmp")]:  # fmt: skip
+                spilled_file.unlink(missing_ok=True)
+
+    @staticmethod
+    def make_key(text: str, word2ph: list[int], *options: Any) -> str:
+        """
+        正規化済みテキスト・文字ごとの音素数 (word2ph) ・その他の抽出オプションからキャッシュキーを生成する
+
+        Parameters
+        ----------
+        text : str
+            正規化済みのテキスト
+        word2ph : list[int]
+            テキストの各文字に割り当てられる音素の数
+        *options : Any
+            補助テキストなど、特徴量に影響するその他のオプション (repr() で文字列化される)
+
+        Returns
+        -------
+        str
+            キャッシュキー
+        """
+
+        source = "\0".join([text, ",".join(map(str, word2ph)), *map(repr, options)])
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> BertFeatureCacheStats:
+        """これまでの統計情報"""
+        with self._lock:
+            return BertFeatureCacheStats(
+                hit_count=self._hit_count,
+                miss_count=self._miss_count,
+                entry_count=len(self._entries),
+                memory_size=self._memory_size,
+                disk_entry_count=len(self._disk_entries),
+                disk_size=self._disk_size,
+            )
+
+    def get(self, key: str) -> NDArray[Any] | None:
+        """
+        キャッシュされた特徴量を取得する。ディスクに退避されている場合はメモリへ読み戻す。
+
+        Parameters
+        ----------
+        key : str
+            make_key() で生成したキャッシュキー
+
+        Returns
+        -------
+        NDArray[Any] | None
+            キャッシュされた特徴量のコピー (キャッシュされていない場合は None)
+        """
+
+        with self._lock:
+            feature = self._entries.get(key)
+            if feature is not None:
+                self._entries.move_to_end(key)
+                self._hit_count += 1
+                return feature.copy()
+            if key not in self._disk_entries:
+                self._miss_count += 1
+                return None
+            # 読み戻した特徴量はディスクから削除されるため、読み込む前に退避済みの一覧から取り除いておく
+            self._disk_size -= self._disk_entries.pop(key)
+
+        # ディスクの読み書きには時間がかかるため、ロックを解放した状態で行う
+        feature = self._load_from_disk(key)
+        with self._lock:
+            if feature is None:
+                self._miss_count += 1
+                return None
+            self._hit_count += 1
+            evicted = self._put_locked(key, feature)
+            generation = self._generation
+        self._spill(evicted, generation)
+        return feature.copy()
+
+    def put(self, key: str, feature: NDArray[Any]) -> None:
+        """
+        特徴量をキャッシュする。
+
+        Parameters
+        ----------
+        key : str
+            make_key() で生成したキャッシュキー
+        feature : NDArray[Any]
+            キャッシュする特徴量 (コピーが保持される)
+        """
+
+        with self._lock:
+            evicted = self._put_locked(key, feature.copy())
+            generation = self._generation
+        self._spill(evicted, generation)
+
+    def clear(self) -> None:
+        """キャッシュされた全ての特徴量を破棄する。"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._memory_size = 0
+            for key in list(self._disk_entries.keys()):
+                self._remove_from_disk(key)
+
+    def _put_locked(self, key: str, feature: NDArray[Any]) -> list[tuple[str, NDArray[Any]]]:  # fmt: skip
+        """
+        ロックを取得した状態で特徴量をメモリ上にキャッシュし、上限を超えた分を破棄する。
+        退避先ディレクトリが指定されている場合は、破棄した特徴量をディスクに退避すべき特徴量として返す。
+        """
+
+        # 上限を超える巨大な特徴量はキャッシュしない
+        if feature.nbytes > self.max_size:
+            return []
+
+        previous_feature = self._entries.pop(key, None)
+        if previous_feature is not None:
+            self._memory_size -= previous_feature.nbytes
+        self._entries[key] = feature
+        self._memory_size += feature.nbytes
+
+        evicted: list[tuple[str, NDArray[Any]]] = []
+        while self._memory_size > self.max_size:
+            evicted_key, evicted_feature = self._entries.popitem(last=False)
+            self._memory_size -= evicted_feature.nbytes
+            if self.spill_dir is not None:
+                evicted.append((evicted_key, evicted_feature))
+        return evicted
+
+    def _spill(self, evicted: list[tuple[str, NDArray[Any]]], generation: int) -> None:
+        """
+        メモリから溢れた特徴量を、ロックを解放した状態でディスクに退避する。ディスクの上限を超えた分は古い順に削除する。
+        退避している間に clear() が呼ばれた場合 (世代番号が変わった場合) は、退避した特徴量を破棄する。
+        """
+
+        for key, feature in evicted:
+            assert self.spill_dir is not None
+            if feature.nbytes > self.max_disk_size:
+                continue
+            path = self.spill_dir / f"{key}.npy"
+            # 同じ特徴量を複数のスレッドが同時に退避しても壊れたファイルを読み込まないよう、一時ファイルに書き込んでから置き換える
+            temp_path = self.spill_dir / f"{key}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, mode="wb") as f:
+                    np.save(f, feature, allow_pickle=False)
+                os.replace(temp_path, path)
+            except OSError:
+                temp_path.unlink(missing_ok=True)
+                continue
+            with self._lock:
+                if key in self._disk_entries:
+                    continue
+                if generation != self._generation:
+                    path.unlink(missing_ok=True)
+                    continue
+                self._disk_entries[key] = feature.nbytes
+                self._disk_size += feature.nbytes
+                while self._disk_size > self.max_disk_size:
+                    self._remove_from_disk(next(iter(self._disk_entries)))
+
+    def _load_from_disk(self, key: str) -> NDArray[Any] | None:
+        """ディスクに退避された特徴量を読み込み、ディスクからは削除する。ロックを解放した状態で呼び出される。"""
+
+        assert self.spill_dir is not None
+        path = self.spill_dir / f"{key}.npy"
+        feature: NDArray[Any] | None
+        try:
+            feature = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            feature = None
+        path.unlink(missing_ok=True)
+        return feature
+
+    def _remove_from_disk(self, key: str) -> None:
+        """ディスクに退避された特徴量を削除する。"""
+
+        assert self.spill_dir is not None
+        self._disk_size -= self._disk_entries.pop(key, 0)
+        (self.spill_dir / f"{key}.npy").unlink(missing_ok=True)
@@ -0,0 +1,267 @@
+"""長い文章を文ごとに分割し、読み上げテキストの解析を複数のプロセスで並列に実行する文書モードのフロントエンド"""
+
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Final, TypeAlias, TypeVar
+
+from ..logging import logger
+from ..user_dict.user_dict_manager import apply_dict_in_worker, get_applied_dict
+from .model import AccentPhrase
+from .text_frontend_cache import TextFrontendCache
+from .tts_session import find_sentence_end
+
+_T = TypeVar("_T")
+
+# 文のリストを受け取り、文ごとのアクセント句系列のリストを返す関数
+# ワーカープロセスに渡せるよう、モジュールのトップレベルで定義された関数でなければならない
+SentenceAnalyzer: TypeAlias = Callable[[list[str]], list[list[AccentPhrase]]]
+
+# 1 つのワーカープロセスあたりに割り当てる、文のまとまりの数
+# 文の長さのばらつきによってワーカープロセスの処理時間が偏らないよう、ワーカープロセスの数より細かく分割する
+_CHUNKS_PER_WORKER: Final[int] = 4
+
+
+def split_document(text: str, max_sentence_length: int) -> list[str]:
+    """
+    文章を文の終わりを表す記号の位置で文に分割する
+    文の終わりを表す記号が現れないまま max_sentence_length 文字を超えた場合は、読点 (なければ max_sentence_length 文字目) で区切る
+
+    Parameters
+    ----------
+    text : str
+        文章
+    max_sentence_length : int
+        1 文の最大文字数
+
+    Returns
+    -------
+    list[str]
+        文のリスト (前後の空白は取り除かれ、空の文は含まれない)
+        空白を除き、全ての文を連結すると元の文章と一致する
+    """
+
+    # 逐次届く断片を扱う SentenceBuffer とは異なり、文章全体が揃っているため、文頭の記号も捨てずに残す
+    sentences: list[str] = []
+    while text != "":
+        end = find_sentence_end(text, max_sentence_length)
+        if end is None:
+            end = len(text)
+        sentence, text = text[:end].strip(), text[end:]
+        if sentence != "":
+            sentences.append(sentence)
+    return sentences
+
+
+class DocumentFrontend:
+    """
+    長い文章を文ごとに分割し、文ごとのテキスト解析を複数のワーカープロセスで並列に実行する
+    テキスト解析の大部分は GIL を保持したまま実行される Python の処理のため、スレッドではなくプロセスで並列化する
+    各ワーカープロセスには、解析時点でこのプロセスの pyopenjtalk に適用されているユーザー辞書が適用される
+    文ごとのアクセント句系列はキャッシュされるため、一部の文だけを編集した文章を再度解析する際は、新しい文や変更された文のみが解析される
+    """
+
+    def __init__(
+        self,
+        analyze_sentences: SentenceAnalyzer,
+        max_workers: int,
+        max_sentence_length: int = 100,
+        sentence_cache: TextFrontendCache | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        analyze_sentences : SentenceAnalyzer
+            文のリストを受け取り、文ごとのアクセント句系列のリストを返す関数 (モジュールのトップレベルで定義された関数)
+        max_workers : int
+            ワーカープロセスの数 (0 の場合はワーカープロセスを使わず、呼び出し元のスレッドで解析する)
+        max_sentence_length : int
+            1 文の最大文字数
+        sentence_cache : TextFrontendCache | None
+            文から文ごとのアクセント句系列へのキャッシュ (copy_accent_phrases() を解析結果のコピーに用いるもの) 。
+            None の場合は常に全ての文を解析する
+        """
+
+        if max_workers < 0:
+            raise ValueError("max_workers must be greater than or equal to 0.")
+        self.max_workers = max_workers
+        self.max_sentence_length = max_sentence_length
+        self.sentence_cache = sentence_cache
+        self._analyze_sentences = analyze_sentences
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """ワーカープロセスを起動し、テキスト解析に必要なモジュールのインポートとユーザー辞書の適用を済ませておく。(完了は待たない)"""
+        if self.max_workers == 0:
+            return
+        executor = self._get_executor()
+        dict_version, dict_path = get_applied_dict()
+        for _ in range(self.max_workers):
+            executor.submit(_analyze_sentences_in_worker, self._analyze_sentences, [], dict_version, dict_path)  # fmt: skip
+
+    def create_accent_phrases(self, text: str) -> list[AccentPhrase]:
+        """
+        文章を文ごとに分割して解析し、文ごとのアクセント句系列を元の順序で連結したアクセント句系列を返す
+
+        Parameters
+        ----------
+        text : str
+            文章
+
+        Returns
+        -------
+        list[AccentPhrase]
+            アクセント句系列
+        """
+
+        sentences = split_document(text, self.max_sentence_length)
+        if self.sentence_cache is None:
+            sentence_accent_phrases = self._analyze_uncached_sentences(sentences)
+        else:
+            sentence_accent_phrases = self._analyze_sentences_with_cache(sentences, self.sentence_cache)  # fmt: skip
+        return [
+            accent_phrase
+            for accent_phrases in sentence_accent_phrases
+            for accent_phrase in accent_phrases
+        ]
+
+    def close(self) -> None:
+        """ワーカープロセスを終了する。"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _analyze_sentences_with_cache(
+        self, sentences: list[str], sentence_cache: TextFrontendCache
+    ) -> list[list[AccentPhrase]]:
+        """キャッシュされていない文のみを解析し、キャッシュされた文のアクセント句系列と合わせて文の順に返す。"""
+
+        # 解析中にユーザー辞書が更新された場合に古い解析結果をキャッシュしないよう、解析前に辞書のバージョンを取得しておく
+        dict_version = sentence_cache.get_dict_version()
+        cached_results: dict[str, list[AccentPhrase]] = {}
+        uncached_sentences: dict[str, None] = {}  # 挿入順を保持する集合として使う
+        for sentence in sentences:
+            if sentence in cached_results or sentence in uncached_sentences:
+                continue
+            cached_result = sentence_cache.get(sentence)
+            if cached_result is None:
+                uncached_sentences[sentence] = None
+            else:
+                cached_results[sentence] = list(cached_result)
+
+        analyzed_results = self._analyze_uncached_sentences(list(uncached_sentences))
+        for sentence, accent_phrases in zip(uncached_sentences, analyzed_results):
+            sentence_cache.put(sentence, tuple(accent_phrases), dict_version)
+            cached_results[sentence] = accent_phrases
+
+        # 同じ文が複数回現れる場合も、それぞれ独立したアクセント句系列を返す
+        results: list[list[AccentPhrase]] = []
+        used_sentences: set[str] = set()
+        for sentence in sentences:
+            if sentence in used_sentences:
+                results.append(list(copy_accent_phrases(tuple(cached_results[sentence]))))  # fmt: skip
+            else:
+                results.append(cached_results[sentence])
+                used_sentences.add(sentence)
+        return results
+
+    def _analyze_uncached_sentences(
+        self, sentences: list[str]
+    ) -> list[list[AccentPhrase]]:
+        """文のリストを、ワーカープロセスが有効であればワーカープロセスで、そうでなければ呼び出し元のスレッドで解析する。"""
+        if len(sentences) == 0:
+            return []
+        if self.max_workers == 0 or len(sentences) <= 1:
+            return self._analyze_sentences(sentences)
+        return self._analyze_sentences_in_workers(sentences)
+
+    def _analyze_sentences_in_workers(
+        self, sentences: list[str]
+    ) -> list[list[AccentPhrase]]:
+        """文のリストを連続したまとまりに分け、ワーカープロセスで並列に解析する。"""
+
+        # 解析中にユーザー辞書が更新された場合でも、全ての文が同じ辞書で解析されるよう、辞書の状態は投入前に 1 度だけ取得する
+        dict_version, dict_path = get_applied_dict()
+        executor = self._get_executor()
+        chunks = _split_into_chunks(sentences, self.max_workers * _CHUNKS_PER_WORKER)
+        try:
+            futures: list[Future[list[list[AccentPhrase]]]] = [
+                executor.submit(
+                    _analyze_sentences_in_worker,
+                    self._analyze_sentences,
+                    chunk,
+                    dict_version,
+                    dict_path,
+                )
+                for chunk in chunks
+            ]
+            results: list[list[AccentPhrase]] = []
+            for future in futures:
+                results.extend(future.result())
+            return results
+        except BrokenProcessPool:
+            # ワーカープロセスが異常終了した場合は、次回の解析時にワーカープロセスを起動し直し、今回はこのプロセスで解析する
+            logger.warning("Document frontend worker terminated unexpectedly. Analyzing in the current process.")  # fmt: skip
+            with self._executor_lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return self._analyze_sentences(sentences)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """ワーカープロセスのプールを取得する。まだ起動していない場合は起動する。"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+def copy_accent_phrases(accent_phrases: tuple[Any, ...]) -> tuple[Any, ...]:
+    """
+    アクセント句のタプルを、モーラまで含めてコピーする
+    copy.deepcopy() より高速に、呼び出し元でモーラの属性を書き換えても元のアクセント句に影響しないコピーを作成する
+    """
+    return tuple(
+        accent_phrase.model_copy(
+            update={
+                "moras": [mora.model_copy() for mora in accent_phrase.moras],
+                "pause_mora": (
+                    accent_phrase.pause_mora.model_copy()
+                    if accent_phrase.pause_mora is not None
+                    else None
+                ),
+            }
+        )
+        for accent_phrase in accent_phrases
+    )
+
+
+def _split_into_chunks(items: list[_T], n_chunks: int) -> list[list[_T]]:
+    """リストを、要素数がほぼ等しい連続したまとまりに分割する。"""
+    n_chunks = max(min(n_chunks, len(items)), 1)
+    chunk_size, remainder = divmod(len(items), n_chunks)
+    chunks: list[list[_T]] = []
+    start = 0
+    for index in range(n_chunks):
+        end = start + chunk_size + (1 if index < remainder else 0)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+def _analyze_sentences_in_worker(
+    analyze_sentences: SentenceAnalyzer,
+    sentences: list[str],
+    dict_version: int,
+    dict_path: str | None,
+) -> list[list[AccentPhrase]]:
+    """ワーカープロセスで、親プロセスと同じ辞書を適用してから文のリストを解析する。"""
+    apply_dict_in_worker(dict_version, dict_path)
+    return analyze_sentences(sentences)
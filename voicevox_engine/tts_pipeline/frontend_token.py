@@ -0,0 +1,164 @@
+"""音声合成用のクエリに埋め込む、読み上げテキストの解析結果 (g2p の結果) のトークン"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import zlib
+from typing import Any, Final
+
+from ..tts_pipeline.model import AccentPhrase
+from ..utility.fingerprint_utility import FINGERPRINT_SIZE, FingerprintBuilder
+
+# トークンの形式のバージョン
+# 形式を変更した場合は値を増やし、古い形式のトークンは復元に失敗させる (解析し直される)
+FRONTEND_TOKEN_VERSION: Final[int] = 1
+_TOKEN_PREFIX: Final[str] = f"v{FRONTEND_TOKEN_VERSION}"
+
+
+class FrontendTokenCodec:
+    """
+    読み上げテキストの解析結果 (g2p の結果) と、音声合成用のクエリに埋め込めるコンパクトな文字列 (トークン) とを相互に変換する
+    トークンは作成時の読み上げテキスト・アクセント句・辞書・エンジンのバージョンに結びつけて鍵付きハッシュで署名されるため、
+    いずれかが変わった場合や、トークンが改竄・破損している場合は復元に失敗する
+    同じ鍵を共有するエンジンのプロセス間であれば、クエリを作成したプロセス以外でも解析結果を復元できる
+    """
+
+    def __init__(self, key: bytes, namespace: str) -> None:
+        """
+        Parameters
+        ----------
+        key : bytes
+            署名に用いる鍵 (任意の長さのバイト列から、BLAKE2b の鍵長に収まるよう導出される)
+        namespace : str
+            エンジンのバージョンなど、解析結果に影響するエンジン側の情報 (異なる場合は復元に失敗する)
+        """
+
+        self._key = hashlib.blake2b(key, digest_size=32).digest()
+        self._namespace = namespace
+
+    def encode(
+        self,
+        text: str,
+        accent_phrases: list[AccentPhrase],
+        dict_fingerprint: bytes,
+        g2p_result: tuple[Any, ...],
+    ) -> str:
+        """
+        読み上げテキストの解析結果をトークンに変換する
+
+        Parameters
+        ----------
+        text : str
+            解析した読み上げテキスト
+        accent_phrases : list[AccentPhrase]
+            読み上げテキストから生成したアクセント句系列
+        dict_fingerprint : bytes
+            解析を始める前に取得した、pyopenjtalk に適用されている辞書のフィンガープリント
+        g2p_result : tuple[Any, ...]
+            g2p による解析結果 (音素・音高・word2ph などのリスト)
+
+        Returns
+        -------
+        str
+            トークン
+        """
+
+        payload = zlib.compress(
+            json.dumps(g2p_result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")  # fmt: skip
+        )
+        signature = self._sign(payload, text, accent_phrases, dict_fingerprint)
+        return ".".join([_TOKEN_PREFIX, _encode_base64(payload), _encode_base64(signature)])  # fmt: skip
+
+    def decode(
+        self,
+        token: str,
+        text: str,
+        accent_phrases: list[AccentPhrase],
+        dict_fingerprint: bytes,
+    ) -> tuple[Any, ...] | None:
+        """
+        トークンから読み上げテキストの解析結果を復元する
+
+        Parameters
+        ----------
+        token : str
+            encode() で生成したトークン
+        text : str
+            音声合成する読み上げテキスト
+        accent_phrases : list[AccentPhrase]
+            音声合成用のクエリのアクセント句系列
+        dict_fingerprint : bytes
+            現在 pyopenjtalk に適用されている辞書のフィンガープリント
+
+        Returns
+        -------
+        tuple[Any, ...] | None
+            g2p による解析結果 (トークンの形式・署名が不正な場合や、読み上げテキスト・アクセント句・辞書が作成時と異なる場合は None)
+        """
+
+        parts = token.split(".")
+        if len(parts) != 3 or parts[0] != _TOKEN_PREFIX:
+            return None
+        try:
+            payload = _decode_base64(parts[1])
+            signature = _decode_base64(parts[2])
+        except (ValueError, binascii.Error):
+            return None
+        expected_signature = self._sign(payload, text, accent_phrases, dict_fingerprint)
+        if not hmac.compare_digest(signature, expected_signature):
+            return None
+
+        try:
+            g2p_result = json.loads(zlib.decompress(payload))
+        except (zlib.error, ValueError):
+            return None
+        if not _is_valid_g2p_result(g2p_result):
+            return None
+        return tuple(g2p_result)
+
+    def _sign(
+        self,
+        payload: bytes,
+        text: str,
+        accent_phrases: list[AccentPhrase],
+        dict_fingerprint: bytes,
+    ) -> bytes:
+        """トークンの内容と、トークンを結びつける読み上げテキスト・アクセント句・辞書・エンジンのバージョンに対する署名を生成する。"""
+        builder = FingerprintBuilder("FrontendToken")
+        builder.add_int(FRONTEND_TOKEN_VERSION)
+        builder.add_str(self._namespace)
+        builder.add_str(text)
+        builder.add_fingerprints([accent_phrase.fingerprint() for accent_phrase in accent_phrases])  # fmt: skip
+        builder.add_fingerprints([dict_fingerprint])
+        source = builder.digest() + payload
+        return hashlib.blake2b(source, digest_size=FINGERPRINT_SIZE, key=self._key).digest()  # fmt: skip
+
+
+def _encode_base64(value: bytes) -> str:
+    """バイト列をパディングなしの URL-safe Base64 文字列に変換する。"""
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+def _decode_base64(value: str) -> bytes:
+    """パディングなしの URL-safe Base64 文字列をバイト列に変換する。"""
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _is_valid_g2p_result(g2p_result: Any) -> bool:
+    """
+    復元した解析結果が g2p の戻り値として妥当な構造かどうかを判定する
+    (音素・音高・word2ph を含むリストの組で、音素と音高の数および word2ph の合計が一致する)
+    """
+
+    if not isinstance(g2p_result, list) or len(g2p_result) < 3:
+        return False
+    if not all(isinstance(value, list) for value in g2p_result):
+        return False
+    phones, tones, word2ph = g2p_result[0], g2p_result[1], g2p_result[2]
+    if not all(isinstance(phone, str) for phone in phones):
+        return False
+    if not all(type(value) is int for value in [*tones, *word2ph]):
+        return False
+    return len(phones) == len(tones) == sum(word2ph)
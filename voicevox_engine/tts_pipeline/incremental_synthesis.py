@@ -0,0 +1,176 @@
+"""一部だけを編集した音声合成用のクエリの再音声合成で、変更された区間のみを音声合成し直すための前回の音声合成結果の保持"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class RenderedSegment:
+    """前回の音声合成で、区間ごとに生成した音声波形"""
+
+    key: bytes  # 区間の音声波形に影響する入力 (読み上げテキスト・音素・音高・パラメータ・音声合成モデルなど) のフィンガープリント
+    sample_rate: int  # 音声波形のサンプリングレート
+    raw_wave: NDArray[Any]  # 後処理前の音声波形 (前後の無音区間を含まない)
+
+
+@dataclass(frozen=True)
+class IncrementalSynthesisStats:
+    """差分音声合成の統計情報"""
+
+    render_count: int  # 保持している前回の音声合成結果 (ハンドル) の数
+    memory_size: int  # 保持している音声波形の合計サイズ (バイト)
+    reused_segment_count: int  # 前回の音声合成結果を再利用した区間の数
+    synthesized_segment_count: int  # 音声合成し直した区間の数
+
+    @property
+    def reuse_rate(self) -> float:
+        """前回の音声合成結果を再利用した区間の割合 (0.0 ~ 1.0)"""
+        total = self.reused_segment_count + self.synthesized_segment_count
+        return self.reused_segment_count / total if total > 0 else 0.0
+
+
+class IncrementalSynthesisStore:
+    """
+    クライアントが指定するハンドル (エディタの行など) ごとに、前回の音声合成結果を区間ごとの音声波形として保持する LRU キャッシュ
+    同じハンドルで再度音声合成する際、入力が変わっていない区間は前回の音声波形を再利用し、変更された区間のみを音声合成し直す
+    保持している音声波形の合計サイズが上限を超えると、最も長く使われていないハンドルの音声合成結果から順に破棄する
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Parameters
+        ----------
+        max_size : int
+            保持する音声波形の合計サイズの上限 (バイト) 。0 の場合は何も保持しない
+        """
+
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._renders: OrderedDict[str, list[RenderedSegment]] = OrderedDict()
+        self._memory_size = 0
+        self._reused_segment_count = 0
+        self._synthesized_segment_count = 0
+
+    @property
+    def stats(self) -> IncrementalSynthesisStats:
+        """これまでの統計情報"""
+        with self._lock:
+            return IncrementalSynthesisStats(
+                render_count=len(self._renders),
+                memory_size=self._memory_size,
+                reused_segment_count=self._reused_segment_count,
+                synthesized_segment_count=self._synthesized_segment_count,
+            )
+
+    def get(self, handle: str) -> dict[bytes, RenderedSegment]:
+        """
+        ハンドルの前回の音声合成結果を取得する
+
+        Parameters
+        ----------
+        handle : str
+            ハンドル
+
+        Returns
+        -------
+        dict[bytes, RenderedSegment]
+            区間の入力のフィンガープリントから、前回生成した音声波形への辞書 (前回の音声合成結果がない場合は空)
+        """
+
+        with self._lock:
+            segments = self._renders.get(handle)
+            if segments is None:
+                return {}
+            self._renders.move_to_end(handle)
+            return {segment.key: segment for segment in segments}
+
+    def put(self, handle: str, segments: list[RenderedSegment]) -> None:
+        """
+        ハンドルの音声合成結果を保持する。前回の音声合成結果は置き換えられる。
+
+        Parameters
+        ----------
+        handle : str
+            ハンドル
+        segments : list[RenderedSegment]
+            区間ごとに生成した音声波形のリスト
+        """
+
+        size = sum(segment.raw_wave.nbytes for segment in segments)
+        with self._lock:
+            self._remove(handle)
+            # 1 件で上限を超える音声合成結果は保持しない
+            if size > self.max_size:
+                return
+            self._renders[handle] = segments
+            self._memory_size += size
+            while self._memory_size > self.max_size:
+                oldest_handle = next(iter(self._renders))
+                self._remove(oldest_handle)
+
+    def delete(self, handle: str) -> None:
+        """ハンドルの前回の音声合成結果を破棄する。"""
+        with self._lock:
+            self._remove(handle)
+
+    def record(self, reused_segment_count: int, synthesized_segment_count: int) -> None:
+        """1 回の差分音声合成で、前回の音声合成結果を再利用した区間と音声合成し直した区間の数を記録する。"""
+        with self._lock:
+            self._reused_segment_count += reused_segment_count
+            self._synthesized_segment_count += synthesized_segment_count
+
+    def _remove(self, handle: str) -> None:
+        """ハンドルの音声合成結果を破棄する。(ロックを取得した状態で呼び出す)"""
+        segments = self._renders.pop(handle, None)
+        if segments is not None:
+            self._memory_size -= sum(segment.raw_wave.nbytes for segment in segments)
+
+
+def render_segments(
+    store: IncrementalSynthesisStore | None,
+    handle: str,
+    segment_keys: list[bytes],
+    synthesize: Callable[[list[int]], Iterable[tuple[int, NDArray[Any]]]],
+) -> tuple[list[RenderedSegment], int, int]:
+    """
+    ハンドルの前回の音声合成結果と区間のキーを照合し、前回の音声合成結果にない区間のみを音声合成した上で、区間ごとの音声波形を返す
+    音声合成結果はハンドルの新たな音声合成結果として保持される
+    推論結果の音声波形は読み取り専用として扱い、前回の音声合成結果と次回以降の呼び出しで共有する
+
+    Parameters
+    ----------
+    store : IncrementalSynthesisStore | None
+        前回の音声合成結果の保持先 (None の場合は常に全ての区間を音声合成する)
+    handle : str
+        ハンドル
+    segment_keys : list[bytes]
+        区間ごとの、区間の音声波形に影響する入力のフィンガープリント
+    synthesize : Callable[[list[int]], Iterable[tuple[int, NDArray[Any]]]]
+        音声合成し直す区間のインデックスのリストを受け取り、その順にサンプリングレートと後処理前の音声波形のタプルを返す関数
+
+    Returns
+    -------
+    tuple[list[RenderedSegment], int, int]
+        区間ごとの音声波形・前回の音声波形を再利用した区間の数・音声合成し直した区間の数
+    """
+
+    previous_segments = store.get(handle) if store is not None else {}
+    segments: list[RenderedSegment | None] = [previous_segments.get(key) for key in segment_keys]  # fmt: skip
+    changed_indices = [index for index, segment in enumerate(segments) if segment is None]  # fmt: skip
+    if len(changed_indices) > 0:
+        for index, (sample_rate, raw_wave) in zip(changed_indices, synthesize(changed_indices)):  # fmt: skip
+            segments[index] = RenderedSegment(segment_keys[index], sample_rate, raw_wave)  # fmt: skip
+    rendered_segments = [segment for segment in segments if segment is not None]
+    if len(rendered_segments) != len(segments):
+        raise ValueError("Synthesized segment count does not match the changed segment count.")  # fmt: skip
+
+    reused_segment_count = len(segments) - len(changed_indices)
+    if store is not None:
+        store.put(handle, rendered_segments)
+        store.record(reused_segment_count, len(changed_indices))
+    return rendered_segments, reused_segment_count, len(changed_indices)
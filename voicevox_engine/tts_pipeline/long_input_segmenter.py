@@ -0,0 +1,166 @@
+"""長い読み上げテキストを句読点で分割して音声合成するための分割・連結処理"""
+
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+_T = TypeVar("_T")
+
+# Style-Bert-VITS2 の音素列の先頭と末尾に置かれる境界記号
+_BOUNDARY_PHONE = "_"
+
+
+@dataclass(frozen=True)
+class InputSegment:
+    """分割された読み上げテキストの 1 区間"""
+
+    text: str  # 区間の (正規化済みの) 読み上げテキスト
+    phones: list[str]  # 区間の音素のリスト (先頭と末尾に境界記号を含む)
+    tones: list[int]  # 区間の音高のリスト (先頭と末尾に境界記号の音高を含む)
+
+
+def split_long_input(
+    normalized_text: str,
+    phones: list[str],
+    tones: list[int],
+    max_segment_phones: int,
+    punctuations: Collection[str],
+) -> list[InputSegment]:
+    """
+    音素数が max_segment_phones を超える読み上げテキストを、句読点の位置で max_segment_phones 以下の区間に分割する
+    読み上げテキストと音素のリストを同じ句読点の位置で分割するため、両者に含まれる句読点の並びが一致しない場合は分割しない
+    句読点の間隔が max_segment_phones より長い場合、その区間は max_segment_phones を超えたまま 1 つの区間になる
+
+    Parameters
+    ----------
+    normalized_text : str
+        正規化済みの読み上げテキスト
+    phones : list[str]
+        読み上げテキストに対応する音素のリスト (先頭と末尾に境界記号を含む)
+    tones : list[int]
+        音素のリストに対応する音高のリスト
+    max_segment_phones : int
+        1 区間あたりの音素数の目安となる上限 (0 の場合は全ての句読点の位置で分割する)
+    punctuations : Collection[str]
+        区間の区切りとする句読点
+
+    Returns
+    -------
+    list[InputSegment]
+        分割された区間のリスト (分割しない場合は要素数 1)
+    """
+
+    whole_input = [InputSegment(text=normalized_text, phones=phones, tones=tones)]
+    if len(phones) <= max_segment_phones or len(phones) != len(tones):
+        return whole_input
+
+    # 先頭と末尾の境界記号を取り除いた音素・音高のリスト
+    has_boundary = len(phones) >= 2 and phones[0] == _BOUNDARY_PHONE and phones[-1] == _BOUNDARY_PHONE  # fmt: skip
+    inner_phones = phones[1:-1] if has_boundary else phones
+    inner_tones = tones[1:-1] if has_boundary else tones
+
+    # 読み上げテキストと音素のリストを、それぞれ句読点の直後で区切った断片に分ける
+    text_pieces = _split_after_punctuations(normalized_text, lambda char: char in punctuations)  # fmt: skip
+    phone_indices = _split_after_punctuations(range(len(inner_phones)), lambda index: inner_phones[index] in punctuations)  # fmt: skip
+    if len(text_pieces) != len(phone_indices):
+        return whole_input
+    text_punctuations = [char for char in normalized_text if char in punctuations]
+    phone_punctuations = [phone for phone in inner_phones if phone in punctuations]
+    if text_punctuations != phone_punctuations:
+        return whole_input
+
+    # 断片を先頭から順に、音素数が max_segment_phones を超えない範囲でまとめて区間にする
+    segments: list[InputSegment] = []
+    segment_text: list[str] = []
+    segment_indices: list[int] = []
+    for text_piece, piece_indices in zip(text_pieces, phone_indices):
+        if len(segment_indices) > 0 and len(segment_indices) + len(piece_indices) > max_segment_phones:  # fmt: skip
+            segments.append(_to_segment(segment_text, segment_indices, inner_phones, inner_tones, has_boundary))  # fmt: skip
+            segment_text, segment_indices = [], []
+        segment_text.extend(text_piece)
+        segment_indices.extend(piece_indices)
+    if len(segment_indices) > 0:
+        segments.append(_to_segment(segment_text, segment_indices, inner_phones, inner_tones, has_boundary))  # fmt: skip
+
+    # 句読点以外の音素を含まない区間があると音声合成できないため、分割しない
+    for segment in segments:
+        if all(phone in punctuations or phone == _BOUNDARY_PHONE for phone in segment.phones):  # fmt: skip
+            return whole_input
+    return segments
+
+
+def crossfade_concatenate(
+    waves: Sequence[NDArray[np.float32]], crossfade_length: int
+) -> NDArray[np.float32]:
+    """
+    区間ごとに生成した音声波形を、境界を crossfade_length サンプルずつ重ねてクロスフェードしながら連結する
+    連結後の音声波形は、境界 1 つにつき最大 crossfade_length サンプル短くなる
+
+    Parameters
+    ----------
+    waves : Sequence[NDArray[np.float32]]
+        連結する音声波形のリスト
+    crossfade_length : int
+        クロスフェードする長さ (サンプル数)
+
+    Returns
+    -------
+    NDArray[np.float32]
+        連結した音声波形
+    """
+
+    if len(waves) == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    parts: list[NDArray[np.float32]] = []
+    previous_wave = waves[0].astype(np.float32)
+    for wave in waves[1:]:
+        wave = wave.astype(np.float32)
+        overlap = min(crossfade_length, len(previous_wave), len(wave))
+        if overlap == 0:
+            parts.append(previous_wave)
+            previous_wave = wave
+            continue
+        fade_in = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+        crossfaded = previous_wave[-overlap:] * (1.0 - fade_in) + wave[:overlap] * fade_in  # fmt: skip
+        parts.append(previous_wave[:-overlap])
+        parts.append(crossfaded)
+        previous_wave = wave[overlap:]
+    parts.append(previous_wave)
+    return np.concatenate(parts)
+
+
+def _split_after_punctuations(
+    items: Sequence[_T], is_punctuation: Callable[[_T], bool]
+) -> list[list[_T]]:
+    """要素の並びを、句読点の要素の直後で区切った断片のリストに分ける。"""
+
+    pieces: list[list[_T]] = [[]]
+    for index, item in enumerate(items):
+        pieces[-1].append(item)
+        # 句読点が連続する場合は、連続した句読点の末尾で区切る
+        if is_punctuation(item) and not (index + 1 < len(items) and is_punctuation(items[index + 1])):  # fmt: skip
+            pieces.append([])
+    if len(pieces[-1]) == 0:
+        pieces.pop()
+    return pieces
+
+
+def _to_segment(
+    segment_text: list[str],
+    segment_indices: list[int],
+    inner_phones: list[str],
+    inner_tones: list[int],
+    has_boundary: bool,
+) -> InputSegment:
+    """区間に含まれる文字と音素のインデックスから InputSegment を生成する。"""
+
+    phones = [inner_phones[index] for index in segment_indices]
+    tones = [inner_tones[index] for index in segment_indices]
+    if has_boundary:
+        phones = [_BOUNDARY_PHONE, *phones, _BOUNDARY_PHONE]
+        tones = [0, *tones, 0]
+    return InputSegment(text="".join(segment_text), phones=phones, tones=tones)
@@ -4,12 +4,23 @@
 モデルの注意点は `voicevox_engine/model.py` の module docstring を確認すること。
 """
 
+import struct
 from enum import Enum
-from typing import NewType
+from typing import Any, NewType
 
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.json_schema import SkipJsonSchema
 
+from voicevox_engine.utility.fingerprint_utility import digest_fingerprint
+
+# Mora.fingerprint() で用いる固定レイアウトのヘッダ
+# (None かどうかのフラグ, text の文字数, consonant の文字数, consonant_length, vowel_length, pitch)
+_pack_mora_header = struct.Struct("<B2I3d").pack
+
+# AccentPhrase.fingerprint() で用いる固定レイアウトのヘッダ
+# (モーラ数, pause_mora があるかどうか, accent, is_interrogative)
+_pack_accent_phrase_header = struct.Struct("<I?q?").pack
+
 NoteId = NewType("NoteId", str)
 
 
@@ -18,6 +29,10 @@ class Mora(BaseModel):
     モーラ（子音＋母音）ごとの情報
     """
 
+    # fingerprint() の計算結果 (フィールドへの代入で破棄される)
+    # pydantic のフィールドやプライベート属性にすると等値比較やシリアライズの対象になるため、スロットに保持する
+    __slots__ = ("_fingerprint",)
+
     model_config = ConfigDict(validate_assignment=True)
 
     text: str = Field(
@@ -47,12 +62,49 @@ class Mora(BaseModel):
         description="音高。\nAivisSpeech Engine の実装上算出できないため、ダミー値として常に 0.0 が返される。",
     )  # デフォルト値をつけるとts側のOpenAPIで生成されたコードの型がOptionalになる
 
+    def model_post_init(self, context: Any) -> None:
+        object.__setattr__(self, "_fingerprint", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        object.__setattr__(self, "_fingerprint", None)
+
+    def fingerprint(self) -> bytes:
+        """
+        モーラの内容から、プロセスを跨いでも安定したフィンガープリントを生成する
+        計算結果はフィールドに代入されるまでメモ化される
+
+        Returns
+        -------
+        bytes
+            16 バイトのフィンガープリント
+        """
+
+        # コピーや unpickle で生成されたインスタンスでは model_post_init() が呼ばれず、スロットが未設定の場合がある
+        try:
+            fingerprint: bytes | None = self._fingerprint
+        except AttributeError:
+            fingerprint = None
+        if fingerprint is None:
+            # モーラは 1 リクエストで大量に生成されるため、FingerprintBuilder を使わず固定のレイアウトで組み立てる
+            # 文字列は文字数をヘッダに含めた上で連結し、浮動小数点数は 0.0 を足して -0.0 を 0.0 に正規化する
+            consonant = self.consonant or ""
+            consonant_length = self.consonant_length
+            header = _pack_mora_header(
+                (self.consonant is None) | ((consonant_length is None) << 1),
+                len(self.text),
+                len(consonant),
+                0.0 if consonant_length is None else consonant_length + 0.0,
+                self.vowel_length + 0.0,
+                self.pitch + 0.0,
+            )
+            source = header + (self.text + consonant + self.vowel).encode("utf-8")
+            fingerprint = digest_fingerprint(source)
+            object.__setattr__(self, "_fingerprint", fingerprint)
+        return fingerprint
+
     def __hash__(self) -> int:
-        items = [
-            (k, tuple(v)) if isinstance(v, list) else (k, v)
-            for k, v in self.__dict__.items()
-        ]
-        return hash(tuple(sorted(items)))
+        return hash(self.fingerprint())
 
 
 class AccentPhrase(BaseModel):
@@ -67,12 +119,31 @@ class AccentPhrase(BaseModel):
     )
     is_interrogative: bool = Field(default=False, description="疑問系かどうか")
 
+    def fingerprint(self) -> bytes:
+        """
+        アクセント句の内容から、プロセスを跨いでも安定したフィンガープリントを生成する
+        moras はリストの要素が直接書き換えられる可能性があるためメモ化せず、メモ化された各モーラのフィンガープリントから毎回合成する
+
+        Returns
+        -------
+        bytes
+            16 バイトのフィンガープリント
+        """
+
+        # アクセント句も 1 リクエストで多数生成されるため、モーラと同様に固定のレイアウトで組み立てる
+        header = _pack_accent_phrase_header(
+            len(self.moras),
+            self.pause_mora is not None,
+            self.accent,
+            self.is_interrogative,
+        )
+        parts = [header, *[mora.fingerprint() for mora in self.moras]]
+        if self.pause_mora is not None:
+            parts.append(self.pause_mora.fingerprint())
+        return digest_fingerprint(b"".join(parts))
+
     def __hash__(self) -> int:
-        items = [
-            (k, tuple(v)) if isinstance(v, list) else (k, v)
-            for k, v in self.__dict__.items()
-        ]
-        return hash(tuple(sorted(items)))
+        return hash(self.fingerprint())
 
 
 class Note(BaseModel):
@@ -0,0 +1,175 @@
+"""音声合成モデルのバックグラウンドでの事前ロード"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import Literal, TypeAlias
+
+from ..logging import logger
+
+# 事前ロードジョブの状態
+# queued: ロード待ち / loading: ロード中 / warming_up: ウォームアップ推論中 / ready: 完了 / failed: 失敗
+ModelLoadState: TypeAlias = Literal[
+    "queued", "loading", "warming_up", "ready", "failed"
+]
+
+
+@dataclass(frozen=True)
+class ModelLoadJob:
+    """音声合成モデルの事前ロードジョブの状態"""
+
+    key: str
+    state: ModelLoadState
+    queued_at: float  # ジョブの登録日時 (UNIX 時間)
+    started_at: float | None = None  # ロードの開始日時 (UNIX 時間)
+    finished_at: float | None = None  # ロードの完了日時 (UNIX 時間)
+    error: str | None = None  # 失敗した場合のエラーメッセージ
+
+    @property
+    def is_finished(self) -> bool:
+        """ジョブが完了 (成功または失敗) しているか"""
+        return self.state in ("ready", "failed")
+
+
+@dataclass
+class _JobEntry:
+    """ジョブの状態と、ジョブの完了を待つためのイベント"""
+
+    job: ModelLoadJob
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class ModelPreloader:
+    """
+    音声合成モデルの事前ロード要求をキューに積み、専用のバックグラウンドスレッドで 1 件ずつ順にロードする
+    同じモデルに対する実行中 (またはロード待ち) のジョブがある場合は、新たなジョブを作らずに既存のジョブを返す
+    ロード処理は load_function に委譲し、このクラスはジョブのキューと状態の管理のみを行う
+    """
+
+    def __init__(
+        self,
+        load_function: Callable[[str, Callable[[ModelLoadState], None]], None],
+        max_finished_jobs: int = 100,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        load_function : Callable[[str, Callable[[ModelLoadState], None]], None]
+            モデルのキーと、ロードの進捗 (状態) を報告する関数を受け取り、モデルをロードする関数 (失敗した場合は例外を送出する)
+        max_finished_jobs : int
+            状態を保持しておく完了済みジョブの最大数 (超えた分は古い順に破棄される)
+        """
+
+        self._load_function = load_function
+        self._max_finished_jobs = max_finished_jobs
+        self._lock = threading.Lock()
+        self._queue_not_empty = threading.Condition(self._lock)
+        self._queue: deque[str] = deque()
+        # ジョブの登録順に並んだ、各モデルの最新のジョブ
+        self._jobs: dict[str, _JobEntry] = {}
+        self._worker: threading.Thread | None = None
+
+    def enqueue(self, key: str) -> ModelLoadJob:
+        """
+        モデルの事前ロードジョブをキューに登録する
+
+        Parameters
+        ----------
+        key : str
+            ロードするモデルのキー
+
+        Returns
+        -------
+        ModelLoadJob
+            登録したジョブ (同じモデルの未完了のジョブがある場合はそのジョブ) の現在の状態
+        """
+
+        with self._lock:
+            entry = self._jobs.get(key)
+            if entry is not None and not entry.job.is_finished:
+                return entry.job
+
+            # 完了済みのジョブは登録し直し、一覧の末尾に移動する
+            self._jobs.pop(key, None)
+            entry = _JobEntry(job=ModelLoadJob(key=key, state="queued", queued_at=time.time()))  # fmt: skip
+            self._jobs[key] = entry
+            self._discard_finished_jobs()
+            self._queue.append(key)
+            self._queue_not_empty.notify()
+
+            # ワーカースレッドは最初のジョブの登録時に起動する
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_worker, name="ModelPreloader", daemon=True)  # fmt: skip
+                self._worker.start()
+            return entry.job
+
+    def wait(self, key: str, timeout: float | None = None) -> ModelLoadJob | None:
+        """
+        モデルの最新のジョブが完了するまで待機する
+
+        Parameters
+        ----------
+        key : str
+            モデルのキー
+        timeout : float | None
+            最大の待機時間 (秒) 。None の場合は完了するまで待機する
+
+        Returns
+        -------
+        ModelLoadJob | None
+            ジョブの状態 (ジョブが存在しない場合は None)
+        """
+
+        with self._lock:
+            entry = self._jobs.get(key)
+        if entry is None:
+            return None
+        entry.done.wait(timeout)
+        with self._lock:
+            return entry.job
+
+    def get_job(self, key: str) -> ModelLoadJob | None:
+        """モデルの最新のジョブの状態を返す。"""
+        with self._lock:
+            entry = self._jobs.get(key)
+            return entry.job if entry is not None else None
+
+    def get_jobs(self) -> list[ModelLoadJob]:
+        """保持している全てのジョブの状態を、登録日時が古い順に返す。"""
+        with self._lock:
+            return [entry.job for entry in self._jobs.values()]
+
+    def _run_worker(self) -> None:
+        """キューに積まれたジョブを 1 件ずつ順に処理する。"""
+
+        while True:
+            with self._lock:
+                while len(self._queue) == 0:
+                    self._queue_not_empty.wait()
+                key = self._queue.popleft()
+                entry = self._jobs[key]
+                entry.job = replace(entry.job, state="loading", started_at=time.time())
+
+            def report_progress(state: ModelLoadState, entry: _JobEntry = entry) -> None:  # fmt: skip
+                with self._lock:
+                    entry.job = replace(entry.job, state=state)
+
+            try:
+                self._load_function(key, report_progress)
+            except Exception as e:
+                logger.error(f"Failed to preload model {key}.", exc_info=e)
+                with self._lock:
+                    entry.job = replace(entry.job, state="failed", finished_at=time.time(), error=str(e))  # fmt: skip
+            else:
+                with self._lock:
+                    entry.job = replace(entry.job, state="ready", finished_at=time.time())  # fmt: skip
+            entry.done.set()
+
+    def _discard_finished_jobs(self) -> None:
+        """ロックを取得した状態で、上限を超えた古い完了済みジョブを破棄する。"""
+
+        finished_keys = [key for key, entry in self._jobs.items() if entry.job.is_finished]  # fmt: skip
+        for key in finished_keys[: max(0, len(finished_keys) - self._max_finished_jobs)]:  # fmt: skip
+            del self._jobs[key]
@@ -0,0 +1,117 @@
+"""ONNX モデルの int8 動的量子化"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Final
+
+from ..logging import logger
+
+# 量子化の対象とする演算子
+# 重みを持つ行列積のみを量子化し、活性化同士の行列積 (Attention など) や畳み込みは精度と速度の兼ね合いから量子化しない
+_OP_TYPES_TO_QUANTIZE: Final[list[str]] = ["MatMul", "Gemm"]
+
+# ファイルの内容のハッシュ値のキャッシュ
+# 巨大なモデルファイルのハッシュ値をロードのたびに計算しないよう、パス・サイズ・更新日時が変わらない限り再利用する
+_content_hash_cache: dict[tuple[str, int, int], str] = {}
+_content_hash_cache_lock = threading.Lock()
+
+
+def get_file_content_hash(file_path: Path) -> str:
+    """
+    ファイルの内容の SHA-256 ハッシュ値を取得する
+
+    Parameters
+    ----------
+    file_path : Path
+        ファイルのパス
+
+    Returns
+    -------
+    str
+        ファイルの内容の SHA-256 ハッシュ値 (16 進数表記)
+    """
+
+    stat = file_path.stat()
+    cache_key = (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _content_hash_cache_lock:
+        content_hash = _content_hash_cache.get(cache_key)
+    if content_hash is not None:
+        return content_hash
+
+    hasher = hashlib.sha256()
+    with open(file_path, mode="rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    content_hash = hasher.hexdigest()
+    with _content_hash_cache_lock:
+        _content_hash_cache[cache_key] = content_hash
+    return content_hash
+
+
+def get_quantized_model_path(cache_dir: Path, model_path: Path) -> Path:
+    """
+    元のモデルファイルに対応する、int8 動的量子化済みモデルのキャッシュファイルのパスを取得する
+    キャッシュファイルは元のモデルファイルの内容のハッシュ値で識別されるため、同じ内容のモデルは名前や配置場所が違っても共有される
+
+    Parameters
+    ----------
+    cache_dir : Path
+        キャッシュディレクトリ
+    model_path : Path
+        元のモデルファイルのパス
+
+    Returns
+    -------
+    Path
+        量子化済みモデルのキャッシュファイルのパス
+    """
+
+    content_hash = get_file_content_hash(model_path)
+    return cache_dir / f"{model_path.stem}-{content_hash[:16]}-int8.onnx"
+
+
+def quantize_model_dynamic(cache_dir: Path, model_path: Path) -> Path:
+    """
+    ONNX モデルの重みを int8 に動的量子化し、量子化済みモデルのキャッシュファイルのパスを返す
+    既に量子化済みのモデルがキャッシュされている場合は、量子化せずにそのパスを返す
+
+    Parameters
+    ----------
+    cache_dir : Path
+        キャッシュディレクトリ
+    model_path : Path
+        元のモデルファイルのパス
+
+    Returns
+    -------
+    Path
+        量子化済みモデルのキャッシュファイルのパス
+    """
+
+    quantized_model_path = get_quantized_model_path(cache_dir, model_path)
+    if quantized_model_path.is_file():
+        return quantized_model_path
+
+    # 量子化機能は onnx パッケージに依存しており、インポートに時間がかかるため、必要になった時点でインポートする
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    logger.info(f"Quantizing {model_path.name} to int8...")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # 量子化途中でプロセスが終了した場合に、不完全なキャッシュファイルが残らないよう一時ファイルに保存してからリネームする
+    temp_quantized_model_path = quantized_model_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")  # fmt: skip
+    try:
+        quantize_dynamic(
+            model_input=model_path,
+            model_output=temp_quantized_model_path,
+            op_types_to_quantize=_OP_TYPES_TO_QUANTIZE,
+            weight_type=QuantType.QInt8,
+            # 定数の重みを持つ行列積のみを量子化する
+            extra_options={"MatMulConstBOnly": True},
+        )
+        temp_quantized_model_path.replace(quantized_model_path)
+    finally:
+        temp_quantized_model_path.unlink(missing_ok=True)
+    logger.info(f"{model_path.name} quantized to int8.")
+    return quantized_model_path
@@ -0,0 +1,149 @@
+"""ロード済み音声合成モデルのメモリ常駐管理"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ResidentModel:
+    """メモリ上に常駐している音声合成モデルの情報"""
+
+    key: str
+    size: int  # 推定メモリ使用量 (バイト)
+    last_used_at: float  # 最終利用日時 (UNIX 時間)
+    pinned: bool
+
+
+class ModelResidencyManager:
+    """
+    ロード済み音声合成モデルのメモリ使用量を追跡し、メモリ使用量の上限を超えた場合に
+    最も長く使われていないモデル (LRU) から順にアンロード対象として選ぶ
+    ピン留めされたモデルはアンロード対象にならない
+    実際のモデルのロード・アンロードは呼び出し側の責務で、このクラスは常駐状態の管理のみを行う
+    """
+
+    def __init__(self, max_memory: int | None = None) -> None:
+        """
+        Parameters
+        ----------
+        max_memory : int | None
+            常駐させるモデルの合計メモリ使用量の上限 (バイト) 。None の場合は無制限
+        """
+
+        self.max_memory = max_memory
+        self._lock = threading.Lock()
+        # 最終利用日時が古い順に並んだ、常駐中のモデルのサイズと最終利用日時
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        # ピン留めされたモデルのキーとそのピン留め数
+        self._pin_counts: dict[str, int] = {}
+
+    @property
+    def total_size(self) -> int:
+        """常駐中の全モデルの推定メモリ使用量の合計 (バイト)"""
+        with self._lock:
+            return sum(size for size, _ in self._entries.values())
+
+    def add(self, key: str, size: int) -> None:
+        """モデルを常駐中として登録する。既に登録済みの場合はサイズを更新し、利用日時を更新する。"""
+        with self._lock:
+            self._entries[key] = (size, time.time())
+            self._entries.move_to_end(key)
+
+    def update_size(self, key: str, size: int) -> None:
+        """常駐中のモデルの推定メモリ使用量を更新する。"""
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (size, self._entries[key][1])
+
+    def touch(self, key: str) -> None:
+        """常駐中のモデルの最終利用日時を更新する。"""
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (self._entries[key][0], time.time())
+                self._entries.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        """モデルを常駐中の一覧から削除する。ピン留め状態は維持される。"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def pin(self, key: str) -> None:
+        """モデルをピン留めし、アンロード対象から除外する。複数回ピン留めした場合は同じ回数だけ unpin() が必要。"""
+        with self._lock:
+            self._pin_counts[key] = self._pin_counts.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        """モデルのピン留めを 1 回分解除する。"""
+        with self._lock:
+            count = self._pin_counts.get(key, 0) - 1
+            if count <= 0:
+                self._pin_counts.pop(key, None)
+            else:
+                self._pin_counts[key] = count
+
+    def is_pinned(self, key: str) -> bool:
+        """モデルがピン留めされているかを返す。"""
+        with self._lock:
+            return key in self._pin_counts
+
+    def select_evictions(
+        self,
+        incoming_size: int = 0,
+        is_evictable: Callable[[str], bool] = lambda key: True,
+        exclude: str | None = None,
+    ) -> list[str]:
+        """
+        メモリ使用量を上限以下に収めるためにアンロードすべきモデルのキーを、最終利用日時が古い順に選ぶ
+        選ばれたモデルはこの時点で常駐中の一覧から削除される
+
+        Parameters
+        ----------
+        incoming_size : int
+            これから新たにロードするモデルの推定メモリ使用量 (バイト)
+        is_evictable : Callable[[str], bool]
+            モデルを今すぐアンロードできるかを返す関数 (推論中のモデルを除外するために使う)
+        exclude : str | None
+            アンロード対象から除外するモデルのキー (これからロードするモデルなど)
+
+        Returns
+        -------
+        list[str]
+            アンロードすべきモデルのキーのリスト (上限に収まらない場合でも、アンロード可能なモデルのみを返す)
+        """
+
+        if self.max_memory is None:
+            return []
+
+        with self._lock:
+            total_size = incoming_size + sum(size for size, _ in self._entries.values())
+            evictions: list[str] = []
+            for key, (size, _) in self._entries.items():
+                if total_size <= self.max_memory:
+                    break
+                if key == exclude or key in self._pin_counts or not is_evictable(key):
+                    continue
+                evictions.append(key)
+                total_size -= size
+            for key in evictions:
+                del self._entries[key]
+            return evictions
+
+    def get_resident_models(self) -> list[ResidentModel]:
+        """常駐中のモデルの一覧を、最終利用日時が新しい順に返す。"""
+        with self._lock:
+            return [
+                ResidentModel(
+                    key=key,
+                    size=size,
+                    last_used_at=last_used_at,
+                    pinned=key in self._pin_counts,
+                )
+                for key, (size, last_used_at) in reversed(self._entries.items())
+            ]
@@ -0,0 +1,233 @@
+"""音声合成の内部処理で用いる、配列ベースのモーラ系列の表現"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Final
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import TypeAdapter
+
+from .model import AccentPhrase
+from .phoneme import _PHONEME_IDS, _PHONEME_LIST
+
+# 子音がないモーラの子音 ID
+NO_CONSONANT_ID: Final[int] = -1
+
+# AccentPhrase のリストをまとめて検証するためのアダプター
+_ACCENT_PHRASES_ADAPTER: Final = TypeAdapter(list[AccentPhrase])
+
+
+@dataclass(frozen=True)
+class MoraSequence:
+    """
+    アクセント句系列を、モーラごと・アクセント句ごとの属性を NumPy 配列として持つ構造体配列 (structure of arrays) で表したもの
+    pydantic の AccentPhrase / Mora はモーラごとにオブジェクトを生成し、フィールドへの代入のたびに検証を行うため、
+    読み上げテキストからアクセント句系列を生成する際はこの表現でモーラ系列を組み立て、AccentPhrase への変換は最後に 1 度だけ行う
+    モーラは to_flatten_moras() と同じ順序 (各アクセント句のモーラの後ろに、あれば pause_mora が続く) で並ぶ
+    """
+
+    texts: list[str]  # モーラのテキストの一覧 (重複なし)
+    text_ids: NDArray[np.int32]  # モーラごとの、texts 内でのテキストのインデックス
+    extra_phonemes: list[str]  # 音素リストにない音素の一覧 (音素 ID は音素リストの要素数から順に割り当てる)  # fmt: skip
+    consonant_ids: NDArray[np.int64]  # モーラごとの子音の音素 ID (子音がない場合は NO_CONSONANT_ID)  # fmt: skip
+    vowel_ids: NDArray[np.int64]  # モーラごとの母音の音素 ID
+    consonant_lengths: NDArray[np.float64]  # モーラごとの子音の音長 (None の場合は NaN)
+    vowel_lengths: NDArray[np.float64]  # モーラごとの母音の音長
+    pitches: NDArray[np.float64]  # モーラごとの音高
+    phrase_offsets: NDArray[np.int64]  # アクセント句ごとの、先頭のモーラのインデックス (末尾にモーラ数を加えた、アクセント句数 + 1 の長さ)  # fmt: skip
+    accents: NDArray[np.int64]  # アクセント句ごとのアクセント核の位置 (1 始まり)
+    has_pause_mora: NDArray[np.bool_]  # アクセント句ごとの、末尾のモーラが pause_mora かどうか  # fmt: skip
+    is_interrogative: NDArray[np.bool_]  # アクセント句ごとの、疑問系かどうか
+
+    def mora_texts(self) -> list[str]:
+        """モーラごとのテキストのリストを取得する。"""
+        texts = self.texts
+        return [texts[text_id] for text_id in self.text_ids.tolist()]
+
+    def phoneme_names(self, phoneme_ids: NDArray[np.int64]) -> list[str | None]:
+        """音素 ID の配列を、音素の文字列 (NO_CONSONANT_ID の場合は None) のリストに変換する。"""
+        # 音素リストと追加の音素を連結した表を引き、NO_CONSONANT_ID (-1) は末尾の None を指すようにする
+        phoneme_table: list[str | None] = [*_PHONEME_LIST, *self.extra_phonemes, None]
+        return [phoneme_table[phoneme_id] for phoneme_id in phoneme_ids.tolist()]
+
+    def with_accent_phrases(
+        self, phrase_offsets: list[int], accents: list[int]
+    ) -> "MoraSequence":
+        """
+        モーラの配列を共有したまま、アクセント句の区切りとアクセント核の位置を置き換えた系列を生成する
+        pause_mora は持たず、疑問系ではないアクセント句として扱う
+
+        Parameters
+        ----------
+        phrase_offsets : list[int]
+            アクセント句ごとの先頭のモーラのインデックス (末尾にモーラ数を加えたもの)
+        accents : list[int]
+            アクセント句ごとのアクセント核の位置 (1 始まり)
+
+        Returns
+        -------
+        MoraSequence
+            アクセント句を置き換えたモーラ系列
+        """
+
+        return replace(
+            self,
+            phrase_offsets=np.array(phrase_offsets, dtype=np.int64),
+            accents=np.array(accents, dtype=np.int64),
+            has_pause_mora=np.zeros(len(accents), dtype=np.bool_),
+            is_interrogative=np.zeros(len(accents), dtype=np.bool_),
+        )
+
+    def to_accent_phrases(self) -> list[AccentPhrase]:
+        """
+        モーラ系列を AccentPhrase のリストに変換する
+        モデルを 1 つずつ生成するよりも速いため、アクセント句系列全体を辞書に変換してからまとめて検証する
+
+        Returns
+        -------
+        list[AccentPhrase]
+            アクセント句系列
+        """
+
+        moras = [
+            {
+                "text": text,
+                "consonant": consonant,
+                "consonant_length": None if consonant_length != consonant_length else consonant_length,  # NaN は None に戻す  # fmt: skip
+                "vowel": vowel,
+                "vowel_length": vowel_length,
+                "pitch": pitch,
+            }
+            for text, consonant, consonant_length, vowel, vowel_length, pitch in zip(
+                self.mora_texts(),
+                self.phoneme_names(self.consonant_ids),
+                self.consonant_lengths.tolist(),
+                self.phoneme_names(self.vowel_ids),
+                self.vowel_lengths.tolist(),
+                self.pitches.tolist(),
+            )
+        ]
+
+        accent_phrases: list[dict[str, Any]] = []
+        phrase_offsets = self.phrase_offsets.tolist()
+        for index, (accent, has_pause_mora, is_interrogative) in enumerate(
+            zip(
+                self.accents.tolist(),
+                self.has_pause_mora.tolist(),
+                self.is_interrogative.tolist(),
+            )
+        ):
+            start, end = phrase_offsets[index], phrase_offsets[index + 1]
+            if has_pause_mora:
+                end -= 1
+            accent_phrases.append(
+                {
+                    "moras": moras[start:end],
+                    "accent": accent,
+                    "pause_mora": moras[end] if has_pause_mora else None,
+                    "is_interrogative": is_interrogative,
+                }
+            )
+        return _ACCENT_PHRASES_ADAPTER.validate_python(accent_phrases)
+
+
+class _PhonemeEncoder:
+    """音素を音素 ID に変換する。音素リストにない音素には、音素リストの要素数から順に追加の ID を割り当てる"""
+
+    def __init__(self) -> None:
+        self.extra_phonemes: list[str] = []
+        self._extra_phoneme_ids: dict[str, int] = {}
+
+    def encode(self, phoneme: str | None) -> int:
+        """音素の音素 ID (None の場合は NO_CONSONANT_ID) を取得する。"""
+        if phoneme is None:
+            return NO_CONSONANT_ID
+        phoneme_id = _PHONEME_IDS.get(phoneme)
+        if phoneme_id is not None:
+            return phoneme_id
+        phoneme_id = self._extra_phoneme_ids.get(phoneme)
+        if phoneme_id is None:
+            phoneme_id = len(_PHONEME_LIST) + len(self.extra_phonemes)
+            self._extra_phoneme_ids[phoneme] = phoneme_id
+            self.extra_phonemes.append(phoneme)
+        return phoneme_id
+
+
+class MoraSequenceBuilder:
+    """モーラとアクセント句を先頭から順に追加して、MoraSequence を生成する"""
+
+    def __init__(self) -> None:
+        self._text_ids: dict[str, int] = {}
+        self._phoneme_encoder = _PhonemeEncoder()
+        self._mora_text_ids: list[int] = []
+        self._consonant_ids: list[int] = []
+        self._vowel_ids: list[int] = []
+        self._consonant_lengths: list[float] = []
+        self._vowel_lengths: list[float] = []
+        self._pitches: list[float] = []
+        self._phrase_offsets: list[int] = [0]
+        self._accents: list[int] = []
+        self._has_pause_mora: list[bool] = []
+        self._is_interrogative: list[bool] = []
+
+    @property
+    def mora_count(self) -> int:
+        """これまでに追加したモーラの数"""
+        return len(self._mora_text_ids)
+
+    def add_mora(
+        self,
+        text: str,
+        consonant: str | None,
+        vowel: str,
+        consonant_length: float | None,
+        vowel_length: float,
+        pitch: float,
+    ) -> None:
+        """モーラを末尾に追加する。"""
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = len(self._text_ids)
+        self._mora_text_ids.append(text_id)
+        self._consonant_ids.append(self._phoneme_encoder.encode(consonant))
+        self._vowel_ids.append(self._phoneme_encoder.encode(vowel))
+        self._consonant_lengths.append(
+            np.nan if consonant_length is None else consonant_length
+        )
+        self._vowel_lengths.append(vowel_length)
+        self._pitches.append(pitch)
+
+    def end_accent_phrase(
+        self,
+        accent: int,
+        has_pause_mora: bool = False,
+        is_interrogative: bool = False,
+    ) -> None:
+        """直前のアクセント句の終わりから、これまでに追加したモーラまでを 1 つのアクセント句とする。"""
+        self._phrase_offsets.append(self.mora_count)
+        self._accents.append(accent)
+        self._has_pause_mora.append(has_pause_mora)
+        self._is_interrogative.append(is_interrogative)
+
+    def build(self) -> MoraSequence:
+        """
+        これまでに追加したモーラとアクセント句から MoraSequence を生成する
+        最後のアクセント句の後に追加したモーラがあれば、アクセント核を末尾とした 1 つのアクセント句とする
+        """
+
+        if self._phrase_offsets[-1] != self.mora_count:
+            self.end_accent_phrase(self.mora_count - self._phrase_offsets[-1])
+        return MoraSequence(
+            texts=list(self._text_ids),
+            text_ids=np.array(self._mora_text_ids, dtype=np.int32),
+            extra_phonemes=self._phoneme_encoder.extra_phonemes,
+            consonant_ids=np.array(self._consonant_ids, dtype=np.int64),
+            vowel_ids=np.array(self._vowel_ids, dtype=np.int64),
+            consonant_lengths=np.array(self._consonant_lengths, dtype=np.float64),
+            vowel_lengths=np.array(self._vowel_lengths, dtype=np.float64),
+            pitches=np.array(self._pitches, dtype=np.float64),
+            phrase_offsets=np.array(self._phrase_offsets, dtype=np.int64),
+            accents=np.array(self._accents, dtype=np.int64),
+            has_pause_mora=np.array(self._has_pause_mora, dtype=np.bool_),
+            is_interrogative=np.array(self._is_interrogative, dtype=np.bool_),
+        )
@@ -0,0 +1,247 @@
+"""ONNX Runtime の推論セッションの設定"""
+
+import hashlib
+import os
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import onnxruntime
+
+from ..logging import logger
+from ..setting.model import (
+    ModelPrecision,
+    OnnxExecutionMode,
+    OnnxGraphOptimizationLevel,
+)
+from .model_quantization import quantize_model_dynamic
+
+_GRAPH_OPTIMIZATION_LEVELS: dict[
+    OnnxGraphOptimizationLevel, onnxruntime.GraphOptimizationLevel
+] = {
+    OnnxGraphOptimizationLevel.disable: onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    OnnxGraphOptimizationLevel.basic: onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    OnnxGraphOptimizationLevel.extended: onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    OnnxGraphOptimizationLevel.all: onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}  # fmt: skip
+
+_EXECUTION_MODES: dict[OnnxExecutionMode, onnxruntime.ExecutionMode] = {
+    OnnxExecutionMode.sequential: onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+    OnnxExecutionMode.parallel: onnxruntime.ExecutionMode.ORT_PARALLEL,
+}
+
+
+@dataclass(frozen=True)
+class OnnxSessionConfig:
+    """エンジン内で生成する全ての ONNX Runtime 推論セッションに共通する設定"""
+
+    # ノード内の並列処理に使うスレッド数 (0 の場合は ONNX Runtime が自動的に決定する)
+    intra_op_num_threads: int = 0
+    # ノード間の並列処理に使うスレッド数 (0 の場合は ONNX Runtime が自動的に決定する)
+    inter_op_num_threads: int = 0
+    # グラフ最適化レベル
+    graph_optimization_level: OnnxGraphOptimizationLevel = (
+        OnnxGraphOptimizationLevel.all
+    )
+    # グラフの実行モード
+    execution_mode: OnnxExecutionMode = OnnxExecutionMode.sequential
+    # CPU のメモリアリーナを有効にするか (無効にするとメモリ使用量が減る代わりに推論が若干遅くなる)
+    enable_cpu_mem_arena: bool = True
+    # 最適化済みモデルのキャッシュディレクトリ (None の場合はキャッシュしない)
+    optimized_model_cache_dir: Path | None = None
+    # 推論に利用するモデルの精度 (int8 の場合は CPU 推論時のみ、重みを int8 に動的量子化したモデルを利用する)
+    precision: ModelPrecision = ModelPrecision.fp32
+    # int8 に動的量子化したモデルのキャッシュディレクトリ (precision が int8 の場合は必須)
+    quantized_model_cache_dir: Path | None = None
+
+    def create_session_options(self) -> onnxruntime.SessionOptions:
+        """この設定を反映した SessionOptions を生成する。"""
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = self.intra_op_num_threads
+        session_options.inter_op_num_threads = self.inter_op_num_threads
+        session_options.graph_optimization_level = _GRAPH_OPTIMIZATION_LEVELS[self.graph_optimization_level]  # fmt: skip
+        session_options.execution_mode = _EXECUTION_MODES[self.execution_mode]
+        session_options.enable_cpu_mem_arena = self.enable_cpu_mem_arena
+        return session_options
+
+
+def get_optimized_model_cache_path(
+    cache_dir: Path,
+    model_path: Path,
+    providers: Sequence[Any] | None,
+    graph_optimization_level: OnnxGraphOptimizationLevel,
+) -> Path:
+    """
+    元のモデルファイルに対応する最適化済みモデルのキャッシュファイルのパスを取得する
+    最適化済みモデルは元のモデルファイルの内容・ExecutionProvider・最適化レベル・ONNX Runtime のバージョンに依存するため、
+    それら全てを含めたハッシュ値をファイル名とする
+    元のモデルファイルの内容は、巨大なファイル全体を読み込まずに済むよう、パス・サイズ・更新日時で代用する
+
+    Parameters
+    ----------
+    cache_dir : Path
+        キャッシュディレクトリ
+    model_path : Path
+        元のモデルファイルのパス
+    providers : Sequence[Any] | None
+        推論セッションに指定する ExecutionProvider のリスト
+    graph_optimization_level : OnnxGraphOptimizationLevel
+        グラフ最適化レベル
+
+    Returns
+    -------
+    Path
+        最適化済みモデルのキャッシュファイルのパス
+    """
+
+    stat = model_path.stat()
+    source = "|".join(
+        [
+            str(model_path.resolve()),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            repr(providers),
+            graph_optimization_level.value,
+            onnxruntime.__version__,
+        ]
+    )
+    cache_key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return cache_dir / f"{model_path.stem}-{cache_key[:16]}.onnx"
+
+
+_original_inference_session: type[onnxruntime.InferenceSession] | None = None
+
+
+def install_onnx_session_config(config: OnnxSessionConfig) -> None:
+    """
+    以降に生成される ONNX Runtime の推論セッションに、エンジン全体の推論セッション設定を適用する
+    Style-Bert-VITS2 は TTSModel / onnx_bert_models の内部で SessionOptions を指定せずに推論セッションを生成するため、
+    onnxruntime.InferenceSession を SessionOptions が指定されていない場合のみ設定を補う派生クラスに差し替える
+
+    precision が int8 の場合、CPU のみで推論するセッションでは元のモデルの代わりに int8 に動的量子化したモデルを読み込む
+    量子化済みモデルは初回ロード時に生成して quantized_model_cache_dir に保存し、2 回目以降のロードでは保存済みのモデルを使う
+
+    optimized_model_cache_dir が指定されている場合、初回ロード時に最適化済みのグラフをキャッシュディレクトリに保存し、
+    2 回目以降のロードでは保存済みの最適化済みグラフを最適化処理なしで読み込むことで、ロード時間を短縮する
+    DirectML は最適化済みグラフの保存に対応していないため、DmlExecutionProvider を使う場合はキャッシュしない
+
+    Parameters
+    ----------
+    config : OnnxSessionConfig
+        推論セッションの設定
+    """
+
+    global _original_inference_session
+
+    if _original_inference_session is None:
+        _original_inference_session = onnxruntime.InferenceSession
+    original_inference_session = _original_inference_session
+
+    if config.optimized_model_cache_dir is not None:
+        config.optimized_model_cache_dir.mkdir(parents=True, exist_ok=True)
+    if config.precision == ModelPrecision.int8 and config.quantized_model_cache_dir is None:  # fmt: skip
+        raise ValueError("quantized_model_cache_dir is required for int8 precision.")
+
+    # 量子化に失敗したモデルのパス (ロードのたびに量子化を再試行しないようにする)
+    failed_quantizations: set[Path] = set()
+
+    class ConfiguredInferenceSession(original_inference_session):  # type: ignore[valid-type, misc]
+        """エンジン全体の推論セッション設定を適用する InferenceSession"""
+
+        def __init__(
+            self,
+            path_or_bytes: str | bytes | os.PathLike[str],
+            sess_options: onnxruntime.SessionOptions | None = None,
+            providers: Sequence[Any] | None = None,
+            provider_options: Sequence[dict[Any, Any]] | None = None,
+            **kwargs: Any,
+        ) -> None:
+            # 明示的に SessionOptions が指定されている場合はそのまま使う
+            if sess_options is not None:
+                super().__init__(path_or_bytes, sess_options, providers, provider_options, **kwargs)  # fmt: skip
+                return
+
+            sess_options = config.create_session_options()
+            path_or_bytes = _get_quantized_model_path(path_or_bytes, providers)
+            cache_path = _get_cache_path(path_or_bytes, providers)
+            if cache_path is None:
+                super().__init__(path_or_bytes, sess_options, providers, provider_options, **kwargs)  # fmt: skip
+                return
+
+            # 最適化済みのグラフがキャッシュされていれば、最適化処理を省略して読み込む
+            if cache_path.is_file():
+                sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL  # fmt: skip
+                try:
+                    super().__init__(str(cache_path), sess_options, providers, provider_options, **kwargs)  # fmt: skip
+                    logger.info(f"Loaded optimized model from cache: {cache_path.name}")  # fmt: skip
+                    return
+                except Exception as e:
+                    # キャッシュが壊れている場合は削除して元のモデルから読み込み直す
+                    logger.warning(f"Failed to load optimized model cache. Regenerating. ({e})")  # fmt: skip
+                    cache_path.unlink(missing_ok=True)
+                    sess_options = config.create_session_options()
+
+            # 初回ロード時は、最適化済みのグラフを一時ファイルに保存してからキャッシュファイルにリネームする
+            # ロード途中でプロセスが終了した場合に、不完全なキャッシュファイルが残らないようにするため
+            temp_cache_path = cache_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")  # fmt: skip
+            sess_options.optimized_model_filepath = str(temp_cache_path)
+            try:
+                super().__init__(path_or_bytes, sess_options, providers, provider_options, **kwargs)  # fmt: skip
+            except Exception:
+                temp_cache_path.unlink(missing_ok=True)
+                raise
+            try:
+                temp_cache_path.replace(cache_path)
+            except OSError as e:
+                logger.warning(f"Failed to save optimized model cache. ({e})")
+                temp_cache_path.unlink(missing_ok=True)
+
+    def _get_quantized_model_path(
+        path_or_bytes: str | bytes | os.PathLike[str],
+        providers: Sequence[Any] | None,
+    ) -> str | bytes | os.PathLike[str]:
+        """int8 に動的量子化したモデルを使う場合は量子化済みモデルのパスを、それ以外の場合は元のモデルのパスを返す。"""
+        if config.precision != ModelPrecision.int8:
+            return path_or_bytes
+        if isinstance(path_or_bytes, bytes):
+            return path_or_bytes
+        # 動的量子化したモデルは CPU 推論でのみ高速化が見込めるため、GPU を使う場合は元のモデルを使う
+        if any("CPUExecutionProvider" not in repr(provider) for provider in providers or []):  # fmt: skip
+            return path_or_bytes
+        model_path = Path(path_or_bytes)
+        if not model_path.is_file() or model_path in failed_quantizations:
+            return path_or_bytes
+        assert config.quantized_model_cache_dir is not None
+        try:
+            return quantize_model_dynamic(config.quantized_model_cache_dir, model_path)
+        except Exception as e:
+            logger.warning(f"Failed to quantize {model_path.name}. Using the original model instead. ({e})")  # fmt: skip
+            failed_quantizations.add(model_path)
+            return path_or_bytes
+
+    def _get_cache_path(
+        path_or_bytes: str | bytes | os.PathLike[str],
+        providers: Sequence[Any] | None,
+    ) -> Path | None:
+        """最適化済みモデルをキャッシュできる場合は、キャッシュファイルのパスを返す。"""
+        if config.optimized_model_cache_dir is None:
+            return None
+        if config.graph_optimization_level == OnnxGraphOptimizationLevel.disable:
+            return None
+        if isinstance(path_or_bytes, bytes):
+            return None
+        if any("DmlExecutionProvider" in repr(provider) for provider in providers or []):  # fmt: skip
+            return None
+        model_path = Path(path_or_bytes)
+        if not model_path.is_file():
+            return None
+        return get_optimized_model_cache_path(
+            config.optimized_model_cache_dir,
+            model_path,
+            providers,
+            config.graph_optimization_level,
+        )
+
+    onnxruntime.InferenceSession = ConfiguredInferenceSession  # type: ignore[misc]
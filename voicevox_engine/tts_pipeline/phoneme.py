@@ -1,6 +1,6 @@
 """音素"""
 
-from typing import Literal
+from typing import Final, Literal
 
 import numpy as np
 from numpy.typing import NDArray
@@ -56,9 +56,19 @@ _PHONEME_LIST += ("u", "v", "w", "y", "z")
 # 音素リストの要素数
 _NUM_PHONEME = len(_PHONEME_LIST)
 
+# 音素から音素ID (音素リスト内でのindex) への変換表
+_PHONEME_IDS: Final[dict[str, int]] = {
+    phoneme: index for index, phoneme in enumerate(_PHONEME_LIST)
+}
+
 _UNVOICED_MORA_TAIL_PHONEMES = ["A", "I", "U", "E", "O", "cl", "pau"]
 _MORA_TAIL_PHONEMES = ["a", "i", "u", "e", "o", "N"] + _UNVOICED_MORA_TAIL_PHONEMES
 
+# 無声のモーラ末尾音素（無声母音・促音・無音）の音素ID
+_UNVOICED_MORA_TAIL_PHONEME_IDS: Final[NDArray[np.int64]] = np.array(
+    [_PHONEME_IDS[phoneme] for phoneme in _UNVOICED_MORA_TAIL_PHONEMES], dtype=np.int64
+)
+
 
 class Phoneme:
     """音素"""
@@ -78,7 +88,11 @@ class Phoneme:
     @property
     def id(self) -> int:
         """音素ID (音素リスト内でのindex) を取得する"""
-        return self._PHONEME_LIST.index(self._phoneme)
+        phoneme_id = _PHONEME_IDS.get(self._phoneme)
+        if phoneme_id is None:
+            # 音素リストにない音素は、従来通り tuple.index() の ValueError を送出する
+            return self._PHONEME_LIST.index(self._phoneme)
+        return phoneme_id
 
     @property
     def onehot(self) -> NDArray[np.float32]:
@@ -94,3 +108,47 @@ class Phoneme:
     def is_unvoiced_mora_tail(self) -> bool:
         """この音素は無声のモーラ末尾音素（無声母音・促音・無音）である"""
         return self._phoneme in _UNVOICED_MORA_TAIL_PHONEMES
+
+
+def to_phoneme_id(phoneme: str) -> int:
+    """音素の文字列を音素IDへ変換する。音素リストにない音素の場合は ValueError を送出する。"""
+    # 大半の音素は変換表から直接引き、無音 (sil) の変換などは Phoneme に任せる
+    phoneme_id = _PHONEME_IDS.get(phoneme)
+    if phoneme_id is None:
+        phoneme_id = Phoneme(phoneme).id
+    return phoneme_id
+
+
+def to_phoneme_ids(phonemes: list[str]) -> NDArray[np.int64]:
+    """音素の文字列の系列を音素ID系列へ変換する。音素リストにない音素を含む場合は ValueError を送出する。"""
+    return np.array([to_phoneme_id(phoneme) for phoneme in phonemes], dtype=np.int64)
+
+
+def is_unvoiced_mora_tail_ids(phoneme_ids: NDArray[np.int64]) -> NDArray[np.bool_]:
+    """音素ID系列の各音素が、無声のモーラ末尾音素（無声母音・促音・無音）であるかを判定する"""
+    return np.isin(phoneme_ids, _UNVOICED_MORA_TAIL_PHONEME_IDS)
+
+
+def to_frame_onehot(
+    phoneme_ids: NDArray[np.int64], frame_per_phoneme: NDArray[np.int64]
+) -> NDArray[np.float32]:
+    """
+    音素ID系列を、音素ごとのフレーム長だけ繰り返したフレームごとの音素onehotベクトルへ変換する
+    音素ごとの onehot ベクトルを生成・連結してから繰り返すのではなく、フレームごとの音素IDから直接 1 を書き込む
+
+    Parameters
+    ----------
+    phoneme_ids : NDArray[np.int64]
+        音素ID系列。shape = (Phoneme,)
+    frame_per_phoneme : NDArray[np.int64]
+        音素あたりのフレーム長。shape = (Phoneme,)
+
+    Returns
+    -------
+    NDArray[np.float32]
+        フレームごとの音素onehotベクトル。shape = (Frame, 音素数)
+    """
+    frame_phoneme_ids = np.repeat(phoneme_ids, frame_per_phoneme)
+    onehot = np.zeros((len(frame_phoneme_ids), _NUM_PHONEME), dtype=np.float32)
+    onehot[np.arange(len(frame_phoneme_ids)), frame_phoneme_ids] = 1.0
+    return onehot
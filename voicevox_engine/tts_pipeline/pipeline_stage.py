@@ -0,0 +1,240 @@
+"""音声合成処理の 1 段階を専用のスレッドで実行するパイプラインステージ"""
+
+import functools
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+_Req = TypeVar("_Req")
+_Res = TypeVar("_Res")
+
+
+@dataclass(frozen=True)
+class PipelineStageStats:
+    """パイプラインステージの統計情報"""
+
+    name: str  # ステージ名
+    threads: int  # ステージの処理に使うスレッド数
+    queue_size: int  # 処理待ちキューの上限
+    queue_depth: int  # 現在の処理待ちのジョブ数
+    running_count: int  # 現在処理中のジョブ数
+    processed_count: int  # 処理したジョブの数 (失敗したジョブを含む)
+    failed_count: int  # 処理に失敗したジョブの数
+    total_queue_wait: float  # 全ジョブが処理の開始まで待機した時間の合計 (秒)
+    max_queue_wait: float  # ジョブが処理の開始まで待機した時間の最大値 (秒)
+    total_processing_time: float  # 全ジョブの処理にかかった時間の合計 (秒)
+    max_processing_time: float  # ジョブの処理にかかった時間の最大値 (秒)
+
+    @property
+    def average_queue_wait(self) -> float:
+        """ジョブが処理の開始まで待機した時間の平均値 (秒)"""
+        return self.total_queue_wait / self.processed_count if self.processed_count > 0 else 0.0  # fmt: skip
+
+    @property
+    def average_processing_time(self) -> float:
+        """ジョブの処理にかかった時間の平均値 (秒)"""
+        return self.total_processing_time / self.processed_count if self.processed_count > 0 else 0.0  # fmt: skip
+
+
+@dataclass
+class _StageJob:
+    """ステージの処理待ちキューに積まれたジョブ"""
+
+    function: Callable[[], Any]
+    future: "Future[Any]"
+    enqueued_at: float
+
+
+class PipelineStage:
+    """
+    音声合成処理の 1 段階 (テキスト処理・BERT 特徴量の抽出・音響モデルの推論など) を、ステージ専用のスレッドで実行する
+    ステージごとにスレッド数と処理待ちキューの上限を持つため、あるリクエストが後段のステージで処理されている間に、
+    後続のリクエストを前段のステージで並行して処理できる
+    処理待ちキューが満杯の場合、新たなジョブの投入は空きができるまでブロックされる (前段のステージに背圧がかかる)
+    """
+
+    def __init__(self, name: str, threads: int, queue_size: int) -> None:
+        """
+        Parameters
+        ----------
+        name : str
+            ステージ名 (統計情報やスレッド名に使われる)
+        threads : int
+            ステージの処理に使うスレッド数
+        queue_size : int
+            処理待ちキューの上限
+        """
+
+        if threads < 1:
+            raise ValueError("threads must be greater than or equal to 1.")
+        if queue_size < 1:
+            raise ValueError("queue_size must be greater than or equal to 1.")
+
+        self.name = name
+        self._threads = threads
+        self._queue_size = queue_size
+        self._queue: queue.Queue[_StageJob] = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+
+        # 統計情報
+        self._running_count = 0
+        self._processed_count = 0
+        self._failed_count = 0
+        self._total_queue_wait = 0.0
+        self._max_queue_wait = 0.0
+        self._total_processing_time = 0.0
+        self._max_processing_time = 0.0
+
+    @property
+    def stats(self) -> PipelineStageStats:
+        """これまでの統計情報"""
+        with self._lock:
+            return PipelineStageStats(
+                name=self.name,
+                threads=self._threads,
+                queue_size=self._queue_size,
+                queue_depth=self._queue.qsize(),
+                running_count=self._running_count,
+                processed_count=self._processed_count,
+                failed_count=self._failed_count,
+                total_queue_wait=self._total_queue_wait,
+                max_queue_wait=self._max_queue_wait,
+                total_processing_time=self._total_processing_time,
+                max_processing_time=self._max_processing_time,
+            )
+
+    def submit(self, function: Callable[[], _T]) -> "Future[_T]":
+        """
+        ジョブを処理待ちキューに積み、その結果を受け取るための Future を返す
+        処理待ちキューが満杯の場合は、空きができるまでブロックする
+
+        Parameters
+        ----------
+        function : Callable[[], _T]
+            ステージのスレッドで実行する関数
+
+        Returns
+        -------
+        Future[_T]
+            関数の戻り値 (失敗した場合は例外) を受け取るための Future
+        """
+
+        # ワーカースレッドは最初のジョブの投入時に起動する
+        with self._lock:
+            if len(self._workers) == 0:
+                for index in range(self._threads):
+                    worker = threading.Thread(target=self._run_worker, name=f"PipelineStage-{self.name}-{index}", daemon=True)  # fmt: skip
+                    worker.start()
+                    self._workers.append(worker)
+
+        future: Future[_T] = Future()
+        self._queue.put(_StageJob(function=function, future=future, enqueued_at=time.perf_counter()))  # fmt: skip
+        return future
+
+    def run(self, function: Callable[[], _T]) -> _T:
+        """ジョブをステージのスレッドで実行し、完了するまで待って結果を返す。"""
+        return self.submit(function).result()
+
+    def _run_worker(self) -> None:
+        """処理待ちキューに積まれたジョブを順に処理する。"""
+
+        while True:
+            job = self._queue.get()
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running_count += 1
+            failed = False
+            try:
+                job.future.set_result(job.function())
+            except BaseException as e:
+                failed = True
+                job.future.set_exception(e)
+            finished_at = time.perf_counter()
+
+            queue_wait = started_at - job.enqueued_at
+            processing_time = finished_at - started_at
+            with self._lock:
+                self._running_count -= 1
+                self._processed_count += 1
+                self._failed_count += int(failed)
+                self._total_queue_wait += queue_wait
+                self._max_queue_wait = max(self._max_queue_wait, queue_wait)
+                self._total_processing_time += processing_time
+                self._max_processing_time = max(self._max_processing_time, processing_time)  # fmt: skip
+
+
+class SynthesisPipeline:
+    """
+    音声合成処理をテキスト処理・BERT 特徴量の抽出・音響モデルの推論の 3 段階に分け、各段階をそれぞれ専用のスレッドで実行するパイプライン
+    あるリクエストの音響モデルの推論中に、後続のリクエストや次の区間の BERT 特徴量を並行して抽出できる
+    """
+
+    def __init__(
+        self,
+        frontend_threads: int,
+        bert_threads: int,
+        acoustic_threads: int,
+        queue_size: int,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        frontend_threads : int
+            テキスト処理のステージのスレッド数
+        bert_threads : int
+            BERT 特徴量の抽出のステージのスレッド数
+        acoustic_threads : int
+            音響モデルの推論のステージのスレッド数
+        queue_size : int
+            各ステージの処理待ちキューの上限
+        """
+
+        self.frontend = PipelineStage("frontend", frontend_threads, queue_size)
+        self.bert = PipelineStage("bert", bert_threads, queue_size)
+        self.acoustic = PipelineStage("acoustic", acoustic_threads, queue_size)
+
+    @property
+    def stages(self) -> list[PipelineStage]:
+        """処理順に並んだ全てのステージ"""
+        return [self.frontend, self.bert, self.acoustic]
+
+    def iter_segments(
+        self,
+        requests: Sequence[_Req],
+        prefetch: Callable[[_Req], _Req],
+        infer: Callable[[_Req], _Res],
+    ) -> Iterator[_Res]:
+        """
+        区間ごとの推論リクエストを先頭から順に、BERT ステージで BERT 特徴量を抽出した上で音響ステージで推論し、区間ごとの推論結果を返す
+        次の区間の BERT 特徴量の抽出は 1 区間分だけ先に投入し、現在の区間の推論と並行して実行する
+        先読みを 1 区間分に留めることで、長い入力でも抽出済みの BERT 特徴量が溜まり続けないようにする
+
+        Parameters
+        ----------
+        requests : Sequence[_Req]
+            区間ごとの推論リクエスト
+        prefetch : Callable[[_Req], _Req]
+            推論リクエストの BERT 特徴量を抽出し、抽出した BERT 特徴量を付与した推論リクエストを返す関数 (BERT ステージで実行される)
+        infer : Callable[[_Req], _Res]
+            推論リクエストを推論する関数 (音響ステージで実行される)
+
+        Returns
+        -------
+        Iterator[_Res]
+            区間ごとの推論結果のイテレーター
+        """
+
+        if len(requests) == 0:
+            return
+        next_prefetch = self.bert.submit(functools.partial(prefetch, requests[0]))
+        for index in range(len(requests)):
+            prefetched_request = next_prefetch.result()
+            if index + 1 < len(requests):
+                next_prefetch = self.bert.submit(functools.partial(prefetch, requests[index + 1]))  # fmt: skip
+            yield self.acoustic.run(functools.partial(infer, prefetched_request))
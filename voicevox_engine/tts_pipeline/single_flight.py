@@ -0,0 +1,84 @@
+"""同じキーに対する同時実行中の処理を 1 回にまとめるシングルフライト"""
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """シングルフライトの統計情報"""
+
+    execution_count: int  # 実際に処理を実行した回数
+    shared_count: int  # 実行中の処理の結果を共有し、処理の実行を省略した回数
+
+
+class SingleFlight(Generic[_K, _V]):
+    """
+    同じキーに対する処理が同時に要求された場合に、最初の要求のみが処理を実行し、後続の要求はその結果を共有する
+    処理が完了した時点でキーは忘れられるため、完了後の要求では再び処理が実行される (結果はキャッシュされない)
+    処理が例外を送出した場合は、その処理の結果を待っていた全ての要求に同じ例外が送出される
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[_K, Future[_V]] = {}
+        self._execution_count = 0
+        self._shared_count = 0
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """これまでの統計情報"""
+        with self._lock:
+            return SingleFlightStats(
+                execution_count=self._execution_count,
+                shared_count=self._shared_count,
+            )
+
+    def run(self, key: _K, function: Callable[[], _V]) -> tuple[_V, bool]:
+        """
+        同じキーの処理が実行中であればその完了を待って結果を返し、実行中でなければ function を呼び出し元のスレッドで実行する
+
+        Parameters
+        ----------
+        key : _K
+            処理を識別するキー (同じキーの処理は同じ結果を返す必要がある)
+        function : Callable[[], _V]
+            実行する処理
+
+        Returns
+        -------
+        tuple[_V, bool]
+            処理の結果と、実行中の処理の結果を共有したかどうか (共有された結果は複数の呼び出し元から参照されるため、変更してはならない)
+        """
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._shared_count += 1
+                is_leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self._execution_count += 1
+                is_leader = True
+
+        if not is_leader:
+            return future.result(), True
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
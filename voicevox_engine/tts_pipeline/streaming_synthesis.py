@@ -0,0 +1,145 @@
+"""文ごとに音声波形を返すストリーミング音声合成のための補助処理"""
+
+import struct
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Literal, TypeAlias
+
+import numpy as np
+from numpy.typing import NDArray
+
+# ストリーミング音声合成の出力形式
+# wav: ストリーミング用の WAV ヘッダーに続けて PCM データを返す / pcm: ヘッダーなしの PCM データのみを返す
+# いずれも PCM データは 16bit 符号付き整数 (リトルエンディアン) で、ステレオの場合は左右のサンプルが交互に並ぶ
+StreamingAudioFormat: TypeAlias = Literal["wav", "pcm"]
+
+# データ長が不明なストリーミング用の WAV ファイルで、RIFF チャンク・data チャンクのサイズに指定する値
+# 多くのデコーダーは、この値を「ファイル末尾まで」とみなして扱う
+_UNKNOWN_CHUNK_SIZE = 0xFFFFFFFF
+
+
+def create_streaming_wav_header(sample_rate: int, channels: int) -> bytes:
+    """
+    データ長が不明な 16bit PCM の WAV ファイルのヘッダーを生成する
+    RIFF チャンク・data チャンクのサイズには、データ長が不明であることを示す 0xFFFFFFFF を指定する
+
+    Parameters
+    ----------
+    sample_rate : int
+        サンプリングレート
+    channels : int
+        チャンネル数
+
+    Returns
+    -------
+    bytes
+        WAV ファイルのヘッダー
+    """
+
+    bits_per_sample = 16
+    block_align = channels * bits_per_sample // 8
+    return b"".join(
+        [
+            b"RIFF",
+            struct.pack("<I", _UNKNOWN_CHUNK_SIZE),
+            b"WAVE",
+            b"fmt ",
+            struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, bits_per_sample),  # fmt: skip
+            b"data",
+            struct.pack("<I", _UNKNOWN_CHUNK_SIZE),
+        ]
+    )
+
+
+def wave_to_pcm16_bytes(wave: NDArray[np.float32]) -> bytes:
+    """-1.0 ~ 1.0 の範囲の float32 型の音声波形を、16bit 符号付き整数 (リトルエンディアン) の PCM データに変換する。"""
+    pcm = np.clip(wave, -1.0, 1.0) * 32767
+    return pcm.astype("<i2").tobytes()
+
+
+def iter_stream_chunks(
+    raw_results: Iterable[tuple[int, NDArray[Any]]],
+    default_sampling_rate: int,
+    pre_phoneme_length: float,
+    post_phoneme_length: float,
+    to_output_wave: Callable[[NDArray[np.float32], int], NDArray[np.float32]],
+    on_first_chunk: Callable[[], None],
+) -> Iterator[NDArray[np.float32]]:
+    """
+    文ごとの推論結果から、ストリーミング音声合成で返す音声波形を順に生成する
+    最初の文の前には無音区間を追加し、最後の文の後ろの無音区間は最後の文とは別に返す
+
+    Parameters
+    ----------
+    raw_results : Iterable[tuple[int, NDArray[Any]]]
+        文ごとのサンプリングレートと int16 型の音声波形のタプル
+    default_sampling_rate : int
+        推論結果が 1 つもない場合に、後ろの無音区間に用いるサンプリングレート
+    pre_phoneme_length : float
+        音声の前の無音時間 (秒)
+    post_phoneme_length : float
+        音声の後の無音時間 (秒)
+    to_output_wave : Callable[[NDArray[np.float32], int], NDArray[np.float32]]
+        float32 型の音声波形とサンプリングレートを受け取り、出力用の音声波形に変換する関数
+    on_first_chunk : Callable[[], None]
+        最初の文の音声波形を返す直前に呼び出される関数
+
+    Returns
+    -------
+    Iterator[NDArray[np.float32]]
+        出力用の音声波形 (float32 型) のイテレーター
+    """
+
+    raw_sample_rate = default_sampling_rate
+    for index, (raw_sample_rate, raw_wave) in enumerate(raw_results):
+        wave = raw_wave.astype(np.float32) / 32768.0
+        if index == 0:
+            silence_wave_pre = np.zeros(int(raw_sample_rate * pre_phoneme_length), dtype=np.float32)  # fmt: skip
+            wave = np.concatenate((silence_wave_pre, wave))
+            on_first_chunk()
+        yield to_output_wave(wave, raw_sample_rate)
+
+    silence_wave_post = np.zeros(int(raw_sample_rate * post_phoneme_length), dtype=np.float32)  # fmt: skip
+    yield to_output_wave(silence_wave_post, raw_sample_rate)
+
+
+@dataclass(frozen=True)
+class FirstChunkLatencyStats:
+    """ストリーミング音声合成の、最初の音声波形を返すまでの時間の統計情報"""
+
+    stream_count: int  # 最初の音声波形を返したストリーミング音声合成の数
+    total_latency: float  # 最初の音声波形を返すまでの時間の合計 (秒)
+    max_latency: float  # 最初の音声波形を返すまでの時間の最大値 (秒)
+
+    @property
+    def average_latency(self) -> float:
+        """最初の音声波形を返すまでの時間の平均値 (秒)"""
+        return self.total_latency / self.stream_count if self.stream_count > 0 else 0.0  # fmt: skip
+
+
+class FirstChunkLatencyRecorder:
+    """ストリーミング音声合成で、最初の音声波形を返すまでの時間を記録する"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stream_count = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    @property
+    def stats(self) -> FirstChunkLatencyStats:
+        """これまでの統計情報"""
+        with self._lock:
+            return FirstChunkLatencyStats(
+                stream_count=self._stream_count,
+                total_latency=self._total_latency,
+                max_latency=self._max_latency,
+            )
+
+    def record(self, latency: float) -> None:
+        """最初の音声波形を返すまでの時間 (秒) を記録する。"""
+        with self._lock:
+            self._stream_count += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
@@ -1,9 +1,16 @@
 # flake8: noqa
 
+import atexit
 import copy
+import functools
+import importlib
 import re
 import threading
 import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, replace
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Final, Sequence, cast
@@ -23,7 +30,10 @@ from style_bert_vits2.logging import logger as style_bert_vits2_logger
 from style_bert_vits2.models.hyper_parameters import HyperParameters
 from style_bert_vits2.nlp import onnx_bert_models
 from style_bert_vits2.nlp.japanese.g2p import g2p
-from style_bert_vits2.nlp.japanese.g2p_utils import g2kata_tone, kata_tone2phone_tone
+from style_bert_vits2.nlp.japanese.g2p_utils import (
+    kata_tone2phone_tone,
+    phone_tone2kata_tone,
+)
 from style_bert_vits2.nlp.japanese.mora_list import (
     CONSONANTS,
     MORA_KATA_TO_MORA_PHONEMES,
@@ -33,18 +43,59 @@ from style_bert_vits2.nlp.japanese.normalizer import normalize_text
 from style_bert_vits2.nlp.symbols import PUNCTUATIONS
 from style_bert_vits2.tts_model import TTSModel
 
+from .. import __version__
 from ..aivm_manager import AivmManager
 from ..core.core_adapter import CoreAdapter, DeviceSupport
 from ..dev.core.mock import MockCoreWrapper
 from ..logging import logger
 from ..metas.Metas import StyleId
-from ..model import AudioQuery
-from ..tts_pipeline.model import AccentPhrase, Mora
+from ..model import (
+    AudioQuery,
+    CacheStatistics,
+    CoalescingStatistics,
+    IncrementalSynthesisStatistics,
+    InferenceStatistics,
+    LoadedModelInfo,
+    ModelLoadStatus,
+    PipelineStageStatistics,
+    StreamingStatistics,
+    TextFrontendCacheStatistics,
+)
+from ..setting.model import ModelPrecision
+from ..tts_pipeline.bert_feature_cache import BertFeatureCache
+from ..tts_pipeline.document_frontend import DocumentFrontend, copy_accent_phrases
+from ..tts_pipeline.frontend_token import FrontendTokenCodec
+from ..tts_pipeline.incremental_synthesis import (
+    IncrementalSynthesisStore,
+    render_segments,
+)
+from ..tts_pipeline.long_input_segmenter import (
+    InputSegment,
+    crossfade_concatenate,
+    split_long_input,
+)
+from ..tts_pipeline.model import AccentPhrase
+from ..tts_pipeline.model_preloader import ModelLoadJob, ModelLoadState, ModelPreloader
+from ..tts_pipeline.model_residency import ModelResidencyManager
+from ..tts_pipeline.mora_sequence import MoraSequence, MoraSequenceBuilder
+from ..tts_pipeline.onnx_session import OnnxSessionConfig, install_onnx_session_config
+from ..tts_pipeline.pipeline_stage import SynthesisPipeline
+from ..tts_pipeline.single_flight import SingleFlight
+from ..tts_pipeline.streaming_synthesis import (
+    FirstChunkLatencyRecorder,
+    iter_stream_chunks,
+)
+from ..tts_pipeline.synthesis_result_cache import SynthesisResultCache
+from ..tts_pipeline.synthesis_worker_pool import SynthesisWorkerPool
+from ..tts_pipeline.text_frontend_cache import TextFrontendCache
 from ..tts_pipeline.tts_engine import (
     TTSEngine,
     raw_wave_to_output_wave,
     to_flatten_moras,
 )
+from ..tts_pipeline.tts_model_pool import TTSModelPool
+from ..user_dict.user_dict_manager import get_dict_fingerprint, get_dict_version
+from ..utility.fingerprint_utility import FingerprintBuilder
 from ..utility.path_utility import get_save_dir
 
 
@@ -54,21 +105,92 @@ class StyleBertVITS2TTSEngine(TTSEngine):
     # BERT モデルのキャッシュディレクトリ
     BERT_MODEL_CACHE_DIR: Final[Path] = get_save_dir() / "BertModelCaches"
 
-    # ONNX Runtime の推論処理を排他制御するためのロック
-    _inference_lock: Final[threading.Lock] = threading.Lock()
+    # BERT 特徴量キャッシュの退避先ディレクトリ
+    BERT_FEATURE_CACHE_DIR: Final[Path] = get_save_dir() / "BertFeatureCaches"
+
+    # 最適化済みモデルのキャッシュディレクトリ
+    OPTIMIZED_MODEL_CACHE_DIR: Final[Path] = get_save_dir() / "OptimizedModelCaches"
+
+    # int8 に動的量子化したモデルのキャッシュディレクトリ
+    QUANTIZED_MODEL_CACHE_DIR: Final[Path] = get_save_dir() / "QuantizedModelCaches"
+
+    # 音声合成結果キャッシュの保存先ディレクトリ
+    SYNTHESIS_RESULT_CACHE_DIR: Final[Path] = get_save_dir() / "SynthesisResultCaches"
+
+    # 長い読み上げテキストを区間に分割して音声合成した際に、区間の境界をクロスフェードする長さ (秒)
+    LONG_INPUT_CROSSFADE_SEC: Final[float] = 0.02
+
+    # 同時に要求された音声合成をまとめる際に、推論結果に影響しないため比較対象から除外する音声合成用のクエリのフィールド
+    _SYNTHESIS_COALESCING_EXCLUDED_FIELDS: Final[set[str]] = {
+        "volumeScale",
+        "prePhonemeLength",
+        "postPhonemeLength",
+        "outputSamplingRate",
+        "outputStereo",
+    }
+
+    # ストリーミング音声合成で、読み上げテキストを文ごとに分割する位置とする (正規化済みの) 句読点
+    SENTENCE_PUNCTUATIONS: Final[list[str]] = [".", "!", "?"]
+
+    # 事前ロード後のウォームアップ推論に使うテキスト
+    WARM_UP_TEXT: Final[str] = "こんにちは。"
 
     def __init__(
         self,
         aivm_manager: AivmManager,
         use_gpu: bool = False,
         load_all_models: bool = False,
+        model_pool_size: int = 1,
+        max_model_memory: int | None = None,
+        pinned_style_ids: list[StyleId] | None = None,
+        bert_feature_cache_size: int = 128 * 1024 * 1024,
+        bert_feature_cache_spill: bool = False,
+        onnx_session_config: OnnxSessionConfig | None = None,
+        synthesis_workers: int = 0,
+        pipeline_stage_threads: tuple[int, int, int] | None = None,
+        pipeline_queue_size: int = 16,
+        max_segment_phones: int = 300,
+        synthesis_cache_size: int = 0,
+        synthesis_cache_disk_size: int = 0,
+        text_frontend_cache_size: int = 1024,
+        frontend_token_key: str | None = None,
+        document_frontend_workers: int = 0,
+        incremental_synthesis_cache_size: int = 0,
     ) -> None:
         self.aivm_manager = aivm_manager
         self.use_gpu = use_gpu
         self.load_all_models = load_all_models
 
-        # ロード済みモデルのキャッシュ
-        self.tts_models: dict[str, TTSModel] = {}
+        # 1 モデルあたりに保持する推論セッション数の上限
+        ## 2 以上を指定すると、同一モデルに対する複数の推論を並列実行できる (その分メモリ使用量が増える)
+        if model_pool_size < 1:
+            raise ValueError("model_pool_size must be greater than or equal to 1.")
+        self.model_pool_size = model_pool_size
+
+        # ストリーミング音声合成で、最初の音声波形を返すまでの時間を記録する
+        self.first_chunk_latency_recorder = FirstChunkLatencyRecorder()
+
+        # 1 回の音響モデルの推論で扱う音素数の目安となる上限
+        ## 音素数がこれを超える長い読み上げテキストは、句読点の位置で区間に分割して区間ごとに音声合成される
+        ## 0 の場合は分割しない
+        if max_segment_phones < 0:
+            raise ValueError("max_segment_phones must be greater than or equal to 0.")
+        self.max_segment_phones = max_segment_phones
+
+        # ロード済みモデルの推論セッションプールのキャッシュ
+        ## 推論セッションはプールごとに排他制御されるため、異なるモデルの推論は並列に実行される
+        self.tts_models: dict[str, TTSModelPool[TTSModel]] = {}
+        self._tts_models_lock = threading.Lock()
+        # ロード中のモデルの推論セッションプールを受け取るための Future
+        ## 同じモデルのロード要求が重なった場合、後続の要求は新たにロードせずに実行中のロードの完了を待つ
+        self._loading_models: dict[str, Future[TTSModelPool[TTSModel]]] = {}
+
+        # 音声合成モデルをバックグラウンドで 1 件ずつ事前ロードし、ロード後にウォームアップ推論を行う
+        self.model_preloader = ModelPreloader(self._preload_model)
+
+        # ロード済みモデルのメモリ使用量を追跡し、max_model_memory (バイト) を超えたら LRU でアンロードする
+        ## max_model_memory が None の場合はアンロードされず、ロードしたモデルは全てメモリ上に常駐し続ける
+        self.model_residency = ModelResidencyManager(max_model_memory)
 
         # ONNX Runtime での推論に利用するデバイスを選択
         self.available_onnx_providers: list[str] = onnxruntime.get_available_providers()
@@ -111,34 +233,235 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         else:
             logger.info("Using CPU for inference.")
 
+        # ONNX Runtime の推論処理をプロセス全体で排他制御するためのロック
+        ## DirectML はセッションをまたいだ並列実行をサポートしておらず、推論処理を並列実行するとプロセスごとクラッシュする
+        ## このため DmlExecutionProvider を優先して利用する場合のみ、従来通り全ての推論処理を直列化する
+        ## CPU / CUDA では音声合成モデルの推論セッションはセッション単位で排他制御すれば並列実行できるが、
+        ## BERT モデルの推論セッションはプロセス内で 1 つだけ保持され全てのリクエストから共有されるため、
+        ## BERT 特徴量の抽出のみ専用のロックで直列化する
+        self._inference_lock: AbstractContextManager[Any] = nullcontext()
+        bert_inference_lock: AbstractContextManager[Any] = threading.Lock()
+        if self.onnx_providers[0][0] == "DmlExecutionProvider":
+            # 推論処理の途中で BERT 特徴量を抽出する際に同じロックを取得し直すため、再入可能なロックを使う
+            self._inference_lock = bert_inference_lock = threading.RLock()
+            if self.model_pool_size > 1:
+                logger.warning("DirectML does not support concurrent inference. model_pool_size is forced to 1.")  # fmt: skip
+                self.model_pool_size = 1
+        self._bert_feature_hook_installed = _install_bert_feature_hook(bert_inference_lock)  # fmt: skip
+        if self._bert_feature_hook_installed is False and isinstance(self._inference_lock, nullcontext):  # fmt: skip
+            # BERT 特徴量抽出関数を差し替えられない場合は BERT 特徴量の抽出のみを排他制御できないため、全ての推論処理を直列化する
+            logger.warning("BERT feature extractor is not found. All inference is serialized.")  # fmt: skip
+            self._inference_lock = threading.Lock()
+
+        # 以降に生成される全ての推論セッション (BERT モデル・音声合成モデル) に共通の推論セッション設定を適用する
+        ## スレッド数などを指定して 1 プロセスあたりの CPU 使用率を予測しやすくするほか、
+        ## 最適化済みモデルのキャッシュディレクトリが指定されていれば、2 回目以降のロード時にグラフ最適化処理を省略できる
+        if onnx_session_config is None:
+            onnx_session_config = OnnxSessionConfig()
+        self.onnx_session_config = onnx_session_config
+        install_onnx_session_config(self.onnx_session_config)
+        if self.onnx_session_config.precision == ModelPrecision.int8:
+            if self.onnx_providers[0][0] == "CPUExecutionProvider":
+                logger.info("Using int8 dynamically quantized models for inference.")
+            else:
+                logger.warning("int8 precision is only supported on CPU. Using the original models instead.")  # fmt: skip
+
         # Style-Bert-VITS2 本体のロガーを抑制
         style_bert_vits2_logger.remove()
 
-        # 音声合成に必要な BERT モデル・トークナイザーを読み込む
-        ## 一度ロードすればプロセス内でグローバルに保持される
-        start_time = time.time()
-        logger.info("Loading BERT model and tokenizer...")
-        onnx_bert_models.load_model(
-            language=Languages.JP,
-            pretrained_model_name_or_path="tsukumijima/deberta-v2-large-japanese-char-wwm-onnx",
-            onnx_providers=self.onnx_providers,
-            cache_dir=str(self.BERT_MODEL_CACHE_DIR),
-        )
-        onnx_bert_models.load_tokenizer(
-            language=Languages.JP,
-            pretrained_model_name_or_path="tsukumijima/deberta-v2-large-japanese-char-wwm-onnx",
-            cache_dir=str(self.BERT_MODEL_CACHE_DIR),
+        # synthesis_workers が 1 以上の場合は、音声合成モデルの推論を別プロセスのワーカーで実行する
+        ## g2p や音声波形の後処理など GIL を必要とする処理が HTTP サーバーと競合しなくなり、
+        ## ワーカープロセスを終了させることで実行中の音声合成をキャンセルできるようになる
+        ## 各ワーカープロセスがそれぞれ BERT モデル・音声合成モデルをロードするため、このプロセスではロードしない
+        ## ワーカープロセスは 1 件ずつリクエストを処理するため、ワーカー内の推論セッションプールは無効化する
+        self.synthesis_worker_pool: SynthesisWorkerPool | None = None
+        if synthesis_workers > 0:
+            # ピン留めするスタイル ID は、対応する音声合成モデルを担当するワーカープロセスにのみ渡す
+            worker_pinned_style_ids: list[list[StyleId]] = [[] for _ in range(synthesis_workers)]  # fmt: skip
+            for pinned_style_id in pinned_style_ids or []:
+                try:
+                    aivm_manifest, _, _ = self.aivm_manager.get_aivm_manifest_from_style_id(pinned_style_id)  # fmt: skip
+                except HTTPException:
+                    logger.warning(f"Style ID {pinned_style_id} is not found. Skipping pinning.")  # fmt: skip
+                    continue
+                worker_index = SynthesisWorkerPool.get_worker_index(str(aivm_manifest.uuid), synthesis_workers)  # fmt: skip
+                worker_pinned_style_ids[worker_index].append(pinned_style_id)
+            self.synthesis_worker_pool = SynthesisWorkerPool(
+                [
+                    {
+                        "use_gpu": use_gpu,
+                        "model_pool_size": 1,
+                        "max_model_memory": max_model_memory,
+                        "pinned_style_ids": worker_pinned_style_ids[worker_index],
+                        "bert_feature_cache_size": bert_feature_cache_size,
+                        # 退避先ディレクトリは起動時に初期化されるため、複数のワーカープロセスで共有できない
+                        "bert_feature_cache_spill": False,
+                        "onnx_session_config": self.onnx_session_config,
+                        "max_segment_phones": max_segment_phones,
+                        # 音声合成結果はこのプロセスでキャッシュするため、ワーカープロセスではキャッシュしない
+                        "synthesis_cache_size": 0,
+                        # ワーカープロセスには、音声合成の前にこのプロセスの辞書の更新が反映され、辞書のバージョンも更新される
+                        "text_frontend_cache_size": text_frontend_cache_size,
+                        # 音声合成時のトークンの復元はワーカープロセスで行われる
+                        ## ワーカープロセスに適用される辞書の内容はこのプロセスと同じため、辞書のフィンガープリントも一致する
+                        "frontend_token_key": frontend_token_key,
+                    }
+                    for worker_index in range(synthesis_workers)
+                ]
+            )
+            # 終了時にワーカープロセスを終了し、音声波形の受け渡しに使っていた共有メモリを解放する
+            atexit.register(self.synthesis_worker_pool.close)
+
+        # Style-Bert-VITS2 の TTSModel.infer() は内部で読み上げテキストの正規化と g2p を行うため、そのままでは
+        # フロントエンドでの解析や、パイプライン並列化時の BERT 特徴量の事前抽出と合わせて、1 リクエストで何度も g2p が実行される
+        ## 推論リクエストごとに 1 度だけ解析した結果 (正規化済みテキスト・音素・音高・word2ph) を推論リクエストに付与し、
+        ## TTSModel.infer() の内部からの呼び出しでは、その解析結果を返すように正規化関数と g2p 関数を差し替える
+        ## 推論を別プロセスのワーカーで実行している場合は、ワーカープロセス側で差し替える
+        self._text_analysis_enabled = False
+        # 差し替えた関数が TTSModel.infer() の内部から実際に呼び出されるかどうかは、最初に完了した推論で確認する
+        self._hooks_verified = False
+        if self.synthesis_worker_pool is None:
+            self._text_analysis_enabled = _install_text_analysis_hook()
+            if self._text_analysis_enabled is False:
+                logger.warning("Text normalizer or g2p is not found. Text analysis results are not reused.")  # fmt: skip
+
+        # text_frontend_cache_size が 0 より大きい場合は、読み上げテキストの解析結果 (g2p の結果) のキャッシュを有効にする
+        ## 同じ文章の音声合成用のクエリの作成と音声合成や、異なる話者での同じ文章の音声合成で、g2p の実行を省略できる
+        ## g2p の結果はユーザー辞書に依存するため、ユーザー辞書が更新されるとキャッシュ全体が自動的に破棄される
+        self.text_frontend_cache: TextFrontendCache | None = None
+        if text_frontend_cache_size > 0:
+            self.text_frontend_cache = TextFrontendCache(
+                max_entries=text_frontend_cache_size,
+                get_dict_version=get_dict_version,
+            )
+
+        # frontend_token_key が指定されている場合は、音声合成用のクエリに読み上げテキストの解析結果のトークンを埋め込む
+        ## 複数のエンジンのプロセスでリクエストを分散している場合、クエリを作成したプロセスと音声合成するプロセスが異なることが多く、
+        ## プロセス内のキャッシュでは g2p を省略できないため、解析結果自体をクエリに含めて音声合成時に復元する
+        ## トークンは同じ鍵を共有するプロセス間でのみ復元でき、読み上げテキスト・アクセント句・辞書のいずれかが変わると解析し直される
+        self.frontend_token_codec: FrontendTokenCodec | None = None
+        if frontend_token_key is not None:
+            self.frontend_token_codec = FrontendTokenCodec(
+                key=frontend_token_key.encode("utf-8"),
+                namespace=__version__,
+            )
+
+        # 文書モードでは、長い文章を文ごとに分割し、文ごとのテキスト解析を document_frontend_workers 個のワーカープロセスで並列に実行する
+        ## テキスト解析の大部分は GIL を保持したまま実行されるため、文章全体を 1 スレッドで解析するとコア数に関わらず時間がかかる
+        ## document_frontend_workers が 0 の場合は、文ごとに分割した上で呼び出し元のスレッドで順に解析する
+        ## text_frontend_cache_size が 0 より大きい場合は、文ごとのアクセント句系列を同じ上限の文数までキャッシュする
+        ## エディタが編集のたびに段落全体を送り直す場合でも、新しい文や変更された文のみが解析される
+        document_sentence_cache: TextFrontendCache | None = None
+        if text_frontend_cache_size > 0:
+            document_sentence_cache = TextFrontendCache(
+                max_entries=text_frontend_cache_size,
+                get_dict_version=get_dict_version,
+                copy_result=copy_accent_phrases,
+            )
+        self.document_frontend = DocumentFrontend(
+            _analyze_document_sentences,
+            max_workers=document_frontend_workers,
+            sentence_cache=document_sentence_cache,
         )
-        logger.info(
-            f"BERT model and tokenizer loaded. ({time.time() - start_time:.2f}s)"
+        if document_frontend_workers > 0:
+            # 最初のリクエストでワーカープロセスの起動を待たないよう、起動時にワーカープロセスを起動しておく
+            self.document_frontend.warm_up()
+            atexit.register(self.document_frontend.close)
+
+        self.bert_feature_cache: BertFeatureCache | None = None
+        if self.synthesis_worker_pool is None:
+            # BERT 特徴量のキャッシュを有効にする
+            ## BERT 特徴量は話者に依存しないため、同じ文章を複数の話者で音声合成する場合などに BERT の推論を省略できる
+            ## bert_feature_cache_size が 0 の場合は無効化される
+            if bert_feature_cache_size > 0:
+                self.bert_feature_cache = BertFeatureCache(
+                    max_size=bert_feature_cache_size,
+                    spill_dir=self.BERT_FEATURE_CACHE_DIR if bert_feature_cache_spill else None,  # fmt: skip
+                )
+                if _install_bert_feature_cache(self.bert_feature_cache) is False:
+                    logger.warning("BERT feature extractor is not found. BERT feature cache is disabled.")  # fmt: skip
+                    self.bert_feature_cache = None
+
+            # 音声合成に必要な BERT モデル・トークナイザーを読み込む
+            ## 一度ロードすればプロセス内でグローバルに保持される
+            start_time = time.time()
+            logger.info("Loading BERT model and tokenizer...")
+            onnx_bert_models.load_model(
+                language=Languages.JP,
+                pretrained_model_name_or_path="tsukumijima/deberta-v2-large-japanese-char-wwm-onnx",
+                onnx_providers=self.onnx_providers,
+                cache_dir=str(self.BERT_MODEL_CACHE_DIR),
+            )
+            onnx_bert_models.load_tokenizer(
+                language=Languages.JP,
+                pretrained_model_name_or_path="tsukumijima/deberta-v2-large-japanese-char-wwm-onnx",
+                cache_dir=str(self.BERT_MODEL_CACHE_DIR),
+            )
+            logger.info(
+                f"BERT model and tokenizer loaded. ({time.time() - start_time:.2f}s)"
+            )
+
+            # ピン留めするスタイル ID が指定されている場合は、対応する音声合成モデルをピン留めした上でロードしておく
+            ## ピン留めされた音声合成モデルは、メモリ使用量が上限を超えても自動的にアンロードされない
+            for pinned_style_id in pinned_style_ids or []:
+                try:
+                    aivm_manifest, _, _ = self.aivm_manager.get_aivm_manifest_from_style_id(pinned_style_id)  # fmt: skip
+                except HTTPException:
+                    logger.warning(f"Style ID {pinned_style_id} is not found. Skipping pinning.")  # fmt: skip
+                    continue
+                self.model_residency.pin(str(aivm_manifest.uuid))
+                self.model_preloader.enqueue(str(aivm_manifest.uuid))
+
+        # synthesis_cache_size が 0 より大きい場合は、音声合成結果のキャッシュを有効にする
+        ## 同じ音声合成用のクエリ・スタイル ID での音声合成 (同じ台詞の再生し直しやプロジェクトの再書き出しなど) で推論を省略できる
+        ## synthesis_cache_disk_size が 0 より大きい場合は、キャッシュした音声波形をディスクにも保存し、再起動後も利用する
+        ## キーには音声合成モデルのリビジョン (バージョン・ファイルサイズ・更新日時) ・ユーザー辞書・出力に影響するエンジンの設定を含める
+        self.synthesis_result_cache: SynthesisResultCache | None = None
+        if synthesis_cache_size > 0:
+            self.synthesis_result_cache = SynthesisResultCache(
+                max_size=synthesis_cache_size,
+                cache_dir=self.SYNTHESIS_RESULT_CACHE_DIR,
+                max_disk_size=synthesis_cache_disk_size,
+            )
+        self._synthesis_cache_namespace = f"{__version__}:{self.onnx_providers[0][0]}:{self.onnx_session_config.precision.value}:{self.max_segment_phones}"  # fmt: skip
+
+        # incremental_synthesis_cache_size が 0 より大きい場合は、差分音声合成でハンドルごとに前回の音声合成結果を文ごとの音声波形として保持する
+        ## 長い台詞の一部のアクセント句だけを編集して再度音声合成する際に、変更されていない文の推論を省略できる
+        self.incremental_synthesis_store: IncrementalSynthesisStore | None = None
+        if incremental_synthesis_cache_size > 0:
+            self.incremental_synthesis_store = IncrementalSynthesisStore(
+                max_size=incremental_synthesis_cache_size,
+            )
+
+        # 同じ音声合成用のクエリ・スタイル ID での音声合成が同時に要求された場合 (UI の二重送信や複数クライアントからの同じ台詞の要求など) は、
+        # 実行中の音声合成の結果を共有し、推論を 1 回にまとめる
+        ## 完了済みの音声合成の結果は保持しないため、メモリ使用量は増えない (完了後の再利用は音声合成結果のキャッシュの役割)
+        self._synthesis_single_flight: SingleFlight[tuple[StyleId, bytes], Any] = (
+            SingleFlight()
         )
 
-        # load_all_models が True の場合は全ての音声合成モデルをロードしておく
+        # pipeline_stage_threads が指定されている場合は、音声合成処理をテキスト処理・BERT 特徴量の抽出・音響モデルの推論の 3 段階に分け、
+        # 各段階をそれぞれ専用のスレッド (frontend / bert / acoustic の順に指定されたスレッド数) で実行するパイプライン並列化を有効にする
+        ## あるリクエストの音響モデルの推論中に後続のリクエストの BERT 特徴量を並行して抽出できるため、同時リクエスト時のスループットが向上する
+        ## ただし BERT 特徴量の抽出中も推論セッションを 1 つ借り出すため、同じモデルへのリクエスト同士が重なるのは model_pool_size が 2 以上の場合のみ
+        ## 各段階の処理待ちキューは pipeline_queue_size で上限が設けられ、満杯の段階への投入は空きができるまで待たされる
+        ## 推論を別プロセスのワーカーで実行している場合、ワーカープロセスは 1 件ずつリクエストを処理するため無効化する
+        self._pipeline: SynthesisPipeline | None = None
+        if pipeline_stage_threads is not None:
+            if self.synthesis_worker_pool is not None:
+                logger.warning("Pipeline parallelism is not available with synthesis workers. Pipeline parallelism is disabled.")  # fmt: skip
+            elif self._bert_feature_hook_installed is False:
+                logger.warning("BERT feature extractor is not found. Pipeline parallelism is disabled.")  # fmt: skip
+            else:
+                self._pipeline = SynthesisPipeline(*pipeline_stage_threads, queue_size=pipeline_queue_size)  # fmt: skip
+
+        # load_all_models が True の場合は全ての音声合成モデルをバックグラウンドでロードしておく
+        ## 起動処理はロードの完了を待たずに進み、ロード中のモデルに対する音声合成リクエストはロードの完了を待ってから処理される
+        ## max_model_memory が指定されている場合、上限を超えた分は古い順にアンロードされる
         if load_all_models is True:
-            logger.info("Loading all models...")
+            logger.info("Loading all models in the background...")
             for aivm_uuid in self.aivm_manager.get_installed_aivm_infos().keys():
-                self.load_model(aivm_uuid)
-            logger.info("All models loaded.")
+                self.model_preloader.enqueue(aivm_uuid)
 
         # VOICEVOX CORE の通常の CoreWrapper の代わりに MockCoreWrapper を利用する
         ## 継承元の TTSEngine は self._core に CoreWrapper を入れた CoreAdapter のインスタンスがないと動作しない
@@ -164,10 +487,12 @@ class StyleBertVITS2TTSEngine(TTSEngine):
             dml=True if "DmlExecutionProvider" in self.available_onnx_providers else False,  # fmt: skip
         )
 
-    def load_model(self, aivm_uuid: str) -> TTSModel:
+    def load_model(self, aivm_uuid: str) -> TTSModelPool[TTSModel]:
         """
-        Style-Bert-VITS2 の音声合成モデルをロードする
+        Style-Bert-VITS2 の音声合成モデルをロードし、その推論セッションプールを返す
         StyleBertVITS2TTSEngine の初期化時に use_gpu=True が指定されている場合、モデルは GPU にロードされる
+        プールには最初の推論セッションのみが生成され、以降は並列推論の必要に応じて model_pool_size まで追加生成される
+        同じモデルが他のスレッドでロード中の場合は、新たにロードせずにそのロードの完了を待つ
         継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
 
         Parameters
@@ -177,13 +502,260 @@ class StyleBertVITS2TTSEngine(TTSEngine):
 
         Returns
         -------
-        TTSModel
-            ロード済みの TTSModel インスタンス (キャッシュ済みの場合はそのまま返す)
+        TTSModelPool[TTSModel]
+            ロード済みの TTSModel インスタンスを保持する推論セッションプール (キャッシュ済みの場合はそのまま返す)
         """
 
         # 既に読み込まれている場合はそのまま返す
-        if aivm_uuid in self.tts_models:
-            return self.tts_models[aivm_uuid]
+        tts_model_pool = self.tts_models.get(aivm_uuid)
+        if tts_model_pool is not None:
+            return tts_model_pool
+
+        # 同一モデルが複数のリクエストから同時にロードされるのを防ぐ
+        ## ロード自体はロックの外で行い、異なるモデルのロードや推論を妨げないようにする
+        with self._tts_models_lock:
+            tts_model_pool = self.tts_models.get(aivm_uuid)
+            if tts_model_pool is not None:
+                return tts_model_pool
+            loading_future = self._loading_models.get(aivm_uuid)
+            if loading_future is None:
+                loading_future = Future()
+                self._loading_models[aivm_uuid] = loading_future
+                is_loader = True
+                # メモリ使用量の上限を超える場合は、事前に最も長く使われていないモデルからアンロードする
+                self._evict_models(
+                    incoming_size=self._estimate_model_size(aivm_uuid, 1),
+                    exclude=aivm_uuid,
+                )
+            else:
+                is_loader = False
+
+        # 他のスレッドでロード中の場合は、そのロードの完了を待つ
+        if is_loader is False:
+            return loading_future.result()
+
+        try:
+            tts_model_pool = TTSModelPool(
+                factory=lambda: self._create_tts_model(aivm_uuid),
+                max_size=self.model_pool_size,
+            )
+        except BaseException as e:
+            with self._tts_models_lock:
+                del self._loading_models[aivm_uuid]
+            loading_future.set_exception(e)
+            raise
+
+        with self._tts_models_lock:
+            self.tts_models[aivm_uuid] = tts_model_pool
+            self.model_residency.add(aivm_uuid, self._estimate_model_size(aivm_uuid, tts_model_pool.size))  # fmt: skip
+            del self._loading_models[aivm_uuid]
+        loading_future.set_result(tts_model_pool)
+        return tts_model_pool
+
+    def preload_model(self, aivm_uuid: str) -> ModelLoadStatus:
+        """
+        指定された AIVM の UUID に対応する音声合成モデルのバックグラウンドでの事前ロードを要求する
+        ロードの完了を待たずに、事前ロードジョブの状態を返す
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+
+        Returns
+        -------
+        ModelLoadStatus
+            事前ロードジョブの状態
+        """
+
+        # 存在しないモデルの場合はここで 404 エラーを送出する
+        self.aivm_manager.get_aivm_info(aivm_uuid)
+        return self._to_model_load_status(self.model_preloader.enqueue(aivm_uuid))
+
+    def get_model_load_statuses(self) -> list[ModelLoadStatus]:
+        """
+        音声合成モデルの事前ロードジョブの状態の一覧を、ジョブの登録日時が古い順に取得する
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Returns
+        -------
+        list[ModelLoadStatus]
+            事前ロードジョブの状態のリスト
+        """
+
+        return [
+            self._to_model_load_status(job) for job in self.model_preloader.get_jobs()
+        ]
+
+    def _to_model_load_status(self, job: ModelLoadJob) -> ModelLoadStatus:
+        """事前ロードジョブの状態を API のレスポンス用のモデルに変換する。"""
+
+        # ロード後にアンインストールされたモデルの場合は、モデル名の代わりに UUID を返す
+        try:
+            name = self.aivm_manager.get_aivm_info(job.key).manifest.name
+        except HTTPException:
+            name = job.key
+        return ModelLoadStatus(
+            aivm_uuid=job.key,
+            name=name,
+            state=job.state,
+            queued_at=job.queued_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            error=job.error,
+        )
+
+    def _preload_model(
+        self,
+        aivm_uuid: str,
+        report_progress: Callable[[ModelLoadState], None],
+    ) -> None:
+        """
+        音声合成モデルをロードし、ウォームアップ推論を行う
+        ModelPreloader のバックグラウンドスレッドと、initialize_synthesis() から呼び出される
+        """
+
+        # 既にロード済みのモデルはウォームアップ済みのため、再度ウォームアップ推論を行わない
+        if self.is_model_loaded(aivm_uuid):
+            return
+
+        # 推論を別プロセスのワーカーで実行している場合は、担当のワーカープロセスでロードとウォームアップ推論を行う
+        if self.synthesis_worker_pool is not None:
+            self.synthesis_worker_pool.load_model(aivm_uuid)
+            return
+        tts_model_pool = self.load_model(aivm_uuid)
+
+        # 初回推論時の ONNX Runtime のメモリ確保やカーネルの選択を事前に済ませ、最初の音声合成リクエストの応答を速くする
+        report_progress("warming_up")
+        start_time = time.time()
+        hyper_parameters = tts_model_pool.sessions[0].hyper_parameters
+        text_analysis = _analyze_text(self.WARM_UP_TEXT, self.text_frontend_cache)
+        inference_request = _InferenceRequest(
+            tts_model_pool=tts_model_pool,
+            text=self.WARM_UP_TEXT,
+            given_phone=text_analysis.phones,
+            given_tone=text_analysis.tones,
+            speaker_id=next(iter(hyper_parameters.data.spk2id.values())),
+            style=next(iter(hyper_parameters.data.style2id.keys())),
+            style_weight=DEFAULT_STYLE_WEIGHT,
+            sdp_ratio=DEFAULT_SDP_RATIO,
+            length=1.0,
+            pitch_scale=1.0,
+            text_analysis=text_analysis,
+        )
+        self._infer(inference_request)
+        logger.info(f"Model {aivm_uuid} warmed up. ({time.time() - start_time:.2f}s)")  # fmt: skip
+
+    def unload_model(self, aivm_uuid: str) -> bool:
+        """
+        指定された AIVM の UUID に対応する音声合成モデルをアンロードする
+        推論中のモデルをアンロードした場合、実行中の推論が完了した時点でメモリが解放される
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+
+        Returns
+        -------
+        bool
+            モデルがロードされていてアンロードした場合は True 、ロードされていなかった場合は False
+        """
+
+        # 推論を別プロセスのワーカーで実行している場合は、担当のワーカープロセスでアンロードする
+        if self.synthesis_worker_pool is not None:
+            return self.synthesis_worker_pool.unload_model(aivm_uuid)
+
+        with self._tts_models_lock:
+            self.model_residency.remove(aivm_uuid)
+            tts_model_pool = self.tts_models.pop(aivm_uuid, None)
+        if tts_model_pool is None:
+            return False
+        logger.info(f"Model {aivm_uuid} unloaded.")
+        return True
+
+    def pin_model(self, aivm_uuid: str) -> None:
+        """
+        指定された AIVM の UUID に対応する音声合成モデルをピン留めし、メモリ使用量の上限による自動アンロードの対象から除外する
+        ピン留めは参照カウント方式で、複数回ピン留めした場合は同じ回数だけ unpin_model() を呼ぶ必要がある
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        """
+
+        # 推論を別プロセスのワーカーで実行している場合は、担当のワーカープロセスでピン留めする
+        if self.synthesis_worker_pool is not None:
+            self.synthesis_worker_pool.pin_model(aivm_uuid)
+            return
+        self.model_residency.pin(aivm_uuid)
+
+    def unpin_model(self, aivm_uuid: str) -> None:
+        """
+        指定された AIVM の UUID に対応する音声合成モデルのピン留めを 1 回分解除する
+        ピン留めが全て解除されたモデルは、次回以降のモデルのロード時に自動アンロードの対象になる
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        """
+
+        if self.synthesis_worker_pool is not None:
+            self.synthesis_worker_pool.unpin_model(aivm_uuid)
+            return
+        self.model_residency.unpin(aivm_uuid)
+
+    def _estimate_model_size(self, aivm_uuid: str, session_count: int) -> int:
+        """
+        音声合成モデルのメモリ使用量をバイト単位で推定する
+        各推論セッションがそれぞれモデルの重みを保持するため、AIVMX ファイルのサイズ × 推論セッション数で近似する
+        """
+
+        aivm_info = self.aivm_manager.get_aivm_info(aivm_uuid)
+        try:
+            file_size = aivm_info.file_path.stat().st_size
+        except OSError:
+            file_size = 0
+        return file_size * session_count
+
+    def _evict_models(self, incoming_size: int = 0, exclude: str | None = None) -> None:
+        """
+        ロード済みモデルのメモリ使用量が上限を超える場合に、最も長く使われていないモデルから順にアンロードする
+        ピン留めされたモデルと推論中のモデルはアンロードされない
+        呼び出し時には self._tts_models_lock を取得している必要がある
+        """
+
+        evicted_aivm_uuids = self.model_residency.select_evictions(
+            incoming_size=incoming_size,
+            is_evictable=lambda key: key in self.tts_models
+            and self.tts_models[key].in_use == 0,  # fmt: skip
+            exclude=exclude,
+        )
+        for evicted_aivm_uuid in evicted_aivm_uuids:
+            self.tts_models.pop(evicted_aivm_uuid, None)
+            logger.info(f"Model {evicted_aivm_uuid} unloaded to stay within the memory budget.")  # fmt: skip
+
+    def _create_tts_model(self, aivm_uuid: str) -> TTSModel:
+        """
+        指定された AIVM の UUID に対応する Style-Bert-VITS2 の音声合成モデルを新たにロードする
+        推論セッションプールに追加する推論セッションの生成に利用される
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+
+        Returns
+        -------
+        TTSModel
+            ロード済みの TTSModel インスタンス
+        """
 
         # AIVM メタデータを読み込む
         aivm_info = self.aivm_manager.get_aivm_info(aivm_uuid)
@@ -223,7 +795,6 @@ class StyleBertVITS2TTSEngine(TTSEngine):
             f"{aivm_info.manifest.name} ({aivm_uuid}) loaded. ({time.time() - start_time:.2f}s)"
         )
 
-        self.tts_models[aivm_uuid] = tts_model
         return tts_model
 
     def is_model_loaded(self, aivm_uuid: str) -> bool:
@@ -242,8 +813,170 @@ class StyleBertVITS2TTSEngine(TTSEngine):
             モデルがロード済みかどうか
         """
 
+        if self.synthesis_worker_pool is not None:
+            return self.synthesis_worker_pool.is_model_loaded(aivm_uuid)
         return aivm_uuid in self.tts_models
 
+    def get_loaded_models(self) -> list[LoadedModelInfo]:
+        """
+        ロード済みの音声合成モデルとその推論セッションプールの状態の一覧を取得する
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Returns
+        -------
+        list[LoadedModelInfo]
+            ロード済みの音声合成モデルの情報のリスト
+        """
+
+        # 推論を別プロセスのワーカーで実行している場合は、全てのワーカープロセスから取得する
+        if self.synthesis_worker_pool is not None:
+            return self.synthesis_worker_pool.get_loaded_models()
+
+        # 最終利用日時が新しい順に返す
+        loaded_models: list[LoadedModelInfo] = []
+        for resident_model in self.model_residency.get_resident_models():
+            tts_model_pool = self.tts_models.get(resident_model.key)
+            if tts_model_pool is None:
+                continue
+            # ロード後にアンインストールされたモデルは一覧に含めない
+            try:
+                aivm_info = self.aivm_manager.get_aivm_info(resident_model.key)
+            except HTTPException:
+                continue
+            loaded_models.append(
+                LoadedModelInfo(
+                    aivm_uuid=resident_model.key,
+                    name=aivm_info.manifest.name,
+                    pool_size=tts_model_pool.size,
+                    max_pool_size=tts_model_pool.max_size,
+                    in_use=tts_model_pool.in_use,
+                    size=resident_model.size,
+                    last_used_at=resident_model.last_used_at,
+                    pinned=resident_model.pinned,
+                )
+            )
+        return loaded_models
+
+    def get_inference_statistics(self) -> InferenceStatistics:
+        """
+        音声合成処理の統計情報を取得する
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Returns
+        -------
+        InferenceStatistics
+            音声合成処理の統計情報
+        """
+
+        bert_feature_cache: CacheStatistics | None = None
+        if self.bert_feature_cache is not None:
+            bert_feature_cache_stats = self.bert_feature_cache.stats
+            bert_feature_cache = CacheStatistics(
+                hit_count=bert_feature_cache_stats.hit_count,
+                miss_count=bert_feature_cache_stats.miss_count,
+                hit_rate=bert_feature_cache_stats.hit_rate,
+                entry_count=bert_feature_cache_stats.entry_count,
+                memory_size=bert_feature_cache_stats.memory_size,
+                disk_entry_count=bert_feature_cache_stats.disk_entry_count,
+                disk_size=bert_feature_cache_stats.disk_size,
+            )
+
+        pipeline_stages: list[PipelineStageStatistics] | None = None
+        if self._pipeline is not None:
+            pipeline_stages = []
+            for stage in self._pipeline.stages:
+                stage_stats = stage.stats
+                pipeline_stages.append(
+                    PipelineStageStatistics(
+                        name=stage_stats.name,
+                        threads=stage_stats.threads,
+                        queue_size=stage_stats.queue_size,
+                        queue_depth=stage_stats.queue_depth,
+                        running_count=stage_stats.running_count,
+                        processed_count=stage_stats.processed_count,
+                        failed_count=stage_stats.failed_count,
+                        average_queue_wait_ms=stage_stats.average_queue_wait * 1000,
+                        max_queue_wait_ms=stage_stats.max_queue_wait * 1000,
+                        average_processing_time_ms=(
+                            stage_stats.average_processing_time * 1000
+                        ),
+                        max_processing_time_ms=stage_stats.max_processing_time * 1000,
+                    )
+                )
+
+        first_chunk_latency_stats = self.first_chunk_latency_recorder.stats
+        streaming = StreamingStatistics(
+            stream_count=first_chunk_latency_stats.stream_count,
+            average_first_chunk_latency_ms=first_chunk_latency_stats.average_latency
+            * 1000,  # fmt: skip
+            max_first_chunk_latency_ms=first_chunk_latency_stats.max_latency * 1000,
+        )
+
+        synthesis_result_cache: CacheStatistics | None = None
+        if self.synthesis_result_cache is not None:
+            synthesis_result_cache_stats = self.synthesis_result_cache.stats
+            synthesis_result_cache = CacheStatistics(
+                hit_count=synthesis_result_cache_stats.hit_count,
+                miss_count=synthesis_result_cache_stats.miss_count,
+                hit_rate=synthesis_result_cache_stats.hit_rate,
+                entry_count=synthesis_result_cache_stats.entry_count,
+                memory_size=synthesis_result_cache_stats.memory_size,
+                disk_entry_count=synthesis_result_cache_stats.disk_entry_count,
+                disk_size=synthesis_result_cache_stats.disk_size,
+            )
+
+        text_frontend_cache: TextFrontendCacheStatistics | None = None
+        if self.text_frontend_cache is not None:
+            text_frontend_cache_stats = self.text_frontend_cache.stats
+            text_frontend_cache = TextFrontendCacheStatistics(
+                hit_count=text_frontend_cache_stats.hit_count,
+                miss_count=text_frontend_cache_stats.miss_count,
+                hit_rate=text_frontend_cache_stats.hit_rate,
+                entry_count=text_frontend_cache_stats.entry_count,
+                max_entry_count=self.text_frontend_cache.max_entries,
+                invalidation_count=text_frontend_cache_stats.invalidation_count,
+            )
+
+        document_sentence_cache: TextFrontendCacheStatistics | None = None
+        if self.document_frontend.sentence_cache is not None:
+            document_sentence_cache_stats = self.document_frontend.sentence_cache.stats
+            document_sentence_cache = TextFrontendCacheStatistics(
+                hit_count=document_sentence_cache_stats.hit_count,
+                miss_count=document_sentence_cache_stats.miss_count,
+                hit_rate=document_sentence_cache_stats.hit_rate,
+                entry_count=document_sentence_cache_stats.entry_count,
+                max_entry_count=self.document_frontend.sentence_cache.max_entries,
+                invalidation_count=document_sentence_cache_stats.invalidation_count,
+            )
+
+        incremental_synthesis: IncrementalSynthesisStatistics | None = None
+        if self.incremental_synthesis_store is not None:
+            incremental_synthesis_stats = self.incremental_synthesis_store.stats
+            incremental_synthesis = IncrementalSynthesisStatistics(
+                render_count=incremental_synthesis_stats.render_count,
+                memory_size=incremental_synthesis_stats.memory_size,
+                reused_segment_count=incremental_synthesis_stats.reused_segment_count,
+                synthesized_segment_count=incremental_synthesis_stats.synthesized_segment_count,
+                reuse_rate=incremental_synthesis_stats.reuse_rate,
+            )
+
+        synthesis_single_flight_stats = self._synthesis_single_flight.stats
+        synthesis_coalescing = CoalescingStatistics(
+            execution_count=synthesis_single_flight_stats.execution_count,
+            shared_count=synthesis_single_flight_stats.shared_count,
+        )
+
+        return InferenceStatistics(
+            bert_feature_cache=bert_feature_cache,
+            text_frontend_cache=text_frontend_cache,
+            document_sentence_cache=document_sentence_cache,
+            synthesis_result_cache=synthesis_result_cache,
+            synthesis_coalescing=synthesis_coalescing,
+            incremental_synthesis=incremental_synthesis,
+            pipeline_stages=pipeline_stages,
+            streaming=streaming,
+        )
+
     def create_accent_phrases(self, text: str, style_id: StyleId) -> list[AccentPhrase]:
         """
         テキストからアクセント句系列を生成する
@@ -271,150 +1004,95 @@ class StyleBertVITS2TTSEngine(TTSEngine):
 
         # 入力テキストを Style-Bert-VITS2 の基準で正規化
         ## Style-Bert-VITS2 では「〜」などの伸ばす棒も長音記号として扱うため、normalize_text() でそれらを統一する
-        normalized_text = normalize_text(text.strip())  # 前後の空白を削除してから実行
-
-        # g2p 処理を行い、テキストからモーラ情報と音高 (0 or 1) のリストを取得
-        ## Style-Bert-VITS2 側では、pyopenjtalk_g2p_prosody() から取得したアクセント情報が含まれるモーラのリストを
-        ## モーラ情報と音高のリストに変換し (句読点や記号は失われている) 、後付けで失われた句読点や記号のモーラを適切な位置に追加する形で実装されている
-        ## VOICEVOX ENGINE 側のアクセント句系列生成処理は微妙に互換性がないため使っていない
-        ## VOICEVOX ENGINE では「ん」の音素を「N」としているため、use_jp_extra (True のとき「ん」の音素を「N」とする) は常に True に設定している
-        ## JP-Extra モデルと通常のモデルの音素差の吸収は synthesize_wave() で行う
-        phones, tones, _, sep_kata_with_joshi = g2p(normalized_text, use_jp_extra=True, raise_yomi_error=False)  # fmt: skip
-        mora_tone_list = _phone_tone2mora_tone(list(zip(phones, tones)))
-
-        # sep_kata_with_joshi のカタカナを音素 (子音と母音のタプル) に変換
-        ## 分割されていないカタカナモーラの場合、「チョ」「ビャ」のような拗音では二文字に跨るため、単に文字数を数えるだけではズレてしまう
-        ## ちゃんと音素に分割することで、確実に要素数を mora_tone_list と合わせられる
-        sep_phonemes_with_joshi = _sep_kata_with_joshi2sep_phonemes_with_joshi(sep_kata_with_joshi)  # fmt: skip
-
-        # mora_tone_list を、まず記号から通常のモーラに変わったタイミングで区切ってグループ化
-        # 通常のモーラから記号に変わったタイミングでは区切らない
-        ## 例: 「...私は,,そう思うよ...?どうかな.」 -> [["..."], ["私", "は", ",", ","], ["そう", "思う", "よ", "...", "?"], ["どう", "か", "な", "."]]
-        mora_tone_groups: list[list[tuple[Mora, int]]] = []
-        current_group: list[tuple[Mora, int]] = []
-        for index, (mora, tone) in enumerate(mora_tone_list):
-            if index == 0 or (
-                mora.text not in PUNCTUATIONS
-                and mora_tone_list[index - 1][0].text in PUNCTUATIONS
-            ):
-                if current_group:
-                    mora_tone_groups.append(current_group)
-                    current_group = []
-                current_group.append((mora, tone))
-            else:
-                current_group.append((mora, tone))
-        if current_group:  # 最後のグループがあれば追加
-            mora_tone_groups.append(current_group)
-
-        # さらにグループごとに、アクセントが変わるタイミングで区切って再グループ化
-        # 音高が 前: 1, 現在: 0, 次: 1 の場合、前と現在の間で区切る
-        # 音高が 前: 0, 現在: 0, 次: 1 の場合、前と現在の間で区切る
-        sep_phonemes_with_joshi_index = 0  # sep_phonemes_with_joshi の参照用インデックス  # fmt: skip
-        sep_phonemes_with_joshi_mora_index = 0  # sep_phonemes_with_joshi 内の要素の何番目のモーラを参照するかのインデックス
-        re_grouped_mora_tone_groups: list[list[list[tuple[Mora, int]]]] = []
-        for group in mora_tone_groups:
-            re_grouped_group: list[list[tuple[Mora, int]]] = []
-            current_re_group: list[tuple[Mora, int]] = []
-            # 現在の位置で確実にアクセント句を区切るべきかどうかのフラグ
-            should_separate_accent_phrase = False
-            for index, (mora, tone) in enumerate(group):
-                # sep_phonemes_with_joshi_mora_index が 0 (つまり要素の最初のモーラ) の時だけ、グループの区切り処理を許可する
-                ## sep_phonemes_with_joshi は ['コダイ', 'ローマ', 'ジダイノ', 'キッチンノ', 'ピット'] のように助詞が連結された状態のリスト
-                ## (実際にはカタカナ文字列ではなく子音と母音のタプルのリストのリスト) で、
-                ## 中に含まれているモーラを全てカウントすると len(mora_tone_list) と一致する
-                ## 上記例であれば "キッチンノ" の先頭の "キ" 、"ピット" の先頭の "ピ" 以外ではグループの区切り処理が禁止される
-                ## 助詞の後のアクセント句が頭高型 (高,低,低 ...) である場合に、例えば "ジダイ" と "ノ" 、"キッチン" と "ノ" の間で
-                ## 区切り処理が走り、アクセント句が ["ジダイ", "ノキッチン, "ノピット"] のように不自然に区切られてしまうのを防ぐための処理
-                if sep_phonemes_with_joshi_mora_index == 0:
-                    is_accent_phrase_boundary_allowed = True
-                else:
-                    is_accent_phrase_boundary_allowed = False
-                # sep_phonemes_with_joshi 内の要素の何番目のモーラを参照するかのインデックスを繰り上げる
-                sep_phonemes_with_joshi_mora_index += 1
-                # 必要に応じて sep_phonemes_with_joshi_index を繰り上げ、次の要素に移動
-                # 繰り上げた結果は次回のループに適用される
-                if sep_phonemes_with_joshi_mora_index >= len(sep_phonemes_with_joshi[sep_phonemes_with_joshi_index]):  # fmt: skip
-                    sep_phonemes_with_joshi_index += 1
-                    sep_phonemes_with_joshi_mora_index = 0
-
-                # 前の音高を取得 (最初のモーラの場合は None)
-                previous_tone = group[index - 1][1] if index > 0 else None
-                # 後続の音高を取得 (最後のモーラの場合は None)
-                next_tone = group[index + 1][1] if index < len(group) - 1 else None
-                # 現在の位置で確実にアクセント句を区切るべきかどうかのフラグが True の場合、前と現在の間で区切る
-                if should_separate_accent_phrase is True:
-                    re_grouped_group.append(current_re_group)
-                    current_re_group = [(mora, tone)]
-                    should_separate_accent_phrase = False  # フラグをリセット
-                # 音高が 前: 1, 現在: 0, 次: 1
-                # または 前: 0, 現在: 0, 次: 1 の場合、前と現在の間で区切る
-                elif ((previous_tone == 1) and (tone == 0) and (next_tone == 1)) or \
-                     ((previous_tone == 0) and (tone == 0) and (next_tone == 1)):  # fmt: skip
-                    # アクセント句の区切り処理を許可するかどうかのフラグが True のときだけ実行
-                    # 今回単語の途中のため区切り処理を実行できない場合は、次回のループで確実にアクセント句が区切られるようフラグを立てる
-                    if is_accent_phrase_boundary_allowed is True:
-                        re_grouped_group.append(current_re_group)
-                        current_re_group = [(mora, tone)]
-                    else:
-                        should_separate_accent_phrase = True
-                        current_re_group.append((mora, tone))  # 既存のグループに追加
-                # それ以外の場合は既存のグループに追加
-                else:
-                    current_re_group.append((mora, tone))
-            if current_re_group:  # 最後のグループがあれば追加
-                re_grouped_group.append(current_re_group)
-            re_grouped_mora_tone_groups.append(re_grouped_group)
-
-        # グループのグループのようにネスト構造になっているので、flatten する
-        mora_tone_groups = [
-            item for sublist in re_grouped_mora_tone_groups for item in sublist
-        ]
+        ## 前後の空白を削除してから実行し、g2p の結果はテキスト解析結果のキャッシュがあれば再利用する
+        text_analysis = _analyze_text(text.strip(), self.text_frontend_cache)
+        return self._text_analysis_to_accent_phrases(text_analysis, style_id)
 
-        # mora_tone_groups を AccentPhrase に変換
-        accent_phrases: list[AccentPhrase] = []
-        for group in mora_tone_groups:
-
-            # グループ内で次のモーラで音高が 1 から 0 に下がるモーラをアクセント核のインデックスとする
-            # 1-indexed なので 1 から始まるインデックスに変換
-            accent_index = None
-            for index, (mora, tone) in enumerate(group):
-                if tone == 1 and index < len(group) - 1 and group[index + 1][1] == 0:
-                    accent_index = index + 1
-                    break
-            ## この時点でアクセント核が見つからなかった場合は最後のモーラまで音高が高いままだと思われるので、
-            ## 最後のモーラをアクセント核とする
-            if accent_index is None:
-                accent_index = len(group)
-
-            # グループ内のモーラをリストに変換
-            moras: list[Mora] = []
-            for mora, _ in group:
-                # Style-Bert-VITS2 にある mora_list.py では VOICEVOX ENGINE のコードが若干改変された上で利用されているが、
-                # "ッ" (促音) が Style-Bert-VITS2 版では cl から q に変わっているため、後述の update_length_and_pitch() 実行時に失敗しうる
-                # これより前のコードで既に子音/母音が必要な処理は終えているため、ここで VOICEVOX ENGINE 向けに q を cl に修正する
-                if mora.vowel == "q":
-                    mora.vowel = "cl"
-                moras.append(mora)
-
-            # アクセント句を生成
-            accent_phrases.append(
-                AccentPhrase(
-                    moras=moras,
-                    # 取得したアクセント核を指定
-                    accent=accent_index,
-                    # AivisSpeech Engine では moras に記号モーラも含めているため、pause_mora は常に None に設定
-                    ## Style-Bert-VITS2 は音声合成時に読み上げテキストに付与する記号 (…!? など)で感情表現が大きく変わるほか、
-                    ## 記号自体にアクセント情報を付与できるため、VOICEVOX のように連続する記号を pause_mora としてまとめられると困る
-                    pause_mora=None,
-                )
-            )
+    def create_accent_phrases_with_frontend_token(
+        self, text: str, style_id: StyleId
+    ) -> tuple[list[AccentPhrase], str | None]:
+        """
+        テキストからアクセント句系列を生成し、音声合成用のクエリに埋め込む読み上げテキストの解析結果のトークンも併せて生成する
+        トークンを含むクエリで音声合成すると、読み上げテキストとアクセント句が変更されていなければ g2p を省略できる
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        text : str
+            テキスト
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        tuple[list[AccentPhrase], str | None]
+            アクセント句系列・読み上げテキストの解析結果のトークン (トークンが無効な場合は None)
+        """
+
+        # 解析中にユーザー辞書が更新された場合に、更新後の辞書で解析したトークンとして扱われないよう、解析前に辞書のフィンガープリントを取得しておく
+        dict_fingerprint = get_dict_fingerprint() if self.frontend_token_codec is not None else b""  # fmt: skip
+        text_analysis = _analyze_text(text.strip(), self.text_frontend_cache)
+        accent_phrases = self._text_analysis_to_accent_phrases(text_analysis, style_id)
+        if self.frontend_token_codec is None:
+            return accent_phrases, None
+        frontend_token = self.frontend_token_codec.encode(
+            text_analysis.text,
+            accent_phrases,
+            dict_fingerprint,
+            text_analysis.g2p_result,
+        )
+        return accent_phrases, frontend_token
 
-        # ダミーの音素長・モーラ音高を生成
+    def create_accent_phrases_from_document(
+        self, text: str, style_id: StyleId
+    ) -> list[AccentPhrase]:
+        """
+        長い文章を文ごとに分割してアクセント句系列を生成し、文の順に連結する (文書モード)
+        文ごとの解析は、document_frontend_workers が指定されていれば別プロセスのワーカーで並列に実行される
+        文章全体を一度に解析する create_accent_phrases() とは、文の境界付近の読みやアクセントが異なる場合がある
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        text : str
+            文章
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        list[AccentPhrase]
+            アクセント句系列
+        """
+
+        accent_phrases = self.document_frontend.create_accent_phrases(text)
+        return self.update_length_and_pitch(accent_phrases, style_id)
+
+    def _text_analysis_to_accent_phrases(
+        self, text_analysis: "_TextAnalysis", style_id: StyleId
+    ) -> list[AccentPhrase]:
+        """
+        読み上げテキストの解析結果からアクセント句系列を生成する (create_accent_phrases() の実装)
+
+        Parameters
+        ----------
+        text_analysis : _TextAnalysis
+            読み上げテキストの解析結果
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        list[AccentPhrase]
+            アクセント句系列
+        """
+
+        # アクセント句系列はモーラごとの配列として生成し、API で返す AccentPhrase への変換は最後に 1 度だけ行う
         ## VOICEVOX ENGINE と異なりスタイル ID に基づいてその音素長・モーラ音高を更新することは原理上不可能なため、
         ## 音素長・モーラ音高は常にダミー値で返される
-        ## 上記処理ですでにダミーデータは入れられているのだが、念のため
-        accent_phrases = self.update_length_and_pitch(accent_phrases, style_id)
-        return accent_phrases
+        ## モーラ系列の生成時点で update_length_and_pitch() と同じダミー値 (子音があるモーラの子音長は 0.0 、ないモーラは None) が入っている
+        mora_sequence = _g2p_result_to_mora_sequence(text_analysis.g2p_result)
+        return mora_sequence.to_accent_phrases()
 
     def update_length(
         self, accent_phrases: list[AccentPhrase], style_id: StyleId
@@ -475,81 +1153,350 @@ class StyleBertVITS2TTSEngine(TTSEngine):
             生成された音声波形 (float32 型)
         """
 
-        # モーフィング時などに同一参照の AudioQuery で複数回呼ばれる可能性があるので、元の引数の AudioQuery に破壊的変更を行わない
-        query = copy.deepcopy(query)
+        # 推論を別プロセスのワーカーで実行している場合は、音声合成モデルを担当するワーカープロセスで音声合成を行う
+        ## ワーカープロセスは音量調整/サンプルレート変更/ステレオ化まで行った音声波形を返すため、クエリ全体が同一の要求のみをまとめる
+        if self.synthesis_worker_pool is not None:
+            synthesis_worker_pool = self.synthesis_worker_pool
+            aivm_manifest, _, _ = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)  # fmt: skip
+            wave, shared = self._synthesis_single_flight.run(
+                (style_id, query.fingerprint()),
+                lambda: synthesis_worker_pool.synthesize(str(aivm_manifest.uuid), query, style_id),  # fmt: skip
+            )
+            # 共有された音声波形は他の呼び出し元も参照しているため、コピーを返す
+            return wave.copy() if shared else wave
+
+        # 推論結果に影響しない音量調整/サンプルレート変更/ステレオ化と前後の無音区間を除いたクエリが同一の要求をまとめて推論し、
+        # それらの処理は共有した推論結果に対して呼び出し元ごとに適用する
+        key = (style_id, query.fingerprint(exclude=self._SYNTHESIS_COALESCING_EXCLUDED_FIELDS))  # fmt: skip
+        (raw_sample_rate, raw_wave), _ = self._synthesis_single_flight.run(
+            key, lambda: self._synthesize_raw_wave(query, style_id)
+        )
+        return self._raw_wave_to_output_wave(query, raw_sample_rate, raw_wave)
 
-        # もし AudioQuery.kana に漢字混じりの通常の文章が指定されている場合はそれを使う (AivisSpeech 独自仕様)
-        ## VOICEVOX ENGINE では AudioQuery.kana は読み取り専用パラメータだが、AivisSpeech Engine では
-        ## 音声合成 API にアクセント句だけでなく通常の読み上げテキストを直接渡すためのパラメータとして利用している
-        ## 通常の読み上げテキストの方が遥かに抑揚が自然になるため、読み仮名のみの読み上げテキストよりも優先される
-        ## VOICEVOX ENGINE との互換性維持のための苦肉の策で、基本可能な限り AudioQuery.kana に読み上げテキストを指定すべき
-        if query.kana is not None and query.kana != "":
-            text = query.kana.strip()  # 事前に前後の空白を削除
+    def _raw_wave_to_output_wave(
+        self,
+        query: AudioQuery,
+        raw_sample_rate: int,
+        raw_wave: NDArray[Any],
+    ) -> NDArray[np.float32]:
+        """
+        後処理前の音声波形を正規化して前後の無音区間を追加し、音量調整/サンプルレート変更/ステレオ化を行う
 
-            # アクセント辞書でのプレビュー時のエラーを回避するための処理
-            ## もし AudioQuery に含まれる最後のモーラの text が "ガ" だったら、テキストの末尾に "ガ" を追加する
-            ## Style-Bert-VITS2 ではトーンの数と g2p した際の音素の数が一致している必要があるが、
-            ## アクセント辞書のプレビュー時にエディタから送信される kana の末尾には "ガ" が含まれておらず、InvalidToneError が発生する
-            ## エディタ側で修正することも可能だが、VOICEVOX ENGINE との互換性のため、エラーにならないようにここで処理する
-            if (
-                len(query.accent_phrases) > 0
-                and len(query.accent_phrases[-1].moras) > 0
-            ):
-                # 最後のモーラを取得し、その text が "ガ" であることを確認
-                last_mora = query.accent_phrases[-1].moras[-1]
-                if last_mora.text == "ガ":
-                    # Style-Bert-VITS2 側の g2p 処理を呼び、カタカナ化されたモーラのリストを取得
-                    kata_mora_list = g2kata_tone(normalize_text(text))
-                    # kata_mora_list の最後のモーラが "ガ" でない場合は "ガ" を追加
-                    if len(kata_mora_list) > 0 and kata_mora_list[-1][0] != "ガ":
-                        text += "ガ"
-        else:
-            logger.warning("AudioQuery.kana is not specified. Using accent phrases instead.")  # fmt: skip
-            # 読み仮名 (カタカナのみ) のテキストを取得
-            ## ひらがなの方がまだ抑揚の棒読み度がマシになるため、カタカナをひらがなに変換する
-            flatten_moras = to_flatten_moras(query.accent_phrases)
-            text = "".join([mora.text for mora in flatten_moras])
-            text = cast(str, jaconv.kata2hira(text))
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        raw_sample_rate : int
+            音声波形のサンプリングレート
+        raw_wave : NDArray[Any]
+            後処理前の音声波形 (前後の無音区間を含まない、正規化前の音声波形)
 
-        # AudioQuery.accent_phrase をカタカナモーラと音高 (0 or 1) のリストに変換
-        kata_tone_list: list[tuple[str, int]] = []
-        for accent_phrase in query.accent_phrases:
-            # モーラのうちどこがアクセント核かを示すインデックス
-            accent_index = accent_phrase.accent - 1  # 1-indexed -> 0-indexed
-            for index, mora in enumerate(accent_phrase.moras):
-                tone = 0
-                # index が 0 かつ accent_index が 0 以外の時は常に tone を 0 にする
-                if index == 0 and accent_index != 0:
-                    tone = 0
-                # index <= accent_index の時は tone を 1 にする
-                elif index <= accent_index:
-                    tone = 1
-                # それ以外の時は tone を 0 にする
-                else:
-                    tone = 0
-                # モーラのテキストと音高をリストに追加
-                kata_tone_list.append((mora.text, tone))
-            # もし pause_mora があればそれも追加
-            ## AivisSpeech Engine から取得した AudioQuery がそのまま送られた際は pause_mora は設定されず、
-            ## 句読点や記号は通常の mora (vowel=pau) として text 内の記号表現を維持した状態で含まれる
-            ## 一方 AivisSpeech エディタ側で読みが編集されている際は AudioQuery に pause_mora が設定されていることがあるため、
-            ## 互換性のために pause_mora が設定されている場合のみ読点として追加する
-            if accent_phrase.pause_mora is not None:
-                kata_tone_list.append((',', 0))  # テキストは "," 固定 ("," は正規化後の読点の文字列表現) 、音高は 0 固定  # fmt: skip
+        Returns
+        -------
+        NDArray[np.float32]
+            後処理済みの音声波形 (float32 型)
+        """
 
-        # 音素と音高のリストに変換した後、さらにそれぞれ音素・音高だけのリストに変換
-        if text != "":
-            # 事前にカタカナ表記でない音素と音高のリストに変換するのが大変重要
-            ## これをやらないと InvalidToneError が発生する
-            ## Mora.consonant / Mora.vowel に入れられた子音/母音は VOICEVOX ENGINE 互換の表現で Style-Bert-VITS2 とは
-            ## 微妙に異なるため採用せず、常に Mora.text に記載のカタカナのみから音素と音高を取得する
-            ## VOICEVOX ENGINE 互換にする際に記号モーラの Mora.vowel が "pau" に統一されてしまう兼ね合いもある
-            phone_tone_list = kata_tone2phone_tone(kata_tone_list)
-            given_phone_list = [phone for phone, _ in phone_tone_list]
-            given_tone_list = [tone for _, tone in phone_tone_list]
+        # VOICEVOX CORE は float32 型の音声波形を返すため、int16 から float32 に変換して VOICEVOX CORE に合わせる
+        ## float32 に変換する際に -1.0 ~ 1.0 の範囲に正規化する (新しい配列が作られるため、共有された推論結果は変更されない)
+        raw_wave = raw_wave.astype(np.float32) / 32768.0
+
+        # 前後の無音区間を追加
+        pre_silence_length = int(raw_sample_rate * query.prePhonemeLength)
+        post_silence_length = int(raw_sample_rate * query.postPhonemeLength)
+        silence_wave_pre = np.zeros(pre_silence_length, dtype=np.float32)
+        silence_wave_post = np.zeros(post_silence_length, dtype=np.float32)
+        raw_wave = np.concatenate((silence_wave_pre, raw_wave, silence_wave_post))
+
+        # 生成した音声の音量調整/サンプルレート変更/ステレオ化を行ってから返す
+        wave = raw_wave_to_output_wave(query, raw_wave, raw_sample_rate)
+        return wave
+
+    def _synthesize_raw_wave(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+    ) -> tuple[int, NDArray[Any]]:
+        """
+        音声合成用のクエリに含まれる読み仮名に基づいて推論を行い、後処理前の音声波形を生成する
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        tuple[int, NDArray[Any]]
+            音声波形のサンプリングレートと、生成された音声波形 (前後の無音区間を含まない、正規化前の音声波形)
+        """
+
+        # モーフィング時などに同一参照の AudioQuery で複数回呼ばれる可能性があるので、元の引数の AudioQuery に破壊的変更を行わない
+        query = copy.deepcopy(query)
+
+        aivm_uuid, tts_model_pool, inference_requests = self._prepare_inference_requests(query, style_id, split_sentences=False)  # fmt: skip
+        pool_size_before_inference = tts_model_pool.size
+
+        # テキストが空文字列ではなく、given_phone_list / given_tone_list が空でない場合のみ音声合成を実行
+        if len(inference_requests) > 0:
+            # 長い読み上げテキストを区間に分割した場合、区間ごとに生成した音声波形は、境界をクロスフェードしながら連結する
+            raw_sample_rate = self.default_sampling_rate
+            raw_waves: list[NDArray[Any]] = []
+            for raw_sample_rate, raw_wave in self._iter_infer_segments(inference_requests):  # fmt: skip
+                raw_waves.append(raw_wave)
+            if len(raw_waves) > 1:
+                raw_wave = crossfade_concatenate(raw_waves, int(raw_sample_rate * self.LONG_INPUT_CROSSFADE_SEC))  # fmt: skip
+            else:
+                raw_wave = raw_waves[0]
+
+        # 空文字列が入力された場合、0.5 秒の無音波形を後続の処理に渡す
         else:
-            given_phone_list = []
-            given_tone_list = []
+            logger.info("Text is empty. Returning 0.5 sec silence.")
+            raw_sample_rate = self.default_sampling_rate
+            raw_wave = np.zeros(int(self.default_sampling_rate * 0.5), dtype=np.float32)  # fmt: skip
+
+        self._update_model_pool_size(aivm_uuid, tts_model_pool, pool_size_before_inference)  # fmt: skip
+
+        return raw_sample_rate, raw_wave
+
+    def synthesize_wave_with_cache(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+    ) -> tuple[NDArray[np.float32], bool]:
+        """
+        音声合成結果のキャッシュを利用して音声合成を行う
+        同じ音声合成用のクエリ・スタイル ID・音声合成モデルのリビジョンでの音声合成結果がキャッシュされていれば、推論せずにそれを返す
+        音声合成結果のキャッシュが無効な場合は、常に音声合成を行う
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        tuple[NDArray[np.float32], bool]
+            生成された音声波形 (float32 型) と、キャッシュにヒットしたかどうか
+        """
+
+        if self.synthesis_result_cache is None:
+            return self.synthesize_wave(query, style_id), False
+
+        aivm_manifest, _, _ = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)  # fmt: skip
+        aivm_uuid = str(aivm_manifest.uuid)
+        model_revision = self._get_model_revision(aivm_uuid)
+        # 読み上げテキストの解析結果はユーザー辞書に依存するため、キーには辞書のフィンガープリントも含める
+        ## ディスク上のキャッシュは再起動後も利用されるため、プロセス内でのみ有効な辞書のバージョンではなく、辞書の内容から計算した値を使う
+        key = SynthesisResultCache.make_key(query, style_id, model_revision, self._synthesis_cache_namespace, get_dict_fingerprint())  # fmt: skip
+        return self.synthesis_result_cache.get_or_synthesize(
+            aivm_uuid,
+            model_revision,
+            key,
+            lambda: self.synthesize_wave(query, style_id),
+        )
+
+    def synthesize_wave_incremental(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        handle: str,
+    ) -> tuple[NDArray[np.float32], int, int]:
+        """
+        同じハンドルでの前回の音声合成結果を利用して、変更された文のみを音声合成し直す差分音声合成を行う
+        読み上げテキストを文ごとに分割し、音素・音高・パラメータ・音声合成モデルが前回と同じ文は前回の音声波形を再利用して、
+        変更された文のみを推論した上で、文の境界をクロスフェードしながら連結する
+        推論を別プロセスのワーカーで実行している場合や、前回の音声合成結果を保持しない設定の場合は、常に全体を音声合成する
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+        handle : str
+            前回の音声合成結果を識別するハンドル (エディタの行ごとの ID など、クライアントが任意に決める)
+
+        Returns
+        -------
+        tuple[NDArray[np.float32], int, int]
+            生成された音声波形 (float32 型)・前回の音声波形を再利用した文の数・音声合成し直した文の数
+        """
+
+        # ワーカープロセスは後処理まで行った音声波形を返すため、文ごとの音声波形を再利用できない
+        ## クエリ全体を 1 つの区間として音声合成したものとして扱う
+        if self.synthesis_worker_pool is not None:
+            return self.synthesize_wave(query, style_id), 0, 1
+
+        # モーフィング時などに同一参照の AudioQuery で複数回呼ばれる可能性があるので、元の引数の AudioQuery に破壊的変更を行わない
+        query = copy.deepcopy(query)
+
+        aivm_uuid, tts_model_pool, inference_requests = self._prepare_inference_requests(query, style_id, split_sentences=True)  # fmt: skip
+        pool_size_before_inference = tts_model_pool.size
+
+        # 空文字列が入力された場合、0.5 秒の無音波形を後続の処理に渡す
+        if len(inference_requests) == 0:
+            logger.info("Text is empty. Returning 0.5 sec silence.")
+            if self.incremental_synthesis_store is not None:
+                self.incremental_synthesis_store.delete(handle)
+            raw_wave = np.zeros(int(self.default_sampling_rate * 0.5), dtype=np.float32)  # fmt: skip
+            return self._raw_wave_to_output_wave(query, self.default_sampling_rate, raw_wave), 0, 0  # fmt: skip
+
+        # 文ごとの推論結果に影響する入力から、前回の音声合成結果を照合するためのキーを生成する
+        model_revision = self._get_model_revision(aivm_uuid)
+        dict_fingerprint = get_dict_fingerprint()
+        segment_keys = [
+            _make_segment_key(
+                aivm_uuid,
+                model_revision,
+                self._synthesis_cache_namespace,
+                dict_fingerprint,
+                inference_request,
+            )  # fmt: skip
+            for inference_request in inference_requests
+        ]
+
+        # 前回の音声合成結果にない文のみを推論する
+        def synthesize(
+            changed_indices: list[int],
+        ) -> Iterator[tuple[int, NDArray[Any]]]:
+            changed_requests = [inference_requests[index] for index in changed_indices]
+            return self._iter_infer_segments(changed_requests)
+
+        rendered_segments, reused_segment_count, synthesized_segment_count = (
+            render_segments(
+                self.incremental_synthesis_store, handle, segment_keys, synthesize
+            )
+        )
+        logger.info(f"Incremental synthesis: {reused_segment_count} reused, {synthesized_segment_count} synthesized.")  # fmt: skip
+
+        # 文ごとの音声波形を、境界をクロスフェードしながら連結する
+        raw_sample_rate = rendered_segments[-1].sample_rate
+        if len(rendered_segments) > 1:
+            raw_wave = crossfade_concatenate([segment.raw_wave for segment in rendered_segments], int(raw_sample_rate * self.LONG_INPUT_CROSSFADE_SEC))  # fmt: skip
+        else:
+            raw_wave = rendered_segments[0].raw_wave
+
+        self._update_model_pool_size(aivm_uuid, tts_model_pool, pool_size_before_inference)  # fmt: skip
+
+        return self._raw_wave_to_output_wave(query, raw_sample_rate, raw_wave), reused_segment_count, synthesized_segment_count  # fmt: skip
+
+    def _get_model_revision(self, aivm_uuid: str) -> str:
+        """
+        音声合成モデルのリビジョンを表す文字列を返す
+        同じバージョンのモデルを再インストールした場合も変わるよう、AIVMX ファイルのサイズと更新日時を含める
+        """
+
+        aivm_info = self.aivm_manager.get_aivm_info(aivm_uuid)
+        try:
+            stat = aivm_info.file_path.stat()
+            file_revision = f"{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            file_revision = "unknown"
+        return f"{aivm_info.manifest.version}:{file_revision}"
+
+    def synthesize_wave_stream(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+    ) -> Iterator[NDArray[np.float32]]:
+        """
+        音声合成用のクエリに含まれる読み上げテキストを文ごとに分割して音声合成し、生成できた文から順に音声波形を返す
+        全ての音声波形を連結すると、前後の無音区間を含む 1 つの音声波形になる (文の境界はクロスフェードせずにそのまま連結する)
+        推論を別プロセスのワーカーで実行している場合は、全体を一度に音声合成した音声波形のみを返す
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        Iterator[NDArray[np.float32]]
+            文ごとに生成された音声波形 (float32 型) のイテレーター
+        """
+
+        start_time = time.perf_counter()
+        if self.synthesis_worker_pool is not None:
+            wave = self.synthesize_wave(query, style_id)
+            self._record_first_chunk_latency(time.perf_counter() - start_time)
+            yield wave
+            return
+
+        query = copy.deepcopy(query)
+        aivm_uuid, tts_model_pool, inference_requests = self._prepare_inference_requests(query, style_id, split_sentences=True)  # fmt: skip
+        pool_size_before_inference = tts_model_pool.size
+
+        # 空文字列が入力された場合は 0.5 秒の無音波形を返す
+        raw_results: Iterator[tuple[int, NDArray[Any]]]
+        if len(inference_requests) > 0:
+            raw_results = self._iter_infer_segments(inference_requests)
+        else:
+            logger.info("Text is empty. Returning 0.5 sec silence.")
+            raw_results = iter([(self.default_sampling_rate, np.zeros(int(self.default_sampling_rate * 0.5), dtype=np.float32))])  # fmt: skip
+
+        # クライアントの切断などでジェネレーターが途中で閉じられた場合も、推論セッションプールのサイズの変化を反映する
+        try:
+            yield from iter_stream_chunks(
+                raw_results,
+                default_sampling_rate=self.default_sampling_rate,
+                pre_phoneme_length=query.prePhonemeLength,
+                post_phoneme_length=query.postPhonemeLength,
+                to_output_wave=lambda wave, sample_rate: raw_wave_to_output_wave(query, wave, sample_rate),  # fmt: skip
+                on_first_chunk=lambda: self._record_first_chunk_latency(time.perf_counter() - start_time),  # fmt: skip
+            )
+        finally:
+            self._update_model_pool_size(aivm_uuid, tts_model_pool, pool_size_before_inference)  # fmt: skip
+
+    def _record_first_chunk_latency(self, latency: float) -> None:
+        """ストリーミング音声合成で、最初の音声波形を返すまでの時間を記録する。"""
+        logger.info(f"First audio chunk is ready. ({latency:.2f}s)")
+        self.first_chunk_latency_recorder.record(latency)
+
+    def _prepare_inference_requests(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        split_sentences: bool,
+    ) -> tuple[str, TTSModelPool[TTSModel], list["_InferenceRequest"]]:
+        """
+        音声合成用のクエリから、音声合成モデルに対する区間ごとの推論リクエストを生成する
+        音素数が max_segment_phones を超える長い読み上げテキストは、句読点の位置で区間に分割する
+        音声合成モデルが未ロードの場合はロードする
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+        split_sentences : bool
+            読み上げテキストを文ごとの区間に分割するかどうか
+
+        Returns
+        -------
+        tuple[str, TTSModelPool[TTSModel], list[_InferenceRequest]]
+            AIVM の UUID・音声合成モデルの推論セッションプール・区間ごとの推論リクエストのリスト (読み上げテキストが空の場合は空のリスト)
+        """
+
+        # 読み上げテキストを音素と音高のリストに変換
+        ## パイプライン並列化が有効な場合は、frontend ステージのスレッドで実行する
+        if self._pipeline is not None:
+            frontend_result = self._pipeline.frontend.run(
+                lambda: self._run_text_frontend(query)
+            )
+        else:
+            frontend_result = self._run_text_frontend(query)
+        text, given_phone_list, given_tone_list, text_analysis = frontend_result
 
         # スタイル ID に対応する AivmManifest, AivmManifestSpeaker, AivmManifestSpeakerStyle を取得
         result = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)
@@ -558,7 +1505,11 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         aivm_manifest_speaker_style = result[2]
 
         # 音声合成モデルをロード (初回のみ)
-        model = self.load_model(str(aivm_manifest.uuid))
+        aivm_uuid = str(aivm_manifest.uuid)
+        tts_model_pool = self.load_model(aivm_uuid)
+        self.model_residency.touch(aivm_uuid)
+        ## ハイパーパラメータはプール内の全ての推論セッションで共通
+        hyper_parameters = tts_model_pool.sessions[0].hyper_parameters
         logger.info(f"Model: {aivm_manifest.name} / Version {aivm_manifest.version}")  # fmt: skip
         logger.info(f"Speaker: {aivm_manifest_speaker.name} / Style: {aivm_manifest_speaker_style.name}")  # fmt: skip
 
@@ -570,7 +1521,7 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         local_speaker_id: int = aivm_manifest_speaker.local_id
         local_style_id: int = aivm_manifest_speaker_style.local_id
         local_style_name: str | None = None
-        for hps_style_name, hps_style_id in model.hyper_parameters.data.style2id.items():  # fmt: skip
+        for hps_style_name, hps_style_id in hyper_parameters.data.style2id.items():  # fmt: skip
             if hps_style_id == local_style_id:
                 local_style_name = hps_style_name
                 break
@@ -614,66 +1565,394 @@ class StyleBertVITS2TTSEngine(TTSEngine):
 
         # 音声合成を実行
         ## 出力音声は int16 型の NDArray で返される
-        ## 推論処理を大量に並列実行すると最悪プロセスごと ONNX Runtime がクラッシュするため、排他ロックを掛ける
-        with self._inference_lock:
-            logger.info("Running inference...")
-            logger.info(f"Text: {text}")
-            logger.info(f"         Speed: {length:.2f} (Input: {query.speedScale:.2f})")
-            logger.info(f"  Style Weight: {style_weight:.2f} (Input: {query.intonationScale:.2f})")  # fmt: skip
-            logger.info(f"Tempo Dynamics: {sdp_ratio:.2f} (Input: {query.tempoDynamicsScale:.2f})")  # fmt: skip
-            logger.info(f"         Pitch: {pitch_scale:.2f} (Input: {query.pitchScale:.2f})")  # fmt: skip
-            logger.info(f"        Volume: {query.volumeScale:.2f}")
-            logger.info(f"   Pre-Silence: {query.prePhonemeLength:.2f}")
-            logger.info(f"  Post-Silence: {query.postPhonemeLength:.2f}")
-
-            # テキストが空文字列ではなく、given_phone_list / given_tone_list が空でない場合のみ音声合成を実行
-            if text != "" and len(given_phone_list) > 0 and len(given_tone_list) > 0:
-                start_time = time.time()
-                raw_sample_rate, raw_wave = model.infer(
-                    text=text,
-                    given_phone=given_phone_list,
-                    given_tone=given_tone_list,
-                    language=Languages.JP,
-                    speaker_id=local_speaker_id,
-                    style=local_style_name,
-                    style_weight=style_weight,
-                    sdp_ratio=sdp_ratio,
-                    length=length,
-                    pitch_scale=pitch_scale,
-                    # AivisSpeech Engine ではテキストの改行ごとの分割生成を行わない (エディタ側の機能と競合するため)
-                    # line_split=True だと音素やアクセントの指定ができない
-                    line_split=False,
-                )
-                logger.info("Inference done. Elapsed time: {:.2f} sec.".format(time.time() - start_time))  # fmt: skip
+        logger.info("Running inference...")
+        logger.info(f"Text: {text}")
+        logger.info(f"         Speed: {length:.2f} (Input: {query.speedScale:.2f})")
+        logger.info(f"  Style Weight: {style_weight:.2f} (Input: {query.intonationScale:.2f})")  # fmt: skip
+        logger.info(f"Tempo Dynamics: {sdp_ratio:.2f} (Input: {query.tempoDynamicsScale:.2f})")  # fmt: skip
+        logger.info(f"         Pitch: {pitch_scale:.2f} (Input: {query.pitchScale:.2f})")  # fmt: skip
+        logger.info(f"        Volume: {query.volumeScale:.2f}")
+        logger.info(f"   Pre-Silence: {query.prePhonemeLength:.2f}")
+        logger.info(f"  Post-Silence: {query.postPhonemeLength:.2f}")
+
+        # テキストが空文字列、または given_phone_list / given_tone_list が空の場合は音声合成しない
+        if text == "" or len(given_phone_list) == 0 or len(given_tone_list) == 0:
+            return aivm_uuid, tts_model_pool, []
+
+        # 音素数が max_segment_phones を超える長い読み上げテキストは、句読点の位置で区間に分割して区間ごとに音声合成する
+        ## 音響モデルの推論に使われるテンソルの大きさが区間の長さで頭打ちになるため、入力が長くなってもピークメモリ使用量が増え続けない
+        ## split_sentences が True の場合は、文末の句読点の位置でも区間に分割する
+        segments = [InputSegment(text=text, phones=given_phone_list, tones=given_tone_list)]  # fmt: skip
+        if split_sentences is True:
+            sentence_segments = split_long_input(normalize_text(text), given_phone_list, given_tone_list, 0, self.SENTENCE_PUNCTUATIONS)  # fmt: skip
+            if len(sentence_segments) > 1:
+                segments = sentence_segments
+        if self.max_segment_phones > 0:
+            split_segments: list[InputSegment] = []
+            for segment in segments:
+                if len(segment.phones) > self.max_segment_phones:
+                    split_segments.extend(split_long_input(normalize_text(segment.text), segment.phones, segment.tones, self.max_segment_phones, PUNCTUATIONS))  # fmt: skip
+                else:
+                    split_segments.append(segment)
+            if len(split_segments) > len(segments):
+                logger.info(f"Long input is split into {len(split_segments)} segments.")  # fmt: skip
+                segments = split_segments
+
+        inference_requests = [
+            _InferenceRequest(
+                tts_model_pool=tts_model_pool,
+                text=segment.text,
+                given_phone=segment.phones,
+                given_tone=segment.tones,
+                speaker_id=local_speaker_id,
+                style=local_style_name,
+                style_weight=style_weight,
+                sdp_ratio=sdp_ratio,
+                length=length,
+                pitch_scale=pitch_scale,
+                # フロントエンドで解析済みの読み上げテキストと一致する区間は、その解析結果を再利用する
+                text_analysis=(
+                    text_analysis
+                    if text_analysis is not None and text_analysis.text == segment.text
+                    else None
+                ),
+            )
+            for segment in segments
+        ]
+        return aivm_uuid, tts_model_pool, inference_requests
 
-            # 空文字列が入力された場合、0.5 秒の無音波形を後続の処理に渡す
-            else:
-                logger.info("Text is empty. Returning 0.5 sec silence.")
-                raw_sample_rate = self.default_sampling_rate
-                raw_wave = np.zeros(int(self.default_sampling_rate * 0.5), dtype=np.float32)  # fmt: skip
+    def _update_model_pool_size(
+        self,
+        aivm_uuid: str,
+        tts_model_pool: TTSModelPool[TTSModel],
+        pool_size_before_inference: int,
+    ) -> None:
+        """
+        推論中に推論セッションプールが拡張された場合は、メモリ使用量の推定値を更新する
+        更新後にメモリ使用量の上限を超えていれば、他のモデルをアンロードする
+        """
 
-        # VOICEVOX CORE は float32 型の音声波形を返すため、int16 から float32 に変換して VOICEVOX CORE に合わせる
-        ## float32 に変換する際に -1.0 ~ 1.0 の範囲に正規化する
-        raw_wave = raw_wave.astype(np.float32) / 32768.0
+        if tts_model_pool.size != pool_size_before_inference and aivm_uuid in self.model_residency:  # fmt: skip
+            with self._tts_models_lock:
+                self.model_residency.update_size(aivm_uuid, self._estimate_model_size(aivm_uuid, tts_model_pool.size))  # fmt: skip
+                self._evict_models(exclude=aivm_uuid)
 
-        # 前後の無音区間を追加
-        pre_silence_length = int(raw_sample_rate * query.prePhonemeLength)
-        post_silence_length = int(raw_sample_rate * query.postPhonemeLength)
-        silence_wave_pre = np.zeros(pre_silence_length, dtype=np.float32)
-        silence_wave_post = np.zeros(post_silence_length, dtype=np.float32)
-        raw_wave = np.concatenate((silence_wave_pre, raw_wave, silence_wave_post))
+    def _run_text_frontend(
+        self, query: AudioQuery
+    ) -> tuple[str, list[str], list[int], "_TextAnalysis | None"]:
+        """
+        音声合成用のクエリから、Style-Bert-VITS2 に渡す読み上げテキストと音素・音高のリストを生成する
 
-        # 生成した音声の音量調整/サンプルレート変更/ステレオ化を行ってから返す
-        wave = raw_wave_to_output_wave(query, raw_wave, raw_sample_rate)
-        return wave
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+
+        Returns
+        -------
+        tuple[str, list[str], list[int], _TextAnalysis | None]
+            読み上げテキスト・音素のリスト・音高のリスト・読み上げテキストの解析結果 (生成の過程で解析しなかった場合は None)
+        """
+
+        text_analysis: _TextAnalysis | None = None
+
+        # もし AudioQuery.kana に漢字混じりの通常の文章が指定されている場合はそれを使う (AivisSpeech 独自仕様)
+        ## VOICEVOX ENGINE では AudioQuery.kana は読み取り専用パラメータだが、AivisSpeech Engine では
+        ## 音声合成 API にアクセント句だけでなく通常の読み上げテキストを直接渡すためのパラメータとして利用している
+        ## 通常の読み上げテキストの方が遥かに抑揚が自然になるため、読み仮名のみの読み上げテキストよりも優先される
+        ## VOICEVOX ENGINE との互換性維持のための苦肉の策で、基本可能な限り AudioQuery.kana に読み上げテキストを指定すべき
+        if query.kana is not None and query.kana != "":
+            text = query.kana.strip()  # 事前に前後の空白を削除
+
+            # 音声合成用のクエリに読み上げテキストの解析結果のトークンが含まれていれば、g2p を行わずに解析結果を復元する
+            ## 読み上げテキスト・アクセント句・辞書のいずれかがトークンの作成時から変わっている場合は、通常通り解析する
+            text_analysis = self._restore_text_analysis(query, text)
+
+            # アクセント辞書でのプレビュー時のエラーを回避するための処理
+            ## もし AudioQuery に含まれる最後のモーラの text が "ガ" だったら、テキストの末尾に "ガ" を追加する
+            ## Style-Bert-VITS2 ではトーンの数と g2p した際の音素の数が一致している必要があるが、
+            ## アクセント辞書のプレビュー時にエディタから送信される kana の末尾には "ガ" が含まれておらず、InvalidToneError が発生する
+            ## エディタ側で修正することも可能だが、VOICEVOX ENGINE との互換性のため、エラーにならないようにここで処理する
+            if (
+                len(query.accent_phrases) > 0
+                and len(query.accent_phrases[-1].moras) > 0
+            ):
+                # 最後のモーラを取得し、その text が "ガ" であることを確認
+                last_mora = query.accent_phrases[-1].moras[-1]
+                if last_mora.text == "ガ":
+                    # Style-Bert-VITS2 側の g2p 処理を呼び、カタカナ化されたモーラのリストを取得
+                    ## 解析結果は、読み上げテキストを変更しない場合は推論時にそのまま再利用される
+                    if text_analysis is None:
+                        text_analysis = _analyze_text(text, self.text_frontend_cache)
+                    kata_mora_list = phone_tone2kata_tone(list(zip(text_analysis.phones, text_analysis.tones)))  # fmt: skip
+                    # kata_mora_list の最後のモーラが "ガ" でない場合は "ガ" を追加
+                    if len(kata_mora_list) > 0 and kata_mora_list[-1][0] != "ガ":
+                        text += "ガ"
+                        text_analysis = None
+        else:
+            logger.warning("AudioQuery.kana is not specified. Using accent phrases instead.")  # fmt: skip
+            # 読み仮名 (カタカナのみ) のテキストを取得
+            ## ひらがなの方がまだ抑揚の棒読み度がマシになるため、カタカナをひらがなに変換する
+            flatten_moras = to_flatten_moras(query.accent_phrases)
+            text = "".join([mora.text for mora in flatten_moras])
+            text = cast(str, jaconv.kata2hira(text))
+
+        # AudioQuery.accent_phrase をカタカナモーラと音高 (0 or 1) のリストに変換
+        kata_tone_list: list[tuple[str, int]] = []
+        for accent_phrase in query.accent_phrases:
+            # モーラのうちどこがアクセント核かを示すインデックス
+            accent_index = accent_phrase.accent - 1  # 1-indexed -> 0-indexed
+            for index, mora in enumerate(accent_phrase.moras):
+                tone = 0
+                # index が 0 かつ accent_index が 0 以外の時は常に tone を 0 にする
+                if index == 0 and accent_index != 0:
+                    tone = 0
+                # index <= accent_index の時は tone を 1 にする
+                elif index <= accent_index:
+                    tone = 1
+                # それ以外の時は tone を 0 にする
+                else:
+                    tone = 0
+                # モーラのテキストと音高をリストに追加
+                kata_tone_list.append((mora.text, tone))
+            # もし pause_mora があればそれも追加
+            ## AivisSpeech Engine から取得した AudioQuery がそのまま送られた際は pause_mora は設定されず、
+            ## 句読点や記号は通常の mora (vowel=pau) として text 内の記号表現を維持した状態で含まれる
+            ## 一方 AivisSpeech エディタ側で読みが編集されている際は AudioQuery に pause_mora が設定されていることがあるため、
+            ## 互換性のために pause_mora が設定されている場合のみ読点として追加する
+            if accent_phrase.pause_mora is not None:
+                kata_tone_list.append((',', 0))  # テキストは "," 固定 ("," は正規化後の読点の文字列表現) 、音高は 0 固定  # fmt: skip
+
+        # 音素と音高のリストに変換した後、さらにそれぞれ音素・音高だけのリストに変換
+        if text != "":
+            # 事前にカタカナ表記でない音素と音高のリストに変換するのが大変重要
+            ## これをやらないと InvalidToneError が発生する
+            ## Mora.consonant / Mora.vowel に入れられた子音/母音は VOICEVOX ENGINE 互換の表現で Style-Bert-VITS2 とは
+            ## 微妙に異なるため採用せず、常に Mora.text に記載のカタカナのみから音素と音高を取得する
+            ## VOICEVOX ENGINE 互換にする際に記号モーラの Mora.vowel が "pau" に統一されてしまう兼ね合いもある
+            phone_tone_list = kata_tone2phone_tone(kata_tone_list)
+            given_phone_list = [phone for phone, _ in phone_tone_list]
+            given_tone_list = [tone for _, tone in phone_tone_list]
+        else:
+            given_phone_list = []
+            given_tone_list = []
+
+        return text, given_phone_list, given_tone_list, text_analysis
+
+    def _restore_text_analysis(
+        self, query: AudioQuery, text: str
+    ) -> "_TextAnalysis | None":
+        """
+        音声合成用のクエリに含まれるトークンから、読み上げテキストの解析結果を復元する
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        text : str
+            音声合成する読み上げテキスト
+
+        Returns
+        -------
+        _TextAnalysis | None
+            読み上げテキストの解析結果 (トークンがない場合や、トークンが無効・不一致の場合は None)
+        """
+
+        if query.frontendToken is None or self.frontend_token_codec is None:
+            return None
+        g2p_result = self.frontend_token_codec.decode(
+            query.frontendToken,
+            text,
+            query.accent_phrases,
+            get_dict_fingerprint(),
+        )
+        if g2p_result is None:
+            logger.info("Frontend token does not match the query. Analyzing text again.")  # fmt: skip
+            return None
+        return _TextAnalysis(text, normalize_text(text), g2p_result)
+
+    def synthesize_wave_cancellable(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        cancel_event: threading.Event,
+    ) -> NDArray[np.float32]:
+        """
+        音声合成用のクエリに基づいて、キャンセル可能な音声合成を行う
+        cancel_event がセットされると、音声合成を担当するワーカープロセスを終了して SynthesisCancelledError を送出する
+        推論を別プロセスのワーカーで実行している (synthesis_workers が 1 以上) 場合のみ利用できる
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+        cancel_event : threading.Event
+            セットされると音声合成をキャンセルするイベント
+
+        Returns
+        -------
+        NDArray[np.float32]
+            生成された音声波形 (float32 型)
+        """
+
+        if self.synthesis_worker_pool is None:
+            raise RuntimeError("Cancellable synthesis requires synthesis workers.")
+        aivm_manifest, _, _ = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)  # fmt: skip
+        return self.synthesis_worker_pool.synthesize(str(aivm_manifest.uuid), query, style_id, cancel_event)  # fmt: skip
+
+    def _iter_infer_segments(
+        self,
+        inference_requests: list["_InferenceRequest"],
+    ) -> Iterator[tuple[int, NDArray[Any]]]:
+        """
+        区間ごとの推論リクエストを先頭から順に推論し、区間ごとにサンプリングレートと int16 型の音声波形のタプルを返す
+        パイプライン並列化が有効な場合は、BERT 特徴量の抽出と音響モデルの推論をそれぞれのステージのスレッドで実行する
+        """
+
+        if self._pipeline is None:
+            for inference_request in inference_requests:
+                yield self._infer(self._analyze_inference_request(inference_request))  # fmt: skip
+            return
+        yield from self._pipeline.iter_segments(inference_requests, self._prefetch_bert_feature, self._infer)  # fmt: skip
+
+    def _infer(
+        self,
+        inference_request: "_InferenceRequest",
+    ) -> tuple[int, NDArray[Any]]:
+        """
+        推論リクエストを推論セッションプールから借り出したセッションで推論し、サンプリングレートと int16 型の音声波形のタプルを返す
+
+        Parameters
+        ----------
+        inference_request : _InferenceRequest
+            推論リクエスト
+
+        Returns
+        -------
+        tuple[int, NDArray[Any]]
+            サンプリングレートと int16 型の音声波形のタプル
+        """
+
+        # BERT ステージで推論まで完了している場合はその結果を返す
+        if inference_request.result is not None:
+            return inference_request.result
+
+        ## 1 つの推論セッションを複数スレッドから同時に利用すると最悪プロセスごと ONNX Runtime がクラッシュするため、
+        ## 推論セッションプールから空いているセッションを借り出し、推論中はそのセッションを占有する
+        ## DirectML 利用時のみ、さらにプロセス全体で推論処理を直列化する
+        ## 全てのセッションで共有される BERT モデルの推論は、差し替えた BERT 特徴量抽出関数の内部で専用のロックにより直列化される
+        with inference_request.tts_model_pool.acquire() as model, self._inference_lock:
+            start_time = time.time()
+            result = self._run_tts_model(model, inference_request)
+            logger.info("Inference done. Elapsed time: {:.2f} sec.".format(time.time() - start_time))  # fmt: skip
+        return result
+
+    def _analyze_inference_request(
+        self,
+        inference_request: "_InferenceRequest",
+    ) -> "_InferenceRequest":
+        """
+        推論リクエストの読み上げテキストを解析し、解析結果を付与した推論リクエストを返す
+        推論セッションを借り出す前に解析しておくことで、g2p が推論セッションの占有中に実行されないようにする
+        既に解析済みの場合や、解析結果を再利用できない場合はそのまま返す
+        """
+
+        if inference_request.text_analysis is not None or self._text_analysis_enabled is False:  # fmt: skip
+            return inference_request
+        return replace(inference_request, text_analysis=_analyze_text(inference_request.text, self.text_frontend_cache))  # fmt: skip
+
+    def _prefetch_bert_feature(
+        self,
+        inference_request: "_InferenceRequest",
+    ) -> "_InferenceRequest":
+        """
+        推論リクエストの BERT 特徴量を事前に抽出し、抽出した BERT 特徴量を付与した推論リクエストを返す
+        パイプライン並列化が有効な場合に、BERT ステージのスレッドで実行される
+
+        Style-Bert-VITS2 は TTSModel.infer() の内部で BERT 特徴量を抽出するため、推論処理を BERT 特徴量の抽出直後に中断させることで、
+        Style-Bert-VITS2 の内部と全く同じ引数で BERT 特徴量を抽出する
+        BERT 特徴量抽出関数が呼び出されなかった場合はそのまま音響モデルの推論まで実行されてしまうため、
+        推論セッションプールから推論セッションを借り出した上で実行し、その場合は推論結果を付与して音響ステージで推論し直さないようにする
+        """
+
+        inference_request = self._analyze_inference_request(inference_request)
+        with inference_request.tts_model_pool.acquire() as model, self._inference_lock:
+            _bert_feature_context.capturing = True
+            try:
+                result = self._run_tts_model(model, inference_request)
+            except _BertFeatureCaptured as e:
+                return replace(inference_request, bert_feature=e.prefetched_feature)
+            finally:
+                _bert_feature_context.capturing = False
+        logger.warning("BERT feature extractor was not called during inference. BERT features are not prefetched.")  # fmt: skip
+        return replace(inference_request, result=result)
+
+    def _run_tts_model(
+        self,
+        model: TTSModel,
+        inference_request: "_InferenceRequest",
+    ) -> tuple[int, NDArray[Any]]:
+        """推論リクエストを音声合成モデルで推論する。読み上げテキストの解析結果や BERT 特徴量が事前に用意されている場合はそれを使う。"""
+
+        _bert_feature_context.prefetched = inference_request.bert_feature
+        _bert_feature_context.called = False
+        _text_analysis_context.analysis = inference_request.text_analysis
+        _text_analysis_context.called = False
+        try:
+            result = model.infer(
+                text=inference_request.text,
+                given_phone=inference_request.given_phone,
+                given_tone=inference_request.given_tone,
+                language=Languages.JP,
+                speaker_id=inference_request.speaker_id,
+                style=inference_request.style,
+                style_weight=inference_request.style_weight,
+                sdp_ratio=inference_request.sdp_ratio,
+                length=inference_request.length,
+                pitch_scale=inference_request.pitch_scale,
+                # AivisSpeech Engine ではテキストの改行ごとの分割生成を行わない (エディタ側の機能と競合するため)
+                # line_split=True だと音素やアクセントの指定ができない
+                line_split=False,
+            )
+        finally:
+            _bert_feature_context.prefetched = None
+            _text_analysis_context.analysis = None
+        if self._hooks_verified is False:
+            self._verify_hooks()
+        return result
+
+    def _verify_hooks(self) -> None:
+        """
+        最初に完了した推論 (通常はモデルのロード直後のウォームアップ推論) で、差し替えた BERT 特徴量抽出関数と g2p 関数が
+        TTSModel.infer() の内部から実際に呼び出されたことを確認する
+        Style-Bert-VITS2 の内部実装が変わり差し替えが効いていない場合は、差し替えに依存する機能を無効化する
+        """
+
+        self._hooks_verified = True
+        if self._bert_feature_hook_installed is True and getattr(_bert_feature_context, "called", False) is False:  # fmt: skip
+            # BERT 特徴量の抽出を専用のロックで排他制御できないため、全ての推論処理を直列化する
+            logger.error("BERT feature extractor hook was not called during inference. BERT feature cache and pipeline parallelism are disabled, and all inference is serialized.")  # fmt: skip
+            self._bert_feature_hook_installed = False
+            self.bert_feature_cache = None
+            self._pipeline = None
+            if isinstance(self._inference_lock, nullcontext):
+                self._inference_lock = threading.Lock()
+        if self._text_analysis_enabled is True and getattr(_text_analysis_context, "called", False) is False:  # fmt: skip
+            logger.warning("g2p hook was not called during inference. Text analysis results are not reused.")  # fmt: skip
+            self._text_analysis_enabled = False
 
     def initialize_synthesis(self, style_id: StyleId, skip_reinit: bool) -> None:
         """指定されたスタイル ID に関する合成機能を初期化する。既に初期化されていた場合は引数に応じて再初期化する。"""
         # スタイル ID に対応する AivmManifest を取得後、
         # AIVM マニフェスト記載の UUID に対応する音声合成モデルをロードする
         ## FIXME: StyleBertVITS2TTSEngine の内部実装上、当面 skip_reinit 引数は無視して必要なときのみロードする
+        ## 事前ロードのキューに積むと先に積まれた全てのモデルのロードを待つことになるため、呼び出し元のスレッドで直接ロードし、ウォームアップ推論まで行う
+        ## 同じモデルが事前ロード中の場合は、load_model() がそのロードの完了を待つ
         aivm_manifest, _, _ = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)  # fmt: skip
-        self.load_model(str(aivm_manifest.uuid))
+        self._preload_model(str(aivm_manifest.uuid), lambda state: None)
 
     def is_synthesis_initialized(self, style_id: StyleId) -> bool:
         """指定されたスタイル ID に関する合成機能が初期化済みか否かを取得する。"""
@@ -683,6 +1962,267 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         return self.is_model_loaded(str(aivm_manifest.uuid))
 
 
+@dataclass(frozen=True)
+class _InferenceRequest:
+    """音声合成モデルに対する 1 回分の推論リクエスト"""
+
+    tts_model_pool: TTSModelPool[TTSModel]
+    text: str
+    given_phone: list[str]
+    given_tone: list[int]
+    speaker_id: int
+    style: str
+    style_weight: float
+    sdp_ratio: float
+    length: float
+    pitch_scale: float
+    # パイプライン並列化が有効な場合に、BERT ステージで事前に抽出された BERT 特徴量
+    bert_feature: "_PrefetchedBertFeature | None" = None
+    # 事前に解析された読み上げテキストの解析結果 (TTSModel.infer() 内部での正規化と g2p の代わりに使われる)
+    text_analysis: "_TextAnalysis | None" = None
+    # BERT ステージで BERT 特徴量を事前抽出できず、推論まで完了した場合の推論結果
+    result: tuple[int, NDArray[Any]] | None = None
+
+
+# BERT 特徴量の抽出を排他制御するためのロック
+## BERT モデルの推論セッションはプロセス内で共有されるため、複数のスレッドから同時に推論しないようにする
+## _install_bert_feature_hook() で差し替えた BERT 特徴量抽出関数から参照される
+_bert_inference_lock: AbstractContextManager[Any] = threading.Lock()
+
+# BERT 特徴量の抽出時に参照される BertFeatureCache
+## _install_bert_feature_cache() で差し替えた BERT 特徴量抽出関数から参照される
+_bert_feature_cache: BertFeatureCache | None = None
+
+# BERT 特徴量抽出関数を呼び出したスレッドごとの状態
+## called: TTSModel.infer() の内部から差し替えた BERT 特徴量抽出関数が呼び出されたかどうか
+## capturing: True の場合、BERT 特徴量を抽出した直後に _BertFeatureCaptured を送出して推論を中断する
+## prefetched: 事前に抽出済みの BERT 特徴量 (呼び出し時の引数が一致する場合は、抽出し直さずにそのまま返す)
+_bert_feature_context = threading.local()
+
+
+@dataclass(frozen=True)
+class _PrefetchedBertFeature:
+    """BERT 特徴量抽出関数の呼び出し時の引数と、抽出された BERT 特徴量"""
+
+    arguments: tuple[Any, ...]
+    feature: NDArray[Any]
+
+
+class _BertFeatureCaptured(Exception):
+    """BERT 特徴量を抽出した直後に、音声合成モデルの推論を中断するための例外"""
+
+    def __init__(self, prefetched_feature: _PrefetchedBertFeature) -> None:
+        super().__init__()
+        self.prefetched_feature = prefetched_feature
+
+
+def _install_bert_feature_cache(bert_feature_cache: BertFeatureCache) -> bool:
+    """
+    Style-Bert-VITS2 の日本語 BERT 特徴量抽出関数が、BertFeatureCache を経由して BERT 特徴量を抽出するようにする
+    キャッシュキーには正規化済みテキスト・word2ph・その他の引数 (補助テキストなど) が含まれる
+
+    Parameters
+    ----------
+    bert_feature_cache : BertFeatureCache
+        BERT 特徴量のキャッシュ
+
+    Returns
+    -------
+    bool
+        差し替えに成功したかどうか (BERT 特徴量抽出関数が見つからない場合は False)
+    """
+
+    global _bert_feature_cache
+
+    if _install_bert_feature_hook() is False:
+        return False
+    _bert_feature_cache = bert_feature_cache
+    return True
+
+
+def _install_bert_feature_hook(
+    bert_inference_lock: AbstractContextManager[Any] | None = None,
+) -> bool:
+    """
+    Style-Bert-VITS2 の日本語 BERT 特徴量抽出関数を、排他制御・BERT 特徴量キャッシュ・事前抽出に対応した関数に差し替える
+    TTSModel.infer() の内部では、BERT 特徴量の抽出のたびに style_bert_vits2.nlp.japanese.bert_feature から
+    抽出関数がインポートされるため、モジュール属性を差し替えることで全ての音声合成モデルの推論に適用される
+
+    Parameters
+    ----------
+    bert_inference_lock : AbstractContextManager[Any] | None
+        BERT 特徴量の抽出を排他制御するためのロック (None の場合は現在のロックをそのまま使う)
+
+    Returns
+    -------
+    bool
+        差し替えに成功したかどうか (BERT 特徴量抽出関数が見つからない場合は False)
+    """
+
+    try:
+        from style_bert_vits2.nlp.japanese import bert_feature
+    except ImportError:
+        return False
+    extract_bert_feature_onnx = getattr(bert_feature, "extract_bert_feature_onnx", None)  # fmt: skip
+    if extract_bert_feature_onnx is None:
+        return False
+
+    global _bert_inference_lock
+    if bert_inference_lock is not None:
+        _bert_inference_lock = bert_inference_lock
+
+    # 既に差し替え済みの場合は何もしない
+    if hasattr(extract_bert_feature_onnx, "__wrapped__"):
+        return True
+
+    @functools.wraps(extract_bert_feature_onnx)
+    def extract_bert_feature_onnx_with_hook(
+        text: str, word2ph: list[int], *args: Any, **kwargs: Any
+    ) -> NDArray[Any]:
+        _bert_feature_context.called = True
+        arguments = (text, tuple(word2ph), args, tuple(sorted(kwargs.items())))
+        prefetched: _PrefetchedBertFeature | None = getattr(_bert_feature_context, "prefetched", None)  # fmt: skip
+        cache = _bert_feature_cache
+        if prefetched is not None and prefetched.arguments == arguments:
+            feature = prefetched.feature
+        elif cache is None:
+            with _bert_inference_lock:
+                feature = extract_bert_feature_onnx(text, word2ph, *args, **kwargs)
+        else:
+            key = BertFeatureCache.make_key(text, word2ph, *args, *sorted(kwargs.items()))  # fmt: skip
+            cached_feature = cache.get(key)
+            if cached_feature is None:
+                with _bert_inference_lock:
+                    cached_feature = extract_bert_feature_onnx(text, word2ph, *args, **kwargs)  # fmt: skip
+                cache.put(key, cached_feature)
+            feature = cached_feature
+        if getattr(_bert_feature_context, "capturing", False) is True:
+            raise _BertFeatureCaptured(_PrefetchedBertFeature(arguments, feature))
+        return feature
+
+    bert_feature.extract_bert_feature_onnx = extract_bert_feature_onnx_with_hook
+    return True
+
+
+# TTSModel.infer() を呼び出したスレッドごとの状態
+## analysis: 事前に解析された読み上げテキストの解析結果 (正規化関数・g2p 関数の引数が一致する場合は、解析し直さずにそのまま返す)
+## called: TTSModel.infer() の内部から差し替えた g2p 関数が呼び出されたかどうか
+_text_analysis_context = threading.local()
+
+
+@dataclass(frozen=True)
+class _TextAnalysis:
+    """読み上げテキストを正規化し、g2p で解析した結果"""
+
+    text: str  # 解析した読み上げテキスト
+    normalized_text: str  # 正規化済みの読み上げテキスト
+    g2p_result: tuple[Any, ...]  # g2p() の戻り値 (音素・音高・word2ph などのリスト)
+
+    @property
+    def phones(self) -> list[str]:
+        """音素のリスト"""
+        return list(self.g2p_result[0])
+
+    @property
+    def tones(self) -> list[int]:
+        """音高のリスト"""
+        return list(self.g2p_result[1])
+
+    @property
+    def word2ph(self) -> list[int]:
+        """正規化済みの読み上げテキストの各文字に割り当てられた音素の数のリスト"""
+        return list(self.g2p_result[2])
+
+
+def _analyze_text(
+    text: str, text_frontend_cache: TextFrontendCache | None = None
+) -> _TextAnalysis:
+    """
+    読み上げテキストを TTSModel.infer() の内部と同じ方法で正規化し、g2p で解析する
+
+    Parameters
+    ----------
+    text : str
+        読み上げテキスト
+    text_frontend_cache : TextFrontendCache | None
+        g2p の結果のキャッシュ (None の場合は常に g2p を実行する)
+
+    Returns
+    -------
+    _TextAnalysis
+        読み上げテキストの解析結果
+    """
+
+    normalized_text = normalize_text(text)
+    if text_frontend_cache is None:
+        g2p_result = g2p(normalized_text, use_jp_extra=True, raise_yomi_error=False)
+        return _TextAnalysis(text, normalized_text, tuple(g2p_result))
+
+    cached_result = text_frontend_cache.get(normalized_text)
+    if cached_result is not None:
+        return _TextAnalysis(text, normalized_text, cached_result)
+    # 解析中にユーザー辞書が更新された場合に古い解析結果をキャッシュしないよう、解析前に辞書のバージョンを取得しておく
+    dict_version = text_frontend_cache.get_dict_version()
+    g2p_result = tuple(g2p(normalized_text, use_jp_extra=True, raise_yomi_error=False))  # fmt: skip
+    text_frontend_cache.put(normalized_text, g2p_result, dict_version)
+    return _TextAnalysis(text, normalized_text, g2p_result)
+
+
+def _install_text_analysis_hook() -> bool:
+    """
+    Style-Bert-VITS2 の日本語テキストの正規化関数と g2p 関数を、事前に解析した結果を返せる関数に差し替える
+    TTSModel.infer() の内部では、テキストのクリーニングのたびに正規化関数と g2p 関数がインポートされるため、
+    モジュール属性を差し替えることで全ての音声合成モデルの推論に適用される
+    このモジュールでインポート済みの normalize_text() / g2p() は差し替え前の関数のままなので、解析自体には影響しない
+
+    Returns
+    -------
+    bool
+        差し替えに成功したかどうか (正規化関数や g2p 関数が見つからない場合は False)
+    """
+
+    try:
+        normalizer_module = importlib.import_module("style_bert_vits2.nlp.japanese.normalizer")  # fmt: skip
+        g2p_module = importlib.import_module("style_bert_vits2.nlp.japanese.g2p")
+    except ImportError:
+        return False
+    original_normalize_text = getattr(normalizer_module, "normalize_text", None)
+    original_g2p = getattr(g2p_module, "g2p", None)
+    if original_normalize_text is None or original_g2p is None:
+        return False
+
+    # 既に差し替え済みの場合は何もしない
+    if hasattr(original_g2p, "__wrapped__"):
+        return True
+
+    @functools.wraps(original_normalize_text)
+    def normalize_text_with_hook(text: str) -> str:
+        analysis: _TextAnalysis | None = getattr(_text_analysis_context, "analysis", None)  # fmt: skip
+        if analysis is not None and analysis.text == text:
+            return analysis.normalized_text
+        return original_normalize_text(text)
+
+    @functools.wraps(original_g2p)
+    def g2p_with_hook(
+        norm_text: str, use_jp_extra: bool = True, raise_yomi_error: bool = False
+    ) -> Any:
+        _text_analysis_context.called = True
+        analysis: _TextAnalysis | None = getattr(_text_analysis_context, "analysis", None)  # fmt: skip
+        if (
+            analysis is not None
+            and analysis.normalized_text == norm_text
+            and use_jp_extra is True
+            and raise_yomi_error is False
+        ):
+            # 呼び出し元で word2ph などのリストが破壊的に変更されるため、リストをコピーして返す
+            return tuple(copy.copy(value) for value in analysis.g2p_result)
+        return original_g2p(norm_text, use_jp_extra, raise_yomi_error)
+
+    normalizer_module.normalize_text = normalize_text_with_hook
+    g2p_module.g2p = g2p_with_hook
+    return True
+
+
 # コンパイル済み正規表現
 __MORA_PATTERN: Final[re.Pattern[str]] = re.compile(
     "|".join(map(re.escape, sorted(MORA_KATA_TO_MORA_PHONEMES.keys(), key=len, reverse=True)))  # fmt: skip
@@ -690,31 +2230,209 @@ __MORA_PATTERN: Final[re.Pattern[str]] = re.compile(
 __LONG_PATTERN: Final[re.Pattern[str]] = re.compile(r"(\w)(ー*)")
 
 
-def _phone_tone2mora_tone(phone_tone: list[tuple[str, int]]) -> list[tuple[Mora, int]]:
+def _make_segment_key(
+    aivm_uuid: str,
+    model_revision: str,
+    namespace: str,
+    dict_fingerprint: bytes,
+    inference_request: _InferenceRequest,
+) -> bytes:
     """
-    phone_tone の phone 部分を VOICEVOX ENGINE の Mora 型に変換する。ただし最初と最後の ("_", 0) は無視する
+    差分音声合成で、前回の音声合成結果の文ごとの音声波形と照合するためのキーを生成する
+    推論結果に影響する入力 (音声合成モデルとそのリビジョン・エンジンの設定・ユーザー辞書・読み上げテキスト・音素・音高・パラメータ) を全て含める
+    BERT 特徴量と音素の対応付けは現在のユーザー辞書での g2p の結果に依存するため、辞書のフィンガープリントも含める
+    """
+
+    builder = FingerprintBuilder("IncrementalSynthesisSegment")
+    builder.add_str(aivm_uuid)
+    builder.add_str(model_revision)
+    builder.add_str(namespace)
+    builder.add_fingerprints([dict_fingerprint])
+    builder.add_str(inference_request.text)
+    builder.add_str(" ".join(inference_request.given_phone))
+    builder.add_str(" ".join(map(str, inference_request.given_tone)))
+    builder.add_int(inference_request.speaker_id)
+    builder.add_str(inference_request.style)
+    builder.add_float(inference_request.style_weight)
+    builder.add_float(inference_request.sdp_ratio)
+    builder.add_float(inference_request.length)
+    builder.add_float(inference_request.pitch_scale)
+    return builder.digest()
+
+
+def _analyze_document_sentences(sentences: list[str]) -> list[list[AccentPhrase]]:
+    """
+    文書モードで分割された文ごとに、音素長・モーラ音高がダミー値のアクセント句系列を生成する
+    DocumentFrontend のワーカープロセスから呼び出されるため、テキスト解析結果のキャッシュは利用しない
+    """
+    return [
+        _g2p_result_to_accent_phrases(_analyze_text(sentence).g2p_result)
+        for sentence in sentences
+    ]
+
+
+def _g2p_result_to_accent_phrases(g2p_result: tuple[Any, ...]) -> list[AccentPhrase]:
+    """
+    g2p による解析結果から、音素長・モーラ音高がダミー値のアクセント句系列を生成する
+    スタイルに依存しないため、文書モードでは別プロセスのワーカーからも呼び出される
+
+    Parameters
+    ----------
+    g2p_result : tuple[Any, ...]
+        g2p() の戻り値 (音素・音高・word2ph などのリスト)
+
+    Returns
+    -------
+    list[AccentPhrase]
+        アクセント句系列
+    """
+
+    return _g2p_result_to_mora_sequence(g2p_result).to_accent_phrases()
+
+
+def _g2p_result_to_mora_sequence(g2p_result: tuple[Any, ...]) -> MoraSequence:
+    """
+    g2p による解析結果から、音素長・モーラ音高がダミー値のモーラ系列を生成する
+
+    Parameters
+    ----------
+    g2p_result : tuple[Any, ...]
+        g2p() の戻り値 (音素・音高・word2ph などのリスト)
+
+    Returns
+    -------
+    MoraSequence
+        アクセント句に区切ったモーラ系列
+    """
+
+    # g2p 処理を行い、テキストからモーラ情報と音高 (0 or 1) のリストを取得
+    ## Style-Bert-VITS2 側では、pyopenjtalk_g2p_prosody() から取得したアクセント情報が含まれるモーラのリストを
+    ## モーラ情報と音高のリストに変換し (句読点や記号は失われている) 、後付けで失われた句読点や記号のモーラを適切な位置に追加する形で実装されている
+    ## VOICEVOX ENGINE 側のアクセント句系列生成処理は微妙に互換性がないため使っていない
+    ## VOICEVOX ENGINE では「ん」の音素を「N」としているため、use_jp_extra (True のとき「ん」の音素を「N」とする) は常に True に設定している
+    ## JP-Extra モデルと通常のモデルの音素差の吸収は synthesize_wave() で行う
+    phones, tones, _, sep_kata_with_joshi = g2p_result
+    mora_sequence, mora_tones = _phone_tone2mora_tone(list(zip(phones, tones)))
+    mora_texts = mora_sequence.mora_texts()
+
+    # sep_kata_with_joshi のカタカナを音素 (子音と母音のタプル) に変換
+    ## 分割されていないカタカナモーラの場合、「チョ」「ビャ」のような拗音では二文字に跨るため、単に文字数を数えるだけではズレてしまう
+    ## ちゃんと音素に分割することで、確実に要素数をモーラ系列と合わせられる
+    sep_phonemes_with_joshi = _sep_kata_with_joshi2sep_phonemes_with_joshi(sep_kata_with_joshi)  # fmt: skip
+
+    # モーラ系列を、まず記号から通常のモーラに変わったタイミングで区切ってグループ化し、各グループの先頭のモーラのインデックスを求める
+    # 通常のモーラから記号に変わったタイミングでは区切らない
+    ## 例: 「...私は,,そう思うよ...?どうかな.」 -> [["..."], ["私", "は", ",", ","], ["そう", "思う", "よ", "...", "?"], ["どう", "か", "な", "."]]
+    group_offsets: list[int] = []
+    for index, text in enumerate(mora_texts):
+        if index == 0 or (
+            text not in PUNCTUATIONS and mora_texts[index - 1] in PUNCTUATIONS
+        ):
+            group_offsets.append(index)
+    group_offsets.append(len(mora_texts))
+
+    # さらにグループごとに、アクセントが変わるタイミングで区切って再グループ化し、各アクセント句の先頭のモーラのインデックスを求める
+    # 音高が 前: 1, 現在: 0, 次: 1 の場合、前と現在の間で区切る
+    # 音高が 前: 0, 現在: 0, 次: 1 の場合、前と現在の間で区切る
+    sep_phonemes_with_joshi_index = 0  # sep_phonemes_with_joshi の参照用インデックス  # fmt: skip
+    sep_phonemes_with_joshi_mora_index = 0  # sep_phonemes_with_joshi 内の要素の何番目のモーラを参照するかのインデックス  # fmt: skip
+    phrase_offsets: list[int] = []
+    for group_start, group_end in zip(group_offsets, group_offsets[1:]):
+        phrase_offsets.append(group_start)
+        # 現在の位置で確実にアクセント句を区切るべきかどうかのフラグ
+        should_separate_accent_phrase = False
+        for index in range(group_start, group_end):
+            tone = mora_tones[index]
+            # sep_phonemes_with_joshi_mora_index が 0 (つまり要素の最初のモーラ) の時だけ、グループの区切り処理を許可する
+            ## sep_phonemes_with_joshi は ['コダイ', 'ローマ', 'ジダイノ', 'キッチンノ', 'ピット'] のように助詞が連結された状態のリスト
+            ## (実際にはカタカナ文字列ではなく子音と母音のタプルのリストのリスト) で、
+            ## 中に含まれているモーラを全てカウントするとモーラ系列のモーラ数と一致する
+            ## 上記例であれば "キッチンノ" の先頭の "キ" 、"ピット" の先頭の "ピ" 以外ではグループの区切り処理が禁止される
+            ## 助詞の後のアクセント句が頭高型 (高,低,低 ...) である場合に、例えば "ジダイ" と "ノ" 、"キッチン" と "ノ" の間で
+            ## 区切り処理が走り、アクセント句が ["ジダイ", "ノキッチン, "ノピット"] のように不自然に区切られてしまうのを防ぐための処理
+            if sep_phonemes_with_joshi_mora_index == 0:
+                is_accent_phrase_boundary_allowed = True
+            else:
+                is_accent_phrase_boundary_allowed = False
+            # sep_phonemes_with_joshi 内の要素の何番目のモーラを参照するかのインデックスを繰り上げる
+            sep_phonemes_with_joshi_mora_index += 1
+            # 必要に応じて sep_phonemes_with_joshi_index を繰り上げ、次の要素に移動
+            # 繰り上げた結果は次回のループに適用される
+            if sep_phonemes_with_joshi_mora_index >= len(sep_phonemes_with_joshi[sep_phonemes_with_joshi_index]):  # fmt: skip
+                sep_phonemes_with_joshi_index += 1
+                sep_phonemes_with_joshi_mora_index = 0
+
+            # 前の音高を取得 (グループの最初のモーラの場合は None)
+            previous_tone = mora_tones[index - 1] if index > group_start else None
+            # 後続の音高を取得 (グループの最後のモーラの場合は None)
+            next_tone = mora_tones[index + 1] if index < group_end - 1 else None
+            # 現在の位置で確実にアクセント句を区切るべきかどうかのフラグが True の場合、前と現在の間で区切る
+            if should_separate_accent_phrase is True:
+                phrase_offsets.append(index)
+                should_separate_accent_phrase = False  # フラグをリセット
+            # 音高が 前: 1, 現在: 0, 次: 1
+            # または 前: 0, 現在: 0, 次: 1 の場合、前と現在の間で区切る
+            elif ((previous_tone == 1) and (tone == 0) and (next_tone == 1)) or \
+                 ((previous_tone == 0) and (tone == 0) and (next_tone == 1)):  # fmt: skip
+                # アクセント句の区切り処理を許可するかどうかのフラグが True のときだけ実行
+                # 今回単語の途中のため区切り処理を実行できない場合は、次回のループで確実にアクセント句が区切られるようフラグを立てる
+                if is_accent_phrase_boundary_allowed is True:
+                    phrase_offsets.append(index)
+                else:
+                    should_separate_accent_phrase = True
+    phrase_offsets.append(len(mora_texts))
+
+    # アクセント句ごとに、次のモーラで音高が 1 から 0 に下がるモーラをアクセント核の位置とする
+    # 1-indexed なので 1 から始まるインデックスに変換
+    ## アクセント核が見つからなかった場合は最後のモーラまで音高が高いままだと思われるので、最後のモーラをアクセント核とする
+    accents: list[int] = []
+    for phrase_start, phrase_end in zip(phrase_offsets, phrase_offsets[1:]):
+        accent_index = phrase_end - phrase_start
+        for index in range(phrase_start, phrase_end - 1):
+            if mora_tones[index] == 1 and mora_tones[index + 1] == 0:
+                accent_index = index - phrase_start + 1
+                break
+        accents.append(accent_index)
+
+    # AivisSpeech Engine ではモーラ系列に記号モーラも含めているため、アクセント句は常に pause_mora を持たない
+    ## Style-Bert-VITS2 は音声合成時に読み上げテキストに付与する記号 (…!? など)で感情表現が大きく変わるほか、
+    ## 記号自体にアクセント情報を付与できるため、VOICEVOX のように連続する記号を pause_mora としてまとめられると困る
+    return mora_sequence.with_accent_phrases(phrase_offsets, accents)
+
+
+def _phone_tone2mora_tone(
+    phone_tone: list[tuple[str, int]],
+) -> tuple[MoraSequence, list[int]]:
+    """
+    phone_tone の phone 部分をモーラ系列に変換する。ただし最初と最後の ("_", 0) は無視する
     style_bert_vits2.nlp.japanese.g2p_utils.phone_tone2kata_tone() をベースに改変したもの
+    モーラ系列は全体で 1 つのアクセント句とし、アクセント句への区切りは呼び出し元で行う
+
+    Returns
+    -------
+    tuple[MoraSequence, list[int]]
+        モーラ系列と、モーラごとの音高 (0 or 1) のリスト
     """
 
     phone_tone = phone_tone[1:]  # 最初の("_", 0)を無視
     phones = [phone for phone, _ in phone_tone]
     tones = [tone for _, tone in phone_tone]
-    result: list[tuple[Mora, int]] = []
+    builder = MoraSequenceBuilder()
+    mora_tones: list[int] = []
     current_consonant: str | None = None
     for phone, _, tone, next_tone in zip(phones, phones[1:], tones, tones[1:]):
         # zip の関係で最後の ("_", 0) は無視されている
         # 記号モーラの場合
         if phone in PUNCTUATIONS:
-            # VOICEVOX ENGINE の Mora に変換
-            mora = Mora(
+            builder.add_mora(
                 text=phone,  # 記号をそのままテキスト (カナ) とする
                 consonant=None,
-                consonant_length=None,  # AivisSpeech Engine では常にダミー値
                 vowel="pau",  # VOICEVOX ENGINE では記号は pau として扱われる
+                consonant_length=None,  # AivisSpeech Engine では常にダミー値
                 vowel_length=0.0,  # AivisSpeech Engine では常にダミー値
                 pitch=0.0,  # AivisSpeech Engine では常にダミー値
             )
-            result.append((mora, tone))
+            mora_tones.append(tone)
             continue
         # n 以外の子音の場合
         if phone in CONSONANTS:
@@ -726,25 +2444,27 @@ def _phone_tone2mora_tone(phone_tone: list[tuple[str, int]]) -> list[tuple[Mora,
         else:
             # 母音を取得
             current_vowel = phone
-            # VOICEVOX ENGINE の Mora に変換
-            mora = Mora(
+            builder.add_mora(
                 # 子音 (あれば) と母音を結合して取得した、対応するカタカナ表記のモーラを設定
                 text=MORA_PHONEMES_TO_MORA_KATA[
                     ("" if current_consonant is None else current_consonant)
                     + current_vowel
                 ],
                 consonant=current_consonant,
+                # Style-Bert-VITS2 にある mora_list.py では VOICEVOX ENGINE のコードが若干改変された上で利用されているが、
+                # "ッ" (促音) が Style-Bert-VITS2 版では cl から q に変わっているため、update_length_and_pitch() 実行時に失敗しうる
+                # カタカナ表記の取得には Style-Bert-VITS2 の音素が必要なため、ここで VOICEVOX ENGINE 向けに q を cl に修正する
+                vowel="cl" if current_vowel == "q" else current_vowel,
                 consonant_length=(
                     None if current_consonant is None else 0.0
                 ),  # AivisSpeech Engine では常にダミー値
-                vowel=current_vowel,
                 vowel_length=0.0,  # AivisSpeech Engine では常にダミー値
                 pitch=0.0,  # AivisSpeech Engine では常にダミー値
             )
-            result.append((mora, tone))
+            mora_tones.append(tone)
             current_consonant = None
 
-    return result
+    return builder.build(), mora_tones
 
 
 def _sep_kata_with_joshi2sep_phonemes_with_joshi(
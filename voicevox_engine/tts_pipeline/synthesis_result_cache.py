@@ -0,0 +1,417 @@
+"""音声合成結果のキャッシュ"""
+
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..logging import logger
+from ..metas.Metas import StyleId
+from ..model import AudioQuery
+
+# ディスクキャッシュの各モデルのディレクトリに置く、キャッシュを生成したモデルのリビジョンを記録したファイルの名前
+_REVISION_FILE_NAME: Final[str] = "REVISION"
+
+
+@dataclass(frozen=True)
+class SynthesisResultCacheStats:
+    """音声合成結果キャッシュの統計情報"""
+
+    hit_count: int  # メモリまたはディスクのキャッシュにヒットした回数
+    miss_count: int  # キャッシュにヒットしなかった回数
+    entry_count: int  # メモリ上にキャッシュされている音声波形の数
+    memory_size: int  # メモリ上にキャッシュされている音声波形の合計サイズ (バイト)
+    disk_entry_count: int  # ディスクにキャッシュされている音声波形の数
+    disk_size: int  # ディスクにキャッシュされている音声波形の合計サイズ (バイト)
+
+    @property
+    def hit_rate(self) -> float:
+        """キャッシュのヒット率 (0.0 ~ 1.0)"""
+        total = self.hit_count + self.miss_count
+        return self.hit_count / total if total > 0 else 0.0
+
+
+class SynthesisResultCache:
+    """
+    音声合成結果 (音声波形) の 2 層の LRU キャッシュ
+    音声合成用のクエリ・スタイル ID・音声合成モデルのリビジョンなどから生成したキーに対して、生成された音声波形を保持する
+    メモリ上のキャッシュがサイズの上限を超えると、最も長く使われていない音声波形から順に破棄される
+    キャッシュディレクトリが指定されている場合は、キャッシュした音声波形をディスクにも保存し (再起動後も利用できる) 、
+    ディスク上のキャッシュがサイズの上限を超えると、最も長く使われていない音声波形から順に削除する
+    音声合成モデルのリビジョンが変わった (再インストールされた) 場合、そのモデルのキャッシュは全て破棄される
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        cache_dir: Path | None = None,
+        max_disk_size: int = 0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        max_size : int
+            メモリ上にキャッシュする音声波形の合計サイズの上限 (バイト)
+        cache_dir : Path | None
+            音声波形を保存するキャッシュディレクトリ (None の場合はディスクに保存しない)
+        max_disk_size : int
+            ディスクにキャッシュする音声波形の合計サイズの上限 (バイト) 。0 の場合はディスクに保存しない
+        """
+
+        self.max_size = max_size
+        self.cache_dir = cache_dir if max_disk_size > 0 else None
+        self.max_disk_size = max_disk_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[str, NDArray[np.float32]]] = OrderedDict()  # fmt: skip
+        self._memory_size = 0
+        self._disk_entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._disk_size = 0
+        self._model_revisions: dict[str, str] = {}
+        self._hit_count = 0
+        self._miss_count = 0
+        # キャッシュを破棄するたびに増える世代番号 (ロックを解放してディスクを読み書きしている間に破棄されたかどうかの判定に使う)
+        self._generation = 0
+        # ロックを解放した状態で行う、破棄したモデルのディレクトリの削除とリビジョンの記録の待ち行列
+        self._pending_removed_dirs: list[Path] = []
+        self._pending_revision_models: set[str] = set()
+        # リビジョンの記録の順序が入れ替わらないよう、待ち行列の処理を直列化するロック
+        self._disk_maintenance_lock = threading.Lock()
+
+        if self.cache_dir is not None:
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(query: AudioQuery, style_id: StyleId, *options: Any) -> str:
+        """
+        音声合成用のクエリ・スタイル ID・その他の音声波形に影響するオプションからキャッシュキーを生成する
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+        *options : Any
+            音声合成モデルのリビジョンなど、音声波形に影響するその他のオプション (repr() で文字列化される)
+
+        Returns
+        -------
+        str
+            キャッシュキー
+        """
+
+        source = "\0".join([query.fingerprint().hex(), str(style_id), *map(repr, options)])  # fmt: skip
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> SynthesisResultCacheStats:
+        """これまでの統計情報"""
+        with self._lock:
+            return SynthesisResultCacheStats(
+                hit_count=self._hit_count,
+                miss_count=self._miss_count,
+                entry_count=len(self._entries),
+                memory_size=self._memory_size,
+                disk_entry_count=len(self._disk_entries),
+                disk_size=self._disk_size,
+            )
+
+    def get(
+        self, aivm_uuid: str, model_revision: str, key: str
+    ) -> NDArray[np.float32] | None:
+        """
+        キャッシュされた音声波形を取得する。ディスクにのみキャッシュされている場合はメモリへ読み込む。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            音声合成に使う音声合成モデルの AIVM の UUID
+        model_revision : str
+            音声合成モデルの現在のリビジョン (前回と異なる場合、そのモデルのキャッシュは全て破棄される)
+        key : str
+            make_key() で生成したキャッシュキー
+
+        Returns
+        -------
+        NDArray[np.float32] | None
+            キャッシュされた音声波形のコピー (キャッシュされていない場合は None)
+        """
+
+        self._check_revision(aivm_uuid, model_revision)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if key in self._disk_entries:
+                    self._disk_entries.move_to_end(key)
+                self._hit_count += 1
+                return entry[1].copy()
+            if key not in self._disk_entries:
+                self._miss_count += 1
+                return None
+            generation = self._generation
+
+        # ディスクの読み書きには時間がかかるため、ロックを解放した状態で行う
+        wave = self._load_from_disk(aivm_uuid, key)
+        with self._lock:
+            # 読み込んでいる間にキャッシュが破棄された場合は、読み込んだ音声波形を使わない
+            if generation != self._generation or key not in self._disk_entries:
+                self._miss_count += 1
+                return None
+            if wave is None:
+                self._remove_from_disk(key)
+                self._miss_count += 1
+                return None
+            self._disk_entries.move_to_end(key)
+            self._hit_count += 1
+            self._put_memory_locked(aivm_uuid, key, wave)
+        return wave.copy()
+
+    def put(
+        self, aivm_uuid: str, model_revision: str, key: str, wave: NDArray[np.float32]
+    ) -> None:
+        """
+        音声波形をキャッシュする。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            音声合成に使った音声合成モデルの AIVM の UUID
+        model_revision : str
+            音声合成に使った音声合成モデルのリビジョン
+        key : str
+            make_key() で生成したキャッシュキー
+        wave : NDArray[np.float32]
+            キャッシュする音声波形 (コピーが保持される)
+        """
+
+        wave = np.array(wave, dtype=np.float32)
+        self._check_revision(aivm_uuid, model_revision)
+        with self._lock:
+            self._put_memory_locked(aivm_uuid, key, wave)
+            if self.cache_dir is None or key in self._disk_entries or wave.nbytes > self.max_disk_size:  # fmt: skip
+                return
+            generation = self._generation
+
+        # ディスクの読み書きには時間がかかるため、ロックを解放した状態で行う
+        size = self._save_to_disk(aivm_uuid, key, wave)
+        if size is None:
+            return
+        with self._lock:
+            if key in self._disk_entries:
+                return
+            # 書き込んでいる間にキャッシュが破棄された場合は、書き込んだ音声波形を削除する
+            if generation != self._generation:
+                (self.cache_dir / aivm_uuid / f"{key}.npy").unlink(missing_ok=True)
+                return
+            self._disk_entries[key] = (aivm_uuid, size)
+            self._disk_size += size
+            while self._disk_size > self.max_disk_size:
+                self._remove_from_disk(next(iter(self._disk_entries)))
+
+    def get_or_synthesize(
+        self,
+        aivm_uuid: str,
+        model_revision: str,
+        key: str,
+        synthesize: Callable[[], NDArray[np.float32]],
+    ) -> tuple[NDArray[np.float32], bool]:
+        """
+        キャッシュされた音声波形があればそれを返し、なければ音声合成を行ってその結果をキャッシュする。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            音声合成に使う音声合成モデルの AIVM の UUID
+        model_revision : str
+            音声合成モデルの現在のリビジョン
+        key : str
+            make_key() で生成したキャッシュキー
+        synthesize : Callable[[], NDArray[np.float32]]
+            キャッシュされていない場合に呼び出される、音声波形を生成する関数
+
+        Returns
+        -------
+        tuple[NDArray[np.float32], bool]
+            音声波形と、キャッシュにヒットしたかどうか
+        """
+
+        cached_wave = self.get(aivm_uuid, model_revision, key)
+        if cached_wave is not None:
+            return cached_wave, True
+        wave = synthesize()
+        self.put(aivm_uuid, model_revision, key, wave)
+        return wave, False
+
+    def invalidate_model(self, aivm_uuid: str) -> None:
+        """指定された音声合成モデルで生成された全ての音声波形をキャッシュから破棄する。"""
+        with self._lock:
+            self._invalidate_model_locked(aivm_uuid)
+        self._flush_pending_disk_changes()
+
+    def clear(self) -> None:
+        """キャッシュされた全ての音声波形を破棄する。"""
+        with self._lock:
+            for aivm_uuid in {aivm_uuid for aivm_uuid, _ in self._entries.values()} | {aivm_uuid for aivm_uuid, _ in self._disk_entries.values()}:  # fmt: skip
+                self._invalidate_model_locked(aivm_uuid)
+        self._flush_pending_disk_changes()
+
+    def _check_revision(self, aivm_uuid: str, model_revision: str) -> None:
+        """音声合成モデルのリビジョンが前回と異なる場合、そのモデルのキャッシュを全て破棄してリビジョンを記録し直す。"""
+
+        with self._lock:
+            previous_revision = self._model_revisions.get(aivm_uuid)
+            if previous_revision == model_revision:
+                return
+            if previous_revision is not None:
+                logger.info(f"Model {aivm_uuid} has been updated. Invalidating synthesis result cache...")  # fmt: skip
+                self._invalidate_model_locked(aivm_uuid)
+            self._model_revisions[aivm_uuid] = model_revision
+            if self.cache_dir is not None:
+                self._pending_revision_models.add(aivm_uuid)
+        self._flush_pending_disk_changes()
+
+    def _invalidate_model_locked(self, aivm_uuid: str) -> None:
+        """
+        ロックを取得した状態で、指定された音声合成モデルのキャッシュを全て破棄する。
+        ディスク上のディレクトリは別名に変更するのみで、削除は _flush_pending_disk_changes() でロックを解放した状態で行う。
+        """
+
+        self._generation += 1
+        for key in [key for key, (entry_aivm_uuid, _) in self._entries.items() if entry_aivm_uuid == aivm_uuid]:  # fmt: skip
+            self._memory_size -= self._entries.pop(key)[1].nbytes
+        for key in [key for key, (entry_aivm_uuid, _) in self._disk_entries.items() if entry_aivm_uuid == aivm_uuid]:  # fmt: skip
+            self._disk_size -= self._disk_entries.pop(key)[1]
+        self._model_revisions.pop(aivm_uuid, None)
+        if self.cache_dir is not None:
+            # 別名のディレクトリにはリビジョンを記録したファイルがないため、削除前に終了しても次回起動時に削除される
+            removed_dir = self.cache_dir / f".removed-{aivm_uuid}-{self._generation}"
+            try:
+                os.replace(self.cache_dir / aivm_uuid, removed_dir)
+            except OSError:
+                return
+            (removed_dir / _REVISION_FILE_NAME).unlink(missing_ok=True)
+            self._pending_removed_dirs.append(removed_dir)
+
+    def _flush_pending_disk_changes(self) -> None:
+        """破棄したモデルのディレクトリの削除とリビジョンの記録を、ロックを解放した状態で行う。"""
+
+        if self.cache_dir is None:
+            return
+        with self._disk_maintenance_lock:
+            with self._lock:
+                removed_dirs = self._pending_removed_dirs
+                self._pending_removed_dirs = []
+                revision_models = self._pending_revision_models
+                self._pending_revision_models = set()
+            for removed_dir in removed_dirs:
+                shutil.rmtree(removed_dir, ignore_errors=True)
+            for aivm_uuid in revision_models:
+                # 待ち行列に積まれた時点ではなく、現在のリビジョンを記録する
+                with self._lock:
+                    model_revision = self._model_revisions.get(aivm_uuid)
+                if model_revision is None:
+                    continue
+                try:
+                    model_dir = self.cache_dir / aivm_uuid
+                    model_dir.mkdir(parents=True, exist_ok=True)
+                    (model_dir / _REVISION_FILE_NAME).write_text(model_revision, encoding="utf-8")  # fmt: skip
+                except OSError:
+                    pass
+
+    def _put_memory_locked(self, aivm_uuid: str, key: str, wave: NDArray[np.float32]) -> None:  # fmt: skip
+        """ロックを取得した状態で音声波形をメモリ上にキャッシュし、上限を超えた分を破棄する。"""
+
+        # 上限を超える巨大な音声波形はメモリ上にはキャッシュしない
+        if wave.nbytes > self.max_size:
+            return
+
+        previous_entry = self._entries.pop(key, None)
+        if previous_entry is not None:
+            self._memory_size -= previous_entry[1].nbytes
+        self._entries[key] = (aivm_uuid, wave)
+        self._memory_size += wave.nbytes
+
+        while self._memory_size > self.max_size:
+            _, (_, evicted_wave) = self._entries.popitem(last=False)
+            self._memory_size -= evicted_wave.nbytes
+
+    def _save_to_disk(self, aivm_uuid: str, key: str, wave: NDArray[np.float32]) -> int | None:  # fmt: skip
+        """音声波形をディスクに保存し、保存したファイルのサイズを返す。保存できなかった場合は None を返す。ロックを解放した状態で呼び出される。"""
+
+        assert self.cache_dir is not None
+        path = self.cache_dir / aivm_uuid / f"{key}.npy"
+        # 書き込み途中のファイルを読み込まないよう、一時ファイルに書き込んでから置き換える
+        # 同じ音声波形を複数のスレッドが同時に保存する場合に備え、一時ファイルはスレッドごとに分ける
+        temp_path = path.parent / f"{key}.{threading.get_ident()}.tmp"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, mode="wb") as f:
+                np.save(f, wave, allow_pickle=False)
+            os.replace(temp_path, path)
+            return path.stat().st_size
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return None
+
+    def _load_from_disk(self, aivm_uuid: str, key: str) -> NDArray[np.float32] | None:
+        """ディスクに保存された音声波形を読み込む。読み込めない場合は None を返す。ロックを解放した状態で呼び出される。"""
+
+        assert self.cache_dir is not None
+        path = self.cache_dir / aivm_uuid / f"{key}.npy"
+        try:
+            wave: NDArray[np.float32] = np.load(path, allow_pickle=False)
+            # 再起動後も最も長く使われていない音声波形から削除できるよう、最終利用日時を更新日時として記録する
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return wave
+
+    def _remove_from_disk(self, key: str) -> None:
+        """ディスクに保存された音声波形を削除する。"""
+
+        assert self.cache_dir is not None
+        entry = self._disk_entries.pop(key, None)
+        if entry is None:
+            return
+        aivm_uuid, size = entry
+        self._disk_size -= size
+        (self.cache_dir / aivm_uuid / f"{key}.npy").unlink(missing_ok=True)
+
+    def _load_disk_index(self) -> None:
+        """前回起動時までにディスクに保存された音声波形の一覧を、最終利用日時が古い順に読み込む。"""
+
+        assert self.cache_dir is not None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        files: list[tuple[float, str, str, int]] = []
+        for model_dir in self.cache_dir.iterdir():
+            if not model_dir.is_dir():
+                continue
+            # リビジョンが記録されていないディレクトリのキャッシュは、どのモデルで生成されたか確認できないため削除する
+            try:
+                self._model_revisions[model_dir.name] = (model_dir / _REVISION_FILE_NAME).read_text(encoding="utf-8")  # fmt: skip
+            except OSError:
+                shutil.rmtree(model_dir, ignore_errors=True)
+                continue
+            for temp_file in model_dir.glob("*.tmp"):
+                temp_file.unlink(missing_ok=True)
+            for cache_file in model_dir.glob("*.npy"):
+                try:
+                    stat = cache_file.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, cache_file.stem, model_dir.name, stat.st_size))  # fmt: skip
+
+        for _, key, aivm_uuid, size in sorted(files):
+            self._disk_entries[key] = (aivm_uuid, size)
+            self._disk_size += size
+        while self._disk_size > self.max_disk_size:
+            self._remove_from_disk(next(iter(self._disk_entries)))
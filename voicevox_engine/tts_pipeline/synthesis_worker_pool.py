@@ -0,0 +1,386 @@
+"""音声合成を別プロセスで実行するワーカープール"""
+
+import multiprocessing
+import threading
+import zlib
+from collections import Counter
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Final
+
+import numpy as np
+from fastapi import HTTPException
+from numpy.typing import NDArray
+
+from ..logging import logger
+from ..metas.Metas import StyleId
+from ..model import AudioQuery, LoadedModelInfo
+from ..user_dict.user_dict_manager import apply_dict_in_worker, get_applied_dict
+from ..utility.path_utility import get_save_dir
+
+# ワーカープロセスが音声波形の受け渡しに使う共有メモリの最小サイズ (バイト)
+# 共有メモリは音声波形が収まらなくなった場合のみ 2 倍ずつ拡張され、以降の音声合成で使い回される
+_MIN_SHARED_BUFFER_SIZE: Final[int] = 4 * 1024 * 1024
+
+# ワーカープロセスの応答を待つ間に、キャンセル要求とワーカープロセスの生存を確認する間隔 (秒)
+_POLL_INTERVAL: Final[float] = 0.1
+
+
+class SynthesisCancelledError(Exception):
+    """音声合成がキャンセルされた"""
+
+    pass
+
+
+class _SynthesisWorker:
+    """ワーカープロセスと、ワーカープロセスとの通信に使う Pipe・共有メモリの組"""
+
+    def __init__(
+        self,
+        index: int,
+        engine_factory: Callable[..., Any],
+        engine_kwargs: dict[str, Any],
+    ) -> None:
+        self.index = index
+        self.engine_factory = engine_factory
+        self.engine_kwargs = engine_kwargs
+        # 1 つのワーカープロセスが同時に処理するリクエストは 1 件のみ
+        self.lock = threading.Lock()
+        self.process: SpawnProcess | None = None
+        self.connection: Connection | None = None
+        self.shared_buffer: SharedMemory | None = None
+        # このワーカープロセスでロード済みの音声合成モデルの AIVM の UUID
+        self.loaded_models: set[str] = set()
+        # このワーカープロセスでピン留めされている音声合成モデルの AIVM の UUID とピン留めの回数
+        # ワーカープロセスを再起動してもピン留め状態を引き継ぐため、再起動時にはクリアしない
+        self.pinned_models: Counter[str] = Counter()
+        # 起動後のワーカープロセスに、ピン留め状態を復元済みかどうか
+        self.pins_restored = True
+
+    def start(self) -> None:
+        """ワーカープロセスを起動する。"""
+        parent_connection, child_connection = multiprocessing.Pipe(duplex=True)
+        self.process = multiprocessing.get_context("spawn").Process(
+            target=_run_synthesis_worker,
+            kwargs={
+                "engine_factory": self.engine_factory,
+                "engine_kwargs": self.engine_kwargs,
+                "connection": child_connection,
+            },
+            name=f"SynthesisWorker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.connection = parent_connection
+        self.loaded_models.clear()
+        self.pins_restored = len(self.pinned_models) == 0
+
+    def stop(self) -> None:
+        """ワーカープロセスを終了し、ワーカープロセスが確保していた共有メモリを解放する。"""
+        # Pipe を先に閉じるとワーカープロセス自身が共有メモリを解放し始めて競合するため、先にワーカープロセスを終了する
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process.join()
+            self.process.close()
+            self.process = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if self.shared_buffer is not None:
+            self.shared_buffer.close()
+            # 異常終了したワーカープロセスは共有メモリを解放できないため、代わりに解放する
+            try:
+                self.shared_buffer.unlink()
+            except FileNotFoundError:
+                pass
+            self.shared_buffer = None
+        self.loaded_models.clear()
+
+    def restart(self) -> None:
+        """ワーカープロセスを再起動する。"""
+        self.stop()
+        self.start()
+
+    def read_wave(self, shared_buffer_name: str, shape: tuple[int, ...]) -> NDArray[np.float32]:  # fmt: skip
+        """ワーカープロセスが共有メモリに書き込んだ音声波形をコピーして返す。"""
+
+        # 共有メモリが拡張された場合は、新しい共有メモリに付け替える
+        if self.shared_buffer is None or self.shared_buffer.name != shared_buffer_name:
+            if self.shared_buffer is not None:
+                self.shared_buffer.close()
+            self.shared_buffer = SharedMemory(name=shared_buffer_name)
+        shared_wave: NDArray[np.float32] = np.ndarray(shape, dtype=np.float32, buffer=self.shared_buffer.buf)  # fmt: skip
+        wave = shared_wave.copy()
+        del shared_wave  # 共有メモリを close() できるよう、共有メモリへの参照を破棄する
+        return wave
+
+
+class SynthesisWorkerPool:
+    """
+    音声合成モデルの推論を別プロセスのワーカーで実行するワーカープール
+    各ワーカープロセスはそれぞれ独立した StyleBertVITS2TTSEngine を持ち、自身に割り当てられた音声合成モデルの推論セッションを保持する
+    リクエストは音声合成モデル (AIVM の UUID) ごとに常に同じワーカープロセスに振り分けられるため、
+    1 つの音声合成モデルが複数のワーカープロセスに重複してロードされることはない
+    生成された音声波形は pickle 化せず、ワーカープロセスごとの共有メモリを介して受け取る
+    ワーカープロセスが異常終了した場合は、次のリクエストの処理前に自動的に再起動される
+    """
+
+    def __init__(
+        self,
+        worker_engine_kwargs: list[dict[str, Any]],
+        engine_factory: Callable[..., Any] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        worker_engine_kwargs : list[dict[str, Any]]
+            各ワーカープロセスで StyleBertVITS2TTSEngine を初期化する際に渡すキーワード引数のリスト (要素数がワーカー数になる)
+        engine_factory : Callable[..., Any] | None
+            ワーカープロセス内でエンジンを生成する関数 (pickle 化できるモジュールのトップレベルの関数である必要がある)
+            None の場合は StyleBertVITS2TTSEngine を生成する
+        """
+
+        if len(worker_engine_kwargs) < 1:
+            raise ValueError("At least one synthesis worker is required.")
+        if engine_factory is None:
+            engine_factory = _create_style_bert_vits2_tts_engine
+        self._workers = [
+            _SynthesisWorker(index, engine_factory, engine_kwargs)
+            for index, engine_kwargs in enumerate(worker_engine_kwargs)
+        ]
+        for worker in self._workers:
+            worker.start()
+        logger.info(f"{len(self._workers)} synthesis workers started.")
+
+    @property
+    def worker_count(self) -> int:
+        """ワーカープロセスの数"""
+        return len(self._workers)
+
+    @staticmethod
+    def get_worker_index(aivm_uuid: str, worker_count: int) -> int:
+        """音声合成モデルを担当するワーカープロセスのインデックスを返す。"""
+        return zlib.crc32(aivm_uuid.encode("utf-8")) % worker_count
+
+    def synthesize(
+        self,
+        aivm_uuid: str,
+        query: AudioQuery,
+        style_id: StyleId,
+        cancel_event: threading.Event | None = None,
+    ) -> NDArray[np.float32]:
+        """
+        音声合成モデルを担当するワーカープロセスで音声合成を行う
+        ワーカープロセスには、音声合成の前にこのプロセスで現在適用されている辞書が適用される
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            スタイル ID に対応する音声合成モデルの AIVM の UUID
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+        cancel_event : threading.Event | None
+            セットされると音声合成をキャンセルするイベント (キャンセルするとワーカープロセスは再起動される)
+
+        Returns
+        -------
+        NDArray[np.float32]
+            生成された音声波形
+        """
+
+        worker = self._workers[self.get_worker_index(aivm_uuid, self.worker_count)]
+        with worker.lock:
+            dict_version, dict_path = get_applied_dict()
+            shared_buffer_name, shape = self._call(worker, "synthesize", (query, style_id, dict_version, dict_path), cancel_event)  # fmt: skip
+            worker.loaded_models.add(aivm_uuid)
+            # 共有メモリの内容は次のリクエストで上書きされるため、ロックを保持したままコピーする
+            return worker.read_wave(shared_buffer_name, shape)
+
+    def load_model(self, aivm_uuid: str) -> None:
+        """音声合成モデルを担当するワーカープロセスで、音声合成モデルをロードしてウォームアップ推論を行う。"""
+        worker = self._workers[self.get_worker_index(aivm_uuid, self.worker_count)]
+        with worker.lock:
+            self._call(worker, "load", aivm_uuid)
+            worker.loaded_models.add(aivm_uuid)
+
+    def unload_model(self, aivm_uuid: str) -> bool:
+        """音声合成モデルを担当するワーカープロセスで、音声合成モデルをアンロードする。"""
+        worker = self._workers[self.get_worker_index(aivm_uuid, self.worker_count)]
+        with worker.lock:
+            worker.loaded_models.discard(aivm_uuid)
+            return bool(self._call(worker, "unload", aivm_uuid))
+
+    def pin_model(self, aivm_uuid: str) -> None:
+        """音声合成モデルを担当するワーカープロセスで、音声合成モデルをピン留めする。"""
+        worker = self._workers[self.get_worker_index(aivm_uuid, self.worker_count)]
+        with worker.lock:
+            self._call(worker, "pin", aivm_uuid)
+            worker.pinned_models[aivm_uuid] += 1
+
+    def unpin_model(self, aivm_uuid: str) -> None:
+        """音声合成モデルを担当するワーカープロセスで、音声合成モデルのピン留めを 1 回分解除する。"""
+        worker = self._workers[self.get_worker_index(aivm_uuid, self.worker_count)]
+        with worker.lock:
+            if worker.pinned_models[aivm_uuid] <= 0:
+                return
+            self._call(worker, "unpin", aivm_uuid)
+            worker.pinned_models[aivm_uuid] -= 1
+            if worker.pinned_models[aivm_uuid] == 0:
+                del worker.pinned_models[aivm_uuid]
+
+    def is_model_loaded(self, aivm_uuid: str) -> bool:
+        """
+        音声合成モデルが担当するワーカープロセスでロード済みかを返す
+        メインプロセス側の記録に基づくため、メモリ使用量の上限によるワーカープロセス内での自動アンロードは反映されない
+        """
+        worker = self._workers[self.get_worker_index(aivm_uuid, self.worker_count)]
+        return aivm_uuid in worker.loaded_models
+
+    def get_loaded_models(self) -> list[LoadedModelInfo]:
+        """全てのワーカープロセスでロード済みの音声合成モデルの一覧を、最終利用日時が新しい順に返す。"""
+        loaded_models: list[LoadedModelInfo] = []
+        for worker in self._workers:
+            with worker.lock:
+                loaded_models.extend(self._call(worker, "loaded_models", None))
+        return sorted(loaded_models, key=lambda model: model.last_used_at, reverse=True)  # fmt: skip
+
+    def close(self) -> None:
+        """全てのワーカープロセスを終了する。"""
+        for worker in self._workers:
+            with worker.lock:
+                worker.stop()
+
+    def _call(
+        self,
+        worker: _SynthesisWorker,
+        command: str,
+        payload: Any,
+        cancel_event: threading.Event | None = None,
+    ) -> Any:
+        """
+        ワーカープロセスにコマンドを送り、その結果を返す
+        呼び出し時には worker.lock を取得している必要がある
+        """
+
+        # 前回のリクエストの処理中に異常終了していた場合は再起動する
+        if worker.process is None or not worker.process.is_alive():
+            logger.warning(f"Synthesis worker {worker.index} is not running. Restarting...")  # fmt: skip
+            worker.restart()
+        assert worker.connection is not None
+        assert worker.process is not None
+
+        # 再起動したワーカープロセスには、再起動前のピン留め状態を復元する
+        if not worker.pins_restored:
+            worker.pins_restored = True
+            for pinned_aivm_uuid, pin_count in worker.pinned_models.items():
+                for _ in range(pin_count):
+                    self._call(worker, "pin", pinned_aivm_uuid)
+
+        try:
+            worker.connection.send((command, payload))
+            while not worker.connection.poll(_POLL_INTERVAL):
+                if cancel_event is not None and cancel_event.is_set():
+                    # 推論の途中で安全に中断する手段がないため、ワーカープロセスごと終了して作り直す
+                    logger.info(f"Synthesis cancelled. Restarting synthesis worker {worker.index}...")  # fmt: skip
+                    worker.restart()
+                    raise SynthesisCancelledError()
+                if not worker.process.is_alive():
+                    raise EOFError()
+            status, result = worker.connection.recv()
+        except (EOFError, OSError) as e:
+            logger.error(f"Synthesis worker {worker.index} crashed. Restarting...", exc_info=e)  # fmt: skip
+            worker.restart()
+            raise HTTPException(status_code=500, detail="Synthesis worker crashed.")
+
+        if status == "error":
+            status_code, detail = result
+            raise HTTPException(status_code=status_code, detail=detail)
+        return result
+
+
+def _create_style_bert_vits2_tts_engine(**engine_kwargs: Any) -> Any:
+    """ワーカープロセス内で StyleBertVITS2TTSEngine を生成する。"""
+
+    # StyleBertVITS2TTSEngine はこのモジュールをインポートしているため、循環インポートを避けるためここでインポートする
+    from ..aivm_manager import AivmManager
+    from .style_bert_vits2_tts_engine import StyleBertVITS2TTSEngine
+
+    return StyleBertVITS2TTSEngine(AivmManager(get_save_dir() / "Models"), **engine_kwargs)  # fmt: skip
+
+
+def _run_synthesis_worker(
+    engine_factory: Callable[..., Any],
+    engine_kwargs: dict[str, Any],
+    connection: Connection,
+) -> None:
+    """
+    ワーカープロセスのエントリーポイント
+    エンジンを初期化し、メインプロセスから送られたコマンドを 1 件ずつ処理する
+    spawn で起動したプロセスから呼び出せるよう、モジュールのトップレベルに定義している
+    """
+
+    engine = engine_factory(**engine_kwargs)
+    shared_buffer: SharedMemory | None = None
+
+    try:
+        while True:
+            try:
+                command, payload = connection.recv()
+            except EOFError:
+                # メインプロセスが終了した
+                break
+
+            try:
+                result: Any = None
+                if command == "synthesize":
+                    query, style_id, dict_version, dict_path = payload
+                    # ユーザー辞書が更新されていれば、親プロセスと同じ辞書を適用してから音声合成する
+                    apply_dict_in_worker(dict_version, dict_path)
+                    wave = np.ascontiguousarray(engine.synthesize_wave(query, style_id), dtype=np.float32)  # fmt: skip
+                    # 音声波形が収まらない場合のみ、共有メモリを作り直して拡張する
+                    if shared_buffer is None or shared_buffer.size < wave.nbytes:
+                        size = _MIN_SHARED_BUFFER_SIZE
+                        while size < wave.nbytes:
+                            size *= 2
+                        if shared_buffer is not None:
+                            shared_buffer.close()
+                            shared_buffer.unlink()
+                        shared_buffer = SharedMemory(create=True, size=size)
+                    shared_wave: NDArray[np.float32] = np.ndarray(wave.shape, dtype=np.float32, buffer=shared_buffer.buf)  # fmt: skip
+                    shared_wave[...] = wave
+                    del shared_wave  # 共有メモリを close() できるよう、共有メモリへの参照を破棄する
+                    result = (shared_buffer.name, wave.shape)
+                elif command == "load":
+                    engine.preload_model(payload)
+                    job = engine.model_preloader.wait(payload)
+                    if job is not None and job.state == "failed":
+                        raise HTTPException(status_code=500, detail=f"Failed to load model. ({job.error})")  # fmt: skip
+                elif command == "unload":
+                    result = engine.unload_model(payload)
+                elif command == "pin":
+                    engine.pin_model(payload)
+                elif command == "unpin":
+                    engine.unpin_model(payload)
+                elif command == "loaded_models":
+                    result = engine.get_loaded_models()
+                else:
+                    raise ValueError(f"Unknown command: {command}")
+            # HTTPException は pickle 化できないため、ステータスコードとエラーメッセージのみを送る
+            except HTTPException as e:
+                connection.send(("error", (e.status_code, e.detail)))
+                continue
+            except Exception as e:
+                logger.error(f"Synthesis worker failed to process {command}.", exc_info=e)  # fmt: skip
+                connection.send(("error", (500, f"{type(e).__name__}: {e}")))
+                continue
+            connection.send(("ok", result))
+    finally:
+        if shared_buffer is not None:
+            shared_buffer.close()
+            shared_buffer.unlink()
@@ -51,71 +51,123 @@ OjtUnknown = Literal["xx"]
 OjtPhoneme = OjtVowel | OjtConsonant | OjtUnknown
 
 
-@dataclass
+# OpenJTalk feature (フルコンテキストラベル) の全ての属性を解析する正規表現
+## フルコンテキストラベルの仕様は、http://hts.sp.nitech.ac.jp/?Download の HTS-2.3のJapanese tar.bz2 (126 MB)をダウンロードして、data/lab_format.pdfを見るとリストが見つかります。 # noqa
+_FULL_CONTEXT_PATTERN = re.compile(
+    r"^(?P<p1>.+?)\^(?P<p2>.+?)\-(?P<p3>.+?)\+(?P<p4>.+?)\=(?P<p5>.+?)"
+    r"/A\:(?P<a1>.+?)\+(?P<a2>.+?)\+(?P<a3>.+?)"
+    r"/B\:(?P<b1>.+?)\-(?P<b2>.+?)\_(?P<b3>.+?)"
+    r"/C\:(?P<c1>.+?)\_(?P<c2>.+?)\+(?P<c3>.+?)"
+    r"/D\:(?P<d1>.+?)\+(?P<d2>.+?)\_(?P<d3>.+?)"
+    r"/E\:(?P<e1>.+?)\_(?P<e2>.+?)\!(?P<e3>.+?)\_(?P<e4>.+?)\-(?P<e5>.+?)"
+    r"/F\:(?P<f1>.+?)\_(?P<f2>.+?)\#(?P<f3>.+?)\_(?P<f4>.+?)\@(?P<f5>.+?)\_(?P<f6>.+?)\|(?P<f7>.+?)\_(?P<f8>.+?)"  # noqa
+    r"/G\:(?P<g1>.+?)\_(?P<g2>.+?)\%(?P<g3>.+?)\_(?P<g4>.+?)\_(?P<g5>.+?)"
+    r"/H\:(?P<h1>.+?)\_(?P<h2>.+?)"
+    r"/I\:(?P<i1>.+?)\-(?P<i2>.+?)\@(?P<i3>.+?)\+(?P<i4>.+?)\&(?P<i5>.+?)\-(?P<i6>.+?)\|(?P<i7>.+?)\+(?P<i8>.+?)"  # noqa
+    r"/J\:(?P<j1>.+?)\_(?P<j2>.+?)"
+    r"/K\:(?P<k1>.+?)\+(?P<k2>.+?)\-(?P<k3>.+?)$"
+)
+
+
+def _parse_contexts(feature: str) -> dict[str, str]:
+    """OpenJTalk feature の全ての属性を正規表現で解析する"""
+    result = _FULL_CONTEXT_PATTERN.search(feature)
+    if result is None:
+        raise ValueError(feature)
+    return result.groupdict()
+
+
+@dataclass(slots=True)
 class Label:
-    """OpenJTalkラベル"""
-
-    contexts: dict[str, str]  # ラベルの属性
+    """
+    OpenJTalkラベル
+    VOICEVOX ENGINE で利用されている属性のみを保持する (全ての属性が必要な場合は contexts から取得する)
+    """
+
+    feature: str  # OpenJTalk feature (フルコンテキストラベル)
+    p3: str  # 音素
+    a2: str  # アクセント句内におけるモーラのインデックス
+    f1: str  # アクセント句のモーラ数
+    f2: str  # アクセント句内でのアクセント位置
+    f3: str  # 疑問形か否か
+    f5: str  # BreathGroup内におけるアクセント句のインデックス
+    i3: str  # BreathGroupのインデックス
 
     @classmethod
     def from_feature(cls, feature: str) -> Self:
         """OpenJTalk feature から Label インスタンスを生成する"""
-        # フルコンテキストラベルの仕様は、http://hts.sp.nitech.ac.jp/?Download の HTS-2.3のJapanese tar.bz2 (126 MB)をダウンロードして、data/lab_format.pdfを見るとリストが見つかります。 # noqa
         # VOICEVOX ENGINE で利用されている属性: p3 phoneme / a2 moraIdx / f1 n_mora / f2 pos_accent / f3 疑問形 / f5 アクセント句Idx / i3 BreathGroupIdx  # noqa: B950
-        result = re.search(
-            r"^(?P<p1>.+?)\^(?P<p2>.+?)\-(?P<p3>.+?)\+(?P<p4>.+?)\=(?P<p5>.+?)"
-            r"/A\:(?P<a1>.+?)\+(?P<a2>.+?)\+(?P<a3>.+?)"
-            r"/B\:(?P<b1>.+?)\-(?P<b2>.+?)\_(?P<b3>.+?)"
-            r"/C\:(?P<c1>.+?)\_(?P<c2>.+?)\+(?P<c3>.+?)"
-            r"/D\:(?P<d1>.+?)\+(?P<d2>.+?)\_(?P<d3>.+?)"
-            r"/E\:(?P<e1>.+?)\_(?P<e2>.+?)\!(?P<e3>.+?)\_(?P<e4>.+?)\-(?P<e5>.+?)"
-            r"/F\:(?P<f1>.+?)\_(?P<f2>.+?)\#(?P<f3>.+?)\_(?P<f4>.+?)\@(?P<f5>.+?)\_(?P<f6>.+?)\|(?P<f7>.+?)\_(?P<f8>.+?)"  # noqa
-            r"/G\:(?P<g1>.+?)\_(?P<g2>.+?)\%(?P<g3>.+?)\_(?P<g4>.+?)\_(?P<g5>.+?)"
-            r"/H\:(?P<h1>.+?)\_(?P<h2>.+?)"
-            r"/I\:(?P<i1>.+?)\-(?P<i2>.+?)\@(?P<i3>.+?)\+(?P<i4>.+?)\&(?P<i5>.+?)\-(?P<i6>.+?)\|(?P<i7>.+?)\+(?P<i8>.+?)"  # noqa
-            r"/J\:(?P<j1>.+?)\_(?P<j2>.+?)"
-            r"/K\:(?P<k1>.+?)\+(?P<k2>.+?)\-(?P<k3>.+?)$",
+        # 長い文章では全ての属性を正規表現で解析する処理が支配的になるため、区切り文字で分割して利用する属性のみを取り出す
+        # OpenJTalk が出力する形式の feature であれば、正規表現で解析した場合 (contexts) と同じ値になる
+        # 想定外の形式の場合は正規表現で解析し直す (それでも解析できない場合は ValueError を送出する)
+        sections = feature.split("/")
+        if len(sections) == 12:
+            p_section, a_section, f_section, i_section = sections[0], sections[1], sections[6], sections[9]  # fmt: skip
+            if a_section[:2] == "A:" and f_section[:2] == "F:" and i_section[:2] == "I:":  # fmt: skip
+                # p1^p2-p3+p4=p5
+                p3 = p_section.partition("^")[2].partition("-")[2].partition("+")[0]
+                # A:a1+a2+a3
+                a2 = a_section[2:].partition("+")[2].partition("+")[0]
+                # F:f1_f2#f3_f4@f5_f6|f7_f8
+                f12, _, f_rest = f_section[2:].partition("#")
+                f1, _, f2 = f12.partition("_")
+                f3 = f_rest.partition("_")[0]
+                f5 = f_rest.partition("@")[2].partition("_")[0]
+                # I:i1-i2@i3+i4&i5-i6|i7+i8
+                i3 = i_section.partition("@")[2].partition("+")[0]
+                if "" not in (p3, a2, f1, f2, f3, f5, i3):
+                    return cls(feature, p3, a2, f1, f2, f3, f5, i3)
+
+        contexts = _parse_contexts(feature)
+        return cls(
             feature,
+            contexts["p3"],
+            contexts["a2"],
+            contexts["f1"],
+            contexts["f2"],
+            contexts["f3"],
+            contexts["f5"],
+            contexts["i3"],
         )
-        if result is None:
-            raise ValueError(feature)
 
-        contexts = result.groupdict()
-        return cls(contexts=contexts)
+    @property
+    def contexts(self) -> dict[str, str]:
+        """ラベルの全ての属性 (参照のたびに feature を正規表現で解析する)"""
+        return _parse_contexts(self.feature)
 
     @property
     def phoneme(self) -> OjtPhoneme:
         """このラベルに含まれる音素。子音 or 母音 (無音含む)。"""
         # FIXME: バリデーションする
-        return self.contexts["p3"]  # type: ignore
+        return self.p3  # type: ignore
 
     @property
     def mora_index(self) -> int:
         """アクセント句内におけるモーラのインデックス (1 ~ 49)"""
-        return int(self.contexts["a2"])
+        return int(self.a2)
 
     def is_pause(self) -> bool:
         """このラベルが無音 (silent/pause) であれば True、そうでなければ False を返す"""
-        return self.contexts["f1"] == "xx"
+        return self.f1 == "xx"
 
     @property
     def accent_position(self) -> int:
         """アクセント句内でのアクセント位置 (1 ~ 49)"""
-        return int(self.contexts["f2"])
+        return int(self.f2)
 
     def is_interrogative(self) -> bool:
         """疑問形か否か"""
-        return self.contexts["f3"] == "1"
+        return self.f3 == "1"
 
     @property
     def accent_phrase_index(self) -> str:
         """BreathGroup内におけるアクセント句のインデックス"""
-        return self.contexts["f5"]
+        return self.f5
 
     @property
     def breath_group_index(self) -> str:
         """BreathGroupのインデックス"""
-        return self.contexts["i3"]
+        return self.i3
 
     def __repr__(self) -> str:
         return f"<Label phoneme='{self.phoneme}'>"
@@ -0,0 +1,156 @@
+"""読み上げテキストの解析結果 (g2p の結果) のキャッシュ"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class TextFrontendCacheStats:
+    """テキスト解析結果キャッシュの統計情報"""
+
+    hit_count: int  # キャッシュにヒットした回数
+    miss_count: int  # キャッシュにヒットしなかった回数
+    entry_count: int  # キャッシュされている解析結果の数
+    invalidation_count: int  # 辞書の更新によってキャッシュが破棄された回数
+
+    @property
+    def hit_rate(self) -> float:
+        """キャッシュのヒット率 (0.0 ~ 1.0)"""
+        total = self.hit_count + self.miss_count
+        return self.hit_count / total if total > 0 else 0.0
+
+
+class TextFrontendCache:
+    """
+    正規化済みの読み上げテキストから、g2p による解析結果 (音素・音高・word2ph などのリスト) への LRU キャッシュ
+    文書モードでは、文から文ごとのアクセント句系列へのキャッシュとしても用いられる
+    解析結果は pyopenjtalk に適用されている辞書に依存するため、辞書のバージョンが変わるとキャッシュ全体を破棄する
+    キャッシュされた解析結果は呼び出し元で書き換えられないよう、格納時と取得時には常にコピーする
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        get_dict_version: Callable[[], int],
+        copy_result: Callable[[tuple[Any, ...]], tuple[Any, ...]] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        max_entries : int
+            キャッシュする解析結果の数の上限
+        get_dict_version : Callable[[], int]
+            pyopenjtalk に適用されている辞書のバージョンを返す関数
+        copy_result : Callable[[tuple[Any, ...]], tuple[Any, ...]] | None
+            解析結果をコピーする関数 (None の場合は、解析結果に含まれるリストを浅くコピーする)
+        """
+
+        self.max_entries = max_entries
+        self._get_dict_version = get_dict_version
+        self._copy_result = copy_result if copy_result is not None else _copy_result
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Any, ...]] = OrderedDict()
+        self._dict_version = get_dict_version()
+        self._hit_count = 0
+        self._miss_count = 0
+        self._invalidation_count = 0
+
+    @property
+    def stats(self) -> TextFrontendCacheStats:
+        """これまでの統計情報"""
+        with self._lock:
+            return TextFrontendCacheStats(
+                hit_count=self._hit_count,
+                miss_count=self._miss_count,
+                entry_count=len(self._entries),
+                invalidation_count=self._invalidation_count,
+            )
+
+    def get_dict_version(self) -> int:
+        """
+        現在の辞書のバージョンを取得する
+        解析を始める前に取得しておき、put() に渡すことで、解析中に辞書が更新された場合に古い解析結果がキャッシュされるのを防ぐ
+
+        Returns
+        -------
+        int
+            辞書のバージョン
+        """
+
+        return self._get_dict_version()
+
+    def get(self, normalized_text: str) -> tuple[Any, ...] | None:
+        """
+        キャッシュされた解析結果を取得する
+
+        Parameters
+        ----------
+        normalized_text : str
+            正規化済みの読み上げテキスト
+
+        Returns
+        -------
+        tuple[Any, ...] | None
+            解析結果のコピー (キャッシュされていない場合は None)
+        """
+
+        with self._lock:
+            self._invalidate_if_dict_updated()
+            result = self._entries.get(normalized_text)
+            if result is None:
+                self._miss_count += 1
+                return None
+            self._entries.move_to_end(normalized_text)
+            self._hit_count += 1
+        return self._copy_result(result)
+
+    def put(
+        self, normalized_text: str, result: tuple[Any, ...], dict_version: int
+    ) -> None:
+        """
+        解析結果をキャッシュする。上限を超えた場合は、最も長く使われていない解析結果から順に破棄する。
+
+        Parameters
+        ----------
+        normalized_text : str
+            正規化済みの読み上げテキスト
+        result : tuple[Any, ...]
+            g2p による解析結果
+        dict_version : int
+            解析を始める前に get_dict_version() で取得した辞書のバージョン
+            現在のバージョンと異なる (解析中に辞書が更新された) 場合はキャッシュしない
+        """
+
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._invalidate_if_dict_updated()
+            if dict_version != self._dict_version:
+                return
+            self._entries[normalized_text] = self._copy_result(result)
+            self._entries.move_to_end(normalized_text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """キャッシュされた解析結果を全て破棄する。"""
+        with self._lock:
+            self._entries.clear()
+
+    def _invalidate_if_dict_updated(self) -> None:
+        """辞書のバージョンが変わっていれば、キャッシュされた解析結果を全て破棄する。(ロックを取得した状態で呼び出す)"""
+        dict_version = self._get_dict_version()
+        if dict_version == self._dict_version:
+            return
+        self._dict_version = dict_version
+        if len(self._entries) > 0:
+            self._entries.clear()
+            self._invalidation_count += 1
+
+
+def _copy_result(result: tuple[Any, ...]) -> tuple[Any, ...]:
+    """解析結果に含まれるリストを浅くコピーする。"""
+    return tuple(list(value) if isinstance(value, list) else value for value in result)
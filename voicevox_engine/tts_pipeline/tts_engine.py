@@ -27,7 +27,13 @@ from .model import (
     Score,
 )
 from .mora_mapping import mora_kana_to_mora_phonemes, mora_phonemes_to_mora_kana
-from .phoneme import Phoneme
+from .phoneme import (
+    Phoneme,
+    is_unvoiced_mora_tail_ids,
+    to_frame_onehot,
+    to_phoneme_id,
+    to_phoneme_ids,
+)
 from .text_analyzer import text_to_accent_phrases
 
 # 疑問文語尾定数
@@ -62,6 +68,44 @@ def _to_flatten_phonemes(moras: list[Mora]) -> list[Phoneme]:
     return phonemes
 
 
+def _to_consonant_and_vowel_ids(
+    moras: list[Mora],
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """モーラ系列から子音ID系列 (子音がないモーラは -1) と母音ID系列を抽出する"""
+    consonant_ids = np.array(
+        [to_phoneme_id(mora.consonant) if mora.consonant else -1 for mora in moras],
+        dtype=np.int64,
+    )
+    vowel_ids = to_phoneme_ids([mora.vowel for mora in moras])
+    return consonant_ids, vowel_ids
+
+
+def _to_flatten_phoneme_ids(
+    consonant_ids: NDArray[np.int64], vowel_ids: NDArray[np.int64]
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """
+    子音ID系列と母音ID系列から、`_to_flatten_phonemes()` と同じ順序の音素ID系列を得る
+    Parameters
+    ----------
+    consonant_ids : NDArray[np.int64]
+        子音ID系列 (子音がないモーラは -1) 。shape = (Mora,)
+    vowel_ids : NDArray[np.int64]
+        母音ID系列。shape = (Mora,)
+    Returns
+    -------
+    phoneme_ids : NDArray[np.int64]
+        音素ID系列。shape = (Phoneme,)
+    vowel_indexes : NDArray[np.int64]
+        音素ID系列内での、各モーラの母音の位置。shape = (Mora,)
+    """
+    # (子音, 母音) の組を並べてから、子音がないモーラの子音を取り除く
+    has_consonant = consonant_ids != -1
+    phoneme_ids = np.stack([consonant_ids, vowel_ids], axis=1).reshape(-1)
+    is_phoneme = np.stack([has_consonant, np.ones_like(has_consonant)], axis=1).reshape(-1)  # fmt: skip
+    vowel_indexes = np.cumsum(has_consonant.astype(np.int64) + 1) - 1
+    return phoneme_ids[is_phoneme], vowel_indexes
+
+
 def _create_one_hot(accent_phrase: AccentPhrase, index: int) -> NDArray[np.int64]:
     """
     アクセント句から指定インデックスのみが 1 の配列 (onehot) を生成する。
@@ -138,33 +182,28 @@ def _count_frame_per_unit(
     frame_per_mora : NDArray[np.int64]
         モーラあたりのフレーム長。端数丸め。shape = (Mora,)
     """
-    frame_per_phoneme: list[int] = []
-    frame_per_mora: list[int] = []
-    for mora in moras:
-        vowel_frames = _to_frame(mora.vowel_length)
-        consonant_frames = (
-            _to_frame(mora.consonant_length) if mora.consonant_length is not None else 0
-        )
-        mora_frames = (
-            vowel_frames + consonant_frames
-        )  # 音素ごとにフレーム長を算出し、和をモーラのフレーム長とする
+    has_consonant = np.array([bool(mora.consonant) for mora in moras], dtype=np.bool_)
+    vowel_frames = _to_frame(
+        np.array([mora.vowel_length for mora in moras], dtype=np.float64)
+    )
+    consonant_frames = _to_frame(
+        np.array([mora.consonant_length or 0.0 for mora in moras], dtype=np.float64)
+    )
+    # 音素ごとにフレーム長を算出し、和をモーラのフレーム長とする
+    frame_per_mora = vowel_frames + consonant_frames
 
-        if mora.consonant:
-            frame_per_phoneme += [consonant_frames]
-        frame_per_phoneme += [vowel_frames]
-        frame_per_mora += [mora_frames]
+    # (子音, 母音) の組を並べてから、子音がないモーラの子音を取り除く
+    frame_per_phoneme = np.stack([consonant_frames, vowel_frames], axis=1).reshape(-1)
+    is_phoneme = np.stack([has_consonant, np.ones_like(has_consonant)], axis=1).reshape(-1)  # fmt: skip
 
-    return (
-        np.array(frame_per_phoneme, dtype=np.int64),
-        np.array(frame_per_mora, dtype=np.int64),
-    )
+    return frame_per_phoneme[is_phoneme], frame_per_mora
 
 
-def _to_frame(sec: float) -> int:
+def _to_frame(sec: NDArray[np.float64]) -> NDArray[np.int64]:
     FRAMERATE = 172.265625  # 44100 / 256 [frame/sec]
     # NOTE: `round` は偶数丸め。移植時に取扱い注意。詳細は voicevox_engine#552
     sec_rounded: NDArray[np.float64] = np.round(sec * FRAMERATE)
-    return sec_rounded.astype(np.int32).item()
+    return sec_rounded.astype(np.int32).astype(np.int64)
 
 
 def _apply_pitch_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
@@ -243,13 +282,13 @@ def _query_to_decoder_feature(
     moras = _apply_pitch_scale(moras, query)
     moras = _apply_intonation_scale(moras, query)
 
-    # 表現を変更する（音素クラス → 音素 onehot ベクトル、モーラクラス → 音高スカラ）
-    phoneme = np.stack([p.onehot for p in _to_flatten_phonemes(moras)])
+    # 表現を変更する（モーラクラス → 音素ID系列・音高スカラ）
+    phoneme_ids, _ = _to_flatten_phoneme_ids(*_to_consonant_and_vowel_ids(moras))
     f0 = np.array([mora.pitch for mora in moras], dtype=np.float32)
 
-    # 時間スケールを変更する（音素・モーラ → フレーム）
+    # 時間スケールを変更する（音素・モーラ → フレーム）し、フレームごとの音素 onehot ベクトルを得る
     frame_per_phoneme, frame_per_mora = _count_frame_per_unit(moras)
-    phoneme = np.repeat(phoneme, frame_per_phoneme, axis=0)
+    phoneme = to_frame_onehot(phoneme_ids, frame_per_phoneme)
     f0 = np.repeat(f0, frame_per_mora)
 
     return phoneme, f0
@@ -464,23 +503,23 @@ class TTSEngine:
         # モーラ系列を抽出する
         moras = to_flatten_moras(accent_phrases)
 
-        # 音素系列を抽出する
-        phonemes = _to_flatten_phonemes(moras)
-
-        # 音素クラスから音素IDスカラへ表現を変換する
-        phoneme_ids = np.array([p.id for p in phonemes], dtype=np.int64)
+        # 音素ID系列と、音素ID系列内での各モーラの母音の位置を抽出する
+        phoneme_ids, vowel_indexes = _to_flatten_phoneme_ids(
+            *_to_consonant_and_vowel_ids(moras)
+        )
 
         # コアを用いて音素長を生成する
         phoneme_lengths = self._core.safe_yukarin_s_forward(phoneme_ids, style_id)
 
         # 生成結果でモーラ内の音素長属性を置換する
-        vowel_indexes = [i for i, p in enumerate(phonemes) if p.is_mora_tail()]
+        vowel_lengths = phoneme_lengths[vowel_indexes].tolist()
+        consonant_lengths = phoneme_lengths[vowel_indexes - 1].tolist()
         for i, mora in enumerate(moras):
             if mora.consonant is None:
                 mora.consonant_length = None
             else:
-                mora.consonant_length = phoneme_lengths[vowel_indexes[i] - 1]
-            mora.vowel_length = phoneme_lengths[vowel_indexes[i]]
+                mora.consonant_length = consonant_lengths[i]
+            mora.vowel_length = vowel_lengths[i]
 
         return accent_phrases
 
@@ -522,12 +561,7 @@ class TTSEngine:
         moras = to_flatten_moras(accent_phrases)
 
         # モーラ系列から子音ID系列・母音ID系列を抽出する
-        consonant_id_ints = [
-            Phoneme(mora.consonant).id if mora.consonant else -1 for mora in moras
-        ]
-        consonant_ids = np.array(consonant_id_ints, dtype=np.int64)
-        vowels = [Phoneme(mora.vowel) for mora in moras]
-        vowel_ids = np.array([p.id for p in vowels], dtype=np.int64)
+        consonant_ids, vowel_ids = _to_consonant_and_vowel_ids(moras)
 
         # コアを用いてモーラ音高を生成する
         f0 = self._core.safe_yukarin_sa_forward(
@@ -541,13 +575,11 @@ class TTSEngine:
         )
 
         # 母音が無声であるモーラは音高を 0 とする
-        for i, p in enumerate(vowels):
-            if p.is_unvoiced_mora_tail():
-                f0[i] = 0
+        f0[is_unvoiced_mora_tail_ids(vowel_ids)] = 0
 
         # 更新する
-        for i, mora in enumerate(moras):
-            mora.pitch = f0[i]
+        for mora, pitch in zip(moras, f0.tolist()):
+            mora.pitch = pitch
 
         return accent_phrases
 
@@ -0,0 +1,117 @@
+"""音声合成モデルの推論セッションプール"""
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class TTSModelPool(Generic[_T]):
+    """
+    単一の音声合成モデルに対応する推論セッション (TTSModel インスタンス) のプール
+
+    1 つのセッションは同時に 1 つのスレッドからしか利用されないことを保証しつつ、
+    プール内の空きセッションを使って同一モデルに対する複数の推論を並列実行できるようにする
+    セッションは必要になった時点で max_size まで遅延生成される
+    プールごとに独立したロックを持つため、異なるモデルに対する推論が互いにブロックし合うことはない
+    """
+
+    def __init__(self, factory: Callable[[], _T], max_size: int) -> None:
+        """
+        Parameters
+        ----------
+        factory : Callable[[], _T]
+            新しいセッションを生成する関数 (生成したセッションはロード済みである必要がある)
+        max_size : int
+            プールが保持するセッションの最大数 (1 以上)
+        """
+
+        if max_size < 1:
+            raise ValueError("max_size must be greater than or equal to 1.")
+
+        self._factory = factory
+        self._max_size = max_size
+        self._condition = threading.Condition()
+        # 全てのセッション (貸出中のものも含む)
+        self._sessions: list[_T] = []
+        # 貸出可能なセッション
+        self._idle_sessions: list[_T] = []
+        # 生成中のセッション数
+        self._creating_count = 0
+
+        # 最初のセッションは即座に生成する
+        # モデルのロードに失敗した場合にここで例外を送出させるため
+        session = self._factory()
+        self._sessions.append(session)
+        self._idle_sessions.append(session)
+
+    @property
+    def max_size(self) -> int:
+        """プールが保持するセッションの最大数"""
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """プールが現在保持しているセッション数"""
+        with self._condition:
+            return len(self._sessions)
+
+    @property
+    def in_use(self) -> int:
+        """現在貸出中のセッション数"""
+        with self._condition:
+            return len(self._sessions) - len(self._idle_sessions)
+
+    @property
+    def sessions(self) -> list[_T]:
+        """プールが現在保持している全てのセッション (貸出中のものも含む)"""
+        with self._condition:
+            return list(self._sessions)
+
+    @contextmanager
+    def acquire(self) -> Iterator[_T]:
+        """
+        プールからセッションを 1 つ借り出す
+        空きセッションがなく、かつプールに余裕がある場合は新しいセッションを生成する
+        プールが満杯の場合は、いずれかのセッションが返却されるまで待機する
+
+        Yields
+        ------
+        _T
+            借り出したセッション (with ブロックを抜けると自動的に返却される)
+        """
+
+        session = self._checkout()
+        try:
+            yield session
+        finally:
+            with self._condition:
+                self._idle_sessions.append(session)
+                self._condition.notify()
+
+    def _checkout(self) -> _T:
+        """プールからセッションを取り出す。必要に応じてセッションを新規生成する。"""
+
+        with self._condition:
+            while True:
+                if len(self._idle_sessions) > 0:
+                    return self._idle_sessions.pop()
+                if len(self._sessions) + self._creating_count < self._max_size:
+                    self._creating_count += 1
+                    break
+                self._condition.wait()
+
+        # セッションの生成には時間がかかるため、ロックを解放した状態で行う
+        try:
+            session = self._factory()
+        except BaseException:
+            with self._condition:
+                self._creating_count -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._creating_count -= 1
+            self._sessions.append(session)
+        return session
@@ -0,0 +1,422 @@
+"""WebSocket で読み上げテキストの断片を受け取り、文ごとに音声合成した音声を返し続ける音声合成セッション"""
+
+import asyncio
+import itertools
+import json
+import threading
+from collections.abc import Generator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final
+
+import numpy as np
+from fastapi import HTTPException, WebSocket
+from numpy.typing import NDArray
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from ..logging import logger
+from ..metas.Metas import StyleId
+from ..model import AudioQuery
+from .streaming_synthesis import wave_to_pcm16_bytes
+from .synthesis_worker_pool import SynthesisCancelledError
+
+if TYPE_CHECKING:
+    from .style_bert_vits2_tts_engine import StyleBertVITS2TTSEngine
+
+# 文の終わりとみなす記号
+# 半角のピリオドは小数点などにも使われるため含めない
+SENTENCE_TERMINATORS: Final[frozenset[str]] = frozenset("。．！？!?♪\n")
+
+# 文の終わりを表す記号の直後に続く場合に、同じ文に含める閉じ括弧
+_CLOSING_BRACKETS: Final[frozenset[str]] = frozenset("」』）)】〉》")
+
+# 開きと閉じが同じ文字の引用符
+# 文の終わりを表す記号の直後に続き、かつ同じ文の中に対応する開きの引用符がある場合のみ、閉じの引用符として同じ文に含める
+_SYMMETRIC_QUOTES: Final[frozenset[str]] = frozenset("\"'")
+
+# 文が長すぎる場合に、文の途中で区切る位置とする記号
+_CLAUSE_SEPARATORS: Final[frozenset[str]] = frozenset("、，,")
+
+
+class SentenceBuffer:
+    """
+    LLM などから逐次届く読み上げテキストの断片を蓄積し、文の終わりまで揃った文から順に取り出す
+    文の終わりを表す記号が現れないまま max_sentence_length 文字を超えた場合は、読点 (なければ max_sentence_length 文字目) で区切る
+    """
+
+    def __init__(self, max_sentence_length: int = 100) -> None:
+        """
+        Parameters
+        ----------
+        max_sentence_length : int
+            1 文の最大文字数
+        """
+
+        if max_sentence_length < 1:
+            raise ValueError("max_sentence_length must be greater than or equal to 1.")
+        self._max_sentence_length = max_sentence_length
+        self._text = ""
+
+    @property
+    def pending_text(self) -> str:
+        """文の終わりが揃っておらず、まだ取り出されていないテキスト"""
+        return self._text
+
+    def append(self, fragment: str) -> list[str]:
+        """
+        読み上げテキストの断片を追加し、文の終わりまで揃った文のリストを返す
+
+        Parameters
+        ----------
+        fragment : str
+            読み上げテキストの断片
+
+        Returns
+        -------
+        list[str]
+            文の終わりまで揃った文のリスト (前後の空白は取り除かれ、空の文は含まれない)
+        """
+
+        self._text += fragment
+        sentences: list[str] = []
+        while True:
+            # 前の文の終わりを表す記号や閉じ括弧が次の断片の先頭に届いた場合は、読み上げる内容がないため捨てる
+            # 引用符は次の文の開きの引用符の可能性があるため捨てない
+            self._text = self._text.lstrip("".join(SENTENCE_TERMINATORS | _CLOSING_BRACKETS) + " 　\t\r")  # fmt: skip
+            end = find_sentence_end(self._text, self._max_sentence_length)
+            if end is None:
+                break
+            sentence, self._text = self._text[:end].strip(), self._text[end:]
+            if sentence != "":
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self) -> str | None:
+        """文の終わりが揃っていないテキストを 1 文として取り出す。取り出すテキストがない場合は None を返す。"""
+        sentence, self._text = self._text.strip(), ""
+        return sentence if sentence != "" else None
+
+    def clear(self) -> None:
+        """蓄積しているテキストを破棄する。"""
+        self._text = ""
+
+
+def find_sentence_end(text: str, max_sentence_length: int) -> int | None:
+    """
+    テキストの先頭の文の終わりの位置を返す
+    文の終わりを表す記号が現れないまま max_sentence_length 文字を超えた場合は、最後の読点 (なければ max_sentence_length 文字目) の位置を返す
+
+    Parameters
+    ----------
+    text : str
+        テキスト
+    max_sentence_length : int
+        1 文の最大文字数
+
+    Returns
+    -------
+    int | None
+        先頭の文の終わりの位置 (文の終わりが揃っていない場合は None)
+    """
+
+    for index, char in enumerate(text):
+        if index >= max_sentence_length:
+            break
+        if char in SENTENCE_TERMINATORS:
+            # 連続する文の終わりを表す記号と、その直後の閉じ括弧・閉じの引用符までを同じ文に含める
+            end = index + 1
+            while end < len(text):
+                if text[end] in SENTENCE_TERMINATORS or text[end] in _CLOSING_BRACKETS:  # fmt: skip
+                    end += 1
+                elif text[end] in _SYMMETRIC_QUOTES and text[:end].count(text[end]) % 2 == 1:  # fmt: skip
+                    end += 1
+                else:
+                    break
+            return end
+
+    # 文の終わりを表す記号が現れないまま長くなりすぎた場合は、最後の読点 (なければ上限の文字数) で区切る
+    if len(text) > max_sentence_length:
+        head = text[:max_sentence_length]
+        separator_index = max(head.rfind(separator) for separator in _CLAUSE_SEPARATORS)  # fmt: skip
+        return separator_index + 1 if separator_index >= 0 else max_sentence_length
+    return None
+
+
+class TTSSessionParameters(BaseModel):
+    """
+    音声合成セッションで読み上げる各文に適用される、音声合成用のクエリのパラメータ
+    各値の意味は AudioQuery の同名のフィールドと同じ
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    speedScale: float = Field(default=1.0, title="全体の話速")
+    intonationScale: float = Field(default=1.0, title="全体のスタイルの強さ")
+    tempoDynamicsScale: float = Field(default=1.0, title="全体のテンポの緩急")
+    pitchScale: float = Field(default=0.0, title="全体の音高")
+    volumeScale: float = Field(default=1.0, title="全体の音量")
+    prePhonemeLength: float = Field(default=0.1, title="音声の前の無音時間 (秒)")
+    postPhonemeLength: float = Field(default=0.1, title="音声の後の無音時間 (秒)")
+    outputSamplingRate: int | None = Field(
+        default=None,
+        title="音声データの出力サンプリングレート (null の場合はモデルのデフォルト値)",
+    )
+    outputStereo: bool = Field(default=False, title="音声データをステレオ出力するか否か")  # fmt: skip
+
+
+@dataclass(frozen=True)
+class _PendingSentence:
+    """音声合成の処理待ちキューに積まれた文"""
+
+    text: str
+    parameters: TTSSessionParameters
+    generation: int  # 積まれた時点のキャンセル世代 (cancel を受け取るたびに増える)
+    cancel_event: (
+        threading.Event
+    )  # 積まれた時点のキャンセル世代でキャンセルされるとセットされるイベント
+
+
+@dataclass(frozen=True)
+class _FlushMarker:
+    """flush を受け取った位置を示す、音声合成の処理待ちキューの目印"""
+
+    generation: int
+
+
+class TTSSession:
+    """
+    1 つの WebSocket 接続に紐づく音声合成セッション
+    接続時に指定されたスタイルで、クライアントから逐次届く読み上げテキストの断片を文ごとに音声合成し、音声をクライアントに送り続ける
+
+    クライアントからのメッセージ (いずれも JSON テキストメッセージ):
+    - {"type": "text", "text": "..."}: 読み上げテキストの断片を追加する (文の終わりまで揃った文から順に音声合成される)
+    - {"type": "flush"}: 文の終わりが揃っていないテキストも音声合成し、それまでの全ての文を送り終えたら flushed を返す
+    - {"type": "cancel"}: 処理待ちのテキストを破棄し、音声合成中の文の残りの音声の送信を中止して cancelled を返す
+    - {"type": "parameters", ...}: 以降に追加する文に適用するパラメータ (TTSSessionParameters) のうち、指定したものを更新する
+
+    サーバーからのメッセージ:
+    - {"type": "sentence_start", "sentence_index": n, "text": "...", "sample_rate": n, "channels": n}: 文の音声の送信開始
+    - バイナリメッセージ: 16bit 符号付き整数 (リトルエンディアン) の PCM データ (1 文につき 1 つ以上)
+    - {"type": "sentence_end", "sentence_index": n}: 文の音声の送信完了
+    - {"type": "flushed"} / {"type": "cancelled"}: flush / cancel の完了
+    - {"type": "error", "detail": "..."}: メッセージや音声合成のエラー (セッションは継続する)
+
+    音声合成の処理待ちの文が max_pending_sentences に達すると、空きができるまでクライアントからのメッセージの受信を停止する
+    (クライアントには TCP のフロー制御による背圧がかかる) ため、その間に送られた cancel は空きができた時点で処理される
+    音声の送信もクライアントが受信するまで待つため、受信の遅いクライアントに対して音声合成が先行しすぎることはない
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        engine: "StyleBertVITS2TTSEngine",
+        style_id: StyleId,
+        max_pending_sentences: int = 8,
+        max_sentence_length: int = 100,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        websocket : WebSocket
+            接続を受け入れ済みの WebSocket
+        engine : StyleBertVITS2TTSEngine
+            音声合成に使うエンジン
+        style_id : StyleId
+            セッションで音声合成に使うスタイル ID
+        max_pending_sentences : int
+            音声合成の処理待ちの文の上限
+        max_sentence_length : int
+            1 文の最大文字数 (文の終わりを表す記号が現れないまま超えた場合は文の途中で区切る)
+        """
+
+        self._websocket = websocket
+        self._engine = engine
+        self._style_id = style_id
+        self._sentence_buffer = SentenceBuffer(max_sentence_length)
+        self._queue: asyncio.Queue[_PendingSentence | _FlushMarker] = asyncio.Queue(maxsize=max_pending_sentences)  # fmt: skip
+        self._parameters = TTSSessionParameters()
+        self._generation = 0
+        self._cancel_event = threading.Event()
+        self._sentence_indices = itertools.count()
+        # 受信側と音声合成側の両方からメッセージを送るため、送信は 1 メッセージずつ排他する
+        self._send_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        """クライアントが切断するまでセッションを処理する。"""
+
+        receiver = asyncio.ensure_future(self._receive_messages())
+        synthesizer = asyncio.ensure_future(self._synthesize_sentences())
+        try:
+            done, _ = await asyncio.wait({receiver, synthesizer}, return_when=asyncio.FIRST_COMPLETED)  # fmt: skip
+            for task in done:
+                task.result()
+        finally:
+            # 音声合成ワーカープロセスで音声合成中の文があれば中断する
+            self._cancel_event.set()
+            for task in (receiver, synthesizer):
+                task.cancel()
+            await asyncio.gather(receiver, synthesizer, return_exceptions=True)
+
+    async def _receive_messages(self) -> None:
+        """クライアントからのメッセージを受信し、音声合成の処理待ちキューに文を積む。"""
+
+        while True:
+            message = await self._websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("text") is None:
+                await self._send_json({"type": "error", "detail": "Binary messages are not supported."})  # fmt: skip
+                continue
+            try:
+                payload = json.loads(message["text"])
+                if not isinstance(payload, dict):
+                    raise ValueError("Message must be a JSON object.")
+                await self._handle_message(payload)
+            except (ValueError, ValidationError) as e:
+                await self._send_json({"type": "error", "detail": str(e)})
+
+    async def _handle_message(self, payload: dict[str, Any]) -> None:
+        """クライアントからの 1 件のメッセージを処理する。"""
+
+        message_type = payload.get("type")
+        if message_type == "text":
+            text = payload.get("text")
+            if not isinstance(text, str):
+                raise ValueError("text must be a string.")
+            for sentence in self._sentence_buffer.append(text):
+                await self._enqueue_sentence(sentence)
+        elif message_type == "flush":
+            sentence = self._sentence_buffer.flush()
+            if sentence is not None:
+                await self._enqueue_sentence(sentence)
+            await self._queue.put(_FlushMarker(generation=self._generation))
+        elif message_type == "cancel":
+            # 世代を進めることで、音声合成中・処理待ちの文の音声が以降送信されないようにする
+            self._generation += 1
+            self._cancel_event.set()
+            self._cancel_event = threading.Event()
+            self._sentence_buffer.clear()
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            await self._send_json({"type": "cancelled"})
+        elif message_type == "parameters":
+            # 指定されたパラメータのみを更新し、指定されなかったパラメータは現在の値を引き継ぐ
+            parameters = {key: value for key, value in payload.items() if key != "type"}  # fmt: skip
+            self._parameters = TTSSessionParameters.model_validate({**self._parameters.model_dump(), **parameters})  # fmt: skip
+        else:
+            raise ValueError(f"Unknown message type: {message_type}")
+
+    async def _enqueue_sentence(self, sentence: str) -> None:
+        """文を音声合成の処理待ちキューに積む。キューが満杯の場合は空きができるまで待つ。"""
+        await self._queue.put(
+            _PendingSentence(
+                text=sentence,
+                parameters=self._parameters,
+                generation=self._generation,
+                cancel_event=self._cancel_event,
+            )
+        )
+
+    async def _synthesize_sentences(self) -> None:
+        """音声合成の処理待ちキューから文を 1 つずつ取り出し、音声合成してクライアントに送る。"""
+
+        while True:
+            item = await self._queue.get()
+            if item.generation != self._generation:
+                continue
+            if isinstance(item, _FlushMarker):
+                await self._send_json({"type": "flushed"}, generation=item.generation)
+                continue
+
+            sentence_index = next(self._sentence_indices)
+            try:
+                await self._synthesize_sentence(item, sentence_index)
+            except SynthesisCancelledError:
+                continue
+            except HTTPException as e:
+                await self._send_json({"type": "error", "sentence_index": sentence_index, "detail": e.detail}, generation=item.generation)  # fmt: skip
+            except Exception as e:
+                logger.error("Failed to synthesize a sentence in TTS session.", exc_info=e)  # fmt: skip
+                await self._send_json({"type": "error", "sentence_index": sentence_index, "detail": "Internal Server Error"}, generation=item.generation)  # fmt: skip
+
+    async def _synthesize_sentence(self, item: _PendingSentence, sentence_index: int) -> None:  # fmt: skip
+        """1 文を音声合成し、音声合成が終わった部分から順にクライアントに送る。"""
+
+        query = await run_in_threadpool(self._create_audio_query, item.text, item.parameters)  # fmt: skip
+        waves = self._synthesize_waves(query, item.cancel_event)
+        try:
+            started = False
+            while True:
+                wave = await run_in_threadpool(next, waves, None)
+                if wave is None or item.generation != self._generation:
+                    break
+                if not started:
+                    started = True
+                    await self._send_json(
+                        {
+                            "type": "sentence_start",
+                            "sentence_index": sentence_index,
+                            "text": item.text,
+                            "sample_rate": query.outputSamplingRate,
+                            "channels": 2 if query.outputStereo else 1,
+                        },
+                        generation=item.generation,
+                    )
+                await self._send_bytes(wave_to_pcm16_bytes(wave), generation=item.generation)  # fmt: skip
+            if started:
+                await self._send_json({"type": "sentence_end", "sentence_index": sentence_index}, generation=item.generation)  # fmt: skip
+        finally:
+            # 途中で送信を中止した場合も、音声合成に使っていたリソースを解放する
+            # セッションの終了で待機が中断された場合はスレッドで実行中のため、実行が終わった後のガベージコレクションに任せる
+            if not waves.gi_running:
+                await run_in_threadpool(waves.close)
+
+    def _create_audio_query(self, text: str, parameters: TTSSessionParameters) -> AudioQuery:  # fmt: skip
+        """読み上げテキストとセッションのパラメータから、音声合成用のクエリを生成する。"""
+
+        accent_phrases = self._engine.create_accent_phrases(text, self._style_id)
+        # アクセント句・パラメータはいずれも検証済みのため、クエリの生成時には再検証しない
+        return AudioQuery.model_construct(
+            accent_phrases=accent_phrases,
+            speedScale=parameters.speedScale,
+            intonationScale=parameters.intonationScale,
+            tempoDynamicsScale=parameters.tempoDynamicsScale,
+            pitchScale=parameters.pitchScale,
+            volumeScale=parameters.volumeScale,
+            prePhonemeLength=parameters.prePhonemeLength,
+            postPhonemeLength=parameters.postPhonemeLength,
+            pauseLength=None,
+            pauseLengthScale=1,
+            outputSamplingRate=parameters.outputSamplingRate
+            or self._engine.default_sampling_rate,  # fmt: skip
+            outputStereo=parameters.outputStereo,
+            kana=text,  # AivisSpeech Engine では音声合成時に読み上げテキストも必要なため、kana に読み上げテキストをそのまま入れる
+        )
+
+    def _synthesize_waves(self, query: AudioQuery, cancel_event: threading.Event) -> Generator[NDArray[np.float32], None, None]:  # fmt: skip
+        """
+        音声合成用のクエリを音声合成し、生成できた部分から順に音声波形を返す
+        推論を別プロセスのワーカーで実行している場合は、キャンセル可能な音声合成で全体を一度に音声合成する
+        """
+
+        if self._engine.synthesis_worker_pool is not None:
+            yield self._engine.synthesize_wave_cancellable(query, self._style_id, cancel_event)  # fmt: skip
+            return
+        yield from self._engine.synthesize_wave_stream(query, self._style_id)
+
+    async def _send_json(self, data: dict[str, Any], generation: int | None = None) -> None:  # fmt: skip
+        """
+        JSON テキストメッセージをクライアントに送る
+        generation が指定された場合、その世代が既にキャンセルされていれば送らない
+        """
+        async with self._send_lock:
+            if generation is not None and generation != self._generation:
+                return
+            await self._websocket.send_text(json.dumps(data, ensure_ascii=False))
+
+    async def _send_bytes(self, data: bytes, generation: int) -> None:
+        """バイナリメッセージをクライアントに送る。その世代が既にキャンセルされていれば送らない。"""
+        async with self._send_lock:
+            if generation != self._generation:
+                return
+            await self._websocket.send_bytes(data)
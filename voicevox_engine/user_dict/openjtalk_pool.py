@@ -0,0 +1,173 @@
+"""複数のリクエストのテキスト解析を並列に実行するための OpenJTalk インスタンスのプール"""
+
+import queue
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pyopenjtalk
+from pyopenjtalk import OPEN_JTALK_DICT_DIR, OpenJTalk
+
+from ..logging import logger
+
+
+class _OpenJTalkGeneration:
+    """同じ辞書を適用した OpenJTalk インスタンスの組 (辞書が置き換えられるたびに作り直される)"""
+
+    def __init__(self, user_dict_path: str | None, max_instances: int) -> None:
+        self.user_dict_path = user_dict_path
+        # 貸し出し可能なインスタンス (None は未作成の枠を表し、初めて貸し出す際に作成する)
+        # 直近に返却されたインスタンスから再利用することで、利用されるインスタンスの数を必要最小限に抑える
+        self.idle_instances: queue.LifoQueue[OpenJTalk | None] = queue.LifoQueue()
+        for _ in range(max_instances):
+            self.idle_instances.put(None)
+        # 貸し出し中 (貸し出し待ちを含む) のインスタンスの数
+        self.active_count = 0
+
+    def create_instance(self) -> OpenJTalk:
+        """この組の辞書を適用した OpenJTalk インスタンスを作成する。"""
+        if self.user_dict_path is None:
+            return OpenJTalk(dn_mecab=OPEN_JTALK_DICT_DIR)
+        return OpenJTalk(
+            dn_mecab=OPEN_JTALK_DICT_DIR,
+            userdic=self.user_dict_path.encode("utf-8"),
+        )
+
+    def close(self) -> None:
+        """作成済みのインスタンスを全て破棄する。(全てのインスタンスが返却された後に呼び出す)"""
+        while not self.idle_instances.empty():
+            self.idle_instances.get_nowait()
+
+
+class OpenJTalkPool:
+    """
+    同じ辞書を適用した独立した OpenJTalk インスタンスのプール
+    pyopenjtalk は単一の OpenJTalk インスタンスを排他制御しながら共有するため、同時に受け付けたリクエストのテキスト解析は直列に実行される
+    スレッドごとに異なるインスタンスを貸し出すことで、最大 max_instances 件のテキスト解析を並列に実行できる
+    辞書が置き換えられた際は、全てのインスタンスを新しい辞書を適用したものに一括で切り替える
+    """
+
+    def __init__(self, max_instances: int, user_dict_path: str | None = None) -> None:
+        """
+        Parameters
+        ----------
+        max_instances : int
+            同時に貸し出す OpenJTalk インスタンスの数の上限 (インスタンスは必要になった時点で作成される)
+        user_dict_path : str | None
+            インスタンスに適用するコンパイル済みユーザー辞書のパス (None の場合はシステム辞書のみ)
+        """
+
+        self.max_instances = max(max_instances, 1)
+        self._condition = threading.Condition()
+        self._generation = _OpenJTalkGeneration(user_dict_path, self.max_instances)
+
+    @property
+    def user_dict_path(self) -> str | None:
+        """インスタンスに適用されているコンパイル済みユーザー辞書のパス"""
+        return self._generation.user_dict_path
+
+    @contextmanager
+    def acquire(self) -> Iterator[OpenJTalk]:
+        """
+        現在の辞書を適用した OpenJTalk インスタンスを貸し出す
+        全てのインスタンスが貸し出し中の場合は、いずれかが返却されるまで待機する
+
+        Returns
+        -------
+        jtalk : Iterator[OpenJTalk]
+            このスレッドが with 文を抜けるまで専有できる OpenJTalk インスタンス
+        """
+
+        with self._condition:
+            generation = self._generation
+            generation.active_count += 1
+        try:
+            jtalk = generation.idle_instances.get()
+            try:
+                if jtalk is None:
+                    jtalk = generation.create_instance()
+                yield jtalk
+            finally:
+                # インスタンスの作成に失敗した場合は、未作成の枠として戻す
+                generation.idle_instances.put(jtalk)
+        finally:
+            with self._condition:
+                generation.active_count -= 1
+                self._condition.notify_all()
+
+    def set_user_dict(self, user_dict_path: str | None) -> None:
+        """
+        インスタンスに適用する辞書を置き換える
+        以降に貸し出すインスタンスは全て新しい辞書を適用したものになり、古い辞書を適用したインスタンスは
+        貸し出し中のものが全て返却されるのを待ってから破棄する (この関数から戻った時点で古い辞書ファイルは開かれていない)
+
+        Parameters
+        ----------
+        user_dict_path : str | None
+            新たに適用するコンパイル済みユーザー辞書のパス (None の場合はユーザー辞書の適用を解除する)
+        """
+
+        with self._condition:
+            old_generation = self._generation
+            self._generation = _OpenJTalkGeneration(user_dict_path, self.max_instances)
+            while old_generation.active_count > 0:
+                self._condition.wait()
+        old_generation.close()
+
+
+# pyopenjtalk のテキスト解析に用いられている OpenJTalk インスタンスのプール (install_openjtalk_pool() の呼び出し前は None)
+_global_pool: OpenJTalkPool | None = None
+# pyopenjtalk に適用されているコンパイル済みユーザー辞書のパス
+_user_dict_path: str | None = None
+_global_pool_lock = threading.Lock()
+
+
+def install_openjtalk_pool(max_instances: int) -> None:
+    """
+    pyopenjtalk の run_frontend() / make_label() (extract_fullcontext() や g2p() などから呼ばれる) が、
+    単一の OpenJTalk インスタンスの代わりに OpenJTalkPool から貸し出されたインスタンスを利用するようにする
+    max_instances に 1 以下を指定した場合は何もしない (pyopenjtalk の単一のインスタンスをそのまま利用する)
+
+    Parameters
+    ----------
+    max_instances : int
+        同時に貸し出す OpenJTalk インスタンスの数の上限
+    """
+
+    global _global_pool
+    if max_instances <= 1:
+        return
+    # _global_jtalk は pyopenjtalk の非公開の実装であるため、存在しない (pyopenjtalk の更新で変更された) 場合はプールを有効にしない
+    if not callable(getattr(pyopenjtalk, "_global_jtalk", None)):
+        logger.warning("pyopenjtalk._global_jtalk is not found. OpenJTalk instance pool is disabled.")  # fmt: skip
+        return
+    with _global_pool_lock:
+        _global_pool = OpenJTalkPool(max_instances, _user_dict_path)
+        # pyopenjtalk は呼び出しのたびにモジュール変数 _global_jtalk() でインスタンスを取得するため、これを差し替える
+        pyopenjtalk._global_jtalk = _global_pool.acquire
+    logger.info(f"OpenJTalk instance pool enabled. (max {max_instances} instances)")
+
+
+def apply_user_dict(user_dict_path: str | None) -> None:
+    """
+    pyopenjtalk のテキスト解析に用いる辞書を置き換える
+    OpenJTalkPool が有効な場合はプール内の全てのインスタンスを、そうでない場合は pyopenjtalk の単一のインスタンスを置き換える
+
+    Parameters
+    ----------
+    user_dict_path : str | None
+        適用するコンパイル済みユーザー辞書のパス (None の場合はユーザー辞書の適用を解除する)
+    """
+
+    global _user_dict_path
+    with _global_pool_lock:
+        _user_dict_path = user_dict_path
+        if _global_pool is None:
+            if user_dict_path is None:
+                pyopenjtalk.unset_user_dict()
+            else:
+                pyopenjtalk.update_global_jtalk_with_user_dict(user_dict_path)
+            return
+        _global_pool.set_user_dict(user_dict_path)
+        # pyopenjtalk.unset_user_dict() などが直接呼ばれ、プールが差し替えられていた場合に備え、再度プールを利用させる
+        pyopenjtalk._global_jtalk = _global_pool.acquire
@@ -1,8 +1,12 @@
 "ユーザー辞書関連の処理"
 
 import gc
+import hashlib
 import json
+import os
+import shutil
 import sys
+import tempfile
 import threading
 import time
 from collections.abc import Callable
@@ -17,6 +21,7 @@ from pydantic import TypeAdapter
 from ..logging import logger
 from ..utility.path_utility import get_save_dir, resource_root
 from .model import UserDictWord
+from .openjtalk_pool import apply_user_dict
 from .user_dict_word import (
     SaveFormatUserDictWord,
     UserDictInputError,
@@ -64,6 +69,146 @@ _COMPILED_DICT_PATH = save_dir / "user.dic"
 mutex_user_dict = threading.Lock()
 mutex_openjtalk_dict = threading.Lock()
 
+# pyopenjtalk に適用されている辞書のバージョン
+# コンパイル済み辞書が適用・置き換えされるたびに加算され、テキスト解析結果のキャッシュの無効化判定に用いられる
+_dict_version = 0
+# pyopenjtalk に適用されているコンパイル済み辞書のパス (ユーザー辞書が適用されていない場合は None) と、その内容のフィンガープリント
+# フィンガープリントは get_dict_fingerprint() の初回呼び出し時に計算される (None は未計算)
+_applied_dict_path: Path | None = None
+_dict_fingerprint: bytes | None = None
+_dict_state_lock = threading.Lock()
+
+# ワーカープロセスの pyopenjtalk に適用されている、親プロセスの辞書のバージョン (まだ適用していない場合は None)
+_worker_dict_version: int | None = None
+# ワーカープロセスが適用のために作成した、コンパイル済み辞書のコピーのうち、まだ削除できていないもののパス
+_worker_dict_copies: list[Path] = []
+
+
+def get_dict_version() -> int:
+    """
+    pyopenjtalk に適用されている辞書のバージョンを取得する
+    辞書が置き換えられるたびに値が変わるため、辞書に依存する解析結果をキャッシュする際の無効化判定に用いる
+
+    Returns
+    -------
+    int
+        辞書のバージョン
+    """
+    return _dict_version
+
+
+def get_applied_dict_path() -> Path | None:
+    """
+    pyopenjtalk に適用されているコンパイル済み辞書のパスを取得する
+    別プロセスでテキスト解析を行う際に、同じ辞書を適用するために用いる
+
+    Returns
+    -------
+    Path | None
+        コンパイル済み辞書のパス (ユーザー辞書が適用されていない場合は None)
+    """
+    with _dict_state_lock:
+        return _applied_dict_path
+
+
+def get_dict_fingerprint() -> bytes:
+    """
+    pyopenjtalk に適用されている辞書の内容から、プロセスを跨いでも安定したフィンガープリントを取得する
+    同じユーザー辞書を共有する複数のエンジンのプロセス間で、辞書に依存する解析結果を受け渡す際の一致判定に用いる
+    コンパイル済み辞書の内容は辞書が置き換えられるまで変わらないため、初回呼び出し時に計算した結果を再利用する
+
+    Returns
+    -------
+    bytes
+        16 バイトのフィンガープリント
+    """
+
+    global _dict_fingerprint
+    with _dict_state_lock:
+        if _dict_fingerprint is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            if _applied_dict_path is not None and _applied_dict_path.is_file():
+                with _applied_dict_path.open("rb") as f:
+                    while chunk := f.read(1024 * 1024):
+                        hasher.update(chunk)
+            _dict_fingerprint = hasher.digest()
+        return _dict_fingerprint
+
+
+def get_applied_dict() -> tuple[int, str | None]:
+    """
+    pyopenjtalk に適用されている辞書のバージョンと、コンパイル済み辞書の絶対パスを取得する
+    ワーカープロセスに同じ辞書を適用させるため、apply_dict_in_worker() に渡す値として用いる
+
+    Returns
+    -------
+    tuple[int, str | None]
+        辞書のバージョンと、コンパイル済み辞書の絶対パス (ユーザー辞書が適用されていない場合は None)
+    """
+    with _dict_state_lock:
+        dict_version, dict_path = _dict_version, _applied_dict_path
+    return dict_version, str(dict_path.resolve()) if dict_path is not None else None
+
+
+def apply_dict_in_worker(dict_version: int, dict_path: str | None) -> None:
+    """
+    ワーカープロセスの pyopenjtalk に、親プロセスで適用されている辞書を適用する (適用済みの場合は何もしない)
+    親プロセスはユーザー辞書の更新時にコンパイル済み辞書を同じパスに置き換えるが、Windows ではワーカープロセスが開いている
+    ファイルを置き換えられないため、ワーカープロセスはコンパイル済み辞書のコピーを作成して適用する
+    ワーカープロセスの辞書のバージョンとフィンガープリントも更新されるため、辞書に依存するキャッシュやトークンの検証も親プロセスと同じ辞書に基づく
+
+    Parameters
+    ----------
+    dict_version : int
+        親プロセスの get_applied_dict() で取得した辞書のバージョン
+    dict_path : str | None
+        親プロセスの get_applied_dict() で取得したコンパイル済み辞書のパス
+    """
+
+    global _worker_dict_version
+    if _worker_dict_version == dict_version:
+        return
+
+    copied_dict_path: Path | None = None
+    if dict_path is not None:
+        fd, copied_dict_name = tempfile.mkstemp(prefix="aivisspeech-user-dict-", suffix=".dic")  # fmt: skip
+        os.close(fd)
+        copied_dict_path = Path(copied_dict_name)
+        _worker_dict_copies.append(copied_dict_path)
+        shutil.copyfile(dict_path, copied_dict_path)
+    apply_user_dict(str(copied_dict_path) if copied_dict_path is not None else None)
+    _set_applied_dict(copied_dict_path)
+    # コピーを削除する前に、辞書の内容からフィンガープリントを計算しておく (コピーの内容は親プロセスの辞書と同じ)
+    get_dict_fingerprint()
+    _worker_dict_version = dict_version
+
+    # 不要になったコピーを削除する
+    # Windows 以外では、適用中の辞書ファイルも削除できる (削除後も pyopenjtalk が開いている間は読み込める)
+    # Windows では適用中のコピーは削除できないため、次に辞書を適用し直した後に削除する
+    for path in list(_worker_dict_copies):
+        try:
+            path.unlink()
+            _worker_dict_copies.remove(path)
+        except OSError:
+            pass
+
+
+def _set_applied_dict(compiled_dict_path: Path | None) -> None:
+    """
+    pyopenjtalk に適用されている辞書が置き換えられたことを記録する。
+
+    Parameters
+    ----------
+    compiled_dict_path : Path | None
+        適用されたコンパイル済み辞書のパス (ユーザー辞書の適用が解除された場合は None)
+    """
+
+    global _dict_version, _applied_dict_path, _dict_fingerprint
+    with _dict_state_lock:
+        _dict_version += 1
+        _applied_dict_path = compiled_dict_path
+        _dict_fingerprint = None
+
 
 _save_format_dict_adapter = TypeAdapter(dict[str, SaveFormatUserDictWord])
 
@@ -106,9 +251,8 @@ class UserDictionary:
 
         # サーバーの起動高速化のため、前回起動時にコンパイル済みのユーザー辞書データがあれば、そのまま pyopenjtalk に適用する
         if self._compiled_dict_path.is_file():
-            pyopenjtalk.update_global_jtalk_with_user_dict(
-                str(self._compiled_dict_path.resolve(strict=True))
-            )
+            apply_user_dict(str(self._compiled_dict_path.resolve(strict=True)))
+            _set_applied_dict(self._compiled_dict_path)
             logger.info("Compiled user dictionary applied.")
 
         # バックグラウンドで辞書更新を行う (数秒程度を要する)
@@ -211,12 +355,16 @@ class UserDictionary:
                 raise RuntimeError("辞書のコンパイル時にエラーが発生しました。")
 
             # コンパイル済み辞書の置き換え・読み込み
-            pyopenjtalk.unset_user_dict()
-            tmp_compiled_path.replace(compiled_dict_path)
-            if compiled_dict_path.is_file():
-                pyopenjtalk.update_global_jtalk_with_user_dict(
-                    str(compiled_dict_path.resolve(strict=True))
-                )
+            # 置き換えの途中で失敗した場合も辞書の状態は変わりうるため、常に辞書のバージョンを更新する
+            applied_dict_path: Path | None = None
+            try:
+                apply_user_dict(None)
+                tmp_compiled_path.replace(compiled_dict_path)
+                if compiled_dict_path.is_file():
+                    apply_user_dict(str(compiled_dict_path.resolve(strict=True)))
+                    applied_dict_path = compiled_dict_path
+            finally:
+                _set_applied_dict(applied_dict_path)
 
             logger.info(f"User dictionary updated. ({time.time() - start_time:.2f}s)")
 
@@ -0,0 +1,98 @@
+"""モデルの内容から、安定したフィンガープリントを高速に生成するためのユーティリティ"""
+
+import hashlib
+import struct
+from typing import Final
+
+# フィンガープリントのバイト数
+FINGERPRINT_SIZE: Final[int] = 16
+
+# 正規化したバイナリ表現で、各値の型を区別するためのタグ
+_TAG_NONE: Final[bytes] = b"\x00"
+_TAG_STR: Final[bytes] = b"\x01"
+_TAG_FLOAT: Final[bytes] = b"\x02"
+_TAG_INT: Final[bytes] = b"\x03"
+_TAG_FINGERPRINT: Final[bytes] = b"\x04"
+
+_pack_float = struct.Struct("<d").pack
+_pack_int = struct.Struct("<q").pack
+_pack_length = struct.Struct("<I").pack
+
+
+class FingerprintBuilder:
+    """
+    モデルの各フィールドの値を、型と長さの情報を含む正規化したバイナリ表現に連結し、フィンガープリントを生成する
+    同じ内容のモデルからは、プロセスや Python のバージョンに依らず常に同じフィンガープリントが生成される
+    """
+
+    __slots__ = ("_parts",)
+
+    def __init__(self, model_name: str) -> None:
+        """
+        Parameters
+        ----------
+        model_name : str
+            モデルの名前 (異なるモデル同士でフィンガープリントが衝突しないよう、バイナリ表現の先頭に含める)
+        """
+
+        self._parts: list[bytes] = []
+        self.add_str(model_name)
+
+    def add_str(self, value: str | None) -> None:
+        """文字列 (または None) を追加する"""
+        if value is None:
+            self._parts.append(_TAG_NONE)
+            return
+        encoded = value.encode("utf-8")
+        self._parts.append(_TAG_STR + _pack_length(len(encoded)) + encoded)
+
+    def add_float(self, value: float | None) -> None:
+        """浮動小数点数 (または None) を追加する"""
+        if value is None:
+            self._parts.append(_TAG_NONE)
+            return
+        # 等値比較で等しい -0.0 と 0.0 が同じ表現になるよう、0.0 を足して正規化する
+        self._parts.append(_TAG_FLOAT + _pack_float(value + 0.0))
+
+    def add_int(self, value: int | None) -> None:
+        """整数・真偽値 (または None) を追加する"""
+        if value is None:
+            self._parts.append(_TAG_NONE)
+            return
+        self._parts.append(_TAG_INT + _pack_int(value))
+
+    def add_fingerprints(self, fingerprints: list[bytes]) -> None:
+        """子要素のフィンガープリントのリストを追加する"""
+        self._parts.append(_TAG_FINGERPRINT + _pack_length(len(fingerprints)))
+        self._parts.extend(fingerprints)
+
+    def digest(self) -> bytes:
+        """
+        これまでに追加した値からフィンガープリントを生成する
+
+        Returns
+        -------
+        bytes
+            FINGERPRINT_SIZE バイトのフィンガープリント
+        """
+
+        return digest_fingerprint(b"".join(self._parts))
+
+
+def digest_fingerprint(source: bytes) -> bytes:
+    """
+    正規化したバイナリ表現からフィンガープリントを生成する
+    FingerprintBuilder を使わず、固定のレイアウトでバイナリ表現を組み立てる (大量に生成されるモデル向けの) 高速な実装から用いる
+
+    Parameters
+    ----------
+    source : bytes
+        正規化したバイナリ表現
+
+    Returns
+    -------
+    bytes
+        FINGERPRINT_SIZE バイトのフィンガープリント
+    """
+
+    return hashlib.blake2b(source, digest_size=FINGERPRINT_SIZE).digest()